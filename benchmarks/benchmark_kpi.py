@@ -0,0 +1,63 @@
+"""asv benchmark suites that run every implemented KPI at multiple scales.
+
+Run with `asv run` from the repository root or without asv, with `python -m benchmarks.run`.
+"""
+
+from benchmarks.common import BUILDING_COUNTS, BUILDING_SCALE, DATASETS, SCALES
+from benchmarks.common import get_arguments, get_dataset_profiles, get_implemented_kpi_names, get_kpis, get_synthetic_profiles
+
+class _KPISuite:
+    timeout = 1800.0
+
+    def _setup(self, kpi: str, profiles):
+        self.kpi = get_kpis()[kpi]
+        self.arguments = list(get_arguments(self.kpi, profiles))
+
+    def _calculate(self):
+        for kwargs in self.arguments:
+            self.kpi.calculate(**kwargs)
+
+class TimeSeriesLengthSuite(_KPISuite):
+    """Single building at 24 h hourly, one year hourly and one year minute-level resolution."""
+
+    params = (get_implemented_kpi_names(), list(SCALES.keys()))
+    param_names = ['kpi', 'scale']
+
+    def setup(self, kpi, scale):
+        self._setup(kpi, get_synthetic_profiles(*SCALES[scale]))
+
+    def time_calculate(self, kpi, scale):
+        self._calculate()
+
+    def peakmem_calculate(self, kpi, scale):
+        self._calculate()
+
+class BuildingCountSuite(_KPISuite):
+    """1, 100 and 10k buildings at 24 h hourly resolution."""
+
+    params = (get_implemented_kpi_names(), BUILDING_COUNTS)
+    param_names = ['kpi', 'building_count']
+
+    def setup(self, kpi, building_count):
+        self._setup(kpi, get_synthetic_profiles(*SCALES[BUILDING_SCALE], building_count=building_count))
+
+    def time_calculate(self, kpi, building_count):
+        self._calculate()
+
+    def peakmem_calculate(self, kpi, building_count):
+        self._calculate()
+
+class DatasetSuite(_KPISuite):
+    """Bundled `data/incite_dataset` and `data/test_dataset`."""
+
+    params = (get_implemented_kpi_names(), DATASETS)
+    param_names = ['kpi', 'dataset']
+
+    def setup(self, kpi, dataset):
+        self._setup(kpi, get_dataset_profiles(dataset))
+
+    def time_calculate(self, kpi, dataset):
+        self._calculate()
+
+    def peakmem_calculate(self, kpi, dataset):
+        self._calculate()
@@ -0,0 +1,344 @@
+"""Shared KPI discovery and input builders for the benchmark suites."""
+
+import datetime
+import functools
+import importlib
+import inspect
+import os
+import pkgutil
+from typing import Any, Iterator, List, Mapping, Type
+import warnings
+import numpy as np
+import pandas as pd
+import energy_flexibility_kpis.kpi.energy_flexibility as energy_flexibility
+from energy_flexibility_kpis.kpi.base import KPI
+from energy_flexibility_kpis.model import RCModel
+
+DATA_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'data')
+
+# name: (timesteps, timestep resolution in minutes)
+SCALES = {
+    '24h_hourly': (24, 60),
+    '1y_hourly': (8760, 60),
+    '1y_minute': (525600, 1),
+}
+BUILDING_COUNTS = [1, 100, 10_000]
+BUILDING_SCALE = '24h_hourly'
+DATASETS = ['incite_dataset', 'test_dataset']
+
+# KPIs whose calculate takes one profile per building of a cluster instead of a single profile
+CLUSTER_KPIS = [
+    'PriceResponsiveness', 'PowerPaybackRatio', 'FlexibilityAggregationSynergyFactor', 'ImpactedDwellingsPercentage',
+    'AverageDisruptionDuration',
+]
+# KPIs whose calculate takes one setpoint profile per building instead of one per zone
+SINGLE_ZONE_KPIS = ['FlexibilityMap']
+# KPIs that solve one optimisation per timestep of the evaluation window, evaluated on this many
+# timesteps from the first timestamp so that minute-level scales stay tractable
+HORIZON_KPIS = {'FlexibilityMap': 24}
+
+def get_kpis() -> Mapping[str, Type[KPI]]:
+    """Return every KPI class defined in `kpi/energy_flexibility/*` keyed by class name."""
+
+    kpis = {}
+
+    for _, module_name, _ in pkgutil.iter_modules(energy_flexibility.__path__):
+        module = importlib.import_module(f'{energy_flexibility.__name__}.{module_name}')
+
+        for name, obj in inspect.getmembers(module, inspect.isclass):
+            if issubclass(obj, KPI) and obj is not KPI and obj.__module__ == module.__name__:
+                kpis[name] = obj
+
+            else:
+                pass
+
+    return dict(sorted(kpis.items()))
+
+@functools.lru_cache(maxsize=None)
+def is_implemented(name: str) -> bool:
+    """Return False if the KPI's calculate raises NotImplementedError on a small synthetic input."""
+
+    kpi = get_kpis()[name]
+    profiles = get_synthetic_profiles(*SCALES['24h_hourly'])
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+
+            for kwargs in get_arguments(kpi, profiles):
+                kpi.calculate(**kwargs)
+
+    except NotImplementedError:
+        return False
+
+    except Exception:
+        # broken KPIs are still benchmarked so that the failure is reported
+        pass
+
+    return True
+
+def get_implemented_kpi_names() -> List[str]:
+    return [k for k in get_kpis() if is_implemented(k)]
+
+def get_synthetic_profiles(length: int, resolution: int, building_count: int = 1, seed: int = 0) -> Mapping[str, Any]:
+    """Return synthetic daily-periodic profiles.
+
+    Parameters
+    ----------
+    length: int
+        Number of timesteps.
+    resolution: int
+        Timestep resolution in minutes.
+    building_count: int, default: 1
+        Number of buildings. Building-level profiles have shape `(building_count, length)`.
+    seed: int, default: 0
+        Random number generator seed.
+    """
+
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range('2022-01-01 00:00:00', periods=length, freq=f'{resolution}min')
+    hour = timestamps.hour.values + timestamps.minute.values/60.0
+    daily = 0.5 + 0.5*np.sin(2.0*np.pi*(hour - 9.0)/24.0)
+    baseline = 2.0 + 3.0*daily + rng.random((building_count, length))
+    flexible = baseline*(1.0 - 0.2*((hour >= 17.0) & (hour < 20.0))) + 0.3*((hour >= 12.0) & (hour < 15.0))
+    signal_start = timestamps[int(length*0.4)]
+    signal_end = timestamps[max(int(length*0.4), int(length*0.6) - 1)]
+
+    profiles = {
+        'timestamps': timestamps,
+        'resolution': resolution,
+        'baseline_power': baseline,
+        'flexible_power': flexible,
+        'price': 0.1 + 0.2*((hour >= 16.0) & (hour < 21.0)),
+        'carbon_intensity': 0.2 + 0.1*np.cos(2.0*np.pi*hour/24.0),
+        'self_production': np.clip(4.0*np.sin(np.pi*(hour - 6.0)/12.0), 0.0, None)*np.ones((building_count, 1)),
+        'availability': (rng.random((building_count, length)) > 0.1).astype(int),
+        'outdoor_temperature': 5.0 + 5.0*daily,
+        'zone_temperature': 22.0 + 2.0*daily[:, np.newaxis] + rng.normal(0.0, 0.5, (length, 3)),
+        'cooling_setpoint': np.full((length, 3), 24.0),
+        'heating_setpoint': np.full((length, 3), 20.0),
+        'signal_start': signal_start.to_pydatetime(),
+        'signal_end': signal_end.to_pydatetime(),
+    }
+
+    return {**profiles, **_get_derived_profiles(profiles, seed=seed)}
+
+@functools.lru_cache(maxsize=None)
+def get_dataset_profiles(name: str) -> Mapping[str, Any]:
+    """Return profiles of a bundled dataset in `data/`."""
+
+    directory = os.path.join(DATA_DIRECTORY, name)
+
+    if name == 'incite_dataset':
+        baseline = pd.read_csv(os.path.join(directory, 'dataset_Ref_Cool.csv'), parse_dates=['Timestamp'])
+        flexible = pd.read_csv(os.path.join(directory, 'dataset_MPC_Cost_Cool.csv'), parse_dates=['Timestamp'])
+        data = baseline.merge(flexible, on='Timestamp', suffixes=('_baseline', '_flexible'))
+        timestamps = pd.DatetimeIndex(data['Timestamp'])
+        high_price = data['Price_baseline'] >= data['Price_baseline'].quantile(0.75)
+        zone_temperature = data['Indoor_Tind_avg_flexible'].values
+        outdoor_temperature = data['Weather_Tamb_baseline'].values
+        cooling_setpoint = np.full(data.shape[0], 26.0)
+        heating_setpoint = np.full(data.shape[0], 20.0)
+        profiles = {
+            'baseline_power': data['HP_Pel_baseline'].values,
+            'flexible_power': data['HP_Pel_flexible'].values,
+            'price': data['Price_baseline'].values,
+            'carbon_intensity': data['CO2_MEF'].values,
+        }
+
+    elif name == 'test_dataset':
+        baseline = pd.read_csv(os.path.join(directory, 'baseline.csv'))
+        flexible = pd.read_csv(os.path.join(directory, 'mpc_results.csv'))
+        signal = pd.read_csv(os.path.join(directory, 'ToU.csv'))
+        timestamps = pd.DatetimeIndex(pd.to_datetime(flexible['Datetime']))
+        high_price = signal['Peak']
+        zone_temperature = flexible['T_i'].values
+        outdoor_temperature = flexible['T_o'].values
+        cooling_setpoint = flexible['T_comfort_u'].values
+        heating_setpoint = flexible['T_comfort_l'].values
+        profiles = {
+            'baseline_power': baseline['Qh_hp'].values,
+            'flexible_power': flexible['Qh_hp'].values,
+            'price': signal['ToU'].values.astype(float),
+            'carbon_intensity': np.full(flexible.shape[0], 0.2),
+        }
+
+    else:
+        raise Exception(f'Unknown dataset: {name}')
+
+    # first contiguous high price event
+    event = (high_price != high_price.shift(1)).cumsum()[high_price]
+    event = event[event == event.iloc[0]].index
+    length = timestamps.shape[0]
+    profiles = {k: v[np.newaxis, :] if k.endswith('power') else v for k, v in profiles.items()}
+
+    profiles = {
+        **profiles,
+        'timestamps': timestamps,
+        'resolution': int((timestamps[1] - timestamps[0]).total_seconds()/60),
+        'self_production': np.zeros((1, length)),
+        'availability': np.ones((1, length), dtype=int),
+        'outdoor_temperature': outdoor_temperature,
+        'zone_temperature': zone_temperature[:, np.newaxis],
+        'cooling_setpoint': cooling_setpoint[:, np.newaxis],
+        'heating_setpoint': heating_setpoint[:, np.newaxis],
+        'signal_start': timestamps[event[0]].to_pydatetime(),
+        'signal_end': timestamps[event[-1]].to_pydatetime(),
+    }
+
+    return {**profiles, **_get_derived_profiles(profiles)}
+
+def _get_derived_profiles(profiles: Mapping[str, Any], seed: int = 0) -> Mapping[str, Any]:
+    """Return inputs of the flexibility KPIs that are derived from the power, temperature and setpoint profiles."""
+
+    rng = np.random.default_rng(seed)
+    baseline = profiles['baseline_power']
+    timestamps = profiles['timestamps']
+    hour = timestamps.hour.values + timestamps.minute.values/60.0
+    occupied = ((hour >= 8.0) & (hour < 18.0)).astype(float)
+    shape = profiles['zone_temperature'].shape
+    threshold = np.median(baseline, axis=1, keepdims=True)
+    setpoint = (profiles['cooling_setpoint'] + profiles['heating_setpoint'])/2.0
+    # the heat pump cools if it is mostly warmer outdoors than within the comfort band
+    efficiency = -3.0 if profiles['outdoor_temperature'].mean() > setpoint.mean() else 3.0
+
+    return {
+        # flat demand at the mean baseline power
+        'target_power': np.repeat(baseline.mean(axis=1, keepdims=True), baseline.shape[1], axis=1),
+        # headroom to the peak and reserve above the minimum of the baseline power
+        'upward_flexible_power': baseline.max(axis=1, keepdims=True) - baseline,
+        'downward_flexible_power': baseline - baseline.min(axis=1, keepdims=True),
+        # heat pumps are on when the power is above the median baseline power
+        'baseline_activation': baseline > threshold,
+        'flexible_activation': profiles['flexible_power'] > threshold,
+        'zone_co2': 600.0 + 500.0*occupied[:, np.newaxis] + rng.normal(0.0, 50.0, shape),
+        'co2_limit': np.full(shape, 1000.0),
+        'model': RCModel(
+            resistance=5.0, capacitance=10.0, maximum_power=5.0, efficiency=efficiency,
+            initial_temperature=float(setpoint[0].mean())
+        ),
+    }
+
+def get_arguments(kpi: Type[KPI], profiles: Mapping[str, Any]) -> Iterator[Mapping[str, Any]]:
+    """Yield :py:meth:`KPI.calculate` keyword arguments for every building in `profiles`.
+
+    Cluster KPIs are called once with the profiles of all buildings.
+    """
+
+    building_count = profiles['baseline_power'].shape[0]
+    timestamps = profiles['timestamps'].to_pydatetime().tolist()
+    parameters = list(inspect.signature(kpi.calculate).parameters)
+    name = kpi.__name__
+    window = {}
+
+    if name in HORIZON_KPIS:
+        window['evaluation_end_timestamp'] = timestamps[min(len(timestamps), HORIZON_KPIS[name]) - 1]
+
+    else:
+        pass
+
+    if name in CLUSTER_KPIS:
+        yield {**{p: _get_argument(name, p, profiles, None, timestamps) for p in parameters if _has_argument(p)}, **window}
+
+    else:
+        for b in range(building_count):
+            yield {**{p: _get_argument(name, p, profiles, b, timestamps) for p in parameters if _has_argument(p)}, **window}
+
+def _has_argument(parameter: str) -> bool:
+    return not parameter.startswith('evaluation_')
+
+def _get_argument(
+    kpi: str, parameter: str, profiles: Mapping[str, Any], building: int, timestamps: List[datetime.datetime]
+) -> Any:
+    building = slice(None) if building is None else building
+    dt = profiles['resolution']/60.0
+    power = {
+        'baseline': profiles['baseline_power'][building],
+        'flexible': profiles['flexible_power'][building],
+        'generic': profiles['flexible_power'][building],
+        'target': profiles['target_power'][building],
+    }
+    activation = {
+        'baseline': profiles['baseline_activation'][building],
+        'flexible': profiles['flexible_activation'][building],
+    }
+    zone = 0 if kpi in SINGLE_ZONE_KPIS else slice(None)
+    scenario = parameter.split('_')[0]
+
+    if parameter == 'timestamps':
+        value = timestamps
+
+    elif parameter == 'availability':
+        value = profiles['availability'][building]
+
+    elif parameter.endswith('_electric_power_profile'):
+        value = power[scenario]
+
+    elif parameter.endswith('_electricity_consumption_profile') or parameter.endswith('_natural_gas_consumption_profile'):
+        value = power[scenario]*dt
+
+    elif parameter.endswith('_cost_profile'):
+        value = power[scenario]*dt*profiles['price']
+
+    elif parameter.endswith('_carbon_emissions_profile'):
+        value = power[scenario]*dt*profiles['carbon_intensity']
+
+    elif parameter.endswith('_carbon_intensity_profile'):
+        value = profiles['carbon_intensity']
+
+    elif parameter == 'electricity_price_profile':
+        value = profiles['price']
+
+    elif parameter in ['upward_flexible_power_profile', 'downward_flexible_power_profile']:
+        value = profiles[parameter.replace('_profile', '')][building]
+
+    elif parameter.endswith('_heat_pump_activation_profile'):
+        value = activation[scenario]
+
+    elif parameter.endswith('_self_production_profile'):
+        value = profiles['self_production'][building]
+
+    elif parameter.endswith('_start_timestamp') or parameter in ['load_profile_peak_timestamp', 'grid_peak_timestamp']:
+        value = profiles['signal_start']
+
+    elif parameter.endswith('_end_timestamp') or parameter == 'load_profile_valley_timestamp':
+        value = profiles['signal_end']
+
+    elif parameter == 'zone_temperature_profile':
+        value = profiles['zone_temperature']
+
+    elif parameter == 'cooling_setpoints':
+        value = profiles['cooling_setpoint'][:, zone]
+
+    elif parameter == 'heating_setpoints':
+        value = profiles['heating_setpoint'][:, zone]
+
+    elif parameter == 'outdoor_air_temperature_profile':
+        value = profiles['outdoor_temperature']
+
+    elif parameter == 'zone_co2_concentration_profile':
+        value = profiles['zone_co2']
+
+    elif parameter == 'upper_co2_concentration_limits':
+        value = profiles['co2_limit']
+
+    elif parameter == 'model':
+        value = profiles['model']
+
+    elif parameter == 'window':
+        # Sakoe-Chiba band of four hours
+        value = max(1, round(4.0/dt))
+
+    elif parameter == 'num_zones':
+        value = profiles['zone_temperature'].shape[1]
+
+    elif parameter == 'num_days':
+        value = max(1, round(len(timestamps)*dt/24.0))
+
+    elif parameter == 'floor_area':
+        value = 100.0
+
+    else:
+        value = None
+
+    return value.tolist() if isinstance(value, np.ndarray) else value
@@ -0,0 +1,128 @@
+"""Standalone runner for the benchmark suites that does not need asv.
+
+Records the best wall time of `--repeat` runs and the peak traced memory of every KPI
+and scale as JSON lines, and optionally compares them to a previous results file to
+catch regressions, e.g.:
+
+    python -m benchmarks.run --output baseline.jsonl
+    python -m benchmarks.run --output current.jsonl --compare baseline.jsonl
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any, Iterator, List, Mapping
+import warnings
+from benchmarks.benchmark_kpi import BuildingCountSuite, DatasetSuite, TimeSeriesLengthSuite
+
+SUITES = [TimeSeriesLengthSuite, BuildingCountSuite, DatasetSuite]
+
+def run(kpis: List[str] = None, suites: List[str] = None, params: List[str] = None, repeat: int = 3) -> Iterator[Mapping[str, Any]]:
+    """Yield a result record for every benchmark case."""
+
+    for suite_class in SUITES:
+        if suites is not None and suite_class.__name__ not in suites:
+            continue
+
+        else:
+            pass
+
+        for kpi, param in itertools.product(*suite_class.params):
+            if (kpis is not None and kpi not in kpis) or (params is not None and str(param) not in params):
+                continue
+
+            else:
+                pass
+
+            record = {'suite': suite_class.__name__, 'kpi': kpi, suite_class.param_names[1]: param}
+            suite = suite_class()
+
+            try:
+                suite.setup(kpi, param)
+                times = []
+
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    suite._calculate()
+                    times.append(time.perf_counter() - start)
+
+                tracemalloc.start()
+                suite._calculate()
+                _, peak = tracemalloc.get_traced_memory()
+                record['time'] = min(times)
+                record['peak_memory'] = peak
+
+            except Exception as e:
+                record['error'] = f'{type(e).__name__}: {e}'
+
+            finally:
+                tracemalloc.stop()
+
+            yield record
+
+def compare(results: List[Mapping[str, Any]], baseline: List[Mapping[str, Any]], threshold: float) -> List[str]:
+    """Return messages for cases that are slower or use more memory than `threshold` times the baseline."""
+
+    get_key = lambda r: tuple((k, str(v)) for k, v in r.items() if k not in ['time', 'peak_memory', 'error'])
+    baseline = {get_key(r): r for r in baseline}
+    regressions = []
+
+    for result in results:
+        reference = baseline.get(get_key(result))
+
+        if reference is None:
+            continue
+
+        elif 'error' in result and 'error' not in reference:
+            regressions.append(f'{dict(get_key(result))}: {result["error"]}')
+
+        else:
+            for metric in ['time', 'peak_memory']:
+                if metric in result and metric in reference and result[metric] > threshold*reference[metric]:
+                    regressions.append(
+                        f'{dict(get_key(result))}: {metric} increased from {reference[metric]} to {result[metric]}.'
+                    )
+
+                else:
+                    pass
+
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(prog='benchmarks.run', description='Run KPI benchmarks and record time and peak memory.')
+    parser.add_argument('--kpi', dest='kpis', nargs='+', help='KPI class names to run. Defaults to all implemented KPIs.')
+    parser.add_argument('--suite', dest='suites', nargs='+', choices=[s.__name__ for s in SUITES], help='Suites to run.')
+    parser.add_argument('--param', dest='params', nargs='+', help='Scales, building counts or datasets to run.')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of timed runs per case.')
+    parser.add_argument('--output', help='JSON lines filepath to write results to.')
+    parser.add_argument('--compare', help='JSON lines filepath of previous results to compare against.')
+    parser.add_argument('--threshold', type=float, default=1.2, help='Regression ratio threshold for --compare.')
+    args = parser.parse_args()
+    results = []
+    warnings.simplefilter('ignore')
+
+    with open(args.output, 'w') if args.output is not None else open(sys.stdout.fileno(), 'w', closefd=False) as f:
+        for record in run(kpis=args.kpis, suites=args.suites, params=args.params, repeat=args.repeat):
+            results.append(record)
+            f.write(json.dumps(record, default=str) + '\n')
+            f.flush()
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = [json.loads(l) for l in f if l.strip() != '']
+
+        regressions = compare(results, baseline, args.threshold)
+
+        for r in regressions:
+            print(f'REGRESSION {r}', file=sys.stderr)
+
+        sys.exit(1 if len(regressions) > 0 else 0)
+
+    else:
+        pass
+
+if __name__ == '__main__':
+    main()
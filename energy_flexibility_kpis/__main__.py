@@ -0,0 +1,4 @@
+from energy_flexibility_kpis.cli import main
+
+if __name__ == '__main__':
+    main()
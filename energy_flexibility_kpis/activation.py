@@ -0,0 +1,187 @@
+"""Compact on/off activation states of device fleets.
+
+Activation states of many devices, e.g. the heat pumps of the dwellings in a demand response
+programme, over long horizons are stored either bit-packed or as run-length encoded on
+intervals so that a fleet of 100k dwellings over a year of minute data fits in memory. Both
+representations return the number of active timesteps of every device within a window
+without expanding the states to a boolean matrix.
+"""
+
+from typing import List, Union
+import numpy as np
+from energy_flexibility_kpis.base import Definition
+
+# number of set bits of every byte value
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+class ActivationMatrix(Definition):
+    r"""Bit-packed activation states of shape `(devices, timesteps)`.
+
+    Timestep `j` of a device is bit `7 - j%8` of byte `j//8` of its row, as returned by
+    :py:func:`numpy.packbits`, so one byte holds 8 timesteps.
+
+    Parameters
+    ----------
+    packed: np.ndarray
+        Packed states of shape `(devices, ceil(timesteps/8))` and type `uint8`.
+    length: int
+        Number of timesteps.
+    """
+
+    def __init__(self, packed: np.ndarray, length: int):
+        super().__init__()
+        packed = np.asarray(packed, dtype=np.uint8)
+        assert packed.ndim == 2 and packed.shape[1] == (length + 7)//8, 'packed must be of shape (devices, ceil(length/8)).'
+        self.__packed = packed
+        self.__length = length
+
+    @property
+    def packed(self) -> np.ndarray:
+        return self.__packed
+
+    @property
+    def length(self) -> int:
+        return self.__length
+
+    @property
+    def shape(self) -> tuple:
+        return self.packed.shape[0], self.length
+
+    @classmethod
+    def from_boolean(cls, values: Union[List[List[bool]], np.ndarray], batch_size: int = None) -> 'ActivationMatrix':
+        """Return packed activation states from a `(devices, timesteps)` boolean matrix, e.g. a
+        :py:class:`numpy.memmap`, packing `batch_size` devices at a time.
+        """
+
+        batch_size = 4096 if batch_size is None else batch_size
+        values = values if isinstance(values, np.ndarray) else np.asarray(values, dtype=bool)
+        packed = np.concatenate([
+            np.packbits(np.asarray(values[i:i + batch_size], dtype=bool), axis=1)
+            for i in range(0, values.shape[0], batch_size)
+        ]) if values.shape[0] > 0 else np.zeros((0, (values.shape[1] + 7)//8), dtype=np.uint8)
+
+        return cls(packed, values.shape[1])
+
+    def get_active_count(self, start: int = None, end: int = None, batch_size: int = None) -> np.ndarray:
+        """Return number of active timesteps of every device from timestep `start` to, but excluding, `end`.
+
+        Whole bytes are counted with a popcount and the bits of the first and last bytes that are
+        outside the window are subtracted, `batch_size` devices at a time.
+        """
+
+        start = 0 if start is None else max(int(start), 0)
+        end = self.length if end is None else min(int(end), self.length)
+        batch_size = 4096 if batch_size is None else batch_size
+        count = np.zeros(self.packed.shape[0], dtype=np.int64)
+
+        if end <= start:
+            return count
+
+        else:
+            pass
+
+        first_byte, last_byte = start//8, (end - 1)//8
+        head_mask = np.uint8(~(0xFF >> (start%8)) & 0xFF)
+        tail_mask = np.uint8(0xFF >> (end%8)) if end%8 != 0 else np.uint8(0)
+
+        for i in range(0, self.packed.shape[0], batch_size):
+            block = self.packed[i:i + batch_size]
+            count[i:i + batch_size] = _popcount(block[:, first_byte:last_byte + 1]).sum(axis=1, dtype=np.int64)\
+                - _popcount(block[:, first_byte] & head_mask) - _popcount(block[:, last_byte] & tail_mask)
+
+        return count
+
+class ActivationIntervals(Definition):
+    r"""Run-length encoded activation states of a fleet of devices.
+
+    The on intervals of device `i` are `[starts[k], ends[k])` for `k` in `offsets[i]:offsets[i + 1]`,
+    as in a compressed sparse row matrix, so devices that switch rarely take little memory.
+
+    Parameters
+    ----------
+    offsets: np.ndarray
+        Index of the first interval of every device followed by the number of intervals, of shape `(devices + 1,)`.
+    starts: np.ndarray
+        First active timestep of every interval.
+    ends: np.ndarray
+        Timestep after the last active timestep of every interval.
+    length: int
+        Number of timesteps.
+    """
+
+    def __init__(self, offsets: np.ndarray, starts: np.ndarray, ends: np.ndarray, length: int):
+        super().__init__()
+        self.__offsets = np.asarray(offsets, dtype=np.int64)
+        self.__starts = np.asarray(starts, dtype=np.int32)
+        self.__ends = np.asarray(ends, dtype=np.int32)
+        self.__length = length
+        assert self.starts.shape == self.ends.shape, 'starts and ends must have equal shapes.'
+        assert self.offsets[-1] == self.starts.shape[0], 'offsets must end with the number of intervals.'
+
+    @property
+    def offsets(self) -> np.ndarray:
+        return self.__offsets
+
+    @property
+    def starts(self) -> np.ndarray:
+        return self.__starts
+
+    @property
+    def ends(self) -> np.ndarray:
+        return self.__ends
+
+    @property
+    def length(self) -> int:
+        return self.__length
+
+    @property
+    def shape(self) -> tuple:
+        return self.offsets.shape[0] - 1, self.length
+
+    @classmethod
+    def from_boolean(cls, values: Union[List[List[bool]], np.ndarray], batch_size: int = None) -> 'ActivationIntervals':
+        """Return on intervals of a `(devices, timesteps)` boolean matrix, encoding `batch_size` devices at a time."""
+
+        batch_size = 1024 if batch_size is None else batch_size
+        values = values if isinstance(values, np.ndarray) else np.asarray(values, dtype=bool)
+        device_count, length = values.shape
+        counts = np.zeros(device_count, dtype=np.int64)
+        starts, ends = [], []
+
+        for i in range(0, device_count, batch_size):
+            block = np.asarray(values[i:i + batch_size], dtype=bool)
+            # state changes with off padding on both edges so that every run has a start and an end,
+            # and as runs alternate the changes of a row are start, end, start, end, ...
+            changes = np.empty((block.shape[0], length + 1), dtype=bool)
+            changes[:, 0] = block[:, 0]
+            changes[:, -1] = block[:, -1]
+            np.not_equal(block[:, 1:], block[:, :-1], out=changes[:, 1:-1])
+            rows, columns = np.nonzero(changes)
+            starts.append(columns[0::2].astype(np.int32))
+            ends.append(columns[1::2].astype(np.int32))
+            counts[i:i + batch_size] = np.bincount(rows[0::2], minlength=block.shape[0])
+
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        starts = np.concatenate(starts) if len(starts) > 0 else np.array([], dtype=np.int32)
+        ends = np.concatenate(ends) if len(ends) > 0 else np.array([], dtype=np.int32)
+
+        return cls(offsets, starts, ends, length)
+
+    def get_active_count(self, start: int = None, end: int = None) -> np.ndarray:
+        """Return number of active timesteps of every device from timestep `start` to, but excluding, `end`.
+
+        Intervals are clipped to the window and summed per device as differences of their cumulative sum.
+        """
+
+        start = 0 if start is None else max(int(start), 0)
+        end = self.length if end is None else min(int(end), self.length)
+        end = max(start, end)
+        lengths = np.clip(self.ends, start, end).astype(np.int64) - np.clip(self.starts, start, end)
+        cumulative_lengths = np.concatenate([[0], np.cumsum(lengths)])
+
+        return cumulative_lengths[self.offsets[1:]] - cumulative_lengths[self.offsets[:-1]]
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    bitwise_count = getattr(np, 'bitwise_count', None)
+
+    return _POPCOUNT[values] if bitwise_count is None else bitwise_count(values)
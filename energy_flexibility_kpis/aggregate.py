@@ -0,0 +1,336 @@
+import datetime
+import functools
+from typing import List, Mapping, Union
+import numpy as np
+from energy_flexibility_kpis.base import Definition
+from energy_flexibility_kpis.enumerations import BaseUnit
+
+class SeriesAggregate(Definition):
+    r"""Combinable partial aggregate of a numeric series.
+
+    Holds the count, sum, sum of squared deviations from the mean, minimum, maximum and the
+    state needed to reproduce a composite Simpson integral (parity-split sums and the first
+    and last :attr:`EDGE_LENGTH` values). Two aggregates of consecutive blocks of a series
+    can be merged into the aggregate of the whole series so that series larger than memory
+    can be reduced one chunk at a time.
+
+    Parameters
+    ----------
+    values: Union[List[float], np.ndarray], optional
+        Series block to aggregate.
+    """
+
+    EDGE_LENGTH = 4
+
+    def __init__(self, values: Union[List[float], np.ndarray] = None):
+        super().__init__()
+        values = np.array([], dtype=float) if values is None else np.asarray(values, dtype=float).ravel()
+        self.count = values.shape[0]
+        self.sum = float(values.sum())
+        self.sum_of_squares = float(((values - self.sum/self.count)**2).sum()) if self.count > 0 else 0.0
+        self.minimum = float(values.min()) if self.count > 0 else np.nan
+        self.maximum = float(values.max()) if self.count > 0 else np.nan
+        self.even_sum = float(values[0::2].sum())
+        self.odd_sum = float(values[1::2].sum())
+        self.head = values[:self.EDGE_LENGTH].copy()
+        self.tail = values[-self.EDGE_LENGTH:].copy() if self.count > 0 else values.copy()
+
+    @property
+    def mean(self) -> float:
+        return self.sum/self.count
+
+    @property
+    def variance(self) -> float:
+        """Population variance, equivalent to :py:func:`numpy.var`."""
+
+        return self.sum_of_squares/self.count
+
+    def merge(self, other: 'SeriesAggregate') -> 'SeriesAggregate':
+        """Return aggregate of this series block followed by `other`."""
+
+        merged = SeriesAggregate()
+        merged.count = self.count + other.count
+
+        if self.count == 0 or other.count == 0:
+            source = other if self.count == 0 else self
+            merged.sum = source.sum
+            merged.sum_of_squares = source.sum_of_squares
+
+        else:
+            delta = other.mean - self.mean
+            merged.sum = self.sum + other.sum
+            merged.sum_of_squares = self.sum_of_squares + other.sum_of_squares\
+                + delta**2*self.count*other.count/merged.count
+
+        merged.minimum = float(np.fmin(self.minimum, other.minimum))
+        merged.maximum = float(np.fmax(self.maximum, other.maximum))
+
+        # the parity of other's positions flips when this block has an odd length
+        if self.count%2 == 0:
+            merged.even_sum = self.even_sum + other.even_sum
+            merged.odd_sum = self.odd_sum + other.odd_sum
+
+        else:
+            merged.even_sum = self.even_sum + other.odd_sum
+            merged.odd_sum = self.odd_sum + other.even_sum
+
+        merged.head = np.concatenate([self.head, other.head])[:self.EDGE_LENGTH]
+        merged.tail = np.concatenate([self.tail, other.tail])[-self.EDGE_LENGTH:]
+
+        return merged
+
+    def simpson(self, dx: float) -> float:
+        """Composite Simpson integral of the aggregated series, equivalent to :py:func:`scipy.integrate.simpson`."""
+
+        edge_length = self.EDGE_LENGTH
+
+        if self.count <= 2*edge_length:
+            from scipy import integrate
+            values = self.head if self.count <= edge_length\
+                else np.concatenate([self.head, self.tail[-(self.count - edge_length):]])
+
+            return integrate.simpson(values, dx=dx)
+
+        else:
+            pass
+
+        weights = _simpson_reference_weights(self.count%2)
+        reference_length = weights.shape[0]
+        pattern = weights[edge_length:edge_length + 2]
+        value = pattern[0]*self.even_sum + pattern[1]*self.odd_sum
+
+        # interior positions follow the periodic pattern, edges need correcting
+        for i in range(edge_length):
+            value += (weights[i] - pattern[i%2])*self.head[i]
+            position = self.count - edge_length + i
+            value += (weights[reference_length - edge_length + i] - pattern[position%2])*self.tail[i]
+
+        return value*dx
+
+class TimestampAggregate(Definition):
+    r"""Combinable partial aggregate of a timestamp series.
+
+    Tracks the first and last timestamps and the minimum and maximum time step, including
+    the step across merged block boundaries, so that the time step resolution of a chunked
+    series can be validated and estimated as in :py:meth:`DateTimeVariable.get_resolution`.
+
+    Parameters
+    ----------
+    values: Union[List[int], List[datetime.datetime], np.ndarray], optional
+        Timestamp block to aggregate. Integers are interpreted as timesteps.
+    """
+
+    def __init__(self, values: Union[List[int], List[datetime.datetime], np.ndarray] = None):
+        super().__init__()
+        values = [] if values is None else values
+        self.count = len(values)
+        self.is_datetime = self.count > 0 and not isinstance(values[0], (int, np.integer))
+
+        if self.is_datetime:
+            import pandas as pd
+            steps = pd.DatetimeIndex(values).asi8
+
+        else:
+            steps = np.asarray(values, dtype=int)
+
+        differences = np.diff(steps)
+        self.first = int(steps[0]) if self.count > 0 else None
+        self.last = int(steps[-1]) if self.count > 0 else None
+        self.minimum_step = int(differences.min()) if differences.shape[0] > 0 else None
+        self.maximum_step = int(differences.max()) if differences.shape[0] > 0 else None
+
+    def merge(self, other: 'TimestampAggregate') -> 'TimestampAggregate':
+        """Return aggregate of this timestamp block followed by `other`."""
+
+        if self.count == 0 or other.count == 0:
+            return other if self.count == 0 else self
+
+        else:
+            pass
+
+        merged = TimestampAggregate()
+        merged.count = self.count + other.count
+        merged.is_datetime = self.is_datetime
+        merged.first = self.first
+        merged.last = other.last
+        steps = [s for s in [self.minimum_step, self.maximum_step, other.minimum_step, other.maximum_step] if s is not None]
+        steps.append(other.first - self.last)
+        merged.minimum_step = min(steps)
+        merged.maximum_step = max(steps)
+
+        return merged
+
+    def get_resolution(self, unit: BaseUnit) -> float:
+        """Estimates time step resolution in specified time unit."""
+
+        assert self.is_datetime, 'Cannot infer resolution of non-datetime timestamps'
+        minimum_resolution = np.nan if self.minimum_step is None else self.minimum_step/1e9
+        maximum_resolution = np.nan if self.maximum_step is None else self.maximum_step/1e9
+
+        assert minimum_resolution == maximum_resolution,\
+            f'Discontinuous time series. Minimum time interval ({minimum_resolution}s)'\
+                f'and maximum time interval ({maximum_resolution}s) are not equal.'
+
+        if unit == BaseUnit.MILLISECOND:
+            resolution = minimum_resolution*1000.0
+
+        elif unit == BaseUnit.SECOND:
+            resolution = minimum_resolution
+
+        elif unit == BaseUnit.MINUTE:
+            resolution = minimum_resolution/60.0
+
+        elif unit == BaseUnit.HOUR:
+            resolution = minimum_resolution/3600.0
+
+        else:
+            raise Exception(f'Unknown unit: {unit}')
+
+        return resolution
+
+class PortfolioAggregate(Definition):
+    r"""Running aggregate of the flexible power of a portfolio of assets.
+
+    Holds the upward and downward flexible power profiles of candidate assets and the summed
+    profiles of the current members so that assets are added or removed in :math:`O(t)` and the
+    symmetric regulation capacity of the aggregate, or of many candidate portfolios, is evaluated
+    without re-summing the members. The regulation capacity of a profile pair is the largest
+    power that can be both added and removed at every timestep, i.e. the minimum over time of the
+    smaller of the upward and downward flexible power.
+
+    Parameters
+    ----------
+    upward_flexible_power_profile: Union[List[List[float]], np.ndarray]
+        Power that each asset can add at each timestep, of shape `(n, t)`.
+    downward_flexible_power_profile: Union[List[List[float]], np.ndarray]
+        Power that each asset can remove at each timestep, of shape `(n, t)`.
+    members: List[int], optional
+        Indices of the initial portfolio members. Defaults to none.
+    """
+
+    def __init__(
+        self, upward_flexible_power_profile: Union[List[List[float]], np.ndarray],
+        downward_flexible_power_profile: Union[List[List[float]], np.ndarray], members: List[int] = None
+    ):
+        super().__init__()
+        self.upward = np.atleast_2d(np.asarray(upward_flexible_power_profile, dtype=float))
+        self.downward = np.atleast_2d(np.asarray(downward_flexible_power_profile, dtype=float))
+        assert self.upward.shape == self.downward.shape, 'Upward and downward profiles must have equal shapes.'
+        self.individual_capacities = self.get_capacity(self.upward, self.downward)
+        self.members = np.zeros(self.upward.shape[0], dtype=bool)
+        self.upward_sum = np.zeros(self.upward.shape[1])
+        self.downward_sum = np.zeros(self.upward.shape[1])
+        self.individual_capacity_sum = 0.0
+
+        for i in [] if members is None else members:
+            self.add(i)
+
+    @property
+    def capacity(self) -> float:
+        """Regulation capacity of the current portfolio."""
+
+        return float(self.get_capacity(self.upward_sum, self.downward_sum))
+
+    @property
+    def synergy_factor(self) -> float:
+        """Capacity of the current portfolio in excess of the sum of its members' individual capacities,
+        relative to that sum."""
+
+        return self.capacity/self.individual_capacity_sum - 1.0 if self.individual_capacity_sum > 0 else np.nan
+
+    def add(self, index: int):
+        """Add asset `index` to the portfolio."""
+
+        assert not self.members[index], f'Asset {index} is already a member.'
+        self.members[index] = True
+        self.upward_sum += self.upward[index]
+        self.downward_sum += self.downward[index]
+        self.individual_capacity_sum += self.individual_capacities[index]
+
+    def remove(self, index: int):
+        """Remove asset `index` from the portfolio."""
+
+        assert self.members[index], f'Asset {index} is not a member.'
+        self.members[index] = False
+        self.upward_sum -= self.upward[index]
+        self.downward_sum -= self.downward[index]
+        self.individual_capacity_sum -= self.individual_capacities[index]
+
+    def get_addition_synergy_factors(self, candidates: List[int] = None) -> np.ndarray:
+        """Return the synergy factor the portfolio would have after adding each candidate asset on its own.
+
+        Candidates default to all non-members. This is the step of a greedy portfolio selection.
+        """
+
+        candidates = np.flatnonzero(~self.members) if candidates is None else np.asarray(candidates, dtype=int)
+        capacity = self.get_capacity(self.upward_sum + self.upward[candidates], self.downward_sum + self.downward[candidates])
+        individual_capacity_sum = self.individual_capacity_sum + self.individual_capacities[candidates]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(individual_capacity_sum > 0, capacity/individual_capacity_sum - 1.0, np.nan)
+
+    def get_subset_synergy_factors(self, subsets: Union[List[List[int]], np.ndarray], batch_size: int = None) -> np.ndarray:
+        """Return the synergy factor of each subset of assets, independent of the current members.
+
+        Parameters
+        ----------
+        subsets: Union[List[List[int]], np.ndarray]
+            Lists of asset indices, or boolean membership matrix of shape `(m, n)`.
+        batch_size: int, default: 256
+            Number of subsets whose summed profiles are held in memory at once.
+        """
+
+        subsets = np.asarray(subsets, dtype=float) if isinstance(subsets, np.ndarray) and subsets.dtype == bool\
+            else self.__get_membership(subsets)
+        batch_size = 256 if batch_size is None else batch_size
+        values = []
+
+        for i in range(0, subsets.shape[0], batch_size):
+            # summed profiles of all subsets in a batch are one matrix product
+            membership = subsets[i:i + batch_size]
+            capacity = self.get_capacity(membership @ self.upward, membership @ self.downward)
+            individual_capacity_sum = membership @ self.individual_capacities
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                values.append(np.where(individual_capacity_sum > 0, capacity/individual_capacity_sum - 1.0, np.nan))
+
+        return np.concatenate(values) if len(values) > 0 else np.array([], dtype=float)
+
+    def get_prefix_synergy_factors(self, order: List[int]) -> np.ndarray:
+        """Return the synergy factor of each portfolio made of the first 1, 2, ..., `len(order)` assets in `order`."""
+
+        order = np.asarray(order, dtype=int)
+        capacity = self.get_capacity(np.cumsum(self.upward[order], axis=0), np.cumsum(self.downward[order], axis=0))
+        individual_capacity_sum = np.cumsum(self.individual_capacities[order])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(individual_capacity_sum > 0, capacity/individual_capacity_sum - 1.0, np.nan)
+
+    @staticmethod
+    def get_capacity(upward: np.ndarray, downward: np.ndarray) -> Union[float, np.ndarray]:
+        """Return regulation capacity of the profiles along the last axis."""
+
+        return np.clip(np.minimum(upward, downward).min(axis=-1), 0.0, None)
+
+    def __get_membership(self, subsets: List[List[int]]) -> np.ndarray:
+        membership = np.zeros((len(subsets), self.upward.shape[0]))
+        rows = np.repeat(np.arange(len(subsets)), [len(s) for s in subsets])
+        columns = np.concatenate([np.asarray(s, dtype=int) for s in subsets]) if len(subsets) > 0 else np.array([], dtype=int)
+        membership[rows, columns] = 1.0
+
+        return membership
+
+def merge_partials(partial: Mapping[str, Definition], other: Mapping[str, Definition]) -> Mapping[str, Definition]:
+    """Merge two partial-aggregate mappings of consecutive chunks key by key."""
+
+    return {k: v.merge(other[k]) for k, v in partial.items()}
+
+@functools.lru_cache(maxsize=2)
+def _simpson_reference_weights(parity: int) -> np.ndarray:
+    # Simpson's rule is linear in the series so its weights are the integrals of the unit vectors.
+    # The weights are periodic in the interior and only the first and last EDGE_LENGTH positions
+    # differ, so a short reference series of matching length parity describes any series length.
+    from scipy import integrate
+    length = 2*SeriesAggregate.EDGE_LENGTH + 2 + parity
+
+    return integrate.simpson(np.eye(length), dx=1.0, axis=1)
@@ -1,6 +1,8 @@
 from copy import deepcopy
 
 class Definition:
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -8,4 +10,13 @@ class Definition:
         return str(self)
 
     def copy(self):
-        return deepcopy(self)
\ No newline at end of file
+        return deepcopy(self)
+
+class DefaultDefinitionMetaClass(type):
+    """Metaclass of registries of default definitions that are built once at import and cannot be reassigned."""
+
+    def __setattr__(cls, name: str, value):
+        raise AttributeError(f'{cls.__name__} definitions are immutable.')
+
+    def __delattr__(cls, name: str):
+        raise AttributeError(f'{cls.__name__} definitions are immutable.')
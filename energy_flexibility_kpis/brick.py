@@ -0,0 +1,290 @@
+"""Resolve KPI inputs from a Brick model of a building and its time series database.
+
+Points in the Brick model reference their time series with `ref:hasExternalReference`,
+`ref:hasTimeseriesId` and `ref:onTable` annotations, where the table is a scenario in the
+database. rdflib and DuckDB are imported only when a model is parsed or a database is
+queried.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, List, Mapping, Tuple, Union
+from energy_flexibility_kpis.base import Definition
+
+BRICK_NAMESPACE = 'https://brickschema.org/schema/Brick#'
+REF_NAMESPACE = 'https://brickschema.org/schema/Brick/ref#'
+
+class BrickInputResolver(Definition):
+    r"""Maps Brick model points to :py:meth:`KPI.calculate` arguments.
+
+    All the roles are resolved with one SPARQL query on the graph, and the result is stored in an
+    on-disk index keyed by the hash of the model file so that later runs on the same model do not
+    parse it. The time series of all the resolved points of a scenario pair are then fetched with
+    one batched SQL query.
+
+    Parameters
+    ----------
+    model_filepath: Union[str, os.PathLike]
+        Brick model Turtle file, e.g. `incite_with_data.ttl`.
+    roles: Mapping[str, Tuple[str, str]], optional
+        Brick class local name mapped to the :py:meth:`KPI.calculate` argument it resolves to and how the
+        points of that class are combined: 'sum' adds them up into one profile and 'stack' returns one
+        profile per point, e.g. per zone. `{scenario}` in the argument name is replaced with `baseline` or
+        `flexible`; other arguments are taken from the flexible scenario. Defaults to :py:attr:`ROLES`.
+        Brick has no price or carbon intensity point class, so add the classes the model uses for
+        them, e.g. `{**BrickInputResolver.ROLES, 'Carbon_Intensity': ('{scenario}_carbon_intensity_profile', 'sum')}`.
+    index_filepath: Union[str, os.PathLike], optional
+        JSON index of resolved points. Defaults to `brick_index.json` in the user cache directory.
+    """
+
+    ROLES = {
+        'Electric_Power_Sensor': ('{scenario}_electric_power_profile', 'sum'),
+        'Zone_Air_Temperature_Sensor': ('zone_temperature_profile', 'stack'),
+        'Zone_Air_Cooling_Temperature_Setpoint': ('cooling_setpoints', 'stack'),
+        'Zone_Air_Heating_Temperature_Setpoint': ('heating_setpoints', 'stack'),
+    }
+
+    def __init__(
+        self, model_filepath: Union[str, os.PathLike], roles: Mapping[str, Tuple[str, str]] = None,
+        index_filepath: Union[str, os.PathLike] = None
+    ):
+        super().__init__()
+        self.model_filepath = model_filepath
+        self.roles = roles
+        self.index_filepath = index_filepath
+        self.__points = None
+
+    @property
+    def model_filepath(self) -> Union[str, os.PathLike]:
+        return self.__model_filepath
+
+    @property
+    def roles(self) -> Mapping[str, Tuple[str, str]]:
+        return self.__roles
+
+    @property
+    def index_filepath(self) -> Union[str, os.PathLike]:
+        return self.__index_filepath
+
+    @model_filepath.setter
+    def model_filepath(self, value: Union[str, os.PathLike]):
+        self.__model_filepath = value
+        self.__points = None
+
+    @roles.setter
+    def roles(self, value: Mapping[str, Tuple[str, str]]):
+        self.__roles = dict(self.ROLES if value is None else value)
+        self.__points = None
+
+    @index_filepath.setter
+    def index_filepath(self, value: Union[str, os.PathLike]):
+        if value is None:
+            cache_directory = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+            value = os.path.join(cache_directory, 'energy_flexibility_kpis', 'brick_index.json')
+
+        else:
+            pass
+
+        self.__index_filepath = value
+
+    def get_points(self) -> List[Mapping[str, str]]:
+        """Return the class, time series ID and table of every model point that has a role.
+
+        The points are read from the index if the model and roles are unchanged since they were
+        last resolved, otherwise the model is parsed, queried once and the index is updated.
+        """
+
+        if self.__points is None:
+            key = self.get_key()
+            index = self.__read_index()
+
+            if key in index:
+                self.__points = index[key]
+
+            else:
+                self.__points = self.__query_points()
+                index[key] = self.__points
+                self.__write_index(index)
+
+        else:
+            pass
+
+        return self.__points
+
+    def resolve(
+        self, connection: Any, baseline_table: str, flexible_table: str, timestamp_column: str = None,
+        evaluation_start_timestamp: Any = None, evaluation_end_timestamp: Any = None
+    ) -> Mapping[str, Any]:
+        """Return :py:meth:`KPI.calculate` arguments of the baseline and flexible scenarios.
+
+        Parameters
+        ----------
+        connection: Any
+            DuckDB connection, or path to a DuckDB database file, that holds the scenario tables.
+        baseline_table: str
+            Baseline scenario table.
+        flexible_table: str
+            Flexible scenario table.
+        timestamp_column: str, default: 'Timestamp'
+            Timestamp column shared by the scenario tables.
+        evaluation_start_timestamp: Any, optional
+            Only fetch rows at or after this timestamp.
+        evaluation_end_timestamp: Any, optional
+            Only fetch rows at or before this timestamp.
+
+        Returns
+        -------
+        arguments: Mapping[str, Any]
+            `timestamps` and the resolved profiles as lists, or lists of shape `(timesteps, points)`
+            for stacked roles, e.g. zone temperatures of shape `(timesteps, zones)`.
+        """
+
+        timestamp_column = 'Timestamp' if timestamp_column is None else timestamp_column
+        columns = self.get_columns(baseline_table, flexible_table)
+        query, parameters = self.build_query(
+            columns, baseline_table, timestamp_column, evaluation_start_timestamp, evaluation_end_timestamp
+        )
+
+        if isinstance(connection, (str, os.PathLike)):
+            import duckdb
+
+            connection = duckdb.connect(str(connection), read_only=True)
+
+            try:
+                rows = connection.execute(query, parameters).fetchall()
+
+            finally:
+                connection.close()
+
+        else:
+            rows = connection.execute(query, parameters).fetchall()
+
+        values = list(zip(*rows)) if len(rows) > 0 else [()]*(len(columns) + 1)
+        arguments = {'timestamps': list(values[0])}
+        stacked = []
+
+        for (name, aggregate, _, _), series in zip(columns, values[1:]):
+            series = list(series)
+
+            if name not in arguments:
+                arguments[name] = [series] if aggregate == 'stack' else series
+                stacked += [name] if aggregate == 'stack' else []
+
+            elif aggregate == 'stack':
+                arguments[name].append(series)
+
+            else:
+                # a timestamp missing from a joined table is NULL and leaves the sum unknown
+                arguments[name] = [None if a is None or b is None else a + b for a, b in zip(arguments[name], series)]
+
+        # stacked series are collected per point and KPIs expect them as (timesteps, points)
+        for name in stacked:
+            arguments[name] = [list(r) for r in zip(*arguments[name])]
+
+        return arguments
+
+    def get_columns(self, baseline_table: str, flexible_table: str) -> List[Tuple[str, str, str, str]]:
+        """Return argument name, aggregate, table and column of every time series to fetch."""
+
+        columns = []
+
+        for point in self.get_points():
+            name, aggregate = self.roles[point['class']]
+
+            for scenario, table in [('baseline', baseline_table), ('flexible', flexible_table)]:
+                if point['table'] != table or ('{scenario}' not in name and scenario != 'flexible'):
+                    continue
+
+                else:
+                    columns.append((name.format(scenario=scenario), aggregate, table, point['id']))
+
+        return columns
+
+    @staticmethod
+    def build_query(
+        columns: List[Tuple[str, str, str, str]], base_table: str, timestamp_column: str,
+        evaluation_start_timestamp: Any = None, evaluation_end_timestamp: Any = None
+    ) -> Tuple[str, list]:
+        """Return one SQL query that selects the timestamps and all `columns` joined on timestamp, and its parameters."""
+
+        quote = lambda n: '"' + str(n).replace('"', '""') + '"'
+        tables = list(dict.fromkeys([base_table] + [c[2] for c in columns]))
+        aliases = {t: f't{i}' for i, t in enumerate(tables)}
+        select = [f'{aliases[base_table]}.{quote(timestamp_column)}']\
+            + [f'{aliases[t]}.{quote(c)} AS c{i}' for i, (_, _, t, c) in enumerate(columns)]
+        query = f'SELECT {", ".join(select)} FROM {quote(base_table)} {aliases[base_table]}'
+
+        for t in tables[1:]:
+            query += f' LEFT JOIN {quote(t)} {aliases[t]} USING ({quote(timestamp_column)})'
+
+        conditions = []
+        parameters = []
+
+        for operator, value in [('>=', evaluation_start_timestamp), ('<=', evaluation_end_timestamp)]:
+            if value is not None:
+                conditions.append(f'{aliases[base_table]}.{quote(timestamp_column)} {operator} ?')
+                parameters.append(value)
+
+            else:
+                pass
+
+        query += '' if len(conditions) == 0 else f' WHERE {" AND ".join(conditions)}'
+        query += f' ORDER BY {aliases[base_table]}.{quote(timestamp_column)}'
+
+        return query, parameters
+
+    def __query_points(self) -> List[Mapping[str, str]]:
+        import rdflib
+
+        graph = rdflib.Graph()
+        graph.parse(self.model_filepath, format='ttl')
+        classes = ' '.join(f'brick:{c}' for c in self.roles)
+        query = f"""
+        PREFIX brick: <{BRICK_NAMESPACE}>
+        PREFIX ref: <{REF_NAMESPACE}>
+        SELECT DISTINCT ?class ?id ?table WHERE {{
+            VALUES ?class {{ {classes} }}
+            ?point a ?class ;
+                ref:hasExternalReference ?ref .
+            ?ref ref:hasTimeseriesId ?id ;
+                ref:onTable ?table .
+        }}"""
+        points = [
+            {'class': str(c).replace(BRICK_NAMESPACE, ''), 'id': str(i), 'table': str(t)}
+            for c, i, t in graph.query(query)
+        ]
+
+        return sorted(points, key=lambda p: (p['class'], p['table'], p['id']))
+
+    def get_key(self) -> str:
+        """Return index key that is the hash of the model file content and role classes."""
+
+        digest = hashlib.sha256()
+
+        with open(self.model_filepath, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+
+        digest.update(json.dumps(sorted(self.roles)).encode())
+
+        return digest.hexdigest()
+
+    def __read_index(self) -> Mapping[str, List[Mapping[str, str]]]:
+        try:
+            with open(self.index_filepath) as f:
+                index = json.load(f)
+
+        except (FileNotFoundError, json.JSONDecodeError):
+            index = {}
+
+        return index
+
+    def __write_index(self, index: Mapping[str, List[Mapping[str, str]]]):
+        os.makedirs(os.path.dirname(os.path.abspath(self.index_filepath)), exist_ok=True)
+        temporary_filepath = f'{self.index_filepath}.{os.getpid()}.tmp'
+
+        with open(temporary_filepath, 'w') as f:
+            json.dump(index, f)
+
+        os.replace(temporary_filepath, self.index_filepath)
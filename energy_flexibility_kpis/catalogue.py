@@ -0,0 +1,81 @@
+"""Static KPI metadata catalogue.
+
+The catalogue holds :py:meth:`KPI.info` of every KPI in `kpi/energy_flexibility` and `kpi/generic` keyed by
+class name, together with the module that defines it. It is read with the standard
+library only so that listing KPIs does not import NumPy, SciPy or pandas. Regenerate it
+after changing KPI metadata with:
+
+    python -m energy_flexibility_kpis.catalogue
+"""
+
+import functools
+import importlib
+import json
+import os
+import pkgutil
+from typing import Any, Mapping
+
+CATALOGUE_FILEPATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'catalogue.json')
+KPI_PACKAGES = ['energy_flexibility_kpis.kpi.energy_flexibility', 'energy_flexibility_kpis.kpi.generic']
+
+@functools.lru_cache(maxsize=None)
+def load_catalogue(filepath: str = None) -> Mapping[str, Mapping[str, Any]]:
+    """Return KPI metadata keyed by KPI class name."""
+
+    filepath = CATALOGUE_FILEPATH if filepath is None else filepath
+
+    with open(filepath) as f:
+        catalogue = json.load(f)
+
+    return catalogue
+
+def get_kpi(name: str) -> type:
+    """Import and return the KPI class called `name`."""
+
+    try:
+        module = load_catalogue()[name]['module']
+
+    except KeyError:
+        raise KeyError(f'Unknown KPI: {name}')
+
+    return getattr(importlib.import_module(module), name)
+
+def build_catalogue() -> Mapping[str, Mapping[str, Any]]:
+    """Return KPI metadata by importing every KPI module."""
+
+    import inspect
+    from energy_flexibility_kpis.kpi.base import KPI
+    catalogue = {}
+
+    for package_name in KPI_PACKAGES:
+        package = importlib.import_module(package_name)
+
+        for _, module_name, _ in pkgutil.iter_modules(package.__path__):
+            module = importlib.import_module(f'{package_name}.{module_name}')
+
+            for name, obj in inspect.getmembers(module, inspect.isclass):
+                if issubclass(obj, KPI) and obj.__module__ == module.__name__:
+                    catalogue[name] = {'module': module.__name__, **obj.info()}
+
+                else:
+                    pass
+
+    # round trip so that the result matches what load_catalogue returns, e.g. value types as type names
+    catalogue = json.loads(json.dumps(dict(sorted(catalogue.items())), default=lambda o: o.__name__))
+
+    return catalogue
+
+def write_catalogue(filepath: str = None):
+    """Build catalogue and write it to `filepath`."""
+
+    filepath = CATALOGUE_FILEPATH if filepath is None else filepath
+    catalogue = build_catalogue()
+
+    with open(filepath, 'w') as f:
+        json.dump(catalogue, f, indent=2)
+        f.write('\n')
+
+    load_catalogue.cache_clear()
+
+if __name__ == '__main__':
+    write_catalogue()
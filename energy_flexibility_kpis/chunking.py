@@ -0,0 +1,187 @@
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Mapping, Tuple, Type, Union
+import numpy as np
+import pandas as pd
+from energy_flexibility_kpis.base import Definition
+from energy_flexibility_kpis.kpi.base import KPI
+
+class ChunkedDataset:
+    r"""Dataset that is iterated in time blocks and/or building blocks instead of being loaded whole.
+
+    Each iteration yields `(building_id, chunk)` pairs where `chunk` maps :py:meth:`KPI.calculate`
+    argument names to the values of a block of consecutive rows of one building. Blocks of
+    the same building must be yielded in time order. Single-building datasets use `None` as
+    `building_id`.
+
+    Parameters
+    ----------
+    chunks: Callable[[], Iterator[Tuple[Any, Mapping[str, Any]]]]
+        Callable that returns a fresh iterator over the chunks so that the dataset can be
+        iterated more than once.
+    """
+
+    def __init__(self, chunks: Callable[[], Iterator[Tuple[Any, Mapping[str, Any]]]]):
+        self.__chunks = chunks
+
+    def __iter__(self) -> Iterator[Tuple[Any, Mapping[str, Any]]]:
+        return self.__chunks()
+
+    @classmethod
+    def from_dataframes(
+        cls, dataframes: Callable[[], Iterator[pd.DataFrame]], columns: Mapping[str, str], building_column: str = None
+    ) -> 'ChunkedDataset':
+        """Return dataset from a callable that yields DataFrame blocks.
+
+        Parameters
+        ----------
+        dataframes: Callable[[], Iterator[pd.DataFrame]]
+            Callable that returns a fresh iterator over DataFrame blocks.
+        columns: Mapping[str, str]
+            Mapping of :py:meth:`KPI.calculate` argument names to column names.
+        building_column: str, optional
+            Column that identifies the building of each row in long-format datasets.
+        """
+
+        def chunks():
+            for df in dataframes():
+                if building_column is None:
+                    yield None, cls.__to_chunk(df, columns)
+
+                else:
+                    for building_id, building_df in df.groupby(building_column, sort=False):
+                        yield building_id, cls.__to_chunk(building_df, columns)
+
+        return cls(chunks)
+
+    @classmethod
+    def from_csv(
+        cls, filepath: Union[str, Path], columns: Mapping[str, str], chunksize: int = 100_000, building_column: str = None, **kwargs
+    ) -> 'ChunkedDataset':
+        """Return dataset that reads a CSV file `chunksize` rows at a time.
+
+        Other keyword arguments are parsed to :py:func:`pandas.read_csv`.
+        """
+
+        usecols = cls.__usecols(columns, building_column)
+        dataframes = lambda: pd.read_csv(filepath, usecols=usecols, chunksize=chunksize, **kwargs)
+
+        return cls.from_dataframes(dataframes, columns, building_column=building_column)
+
+    @classmethod
+    def from_parquet(
+        cls, filepath: Union[str, Path], columns: Mapping[str, str], batch_size: int = 100_000, building_column: str = None
+    ) -> 'ChunkedDataset':
+        """Return dataset that reads a Parquet file one record batch at a time. Requires `pyarrow`."""
+
+        try:
+            import pyarrow.parquet as pq
+
+        except ImportError as e:
+            raise ImportError('pyarrow is required to read Parquet datasets in chunks.') from e
+
+        usecols = cls.__usecols(columns, building_column)
+        dataframes = lambda: (b.to_pandas() for b in pq.ParquetFile(filepath).iter_batches(batch_size=batch_size, columns=usecols))
+
+        return cls.from_dataframes(dataframes, columns, building_column=building_column)
+
+    @classmethod
+    def from_hdf5(
+        cls, filepath: Union[str, Path], key: str, columns: Mapping[str, str], chunksize: int = 100_000, building_column: str = None
+    ) -> 'ChunkedDataset':
+        """Return dataset that reads a table-format HDF5 store `chunksize` rows at a time. Requires `tables`."""
+
+        usecols = cls.__usecols(columns, building_column)
+        dataframes = lambda: pd.read_hdf(filepath, key=key, columns=usecols, chunksize=chunksize, iterator=True)
+
+        return cls.from_dataframes(dataframes, columns, building_column=building_column)
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray], chunksize: int = 100_000) -> 'ChunkedDataset':
+        """Return dataset from arrays, e.g. :py:class:`numpy.memmap`, sliced along their first axis.
+
+        Two-dimensional arrays of shape `(buildings, timesteps)` are iterated one building
+        block at a time, and one-dimensional arrays, like shared timestamps, are broadcast
+        to every building.
+
+        Parameters
+        ----------
+        arrays: Mapping[str, np.ndarray]
+            Mapping of :py:meth:`KPI.calculate` argument names to arrays.
+        chunksize: int, default: 100_000
+            Number of timesteps per chunk.
+        """
+
+        building_count = max([1] + [a.shape[0] for a in arrays.values() if a.ndim == 2])
+        length = max(a.shape[-1] for a in arrays.values())
+        multiple_buildings = any(a.ndim == 2 for a in arrays.values())
+
+        def chunks():
+            for b in range(building_count):
+                for start in range(0, length, chunksize):
+                    chunk = {
+                        k: np.asarray(a[b, start:start + chunksize] if a.ndim == 2 else a[start:start + chunksize]).tolist()
+                        for k, a in arrays.items()
+                    }
+                    yield (b if multiple_buildings else None), chunk
+
+        return cls(chunks)
+
+    @staticmethod
+    def __to_chunk(df: pd.DataFrame, columns: Mapping[str, str]) -> Mapping[str, List[Any]]:
+        return {k: df[c].tolist() for k, c in columns.items()}
+
+    @staticmethod
+    def __usecols(columns: Mapping[str, str], building_column: str) -> List[str]:
+        return list(columns.values()) + ([] if building_column is None else [building_column])
+
+class ChunkedEvaluator:
+    r"""Evaluates KPIs chunk by chunk from their combinable partial-aggregate form.
+
+    Only the partial aggregates of each building are held in memory so datasets larger
+    than memory can be evaluated. The result is the same as calling :py:meth:`KPI.calculate`
+    on the whole dataset up to floating point summation order.
+    """
+
+    @staticmethod
+    def calculate(kpi: Type[KPI], dataset: ChunkedDataset, **kwargs) -> Union[float, Mapping[Any, float]]:
+        """Return KPI value of every building in `dataset`.
+
+        Parameters
+        ----------
+        kpi: Type[KPI]
+            KPI class with a partial-aggregate form.
+        dataset: ChunkedDataset
+            Chunked calculation inputs.
+        **kwargs: Any
+            Non-serial :py:meth:`KPI.calculate` arguments shared by all chunks, e.g., evaluation window.
+
+        Returns
+        -------
+        value: Union[float, Mapping[Any, float]]
+            KPI value if the dataset has a single building otherwise, mapping of building ID to KPI value.
+        """
+
+        assert kpi.supports_partial(), f'{kpi.__name__} does not have a partial-aggregate form.'
+        partials: Mapping[Any, Mapping[str, Definition]] = {}
+        offsets: Mapping[Any, int] = {}
+
+        for building_id, chunk in dataset:
+            chunk = dict(chunk)
+            length = len(next(iter(chunk.values())))
+
+            # without timestamps, timesteps must be global so that evaluation windows are respected
+            if chunk.get('timestamps') is None:
+                offset = offsets.get(building_id, 0)
+                chunk['timestamps'] = list(range(offset, offset + length))
+                offsets[building_id] = offset + length
+
+            else:
+                pass
+
+            partial = kpi.calculate_partial(**chunk, **kwargs)
+            partials[building_id] = partial if building_id not in partials\
+                else kpi.merge_partial(partials[building_id], partial)
+
+        values = {k: kpi.finalize_partial(v) for k, v in partials.items()}
+
+        return values[None] if list(values.keys()) == [None] else values
@@ -0,0 +1,71 @@
+"""Command line interface.
+
+    energy_flexibility_kpis run config_file_incite.yaml [more configs ...] --output results.csv
+    energy_flexibility_kpis serve --port 8000
+"""
+
+import argparse
+import csv
+import json
+import sys
+from typing import Any, List, Mapping
+
+def run(arguments: argparse.Namespace):
+    from energy_flexibility_kpis.runner import BatchRunner
+
+    results = BatchRunner.run(arguments.configs, max_workers=arguments.workers, cache_directory=arguments.cache_directory)
+
+    if arguments.output is None:
+        write_csv(results, sys.stdout)
+
+    else:
+        with open(arguments.output, 'w', newline='') as f:
+            if arguments.output.endswith('.json') or arguments.output.endswith('.jsonl'):
+                for result in results:
+                    f.write(json.dumps(result) + '\n')
+
+            else:
+                write_csv(results, f)
+
+def serve(arguments: argparse.Namespace):
+    from energy_flexibility_kpis.service import KPIService
+
+    service = KPIService(
+        host=arguments.host, port=arguments.port, batch_window=arguments.batch_window, max_batch_size=arguments.max_batch_size
+    )
+    print(f'Serving KPIs on http://{service.host}:{service.port}', file=sys.stderr)
+    service.serve_forever()
+
+def write_csv(results: List[Mapping[str, Any]], f):
+    """Write result rows as CSV with list values encoded as JSON."""
+
+    fieldnames = ['plan', 'event', 'event_index', 'start', 'end', 'kpi', 'value']
+    writer = csv.DictWriter(f, fieldnames=fieldnames)
+    writer.writeheader()
+
+    for result in results:
+        writer.writerow({**result, 'value': json.dumps(result['value'])})
+
+def main(args: List[str] = None):
+    parser = argparse.ArgumentParser(prog='energy_flexibility_kpis', description='Energy flexibility KPI calculation.')
+    subparsers = parser.add_subparsers(title='commands', dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Compute KPIs of the scenarios described in YAML config files.')
+    run_parser.add_argument('configs', nargs='+', help='Config files, e.g. examples/config_file_incite.yaml. Several configs are run as one batch.')
+    run_parser.add_argument('-o', '--output', default=None, help='Result CSV file, or JSON lines file if it ends with .json or .jsonl. Defaults to stdout.')
+    run_parser.add_argument('-w', '--workers', type=int, default=None, help='Number of configs run in parallel. Defaults to the number of CPUs.')
+    run_parser.add_argument('--cache-directory', default=None, help='Directory that results are cached in and reused from when configs and input files are unchanged.')
+    run_parser.set_defaults(function=run)
+
+    serve_parser = subparsers.add_parser('serve', help='Serve the KPI catalogue and calculations over HTTP.')
+    serve_parser.add_argument('--host', default='127.0.0.1', help='Address to listen on.')
+    serve_parser.add_argument('-p', '--port', type=int, default=8000, help='Port to listen on.')
+    serve_parser.add_argument('--batch-window', type=float, default=0.005, help='Seconds concurrent requests for the same KPI are batched for.')
+    serve_parser.add_argument('--max-batch-size', type=int, default=64, help='Batch size that is calculated without waiting for the batch window.')
+    serve_parser.set_defaults(function=serve)
+
+    arguments = parser.parse_args(args)
+    arguments.function(arguments)
+
+if __name__ == '__main__':
+    main()
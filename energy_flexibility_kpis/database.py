@@ -0,0 +1,216 @@
+"""DuckDB dataset adapter.
+
+Time series are read from tables in a local DuckDB database file with the evaluation window
+and the columns a KPI needs pushed down into the SQL query, so that large datasets are
+not loaded whole. Columns are fetched as NumPy arrays that :py:class:`VariableSet` uses
+without copying. DuckDB is imported when the first connection is opened.
+"""
+
+import os
+import threading
+from typing import Any, List, Mapping, Tuple, Union
+import numpy as np
+from energy_flexibility_kpis.base import Definition
+
+class DuckDBDataset(Definition):
+    r"""KPI calculation inputs stored in a DuckDB table.
+
+    Connections are pooled per database file and shared by all datasets and KPI evaluations
+    in the process. Each query runs on its own cursor of the shared connection so datasets
+    can be evaluated from several threads.
+
+    Parameters
+    ----------
+    database: Union[str, os.PathLike]
+        DuckDB database file.
+    table: str
+        Table or view that holds the time series.
+    columns: Mapping[str, str]
+        Mapping of :py:meth:`KPI.calculate` argument names to column names. The `timestamps` column
+        is used to filter the evaluation window.
+    building_column: str, optional
+        Column that identifies the building of each row in long-format tables.
+    """
+
+    __CONNECTIONS: Mapping[str, Any] = {}
+    __LOCK = threading.Lock()
+
+    def __init__(self, database: Union[str, os.PathLike], table: str, columns: Mapping[str, str], building_column: str = None):
+        super().__init__()
+        self.database = database
+        self.table = table
+        self.columns = columns
+        self.building_column = building_column
+
+    @property
+    def database(self) -> str:
+        return self.__database
+
+    @property
+    def table(self) -> str:
+        return self.__table
+
+    @property
+    def columns(self) -> Mapping[str, str]:
+        return self.__columns
+
+    @property
+    def building_column(self) -> str:
+        return self.__building_column
+
+    @database.setter
+    def database(self, value: Union[str, os.PathLike]):
+        self.__database = os.path.abspath(value)
+
+    @table.setter
+    def table(self, value: str):
+        self.__table = value
+
+    @columns.setter
+    def columns(self, value: Mapping[str, str]):
+        self.__columns = dict(value)
+
+    @building_column.setter
+    def building_column(self, value: str):
+        self.__building_column = value
+
+    @classmethod
+    def get_connection(cls, database: Union[str, os.PathLike]) -> Any:
+        """Return the pooled read-only connection to `database`, opening it the first time."""
+
+        database = os.path.abspath(database)
+
+        with cls.__LOCK:
+            if database not in cls.__CONNECTIONS:
+                import duckdb
+                cls.__CONNECTIONS[database] = duckdb.connect(database, read_only=True)
+
+            else:
+                pass
+
+            return cls.__CONNECTIONS[database]
+
+    @classmethod
+    def close_connections(cls):
+        """Close all pooled connections."""
+
+        with cls.__LOCK:
+            for connection in cls.__CONNECTIONS.values():
+                connection.close()
+
+            cls.__CONNECTIONS.clear()
+
+    def build_query(
+        self, arguments: List[str] = None, evaluation_start_timestamp: Any = None, evaluation_end_timestamp: Any = None,
+        building_id: Any = None
+    ) -> Tuple[str, list]:
+        """Return SQL query that selects the `arguments` columns within the evaluation window, and its parameters.
+
+        Parameters
+        ----------
+        arguments: List[str], optional
+            :py:meth:`KPI.calculate` argument names to select. Defaults to all columns.
+        evaluation_start_timestamp: Any, optional
+            Only select rows at or after this timestamp.
+        evaluation_end_timestamp: Any, optional
+            Only select rows at or before this timestamp.
+        building_id: Any, optional
+            Only select rows of this building.
+        """
+
+        quote = lambda n: '"' + str(n).replace('"', '""') + '"'
+        arguments = list(self.columns.keys()) if arguments is None else arguments
+        select = [f'{quote(self.columns[a])} AS {quote(a)}' for a in arguments]
+        select += [] if self.building_column is None else [f'{quote(self.building_column)} AS "__building"']
+        timestamp_column = self.columns.get('timestamps')
+        conditions = []
+        parameters = []
+
+        for column, operator, value in [
+            (timestamp_column, '>=', evaluation_start_timestamp),
+            (timestamp_column, '<=', evaluation_end_timestamp),
+            (self.building_column, '=', building_id),
+        ]:
+            if value is None:
+                continue
+
+            else:
+                assert column is not None, 'A timestamps column is required to filter the evaluation window.'
+                conditions.append(f'{quote(column)} {operator} ?')
+                parameters.append(value)
+
+        order = [c for c in [self.building_column, timestamp_column] if c is not None]
+        query = f'SELECT {", ".join(select)} FROM {quote(self.table)}'
+        query += '' if len(conditions) == 0 else f' WHERE {" AND ".join(conditions)}'
+        query += '' if len(order) == 0 else f' ORDER BY {", ".join(quote(c) for c in order)}'
+
+        return query, parameters
+
+    def get_arguments(
+        self, arguments: List[str] = None, evaluation_start_timestamp: Any = None, evaluation_end_timestamp: Any = None,
+        building_id: Any = None
+    ) -> Mapping[str, np.ndarray]:
+        """Return :py:meth:`KPI.calculate` argument values as NumPy arrays.
+
+        See :py:meth:`build_query` for parameters.
+        """
+
+        query, parameters = self.build_query(arguments, evaluation_start_timestamp, evaluation_end_timestamp, building_id)
+        values = self.get_connection(self.database).cursor().execute(query, parameters).fetchnumpy()
+        values.pop('__building', None)
+
+        return values
+
+    def calculate(
+        self, kpi: type, evaluation_start_timestamp: Any = None, evaluation_end_timestamp: Any = None,
+        building_id: Any = None, **kwargs
+    ) -> Union[float, List[float]]:
+        """Return `kpi` value calculated from the columns it takes.
+
+        Only the columns of `kpi`'s :py:meth:`KPI.calculate` arguments and the rows in the evaluation
+        window are fetched. Other keyword arguments are parsed to :py:meth:`KPI.calculate`.
+        """
+
+        kpi_arguments = kpi.get_calculate_arguments()
+        arguments = [a for a in self.columns if a in kpi_arguments and a not in kwargs]
+        values = self.get_arguments(arguments, evaluation_start_timestamp, evaluation_end_timestamp, building_id)
+
+        for k, v in [('evaluation_start_timestamp', evaluation_start_timestamp), ('evaluation_end_timestamp', evaluation_end_timestamp)]:
+            if k in kpi_arguments and v is not None:
+                values[k] = v
+
+            else:
+                pass
+
+        return kpi.calculate(**values, **kwargs)
+
+    def to_chunked_dataset(
+        self, arguments: List[str] = None, chunksize: int = 100_000, evaluation_start_timestamp: Any = None,
+        evaluation_end_timestamp: Any = None
+    ) -> 'ChunkedDataset':
+        """Return :py:class:`ChunkedDataset` that streams the query result about `chunksize` rows at a time.
+
+        DuckDB returns results in vectors of 2048 rows so chunks are rounded to a multiple of that.
+        """
+
+        from energy_flexibility_kpis.chunking import ChunkedDataset
+
+        query, parameters = self.build_query(arguments, evaluation_start_timestamp, evaluation_end_timestamp)
+        arguments = list(self.columns.keys()) if arguments is None else arguments
+        vectors_per_chunk = max(1, chunksize//2048)
+
+        def dataframes():
+            result = self.get_connection(self.database).cursor().execute(query, parameters)
+
+            while True:
+                df = result.fetch_df_chunk(vectors_per_chunk)
+
+                if len(df) == 0:
+                    break
+
+                else:
+                    yield df
+
+        building_column = None if self.building_column is None else '__building'
+
+        return ChunkedDataset.from_dataframes(dataframes, {a: a for a in arguments}, building_column=building_column)
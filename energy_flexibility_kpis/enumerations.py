@@ -1,14 +1,17 @@
 from datetime import datetime
 from enum import Enum, IntEnum, unique
+import numpy as np
 
 @unique
 class BaseUnit(Enum):
     DIMENSIONLESS = ('', '')
     PERCENT = ('%', 'percent')
+    WH = ('Wh', 'watt-hour')
     KWH = ('kWh', 'kilowatt-hour')
+    W = ('W', 'watt')
     KW = ('kW', 'kilowatt')
-    DOLLAR = ('%', 'dollar')
-    DAY = ('h', 'day')
+    DOLLAR = ('$', 'dollar')
+    DAY = ('d', 'day')
     HOUR = ('h', 'hour')
     MINUTE = ('min', 'minute')
     SECOND = ('s', 'second')
@@ -16,6 +19,7 @@ class BaseUnit(Enum):
     TON = ('ton', 'ton')
     CELSIUS = ('C', 'celsius')
     KELVIN = ('K', 'kelvin')
+    FAHRENHEIT = ('F', 'fahrenheit')
     SQUARE_METER = ('m^2', 'square-meter')
     KG_OF_CO2 = ('kgCO2', 'kilograms-of-CO2')
     PPM = ('ppm', 'parts-per-million')
@@ -23,7 +27,7 @@ class BaseUnit(Enum):
 
 @unique
 class ValueType(Enum):
-    SERIAL = (list,)
+    SERIAL = (list, np.ndarray)
     SINGLE = (str, int, float, bool, datetime)
 
 @unique
@@ -0,0 +1,152 @@
+"""asyncio-compatible KPI evaluation.
+
+KPI calculations are CPU bound so they are run in a thread or process pool executor while
+the event loop keeps fetching the inputs of the next buildings.
+"""
+
+import asyncio
+import inspect
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterable, Awaitable, Iterable, List, Mapping, Union
+from energy_flexibility_kpis.base import Definition
+
+class AsyncEvaluator(Definition):
+    r"""Evaluates KPIs from asyncio code without blocking the event loop.
+
+    Parameters
+    ----------
+    executor: Executor, optional
+        Executor that KPIs are calculated in. Defaults to a new pool of `max_workers` threads, or
+        processes if `use_processes` is `True`, that is shut down by :py:meth:`close`.
+    max_workers: int, optional
+        Number of workers of the default executor.
+    use_processes: bool, default: False
+        Whether the default executor is a process pool. Processes calculate KPIs in parallel but
+        their inputs must be pickled to be sent to the workers.
+    max_pending: int, default: 64
+        Maximum number of buildings that are being fetched or calculated at once. Further datasets
+        are not pulled from their iterable, or their fetch awaited, until a calculation finishes.
+
+    Examples
+    --------
+    >>> async with AsyncEvaluator(max_pending=16) as evaluator:
+    ...     values = await evaluator.gather(PeakPowerReduction, (historian.fetch(b) for b in buildings))
+    """
+
+    def __init__(self, executor: Executor = None, max_workers: int = None, use_processes: bool = None, max_pending: int = None):
+        super().__init__()
+        use_processes = False if use_processes is None else use_processes
+        self.__owns_executor = executor is None
+
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=max_workers) if use_processes else ThreadPoolExecutor(max_workers=max_workers)
+
+        else:
+            pass
+
+        self.__executor = executor
+        self.max_pending = 64 if max_pending is None else max_pending
+
+    @property
+    def executor(self) -> Executor:
+        return self.__executor
+
+    @property
+    def max_pending(self) -> int:
+        return self.__max_pending
+
+    @max_pending.setter
+    def max_pending(self, value: int):
+        assert value > 0, 'max_pending must be greater than 0.'
+        self.__max_pending = value
+
+    async def calculate(self, kpi: type, **kwargs) -> Union[float, List[float]]:
+        """Return :py:meth:`KPI.calculate` value calculated in the evaluator's executor."""
+
+        return await kpi.acalculate(executor=self.executor, **kwargs)
+
+    async def gather(
+        self, kpi: type, datasets: Union[Iterable[Any], AsyncIterable[Any]], return_exceptions: bool = False, **kwargs
+    ) -> List[Any]:
+        """Return `kpi` value of every dataset in the order of `datasets`.
+
+        Datasets are fetched and calculated concurrently with at most :py:attr:`max_pending` of
+        them in flight, so that fetching the next buildings overlaps with calculating the
+        previous ones without queueing every building in memory.
+
+        Parameters
+        ----------
+        kpi: type
+            KPI class.
+        datasets: Union[Iterable[Any], AsyncIterable[Any]]
+            :py:meth:`KPI.calculate` keyword arguments of each building, or awaitables, e.g. fetch
+            coroutines, that return them.
+        return_exceptions: bool, default: False
+            Return calculation and fetch errors in place of values instead of raising the first one.
+        **kwargs: Any
+            :py:meth:`KPI.calculate` keyword arguments shared by all buildings, e.g. evaluation window.
+        """
+
+        semaphore = asyncio.Semaphore(self.max_pending)
+        tasks = []
+        # errors of finished buildings, recorded as they happen so that the dataset loop need not rescan tasks
+        errors = []
+
+        async def evaluate(dataset: Union[Mapping[str, Any], Awaitable[Mapping[str, Any]]]):
+            try:
+                arguments = (await dataset) if inspect.isawaitable(dataset) else dataset
+
+                return await self.calculate(kpi, **{**kwargs, **arguments})
+
+            except Exception as e:
+                errors.append(e)
+                raise
+
+            finally:
+                semaphore.release()
+
+        try:
+            async for dataset in self.__iterate(datasets):
+                # backpressure: wait for a free slot before pulling the next dataset
+                await semaphore.acquire()
+                tasks.append(asyncio.ensure_future(evaluate(dataset)))
+
+                # stop pulling datasets once a building has failed
+                if not return_exceptions and len(errors) > 0:
+                    raise errors[0]
+
+                else:
+                    pass
+
+            return list(await asyncio.gather(*tasks, return_exceptions=return_exceptions))
+
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+
+            raise
+
+    def close(self):
+        """Shut down the default executor."""
+
+        if self.__owns_executor:
+            self.__executor.shutdown(wait=True)
+
+        else:
+            pass
+
+    async def __aenter__(self) -> 'AsyncEvaluator':
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    @staticmethod
+    async def __iterate(datasets: Union[Iterable[Any], AsyncIterable[Any]]):
+        if hasattr(datasets, '__aiter__'):
+            async for dataset in datasets:
+                yield dataset
+
+        else:
+            for dataset in datasets:
+                yield dataset
@@ -1,12 +1,21 @@
+import asyncio
+import contextvars
+import copy
 import datetime
+import functools
 import inspect
+from concurrent.futures import Executor, ProcessPoolExecutor
 from typing import Any, List, Mapping, Tuple, Union
 import numpy as np
 from energy_flexibility_kpis.base import Definition 
-from energy_flexibility_kpis.enumerations import Complexity, DOEFlexibilityCategory, KPICategory, PerformanceAspect, Relevance 
+from energy_flexibility_kpis.aggregate import merge_partials
+from energy_flexibility_kpis.kpi.registry import KPIRegistry
+from energy_flexibility_kpis.profiling import profile_calculate, stage
+from energy_flexibility_kpis.store import store_calculate
+from energy_flexibility_kpis.enumerations import BaseUnit, Complexity, DOEFlexibilityCategory, KPICategory, PerformanceAspect, Relevance 
 from energy_flexibility_kpis.enumerations import Stakeholder, TemporalEvaluationWindow,TemporalResolution, SpatialResolution
 from energy_flexibility_kpis.unit import Unit
-from energy_flexibility_kpis.variable import DefaultVariable, VariableSet
+from energy_flexibility_kpis.variable import DefaultVariable, VariableSet, VariableSetCache
 
 class KPI(Definition):
     NAME: str = 'kpi'
@@ -22,35 +31,81 @@ class KPI(Definition):
     SPATIAL_RESOLUTION: SpatialResolution = SpatialResolution.UNSPECIFIED
     DOE_FLEXIBILITY_CATEGORY: List[DOEFlexibilityCategory] = None
     PERFORMANCE_ASPECT: List[PerformanceAspect] = None
+    IMPLEMENTED: bool = True
+    # per-building arguments that get_batch stacks, mapped to their number of dimensions for one
+    # building, of KPIs that evaluate a batch of buildings in one calculate call
+    BATCH_ARGUMENTS: Mapping[str, int] = None
 
     def __init__(self) -> None:
         pass
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        KPIRegistry.register(cls)
+
+        # record each calculation when a profiling.Profiler is active and reuse stored values when
+        # a store.ResultStore is active
+        if 'calculate' in vars(cls):
+            cls.calculate = classmethod(profile_calculate(store_calculate(vars(cls)['calculate'].__func__)))
+
+        else:
+            pass
+
     @classmethod
     def info(cls) -> Mapping[str, Any]:
-        return {
-            'name': cls.NAME,
-            'definition': cls.DEFINITION,
-            'unit': None if cls.UNIT is None else str(cls.UNIT),
-            'category': None if cls.CATEGORY is None else cls.CATEGORY.value[0].value + ': ' + cls.CATEGORY.value[1],
-            'relevance': None if cls.RELEVANCE is None else cls.RELEVANCE.value,
-            'stakeholders': None if cls.STAKEHOLDERS is None else [s.value for s in cls.STAKEHOLDERS],
-            'complexity': None if cls.COMPLEXITY is None else cls.COMPLEXITY.value,
-            'need_baseline': cls.NEED_BASELINE,
-            'temporal_evaluation_window': cls.TEMPORAL_EVALUATION_WINDOW.value,
-            'temporal_resolution': cls.TEMPORAL_RESOLUTION.value,
-            'spatial_resolution': cls.SPATIAL_RESOLUTION.value,
-            'doe_flexibility_category': None if cls.DOE_FLEXIBILITY_CATEGORY is None else [c.value for c in cls.DOE_FLEXIBILITY_CATEGORY],
-            'performance_aspect': None if cls.PERFORMANCE_ASPECT is None else [p.value for p in cls.PERFORMANCE_ASPECT],
-            'calculation_arguments': cls.__get_calculate_arguments_info()
-        }
+        """Return KPI metadata.
+
+        The metadata is computed once per class on first call and a copy of it is
+        returned so that callers may modify the result.
+        """
+
+        info = vars(cls).get('_KPI__info')
+
+        if info is None:
+            info = {
+                'name': cls.NAME,
+                'definition': cls.DEFINITION,
+                'unit': None if cls.UNIT is None else str(cls.UNIT),
+                'category': None if cls.CATEGORY is None else cls.CATEGORY.value[0].value + ': ' + cls.CATEGORY.value[1],
+                'relevance': None if cls.RELEVANCE is None else cls.RELEVANCE.value,
+                'stakeholders': None if cls.STAKEHOLDERS is None else [s.value for s in cls.STAKEHOLDERS],
+                'complexity': None if cls.COMPLEXITY is None else cls.COMPLEXITY.value,
+                'need_baseline': cls.NEED_BASELINE,
+                'temporal_evaluation_window': cls.TEMPORAL_EVALUATION_WINDOW.value,
+                'temporal_resolution': cls.TEMPORAL_RESOLUTION.value,
+                'spatial_resolution': cls.SPATIAL_RESOLUTION.value,
+                'doe_flexibility_category': None if cls.DOE_FLEXIBILITY_CATEGORY is None else [c.value for c in cls.DOE_FLEXIBILITY_CATEGORY],
+                'performance_aspect': None if cls.PERFORMANCE_ASPECT is None else [p.value for p in cls.PERFORMANCE_ASPECT],
+                'implemented': cls.IMPLEMENTED,
+                'calculation_arguments': cls.__get_calculate_arguments_info()
+            }
+            cls.__info = info
+
+        else:
+            pass
+
+        return copy.deepcopy(info)
+
+    @classmethod
+    def get_calculate_arguments(cls) -> List[str]:
+        """Return :py:meth:`calculate` argument names, computed once per class."""
+
+        arguments = vars(cls).get('_KPI__calculate_arguments')
+
+        if arguments is None:
+            arguments = list(inspect.signature(cls.calculate).parameters)
+            cls.__calculate_arguments = arguments
+
+        else:
+            pass
+
+        return arguments
     
     @classmethod
     def __get_calculate_arguments_info(cls):
-        args = inspect.getfullargspec(cls.calculate).args
         info = []
 
-        for arg in args:
+        for arg in cls.get_calculate_arguments():
             try:
                 info.append(getattr(DefaultVariable, arg).info())
 
@@ -87,6 +142,11 @@ class KPI(Definition):
         generic_carbon_emissions_profile: List[float] = None,
         generic_carbon_intensity_profile: List[float] = None,
         generic_self_production_profile: List[float] = None,
+        target_electric_power_profile: List[float] = None,
+        upward_flexible_power_profile: List[float] = None,
+        downward_flexible_power_profile: List[float] = None,
+        electricity_price_profile: List[float] = None,
+        outdoor_air_temperature_profile: List[float] = None,
         load_profile_peak_timestamp: Union[int, datetime.datetime, str] = None,
         load_profile_valley_timestamp: Union[int, datetime.datetime, str] = None,
         grid_peak_timestamp: Union[int, datetime.datetime, str] = None,
@@ -105,57 +165,149 @@ class KPI(Definition):
         zone_temperature_profile: List[float] = None,  # List of temperature profiles for each zone
         cooling_setpoints: List[float] = None,  # List of cooling setpoints for each zone
         heating_setpoints: List[float] = None,  # List of heating setpoints for each zone
+        zone_co2_concentration_profile: List[float] = None,  # List of CO2 concentration profiles for each zone
+        upper_co2_concentration_limits: List[float] = None,  # List of upper CO2 concentration limits for each zone
+        baseline_heat_pump_activation_profile: List[bool] = None,
+        flexible_heat_pump_activation_profile: List[bool] = None,
         floor_area: Union[int,str] = None,
         num_zones: Union[int,str] = None,
         num_days: Union[int,str] = None,
     ) -> Tuple[Union[float, List[float]], VariableSet]:
-        vs = VariableSet(
-            availability=availability,
-            timestamps=timestamps,
-            evaluation_start_timestamp=evaluation_start_timestamp,
-            evaluation_end_timestamp=evaluation_end_timestamp,
-            baseline_electric_power_profile=baseline_electric_power_profile,
-            baseline_electricity_consumption_profile=baseline_electricity_consumption_profile,
-            baseline_natural_gas_consumption_profile=baseline_natural_gas_consumption_profile,
-            baseline_cost_profile=baseline_cost_profile,
-            baseline_carbon_emissions_profile=baseline_carbon_emissions_profile,
-            baseline_carbon_intensity_profile=baseline_carbon_intensity_profile,
-            baseline_self_production_profile=baseline_self_production_profile,
-            flexible_electric_power_profile=flexible_electric_power_profile,
-            flexible_electricity_consumption_profile=flexible_electricity_consumption_profile,
-            flexible_natural_gas_consumption_profile=flexible_natural_gas_consumption_profile,
-            flexible_cost_profile=flexible_cost_profile,
-            flexible_carbon_emissions_profile=flexible_carbon_emissions_profile,
-            flexible_carbon_intensity_profile=flexible_carbon_intensity_profile,
-            flexible_self_production_profile=flexible_self_production_profile,
-            generic_electric_power_profile=generic_electric_power_profile,
-            generic_electricity_consumption_profile=generic_electricity_consumption_profile,
-            generic_natural_gas_consumption_profile=generic_natural_gas_consumption_profile,
-            generic_cost_profile=generic_cost_profile,
-            generic_carbon_emissions_profile=generic_carbon_emissions_profile,
-            generic_carbon_intensity_profile=generic_carbon_intensity_profile,
-            generic_self_production_profile=generic_self_production_profile,
-            load_profile_peak_timestamp=load_profile_peak_timestamp,
-            load_profile_valley_timestamp=load_profile_valley_timestamp,
-            grid_peak_timestamp=grid_peak_timestamp,
-            generic_signal_start_timestamp=generic_signal_start_timestamp,
-            generic_signal_end_timestamp=generic_signal_end_timestamp,
-            low_generic_signal_start_timestamp=low_generic_signal_start_timestamp,
-            low_generic_signal_end_timestamp=low_generic_signal_end_timestamp,
-            medium_generic_signal_start_timestamp=medium_generic_signal_start_timestamp,
-            medium_generic_signal_end_timestamp=medium_generic_signal_end_timestamp,
-            high_generic_signal_start_timestamp=high_generic_signal_start_timestamp,
-            high_generic_signal_end_timestamp=high_generic_signal_end_timestamp,
-            high_price_start_timestamp=high_price_start_timestamp,
-            high_price_end_timestamp=high_price_end_timestamp,
-            high_emission_start_timestamp=high_emission_start_timestamp,
-            high_emission_end_timestamp=high_emission_end_timestamp,
-            zone_temperature_profile=zone_temperature_profile, 
-            cooling_setpoints=cooling_setpoints, 
-            heating_setpoints=heating_setpoints,
-            floor_area=floor_area,  
-            num_zones=num_zones, 
-            num_days=num_days, 
-        )
-        
-        return np.nan, vs
\ No newline at end of file
+        arguments = {k: v for k, v in locals().items() if k != 'cls'}
+        cache = VariableSetCache.current()
+        vs = None if cache is None else cache.get(arguments)
+
+        if vs is None:
+            with stage('variable_set'):
+                vs = VariableSet(**arguments)
+
+            if cache is not None:
+                cache.set(arguments, vs)
+
+            else:
+                pass
+
+        else:
+            pass
+
+        return np.nan, vs
+
+    @classmethod
+    async def acalculate(cls, *args, executor: Executor = None, **kwargs) -> Union[float, List[float]]:
+        """Awaitable :py:meth:`calculate` that runs in `executor` instead of blocking the event loop.
+
+        Parameters
+        ----------
+        *args: Any
+            :py:meth:`calculate` positional arguments.
+        executor: Executor, optional
+            Thread or process pool executor. Defaults to the event loop's default executor. Thread
+            workers run in a copy of the current context so that an active profiler, result store
+            or variable set cache applies to the calculation.
+        **kwargs: Any
+            :py:meth:`calculate` keyword arguments.
+        """
+
+        loop = asyncio.get_running_loop()
+        function = functools.partial(cls.calculate, *args, **kwargs)
+
+        if not isinstance(executor, ProcessPoolExecutor):
+            function = functools.partial(contextvars.copy_context().run, function)
+
+        else:
+            pass
+
+        return await loop.run_in_executor(executor, function)
+
+    @classmethod
+    def get_timestep_length(cls, vs: VariableSet, unit: BaseUnit = None) -> float:
+        """Return timestep length in `unit`, default hours, of the datetime timestamps in the evaluation
+        window of `vs`. Without timestamps or with integer timesteps, each timestep has length 1."""
+
+        unit = BaseUnit.HOUR if unit is None else unit
+
+        if vs.timestamps.is_datetime:
+            length = vs.get_temporal_resolution(unit, value=vs.timestamps.value[vs.evaluation_mask])
+
+        else:
+            length = 1.0
+
+        return length
+
+    @classmethod
+    def get_batch(
+        cls, profiles: Mapping[str, Any], ndim: int = None, **kwargs
+    ) -> Tuple[Mapping[str, np.ndarray], VariableSet, bool]:
+        """Return `profiles` stacked over buildings, the variable set of the first building and
+        whether the profiles are a batch of buildings.
+
+        Profiles of several buildings are evaluated in one batch when passed as lists of equal-shape
+        profiles, in which case :py:meth:`calculate` returns a list of values. The profile of one
+        building has `ndim` dimensions, default 1, e.g. 2 for profiles of shape `(timesteps, zones)`
+        where a 1-D profile is that of a single zone. The first profile decides whether `profiles`
+        is a batch and the others may be single profiles that all buildings share, which are stacked
+        as a batch of one building. `None` profiles are kept.
+
+        All buildings share timestamps, so the variable set is built from the profiles of the first
+        building and `kwargs`, e.g. timestamps and evaluation window, and its evaluation mask and
+        :py:meth:`get_timestep_length` apply to every building.
+        """
+
+        ndim = 1 if ndim is None else ndim
+        batched = np.ndim(next(iter(profiles.values()))) == ndim + 1
+        stacked = {}
+
+        for k, v in profiles.items():
+            if v is not None:
+                v = np.asarray(v, dtype=float)
+                v = v.reshape(*v.shape, 1) if ndim > 1 and v.ndim == ndim - 1 else v
+                v = v[None] if v.ndim == ndim else v
+
+            else:
+                pass
+
+            stacked[k] = v
+
+        _, vs = KPI.calculate(**{k: None if v is None else v[0] for k, v in stacked.items()}, **kwargs)
+
+        return stacked, vs, batched
+
+    @classmethod
+    def simpson(cls, y: np.ndarray, dx: float = 1.0) -> float:
+        """Composite Simpson integral of `y` using :py:func:`scipy.integrate.simpson`."""
+
+        from scipy import integrate
+
+        with stage('integral', size=len(y)):
+            return integrate.simpson(y, dx=dx)
+
+    @classmethod
+    def calculate_partial(cls, **kwargs) -> Mapping[str, Definition]:
+        """Return the combinable partial aggregates of one chunk of the :py:meth:`calculate` inputs.
+
+        KPIs that reduce their inputs to sums, counts, extrema or integrals override this method
+        and :py:meth:`finalize_partial` so that they can be evaluated on datasets that are iterated
+        in time or building blocks. Partial aggregates of consecutive chunks are combined with
+        :py:meth:`merge_partial`.
+        """
+
+        raise NotImplementedError(f'{cls.__name__} does not have a partial-aggregate form.')
+
+    @classmethod
+    def merge_partial(cls, partial: Mapping[str, Definition], other: Mapping[str, Definition]) -> Mapping[str, Definition]:
+        """Merge partial aggregates of a chunk with those of the chunk that follows it."""
+
+        return merge_partials(partial, other)
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> Union[float, List[float]]:
+        """Return KPI value from the merged partial aggregates of all chunks."""
+
+        raise NotImplementedError(f'{cls.__name__} does not have a partial-aggregate form.')
+
+    @classmethod
+    def supports_partial(cls) -> bool:
+        """Whether the KPI can be evaluated chunk by chunk."""
+
+        return cls.finalize_partial.__func__ is not KPI.finalize_partial.__func__
+
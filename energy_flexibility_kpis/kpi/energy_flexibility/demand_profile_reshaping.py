@@ -1,7 +1,10 @@
 import datetime
-from typing import List, Union
+from typing import List, Mapping, Union
 import numpy as np
+from energy_flexibility_kpis.aggregate import SeriesAggregate
+from energy_flexibility_kpis.base import Definition
 from energy_flexibility_kpis.kpi.base import KPI
+from energy_flexibility_kpis.model import RCModel
 from energy_flexibility_kpis.enumerations import BaseUnit, Complexity, DOEFlexibilityCategory, KPICategory, PerformanceAspect, Relevance 
 from energy_flexibility_kpis.enumerations import Stakeholder, TemporalEvaluationWindow,TemporalResolution, SpatialResolution
 from energy_flexibility_kpis.unit import Unit
@@ -51,9 +54,38 @@ class DeviationDecreaseFromTheFlatDemandProfile(KPI):
 
         return value
 
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electricity_consumption_profile: List[float], 
+        flexible_electricity_consumption_profile: List[float],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            timestamps=timestamps,
+            baseline_electricity_consumption_profile=baseline_electricity_consumption_profile,
+            flexible_electricity_consumption_profile=flexible_electricity_consumption_profile,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        partial = {
+            'baseline_profile': SeriesAggregate(vs.baseline_electricity_consumption_profile.value[vs.evaluation_mask]),
+            'flexible_profile': SeriesAggregate(vs.flexible_electricity_consumption_profile.value[vs.evaluation_mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        value = 1.0 - (partial['flexible_profile'].variance/partial['baseline_profile'].variance)**0.5
+
+        return value
+
 class FlexibilityMap(KPI):
     """Flexibility map (upward and downward load profile for the next 24h). Calculated 
-    by MPC with black box model of the building and energy price forecast."""
+    by MPC with grey-box model of the building and energy price forecast."""
 
     NAME = 'flexibility map'
     DEFINITION = __doc__
@@ -75,18 +107,106 @@ class FlexibilityMap(KPI):
     @classmethod
     def calculate(
         cls,
+        model: Union[RCModel, List[RCModel]],
+        outdoor_air_temperature_profile: Union[List[float], List[List[float]]],
+        electricity_price_profile: Union[List[float], List[List[float]]],
+        heating_setpoints: Union[List[float], List[List[float]]],
+        cooling_setpoints: Union[List[float], List[List[float]]],
         timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
         evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
         evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
-    ) -> float:
-        _, vs = super().calculate(
-            timestamps=timestamps,
-            evaluation_start_timestamp=evaluation_start_timestamp,
-            evaluation_end_timestamp=evaluation_end_timestamp,
-        )
-        
-        raise NotImplementedError('Has no equation. Requires MPC with black box model.')
-    
+    ) -> Mapping[str, Union[List[float], List[List[float]]]]:
+        """Upward and downward energy flexibility of each timestep relative to the cost-optimal operation.
+
+        The baseline is the power schedule that minimizes energy cost for the price forecast while
+        keeping the zone temperature of the grey-box `model` between the heating and cooling
+        setpoints. The upward (downward) flexibility of a timestep is the energy that can be added to
+        (removed from) the baseline in that timestep while the other timesteps are rescheduled to stay
+        within the setpoints. Each schedule is a linear program solved with HiGHS.
+
+        A list of models can be passed to calculate the map of a portfolio, in which case profiles
+        are either shared by all buildings or lists of one profile per building, and the flexibility
+        of each building is returned. The linear programs of all buildings are solved together as one
+        block-diagonal program per timestep. The flexibility of a building whose comfort bounds cannot
+        be met is NaN and does not affect the other buildings."""
+
+        from scipy import optimize, sparse
+
+        batched = isinstance(model, (list, tuple))
+        models = list(model) if batched else [model]
+        profiles, vs, _ = cls.get_batch({
+            'outdoor_air_temperature_profile': outdoor_air_temperature_profile,
+            'electricity_price_profile': electricity_price_profile,
+            'heating_setpoints': heating_setpoints,
+            'cooling_setpoints': cooling_setpoints,
+        }, timestamps=timestamps, evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp)
+        outdoor_temperature, price, lower_temperature, upper_temperature = [
+            np.broadcast_to(p, (len(models), p.shape[1]))[:, vs.evaluation_mask] for p in profiles.values()
+        ]
+        dx = cls.get_timestep_length(vs)
+        n, t = price.shape
+
+        responses = [m.get_response(o, dx) for m, o in zip(models, outdoor_temperature)]
+
+        def get_program(buildings: List[int]) -> tuple:
+            # comfort constraints lower <= G @ power + f <= upper of `buildings` as one block-diagonal program
+            a_ub = sparse.block_diag([np.vstack([responses[b][0], -responses[b][0]]) for b in buildings], format='csr')
+            b_ub = np.concatenate([
+                np.concatenate([upper_temperature[b] - responses[b][1], responses[b][1] - lower_temperature[b]])
+                for b in buildings
+            ])
+            bounds = [(0.0, models[b].maximum_power) for b in buildings for _ in range(t)]
+
+            return a_ub, b_ub, bounds
+
+        def solve(c: np.ndarray, program: tuple) -> optimize.OptimizeResult:
+            a_ub, b_ub, bounds = program
+            result = optimize.linprog(c, A_ub=a_ub, b_ub=b_ub, bounds=bounds, method='highs')
+            # status 2 is an infeasible program, i.e. the comfort bounds cannot be met
+            assert result.status in [0, 2], f'The flexibility map linear program could not be solved: {result.message}'
+
+            return result
+
+        feasible = list(range(n))
+        program = get_program(feasible)
+        result = solve((price*dx).ravel(), program)
+
+        # a building whose comfort bounds cannot be met makes the whole block program infeasible
+        # so the buildings are solved separately to find and leave out the infeasible ones
+        if result.status == 2:
+            feasible = [b for b in range(n) if solve(price[b]*dx, get_program([b])).status == 0]
+            program = get_program(feasible) if len(feasible) > 0 else None
+            result = solve((price[feasible]*dx).ravel(), program) if len(feasible) > 0 else None
+
+        else:
+            pass
+
+        upward = np.full((n, t), np.nan)
+        downward = np.full((n, t), np.nan)
+
+        if len(feasible) > 0:
+            count = len(feasible)
+            baseline_power = result.x.reshape(count, t)
+            upward_power = np.zeros((count, t))
+            downward_power = np.zeros((count, t))
+
+            for i in range(t):
+                c = np.zeros((count, t))
+                c[:, i] = -1.0
+                upward_power[:, i] = solve(c.ravel(), program).x.reshape(count, t)[:, i]
+                downward_power[:, i] = solve(-c.ravel(), program).x.reshape(count, t)[:, i]
+
+            upward[feasible] = np.maximum(upward_power - baseline_power, 0.0)*dx
+            downward[feasible] = np.maximum(baseline_power - downward_power, 0.0)*dx
+
+        else:
+            pass
+
+        value = {'upward': upward.tolist(), 'downward': downward.tolist()}
+
+        return value if batched else {k: v[0] for k, v in value.items()}
+
 class Ramp(KPI):
     """Ramp of the power consumption."""
 
@@ -1,6 +1,7 @@
 import datetime
-from typing import List, Union
-from scipy import integrate
+from typing import List, Mapping, Union
+from energy_flexibility_kpis.aggregate import SeriesAggregate, TimestampAggregate
+from energy_flexibility_kpis.base import Definition
 from energy_flexibility_kpis.kpi.base import KPI
 from energy_flexibility_kpis.enumerations import BaseUnit, Complexity, DOEFlexibilityCategory, KPICategory, PerformanceAspect, Relevance 
 from energy_flexibility_kpis.enumerations import Stakeholder, TemporalEvaluationWindow,TemporalResolution, SpatialResolution
@@ -47,6 +48,35 @@ class FlexibilitySavingsIndex(KPI):
         value = 1 - (vs.flexible_cost_profile.value[vs.evaluation_mask].sum()/vs.baseline_cost_profile.value[vs.evaluation_mask].sum())
 
         return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_cost_profile: List[float],
+        flexible_cost_profile: List[float],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            baseline_cost_profile=baseline_cost_profile,
+            flexible_cost_profile=flexible_cost_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        partial = {
+            'baseline_profile': SeriesAggregate(vs.baseline_cost_profile.value[vs.evaluation_mask]),
+            'flexible_profile': SeriesAggregate(vs.flexible_cost_profile.value[vs.evaluation_mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        value = 1 - (partial['flexible_profile'].sum/partial['baseline_profile'].sum)
+
+        return value
     
 class CostOrEnergyDeviationRatio(KPI):
     """Flexibility is assessed by the energy consumption and cost deviations resulting from 
@@ -93,11 +123,46 @@ class CostOrEnergyDeviationRatio(KPI):
         dx = vs.get_temporal_resolution(BaseUnit.HOUR, value=vs.timestamps.value[vs.evaluation_mask])
         cost_profile = vs.flexible_cost_profile.value[vs.evaluation_mask] - vs.baseline_cost_profile.value[vs.evaluation_mask]
         electric_power_profile = vs.flexible_electric_power_profile.value[vs.evaluation_mask] - vs.baseline_electric_power_profile.value[vs.evaluation_mask]
-        cost_value = integrate.simpson(cost_profile, dx=dx)
-        electric_power_value = integrate.simpson(electric_power_profile, dx=dx)
+        cost_value = cls.simpson(cost_profile, dx=dx)
+        electric_power_value = cls.simpson(electric_power_profile, dx=dx)
         value = cost_value/electric_power_value
 
         return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electric_power_profile: List[float],
+        baseline_cost_profile: List[float],
+        flexible_electric_power_profile: List[float],
+        flexible_cost_profile: List[float],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]],
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            baseline_electric_power_profile=baseline_electric_power_profile,
+            baseline_cost_profile=baseline_cost_profile,
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            flexible_cost_profile=flexible_cost_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        partial = {
+            'cost_profile': SeriesAggregate(vs.flexible_cost_profile.value[vs.evaluation_mask] - vs.baseline_cost_profile.value[vs.evaluation_mask]),
+            'electric_power_profile': SeriesAggregate(vs.flexible_electric_power_profile.value[vs.evaluation_mask] - vs.baseline_electric_power_profile.value[vs.evaluation_mask]),
+            'timestamps': TimestampAggregate(vs.timestamps.value[vs.evaluation_mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        dx = partial['timestamps'].get_resolution(BaseUnit.HOUR)
+        value = partial['cost_profile'].simpson(dx)/partial['electric_power_profile'].simpson(dx)
+
+        return value
     
 class RelativeOperationalCostOfADR(KPI):
     """Ratio between the total operational cost with ADR and the total operational 
@@ -158,6 +223,7 @@ class CostSavings(KPI):
     SPATIAL_RESOLUTION = SpatialResolution.UNSPECIFIED
     DOE_FLEXIBILITY_CATEGORY = [DOEFlexibilityCategory.LOAD_SHEDDING, DOEFlexibilityCategory.LOAD_SHIFTING]
     PERFORMANCE_ASPECT = [PerformanceAspect.COST]
+    IMPLEMENTED = False
 
     def __init__(self):
         super().__init__()
@@ -1,6 +1,7 @@
 import datetime
-from typing import List, Union
-from scipy import integrate
+from typing import List, Mapping, Union
+from energy_flexibility_kpis.aggregate import SeriesAggregate, TimestampAggregate
+from energy_flexibility_kpis.base import Definition
 from energy_flexibility_kpis.kpi.base import KPI
 from energy_flexibility_kpis.enumerations import BaseUnit, Complexity, DOEFlexibilityCategory, KPICategory, PerformanceAspect, Relevance 
 from energy_flexibility_kpis.enumerations import Stakeholder, TemporalEvaluationWindow,TemporalResolution, SpatialResolution
@@ -92,6 +93,39 @@ class EnvironmentalSavings(KPI):
         electric_power_profile = vs.flexible_electric_power_profile.value[vs.evaluation_mask] - vs.baseline_electric_power_profile.value[vs.evaluation_mask]
         carbon_emissions_profile = electric_power_profile*vs.generic_carbon_intensity_profile.value[vs.evaluation_mask]
         dx = vs.get_temporal_resolution(BaseUnit.HOUR, value=vs.timestamps.value[vs.evaluation_mask])
-        value = integrate.simpson(carbon_emissions_profile, dx=dx)
+        value = cls.simpson(carbon_emissions_profile, dx=dx)
 
-        return value
\ No newline at end of file
+        return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electric_power_profile: List[float],
+        flexible_electric_power_profile: List[float],
+        generic_carbon_intensity_profile: List[float],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]],
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            baseline_electric_power_profile=baseline_electric_power_profile,
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            generic_carbon_intensity_profile=generic_carbon_intensity_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        electric_power_profile = vs.flexible_electric_power_profile.value[vs.evaluation_mask] - vs.baseline_electric_power_profile.value[vs.evaluation_mask]
+        partial = {
+            'profile': SeriesAggregate(electric_power_profile*vs.generic_carbon_intensity_profile.value[vs.evaluation_mask]),
+            'timestamps': TimestampAggregate(vs.timestamps.value[vs.evaluation_mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        dx = partial['timestamps'].get_resolution(BaseUnit.HOUR)
+        value = partial['profile'].simpson(dx)
+
+        return value
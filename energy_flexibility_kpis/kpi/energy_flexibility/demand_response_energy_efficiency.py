@@ -1,6 +1,7 @@
 import datetime
-from typing import List, Union
-from scipy import integrate
+from typing import List, Mapping, Union
+from energy_flexibility_kpis.aggregate import SeriesAggregate, TimestampAggregate
+from energy_flexibility_kpis.base import Definition
 from energy_flexibility_kpis.kpi.base import KPI
 from energy_flexibility_kpis.enumerations import BaseUnit, Complexity, DOEFlexibilityCategory, KPICategory, PerformanceAspect, Relevance 
 from energy_flexibility_kpis.enumerations import Stakeholder, TemporalEvaluationWindow,TemporalResolution, SpatialResolution
@@ -46,7 +47,37 @@ class EnergySavingsOfDemandResponse(KPI):
         
         profile = vs.baseline_electric_power_profile.value[vs.evaluation_mask] - vs.flexible_electric_power_profile.value[vs.evaluation_mask]
         dx = vs.get_temporal_resolution(BaseUnit.HOUR, value=vs.timestamps.value[vs.evaluation_mask])
-        value = integrate.simpson(profile, dx=dx)
+        value = cls.simpson(profile, dx=dx)
+
+        return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electric_power_profile: List[float],
+        flexible_electric_power_profile: List[float],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]],
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            baseline_electric_power_profile=baseline_electric_power_profile,
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        partial = {
+            'profile': SeriesAggregate(vs.baseline_electric_power_profile.value[vs.evaluation_mask] - vs.flexible_electric_power_profile.value[vs.evaluation_mask]),
+            'timestamps': TimestampAggregate(vs.timestamps.value[vs.evaluation_mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        dx = partial['timestamps'].get_resolution(BaseUnit.HOUR)
+        value = partial['profile'].simpson(dx)
 
         return value
 
@@ -90,7 +121,38 @@ class EnergyConsumptionRatio(KPI):
         baseline_profile = vs.baseline_electric_power_profile.value[vs.evaluation_mask]
         flexible_profile = vs.flexible_electric_power_profile.value[vs.evaluation_mask]
         dx = vs.get_temporal_resolution(BaseUnit.HOUR, value=vs.timestamps.value[vs.evaluation_mask])
-        value = integrate.simpson(flexible_profile, dx=dx)/integrate.simpson(baseline_profile, dx=dx)
+        value = cls.simpson(flexible_profile, dx=dx)/cls.simpson(baseline_profile, dx=dx)
+
+        return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electric_power_profile: List[float],
+        flexible_electric_power_profile: List[float],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]],
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            baseline_electric_power_profile=baseline_electric_power_profile,
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        partial = {
+            'baseline_profile': SeriesAggregate(vs.baseline_electric_power_profile.value[vs.evaluation_mask]),
+            'flexible_profile': SeriesAggregate(vs.flexible_electric_power_profile.value[vs.evaluation_mask]),
+            'timestamps': TimestampAggregate(vs.timestamps.value[vs.evaluation_mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        dx = partial['timestamps'].get_resolution(BaseUnit.HOUR)
+        value = partial['flexible_profile'].simpson(dx)/partial['baseline_profile'].simpson(dx)
 
         return value
     
@@ -158,6 +220,7 @@ class ConsistencyWithEnergySavings(KPI):
     SPATIAL_RESOLUTION = SpatialResolution.UNSPECIFIED
     DOE_FLEXIBILITY_CATEGORY = [DOEFlexibilityCategory.EFFICIENCY]
     PERFORMANCE_ASPECT = [PerformanceAspect.ENERGY]
+    IMPLEMENTED = False
 
     def __init__(self):
         super().__init__()
@@ -219,7 +282,38 @@ class NetBuildingConsumptionChangePercentage(KPI):
         
         profile = vs.flexible_electric_power_profile.value[vs.evaluation_mask] - vs.baseline_electric_power_profile.value[vs.evaluation_mask]
         dx = vs.get_temporal_resolution(BaseUnit.HOUR, value=vs.timestamps.value[vs.evaluation_mask])
-        baseline_energy = integrate.simpson(vs.baseline_electric_power_profile.value[vs.evaluation_mask], dx=dx)
-        value = integrate.simpson(profile, dx=dx) /  baseline_energy * 100
+        baseline_energy = cls.simpson(vs.baseline_electric_power_profile.value[vs.evaluation_mask], dx=dx)
+        value = cls.simpson(profile, dx=dx) /  baseline_energy * 100
+
+        return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electric_power_profile: List[float],
+        flexible_electric_power_profile: List[float],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]],
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            baseline_electric_power_profile=baseline_electric_power_profile,
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        partial = {
+            'profile': SeriesAggregate(vs.flexible_electric_power_profile.value[vs.evaluation_mask] - vs.baseline_electric_power_profile.value[vs.evaluation_mask]),
+            'baseline_profile': SeriesAggregate(vs.baseline_electric_power_profile.value[vs.evaluation_mask]),
+            'timestamps': TimestampAggregate(vs.timestamps.value[vs.evaluation_mask]),
+        }
+
+        return partial
 
-        return value
\ No newline at end of file
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        dx = partial['timestamps'].get_resolution(BaseUnit.HOUR)
+        value = partial['profile'].simpson(dx)/partial['baseline_profile'].simpson(dx)*100
+
+        return value
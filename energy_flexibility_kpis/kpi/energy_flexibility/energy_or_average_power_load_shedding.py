@@ -1,8 +1,8 @@
 import datetime
-from typing import List, Union
+from typing import List, Mapping, Union
 import numpy as np
-import pandas as pd
-from scipy import integrate
+from energy_flexibility_kpis.aggregate import SeriesAggregate, TimestampAggregate
+from energy_flexibility_kpis.base import Definition
 from energy_flexibility_kpis.kpi.base import KPI
 from energy_flexibility_kpis.enumerations import BaseUnit, Complexity, DOEFlexibilityCategory, KPICategory, PerformanceAspect, Relevance 
 from energy_flexibility_kpis.enumerations import Stakeholder, TemporalEvaluationWindow,TemporalResolution, SpatialResolution
@@ -51,6 +51,34 @@ class EnergyDeviationForPeakShaving(KPI):
         ).mean()*vs.evaluation_length
 
         return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electric_power_profile: List[float], 
+        flexible_electric_power_profile: List[float],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            baseline_electric_power_profile=baseline_electric_power_profile,
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        partial = {
+            'profile': SeriesAggregate(vs.baseline_electric_power_profile.value[vs.evaluation_mask] - vs.flexible_electric_power_profile.value[vs.evaluation_mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        value = partial['profile'].mean*partial['profile'].count
+
+        return value
     
 class AverageLoadReduction(KPI):
     """Average load reduction during the demand response event (peak load shaving) by number of buildings."""
@@ -146,11 +174,42 @@ class BuildingEnergyFlexibilityIndex(KPI):
             evaluation_end_timestamp=evaluation_end_timestamp,
         )
         dx = vs.get_temporal_resolution(BaseUnit.HOUR, value=vs.timestamps.value[vs.evaluation_mask])
-        baseline_value = integrate.simpson(vs.baseline_electric_power_profile.value[vs.evaluation_mask], dx=dx)
-        flexible_value = integrate.simpson(vs.flexible_electric_power_profile.value[vs.evaluation_mask], dx=dx)
+        baseline_value = cls.simpson(vs.baseline_electric_power_profile.value[vs.evaluation_mask], dx=dx)
+        flexible_value = cls.simpson(vs.flexible_electric_power_profile.value[vs.evaluation_mask], dx=dx)
         value = (baseline_value - flexible_value)/(dx*vs.evaluation_length)
 
         return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electric_power_profile: List[float], 
+        flexible_electric_power_profile: List[float],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]],
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            baseline_electric_power_profile=baseline_electric_power_profile,
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        partial = {
+            'baseline_profile': SeriesAggregate(vs.baseline_electric_power_profile.value[vs.evaluation_mask]),
+            'flexible_profile': SeriesAggregate(vs.flexible_electric_power_profile.value[vs.evaluation_mask]),
+            'timestamps': TimestampAggregate(vs.timestamps.value[vs.evaluation_mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        dx = partial['timestamps'].get_resolution(BaseUnit.HOUR)
+        value = (partial['baseline_profile'].simpson(dx) - partial['flexible_profile'].simpson(dx))/(dx*partial['baseline_profile'].count)
+
+        return value
     
 class DimensionlessPeakShaving(KPI):
     """Represents the energy reduction percentage of the cooling system during the downward flexibility period. The evaluation period should consider the downward flexibility period."""
@@ -199,7 +258,38 @@ class DimensionlessPeakShaving(KPI):
         )
         profile = vs.baseline_electric_power_profile.value[vs.evaluation_mask]
         dx = vs.get_temporal_resolution(BaseUnit.HOUR, value=vs.timestamps.value[vs.evaluation_mask])
-        value = q_peak_shaving/integrate.simpson(profile, dx=dx)
+        value = q_peak_shaving/cls.simpson(profile, dx=dx)
+
+        return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electric_power_profile: List[float], 
+        flexible_electric_power_profile: List[float],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]],
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            baseline_electric_power_profile=baseline_electric_power_profile,
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        partial = {
+            'profile': SeriesAggregate(vs.baseline_electric_power_profile.value[vs.evaluation_mask] - vs.flexible_electric_power_profile.value[vs.evaluation_mask]),
+            'baseline_profile': SeriesAggregate(vs.baseline_electric_power_profile.value[vs.evaluation_mask]),
+            'timestamps': TimestampAggregate(vs.timestamps.value[vs.evaluation_mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        dx = partial['timestamps'].get_resolution(BaseUnit.HOUR)
+        value = partial['profile'].mean*partial['profile'].count/partial['baseline_profile'].simpson(dx)
 
         return value
     
@@ -242,6 +332,32 @@ class LoadFactor(KPI):
             /vs.generic_electric_power_profile.value[vs.evaluation_mask].max()
 
         return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        generic_electric_power_profile: List[float],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            generic_electric_power_profile=generic_electric_power_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        partial = {
+            'profile': SeriesAggregate(vs.generic_electric_power_profile.value[vs.evaluation_mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        value = partial['profile'].mean/partial['profile'].maximum
+
+        return value
     
 class AnnualAverageDailyLoadVariation(KPI):
     """An indicator expressing the overall level of load variability in buildings quantified using the accumulated sum of daily load variations relative to the annual heating energy use (unit: unitless). Knowledge about load variations is of interest to."""
@@ -277,6 +393,7 @@ class AnnualAverageDailyLoadVariation(KPI):
             evaluation_start_timestamp=evaluation_start_timestamp,
             evaluation_end_timestamp=evaluation_end_timestamp,
         )
+        import pandas as pd
 
         # get timestamp variables
         data = pd.DataFrame({
@@ -386,12 +503,13 @@ class FlexibleTimeDuration(KPI):
     RELEVANCE = Relevance.HIGH
     STAKEHOLDERS = [Stakeholder.GRID_OPERATOR, Stakeholder.DISTRIBUTION_SYSTEM_OPERATOR]
     COMPLEXITY = Complexity.HIGH
-    NEED_BASELINE = True
+    NEED_BASELINE = False
     TEMPORAL_EVALUATION_WINDOW = TemporalEvaluationWindow.SINGLE_EVENT
     TEMPORAL_RESOLUTION = TemporalResolution.UNSPECIFIED
     SPATIAL_RESOLUTION = SpatialResolution.SINGLE_BUILDING
     DOE_FLEXIBILITY_CATEGORY = [DOEFlexibilityCategory.LOAD_SHIFTING, DOEFlexibilityCategory.LOAD_SHEDDING]
     PERFORMANCE_ASPECT = [PerformanceAspect.COMFORT]
+    BATCH_ARGUMENTS = {'zone_temperature_profile': 2, 'cooling_setpoints': 2, 'heating_setpoints': 2}
 
     def __init__(self):
         super().__init__()
@@ -399,17 +517,41 @@ class FlexibleTimeDuration(KPI):
     @classmethod
     def calculate(
         cls,
+        zone_temperature_profile: Union[List[List[float]], List[List[List[float]]]],
+        cooling_setpoints: Union[List[List[float]], List[List[List[float]]]],
+        heating_setpoints: Union[List[List[float]], List[List[List[float]]]],
         timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
         evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
         evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
-    ) -> float:
-        _, vs = super().calculate(
-            timestamps=timestamps,
-            evaluation_start_timestamp=evaluation_start_timestamp,
-            evaluation_end_timestamp=evaluation_end_timestamp,
-        )
-        
-        raise NotImplementedError('KPI definition is not clear and paper is behind paywall.')
+    ) -> Union[List[float], List[List[float]]]:
+        """Duration from each evaluation timestep until the first timestep at which any zone temperature
+        of the building is outside its heating and cooling setpoints, where the zone temperatures are
+        those of the building while its power demand is reduced or increased. Durations are censored
+        at the end of the evaluation window and are 0 at timesteps that are already uncomfortable.
+
+        Profiles are of shape `(timesteps, zones)` as in :py:class:`CumulativeAverageThermalDiscomfort`.
+        A batch of buildings, see :py:meth:`KPI.get_batch`, returns a matrix of durations of shape
+        `(buildings, timesteps)`. Without datetime timestamps, each timestep is one second."""
+
+        profiles, vs, batched = cls.get_batch({
+            'zone_temperature_profile': zone_temperature_profile,
+            'cooling_setpoints': cooling_setpoints,
+            'heating_setpoints': heating_setpoints,
+        }, ndim=2, timestamps=timestamps, evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp)
+        profiles = list(profiles.values())
+        assert profiles[0].shape == profiles[1].shape == profiles[2].shape, 'Profiles must have equal shapes.'
+        zone_temperature, cooling_setpoint, heating_setpoint = [p[:, vs.evaluation_mask] for p in profiles]
+        dx = cls.get_timestep_length(vs, BaseUnit.SECOND)
+
+        # index of the first violation at or after each start timestep from a reversed cumulative minimum
+        violation = ((zone_temperature > cooling_setpoint) | (zone_temperature < heating_setpoint)).any(axis=2)
+        steps = np.arange(violation.shape[1])
+        violation_step = np.where(violation, steps, violation.shape[1])
+        first_violation_step = np.minimum.accumulate(violation_step[:, ::-1], axis=1)[:, ::-1]
+        value = (first_violation_step - steps)*dx
+
+        return value.tolist() if batched else value[0].tolist()
     
 class FlexibilityDensity(KPI):
     """Demand response potential of a given spatial area as a function of response potential of batteries, heat pumps, 
@@ -428,6 +570,7 @@ class FlexibilityDensity(KPI):
     SPATIAL_RESOLUTION = SpatialResolution.BUILDING_CLUSTER
     DOE_FLEXIBILITY_CATEGORY = [DOEFlexibilityCategory.LOAD_SHEDDING]
     PERFORMANCE_ASPECT = [PerformanceAspect.ENERGY]
+    IMPLEMENTED = False
 
     def __init__(self):
         super().__init__()
@@ -488,7 +631,37 @@ class AverageDownwardPowerDeviation(KPI):
         
         profile = vs.baseline_electric_power_profile.value[vs.evaluation_mask] - vs.flexible_electric_power_profile.value[vs.evaluation_mask]
         dx = vs.get_temporal_resolution(BaseUnit.HOUR, value=vs.timestamps.value[vs.evaluation_mask])
-        value = integrate.simpson(profile, dx=dx)/(dx*vs.evaluation_length)
+        value = cls.simpson(profile, dx=dx)/(dx*vs.evaluation_length)
+
+        return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electric_power_profile: List[float], 
+        flexible_electric_power_profile: List[float],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]],
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            timestamps=timestamps,
+            baseline_electric_power_profile=baseline_electric_power_profile,
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        partial = {
+            'profile': SeriesAggregate(vs.baseline_electric_power_profile.value[vs.evaluation_mask] - vs.flexible_electric_power_profile.value[vs.evaluation_mask]),
+            'timestamps': TimestampAggregate(vs.timestamps.value[vs.evaluation_mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        dx = partial['timestamps'].get_resolution(BaseUnit.HOUR)
+        value = partial['profile'].simpson(dx)/(dx*partial['profile'].count)
 
         return value
     
@@ -540,6 +713,38 @@ class AverageDemandDecrease(KPI):
         ).mean()
 
         return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electric_power_profile: List[List[float]], 
+        flexible_electric_power_profile: List[List[float]],
+        generic_signal_start_timestamp: Union[int, datetime.datetime, str],
+        generic_signal_end_timestamp: Union[int, datetime.datetime, str],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            baseline_electric_power_profile=baseline_electric_power_profile,
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            generic_signal_start_timestamp=generic_signal_start_timestamp,
+            generic_signal_end_timestamp=generic_signal_end_timestamp,
+            timestamps=timestamps,
+        )
+
+        mask = vs.evaluation_mask\
+            & (vs.timestamps.value >= vs.generic_signal_start_timestamp.value)\
+                & (vs.timestamps.value <= vs.generic_signal_end_timestamp.value)
+        partial = {
+            'profile': SeriesAggregate(vs.baseline_electric_power_profile.value[mask] - vs.flexible_electric_power_profile.value[mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        value = partial['profile'].mean
+
+        return value
     
  
 class AverageDemandDecreaseIntensity(KPI):
@@ -590,6 +795,41 @@ class AverageDemandDecreaseIntensity(KPI):
         ).mean()
         value = demand_decrease/floor_area
         return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electric_power_profile: List[List[float]], 
+        flexible_electric_power_profile: List[List[float]],
+        generic_signal_start_timestamp: Union[int, datetime.datetime, str],
+        generic_signal_end_timestamp: Union[int, datetime.datetime, str],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+        floor_area: float = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            baseline_electric_power_profile=baseline_electric_power_profile,
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            generic_signal_start_timestamp=generic_signal_start_timestamp,
+            generic_signal_end_timestamp=generic_signal_end_timestamp,
+            timestamps=timestamps,
+            floor_area=floor_area,
+        )
+
+        mask = vs.evaluation_mask\
+            & (vs.timestamps.value >= vs.generic_signal_start_timestamp.value)\
+                & (vs.timestamps.value <= vs.generic_signal_end_timestamp.value)
+        partial = {
+            'profile': SeriesAggregate(vs.baseline_electric_power_profile.value[mask] - vs.flexible_electric_power_profile.value[mask]),
+            'floor_area': SeriesAggregate([floor_area]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        value = partial['profile'].mean/partial['floor_area'].maximum
+
+        return value
     
 
 
@@ -636,4 +876,37 @@ class AverageDemandDecreaseIndex(KPI):
                
         value = 1 - vs.flexible_electric_power_profile.value[mask].mean()/vs.baseline_electric_power_profile.value[mask].mean()
 
-        return value
\ No newline at end of file
+        return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electric_power_profile: List[List[float]], 
+        flexible_electric_power_profile: List[List[float]],
+        generic_signal_start_timestamp: Union[int, datetime.datetime, str],
+        generic_signal_end_timestamp: Union[int, datetime.datetime, str],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            baseline_electric_power_profile=baseline_electric_power_profile,
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            generic_signal_start_timestamp=generic_signal_start_timestamp,
+            generic_signal_end_timestamp=generic_signal_end_timestamp,
+            timestamps=timestamps,
+        )
+
+        mask = vs.evaluation_mask\
+            & (vs.timestamps.value >= vs.generic_signal_start_timestamp.value)\
+                & (vs.timestamps.value <= vs.generic_signal_end_timestamp.value)
+        partial = {
+            'baseline_profile': SeriesAggregate(vs.baseline_electric_power_profile.value[mask]),
+            'flexible_profile': SeriesAggregate(vs.flexible_electric_power_profile.value[mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        value = 1 - partial['flexible_profile'].mean/partial['baseline_profile'].mean
+
+        return value
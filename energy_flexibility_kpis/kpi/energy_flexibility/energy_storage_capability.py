@@ -1,6 +1,7 @@
 import datetime
-from typing import List, Union
-from scipy import integrate
+from typing import List, Mapping, Union
+from energy_flexibility_kpis.aggregate import SeriesAggregate, TimestampAggregate
+from energy_flexibility_kpis.base import Definition
 from energy_flexibility_kpis.kpi.base import KPI
 from energy_flexibility_kpis.enumerations import BaseUnit, Complexity, DOEFlexibilityCategory, KPICategory, PerformanceAspect, Relevance 
 from energy_flexibility_kpis.enumerations import Stakeholder, TemporalEvaluationWindow,TemporalResolution, SpatialResolution
@@ -48,7 +49,37 @@ class CapacityOfADR(KPI):
         
         profile = vs.flexible_electric_power_profile.value[vs.evaluation_mask] - vs.baseline_electric_power_profile.value[vs.evaluation_mask]
         dx = vs.get_temporal_resolution(BaseUnit.HOUR, value=vs.timestamps.value[vs.evaluation_mask])
-        value = integrate.simpson(profile, dx=dx)
+        value = cls.simpson(profile, dx=dx)
+
+        return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electric_power_profile: List[float],
+        flexible_electric_power_profile: List[float],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]],
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            timestamps=timestamps,
+            baseline_electric_power_profile=baseline_electric_power_profile,
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        partial = {
+            'profile': SeriesAggregate(vs.flexible_electric_power_profile.value[vs.evaluation_mask] - vs.baseline_electric_power_profile.value[vs.evaluation_mask]),
+            'timestamps': TimestampAggregate(vs.timestamps.value[vs.evaluation_mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        dx = partial['timestamps'].get_resolution(BaseUnit.HOUR)
+        value = partial['profile'].simpson(dx)
 
         return value
     
@@ -103,7 +134,7 @@ class EnergyEfficiencyOfDemandResponseAction(KPI):
         adr_profile = vs.flexible_electric_power_profile.value[adr_mask] - vs.baseline_electric_power_profile.value[adr_mask]
         dx = vs.get_temporal_resolution(BaseUnit.HOUR, vs.timestamps.value[vs.evaluation_mask])
         adr_dx = vs.get_temporal_resolution(BaseUnit.HOUR, vs.timestamps.value[adr_mask])
-        value = 1 - (integrate.simpson(profile, dx=dx)/integrate.simpson(adr_profile, dx=adr_dx))
+        value = 1 - (cls.simpson(profile, dx=dx)/cls.simpson(adr_profile, dx=adr_dx))
 
         return value
     
@@ -124,6 +155,7 @@ class AvailableFlexibleEnergy(KPI):
     SPATIAL_RESOLUTION = SpatialResolution.SINGLE_BUILDING
     DOE_FLEXIBILITY_CATEGORY = [DOEFlexibilityCategory.LOAD_SHIFTING, DOEFlexibilityCategory.LOAD_SHEDDING]
     PERFORMANCE_ASPECT = [PerformanceAspect.ENERGY]
+    IMPLEMENTED = False
 
     def __init__(self):
         super().__init__()
@@ -1,7 +1,8 @@
 import datetime
-from typing import List, Union
+from typing import List, Mapping, Union
 import numpy as np
-from scipy import integrate
+from energy_flexibility_kpis.aggregate import PortfolioAggregate, SeriesAggregate, TimestampAggregate
+from energy_flexibility_kpis.base import Definition
 from energy_flexibility_kpis.kpi.base import KPI
 from energy_flexibility_kpis.enumerations import BaseUnit, Complexity, DOEFlexibilityCategory, KPICategory, PerformanceAspect, Relevance 
 from energy_flexibility_kpis.enumerations import Stakeholder, TemporalEvaluationWindow,TemporalResolution, SpatialResolution
@@ -54,7 +55,7 @@ class SelfConsumptionDuringDRAction(KPI):
         ], axis=0) - vs.baseline_electric_power_profile.value[vs.evaluation_mask], min=0.0) 
         denominator_profile = vs.flexible_electric_power_profile.value[vs.evaluation_mask] - vs.baseline_electric_power_profile.value[vs.evaluation_mask]
         dx = vs.get_temporal_resolution(BaseUnit.HOUR, value=vs.timestamps.value[vs.evaluation_mask])
-        value = integrate.simpson(numerator_profile, dx=dx)/integrate(denominator_profile, dx=dx)
+        value = cls.simpson(numerator_profile, dx=dx)/cls.simpson(denominator_profile, dx=dx)
 
         return value
 
@@ -110,11 +111,54 @@ class RelativeEnergyImportSavings(KPI):
             min=0.0
         )
         dx = vs.get_temporal_resolution(BaseUnit.HOUR, value=vs.timestamps.value[vs.evaluation_mask])
-        numerator_value = integrate.simpson(baseline_residual_profile - flexible_residual_profile, dx=dx)
-        denominator_value = integrate.simpson(vs.baseline_electric_power_profile.value[vs.evaluation_mask], dx=dx)
+        numerator_value = cls.simpson(baseline_residual_profile - flexible_residual_profile, dx=dx)
+        denominator_value = cls.simpson(vs.baseline_electric_power_profile.value[vs.evaluation_mask], dx=dx)
         value = numerator_value/denominator_value
 
         return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electric_power_profile: List[float],
+        flexible_electric_power_profile: List[float],
+        generic_self_production_profile: List[float],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]],
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            baseline_electric_power_profile=baseline_electric_power_profile,
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            generic_self_production_profile=generic_self_production_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        baseline_residual_profile = np.clip(
+            vs.baseline_electric_power_profile.value[vs.evaluation_mask] 
+                - vs.generic_self_production_profile.value[vs.evaluation_mask], 
+            a_min=0.0, a_max=None
+        )
+        flexible_residual_profile = np.clip(
+            vs.flexible_electric_power_profile.value[vs.evaluation_mask] 
+                - vs.generic_self_production_profile.value[vs.evaluation_mask], 
+            a_min=0.0, a_max=None
+        )
+        partial = {
+            'profile': SeriesAggregate(baseline_residual_profile - flexible_residual_profile),
+            'baseline_profile': SeriesAggregate(vs.baseline_electric_power_profile.value[vs.evaluation_mask]),
+            'timestamps': TimestampAggregate(vs.timestamps.value[vs.evaluation_mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        dx = partial['timestamps'].get_resolution(BaseUnit.HOUR)
+        value = partial['profile'].simpson(dx)/partial['baseline_profile'].simpson(dx)
+
+        return value
     
 class FlexibilityAggregationSynergyFactor(KPI):
     """Quantify the benefit of aggregating multiple flexible systems by measuring the 
@@ -142,14 +186,25 @@ class FlexibilityAggregationSynergyFactor(KPI):
     @classmethod
     def calculate(
         cls,
+        upward_flexible_power_profile: List[List[float]],
+        downward_flexible_power_profile: List[List[float]],
         timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
         evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
         evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
     ) -> float:
-        _, vs = super().calculate(
-            timestamps=timestamps,
-            evaluation_start_timestamp=evaluation_start_timestamp,
-            evaluation_end_timestamp=evaluation_end_timestamp,
-        )
-        
-        raise NotImplementedError('Complex equation')
\ No newline at end of file
+        """Profiles are lists of one profile per asset. The SFR capacity of an asset, or of the aggregate
+        of the summed profiles, is the largest power that can be both added and removed throughout the
+        evaluation window. Use :py:class:`energy_flexibility_kpis.aggregate.PortfolioAggregate` to evaluate
+        many candidate portfolios of the same assets."""
+
+        # assets are stacked as a batch of buildings
+        profiles, vs, _ = cls.get_batch({
+            'upward_flexible_power_profile': upward_flexible_power_profile,
+            'downward_flexible_power_profile': downward_flexible_power_profile,
+        }, timestamps=timestamps, evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp)
+        upward, downward = [p[:, vs.evaluation_mask] for p in profiles.values()]
+        portfolio = PortfolioAggregate(upward, downward, members=range(upward.shape[0]))
+        value = portfolio.synergy_factor
+
+        return value
@@ -1,7 +1,9 @@
 import datetime
-from typing import List, Union
+from typing import List, Mapping, Union
 import numpy as np
-from scipy import integrate
+from energy_flexibility_kpis.activation import ActivationIntervals, ActivationMatrix
+from energy_flexibility_kpis.aggregate import SeriesAggregate, TimestampAggregate
+from energy_flexibility_kpis.base import Definition
 from energy_flexibility_kpis.kpi.base import KPI
 from energy_flexibility_kpis.enumerations import BaseUnit, Complexity, DOEFlexibilityCategory, KPICategory, PerformanceAspect, Relevance 
 from energy_flexibility_kpis.enumerations import Stakeholder, TemporalEvaluationWindow,TemporalResolution, SpatialResolution
@@ -27,6 +29,7 @@ class CumulativeAverageThermalDiscomfort(KPI):
     SPATIAL_RESOLUTION = SpatialResolution.SINGLE_BUILDING
     DOE_FLEXIBILITY_CATEGORY = [DOEFlexibilityCategory.LOAD_SHIFTING, DOEFlexibilityCategory.LOAD_SHEDDING]
     PERFORMANCE_ASPECT = [PerformanceAspect.COMFORT]
+    BATCH_ARGUMENTS = {'zone_temperature_profile': 2, 'cooling_setpoints': 2, 'heating_setpoints': 2}
 
     def __init__(self):
         super().__init__()
@@ -34,47 +37,82 @@ class CumulativeAverageThermalDiscomfort(KPI):
     @classmethod
     def calculate(
         cls,
-        zone_temperature_profile: List[List[float]],
-        cooling_setpoints: List[List[float]],
-        heating_setpoints: List[List[float]],
+        zone_temperature_profile: Union[List[List[float]], List[List[List[float]]], np.ndarray],
+        cooling_setpoints: Union[List[List[float]], List[List[List[float]]], np.ndarray],
+        heating_setpoints: Union[List[List[float]], List[List[List[float]]], np.ndarray],
         num_zones: int = None,
         num_days: int = None,
         timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
         evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
-        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None
-    ) -> float:
-        _, vs = super().calculate(
-            zone_temperature_profile=zone_temperature_profile, 
-            cooling_setpoints=cooling_setpoints, 
-            heating_setpoints=heating_setpoints, 
-            num_zones=num_zones, 
-            num_days=num_days, 
-            timestamps=timestamps, 
-            evaluation_start_timestamp=evaluation_start_timestamp, 
-            evaluation_end_timestamp=evaluation_end_timestamp
-        )
-        
-        zone_temp = np.array(vs.zone_temperature_profile.value)  # shape (timesteps, zones)
-        cooling_setpoint = np.array(vs.cooling_setpoints.value)
-        heating_setpoint = np.array(vs.heating_setpoints.value)
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+        breakdown: bool = None,
+        chunk_size: int = None,
+    ) -> Union[float, List[float], Mapping[str, Union[float, List[float], List[List[float]]]]]:
+        """Profiles are of shape `(timesteps, zones)`, or `(buildings, timesteps, zones)` for a batch of
+        buildings with the same number of zones, see :py:meth:`KPI.get_batch`.
+
+        `num_zones` defaults to the number of zones in the profiles and `num_days` to the length of
+        the evaluation window in days, which requires datetime timestamps. Without datetime timestamps
+        each timestep is one hour. The window is evaluated
+        `chunk_size` timesteps at a time, default 8760, to bound the memory of long horizons. If
+        `breakdown` is `True`, a mapping of the value and the per-zone total, cooling (above the
+        cooling setpoint) and heating (below the heating setpoint) discomfort is returned."""
 
-        mask = vs.evaluation_mask
+        breakdown = False if breakdown is None else breakdown
+        chunk_size = 8760 if chunk_size is None else chunk_size
+        profiles, vs, batched = cls.get_batch({
+            'zone_temperature_profile': zone_temperature_profile,
+            'cooling_setpoints': cooling_setpoints,
+            'heating_setpoints': heating_setpoints,
+        }, ndim=2, num_zones=num_zones, num_days=num_days, timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp, evaluation_end_timestamp=evaluation_end_timestamp)
+        profiles = list(profiles.values())
+        assert profiles[0].shape == profiles[1].shape == profiles[2].shape, 'Profiles must have equal shapes.'
+        dx = cls.get_timestep_length(vs)
+        num_zones = profiles[0].shape[2] if vs.num_zones.value is None else vs.num_zones.value
 
-        # Filter for evaluation period
-        zone_temp = zone_temp[mask, :]  # (timesteps_selected, zones)
-        cooling_setpoint = cooling_setpoint[mask, :]
-        heating_setpoint = heating_setpoint[mask, :]
+        if vs.num_days.value is None:
+            assert vs.timestamps.is_datetime, 'num_days is required if timestamps are not datetimes.'
+            num_days = vs.evaluation_length*dx/24.0
 
-        # Calculate discomfort 
-        temp_deviation_cooling = np.maximum(zone_temp - cooling_setpoint, 0)
-        temp_deviation_heating = np.maximum(heating_setpoint - zone_temp, 0)
+        else:
+            num_days = vs.num_days.value
 
-        discomfort_per_zone = np.sum(temp_deviation_cooling + temp_deviation_heating, axis=0)  # sum over time
+        # the evaluation window is contiguous so chunks are views of the profiles
+        steps = np.flatnonzero(vs.evaluation_mask)
+        first_step, last_step = (int(steps[0]), int(steps[-1]) + 1) if steps.shape[0] > 0 else (0, 0)
+        building_count, _, zone_count = profiles[0].shape
+        cooling_discomfort = np.zeros((building_count, zone_count))
+        heating_discomfort = np.zeros((building_count, zone_count))
+        deviation = np.empty((building_count, min(chunk_size, last_step - first_step), zone_count))
 
-        total_discomfort = np.sum(discomfort_per_zone)  # sum over zones
+        for i in range(first_step, last_step, chunk_size):
+            j = min(i + chunk_size, last_step)
+            temperature, cooling_setpoint, heating_setpoint = [p[:, i:j] for p in profiles]
+            buffer = deviation[:, :j - i]
+            np.subtract(temperature, cooling_setpoint, out=buffer)
+            np.maximum(buffer, 0.0, out=buffer)
+            cooling_discomfort += buffer.sum(axis=1)
+            np.subtract(heating_setpoint, temperature, out=buffer)
+            np.maximum(buffer, 0.0, out=buffer)
+            heating_discomfort += buffer.sum(axis=1)
 
-        # Normalize by zones and days 
-        value = total_discomfort / (num_zones * num_days)
+        # Normalize by days for zones and by zones and days for buildings
+        cooling_discomfort *= dx/num_days
+        heating_discomfort *= dx/num_days
+        zone_discomfort = cooling_discomfort + heating_discomfort
+        value = zone_discomfort.sum(axis=1)/num_zones
+
+        if breakdown:
+            value = {
+                'value': value.tolist() if batched else float(value[0]),
+                'zone_value': zone_discomfort.tolist() if batched else zone_discomfort[0].tolist(),
+                'zone_cooling_value': cooling_discomfort.tolist() if batched else cooling_discomfort[0].tolist(),
+                'zone_heating_value': heating_discomfort.tolist() if batched else heating_discomfort[0].tolist(),
+            }
+
+        else:
+            value = value.tolist() if batched else float(value[0])
 
         return value
 
@@ -86,7 +124,7 @@ class CumulativeAverageIndoorAirQualityDiscomfort(KPI):
 
     NAME = 'cumulative average indoor air quality discomfort'
     DEFINITION = __doc__
-    UNIT = Unit(numerator=[BaseUnit.PPM, BaseUnit.HOUR])
+    UNIT = Unit(numerator=[BaseUnit.PPM, BaseUnit.HOUR], denominator=[BaseUnit.ZONE])
     CATEGORY = KPICategory.EF_IMPACT_ON_IEQ
     RELEVANCE = Relevance.MEDIUM
     STAKEHOLDERS = [Stakeholder.BUILDING_OWNER, Stakeholder.BUILDING_OPERATOR]
@@ -97,6 +135,7 @@ class CumulativeAverageIndoorAirQualityDiscomfort(KPI):
     SPATIAL_RESOLUTION = SpatialResolution.SINGLE_BUILDING
     DOE_FLEXIBILITY_CATEGORY = [DOEFlexibilityCategory.LOAD_SHIFTING, DOEFlexibilityCategory.LOAD_SHEDDING]
     PERFORMANCE_ASPECT = [PerformanceAspect.COMFORT]
+    BATCH_ARGUMENTS = {'zone_co2_concentration_profile': 2, 'upper_co2_concentration_limits': 2}
 
     def __init__(self):
         super().__init__()
@@ -104,17 +143,69 @@ class CumulativeAverageIndoorAirQualityDiscomfort(KPI):
     @classmethod
     def calculate(
         cls,
+        zone_co2_concentration_profile: Union[List[List[float]], List[List[List[float]]]],
+        upper_co2_concentration_limits: Union[List[List[float]], List[List[List[float]]]],
         timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
         evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
         evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
-    ) -> float:
-        _, vs = super().calculate(
-            timestamps=timestamps,
-            evaluation_start_timestamp=evaluation_start_timestamp,
-            evaluation_end_timestamp=evaluation_end_timestamp,
-        )
-        
-        raise NotImplementedError('Variables are unclear.')
+    ) -> Union[float, List[float]]:
+        """Time integral in ppm*h of the CO2 concentration in excess of the upper limit of each zone,
+        e.g. BOPTEST `UpperCO2[zone]` schedules, averaged over all zones.
+
+        Profiles are of shape `(timesteps, zones)`, or `(buildings, timesteps, zones)` for a batch of
+        buildings with the same number of zones, see :py:meth:`KPI.get_batch`. Without datetime
+        timestamps, each timestep is one hour."""
+
+        profiles, vs, batched = cls.get_batch({
+            'zone_co2_concentration_profile': zone_co2_concentration_profile,
+            'upper_co2_concentration_limits': upper_co2_concentration_limits,
+        }, ndim=2, timestamps=timestamps, evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp)
+        profiles = list(profiles.values())
+        assert profiles[0].shape == profiles[1].shape, 'Profiles must have equal shapes.'
+        exceedance = cls.__get_exceedance(profiles[0][:, vs.evaluation_mask], profiles[1][:, vs.evaluation_mask])
+        dx = cls.get_timestep_length(vs)
+        value = exceedance.sum(axis=1)*dx
+
+        return value.tolist() if batched else float(value[0])
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        zone_co2_concentration_profile: List[List[float]],
+        upper_co2_concentration_limits: List[List[float]],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Mapping[str, Definition]:
+        profiles, vs, _ = cls.get_batch({
+            'zone_co2_concentration_profile': zone_co2_concentration_profile,
+            'upper_co2_concentration_limits': upper_co2_concentration_limits,
+        }, ndim=2, timestamps=timestamps, evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp)
+        profiles = list(profiles.values())
+        exceedance = cls.__get_exceedance(profiles[0][:, vs.evaluation_mask], profiles[1][:, vs.evaluation_mask])
+        partial = {
+            'exceedance': SeriesAggregate(exceedance[0]),
+            'timestamps': TimestampAggregate(vs.timestamps.value[vs.evaluation_mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        dx = partial['timestamps'].get_resolution(BaseUnit.HOUR) if partial['timestamps'].is_datetime else 1.0
+        value = partial['exceedance'].sum*dx
+
+        return value
+
+    @staticmethod
+    def __get_exceedance(concentration: np.ndarray, limit: np.ndarray) -> np.ndarray:
+        # zone-averaged excess concentration of each building and timestep, computed in the masked copy
+        np.subtract(concentration, limit, out=concentration)
+        np.maximum(concentration, 0.0, out=concentration)
+
+        return concentration.mean(axis=2)
     
 class ImpactedDwellingsPercentage(KPI):
     """The percentage of the dwellings with a different duration of EHP activation 
@@ -122,7 +213,7 @@ class ImpactedDwellingsPercentage(KPI):
 
     NAME = 'impacted dwellings percentage'
     DEFINITION = __doc__
-    UNIT = Unit(numerator=[BaseUnit.DIMENSIONLESS])
+    UNIT = Unit(numerator=[BaseUnit.PERCENT])
     CATEGORY = KPICategory.EF_IMPACT_ON_IEQ
     RELEVANCE = Relevance.MEDIUM
     STAKEHOLDERS = [Stakeholder.GRID_OPERATOR, Stakeholder.DISTRIBUTION_SYSTEM_OPERATOR, Stakeholder.TRANSMISSION_SYSTEM_OPERATOR]
@@ -140,17 +231,35 @@ class ImpactedDwellingsPercentage(KPI):
     @classmethod
     def calculate(
         cls,
+        baseline_heat_pump_activation_profile: Union[List[List[bool]], np.ndarray, ActivationMatrix, ActivationIntervals],
+        flexible_heat_pump_activation_profile: Union[List[List[bool]], np.ndarray, ActivationMatrix, ActivationIntervals],
         timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
         evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
         evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+        tolerance: float = None,
     ) -> float:
+        """Activation profiles are the on/off states of the heat pump of every dwelling, of shape
+        `(dwellings, timesteps)`, either as boolean matrices or in the compact
+        :py:class:`energy_flexibility_kpis.activation.ActivationMatrix` or
+        :py:class:`energy_flexibility_kpis.activation.ActivationIntervals` forms for large fleets.
+        A dwelling is impacted if its activation time in the evaluation window changes by more than
+        `tolerance` minutes, default 0. Without datetime timestamps, each timestep is one minute."""
+
+        baseline, flexible = [
+            _get_activation(a) for a in [baseline_heat_pump_activation_profile, flexible_heat_pump_activation_profile]
+        ]
+        assert baseline.shape == flexible.shape, 'Activation profiles must have equal shapes.'
         _, vs = super().calculate(
-            timestamps=timestamps,
+            timestamps=np.arange(baseline.length) if timestamps is None else timestamps,
             evaluation_start_timestamp=evaluation_start_timestamp,
             evaluation_end_timestamp=evaluation_end_timestamp,
         )
-        
-        raise NotImplementedError('Variables are unclear.')
+        dx = cls.get_timestep_length(vs, BaseUnit.MINUTE)
+        difference = np.abs(_get_activation_count_difference(baseline, flexible, vs.evaluation_mask))*dx
+        tolerance = 0.0 if tolerance is None else tolerance
+        value = float((difference > tolerance).mean()*100.0)
+
+        return value
     
 class AverageDisruptionDuration(KPI):
     """Measure the average change of EHP activation time across the service deployment period."""
@@ -175,14 +284,38 @@ class AverageDisruptionDuration(KPI):
     @classmethod
     def calculate(
         cls,
+        baseline_heat_pump_activation_profile: Union[List[List[bool]], np.ndarray, ActivationMatrix, ActivationIntervals],
+        flexible_heat_pump_activation_profile: Union[List[List[bool]], np.ndarray, ActivationMatrix, ActivationIntervals],
         timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
         evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
         evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
     ) -> float:
+        """Mean over dwellings of the absolute change in minutes of the heat pump activation time in the
+        evaluation window. Activation profiles and timesteps are as in :py:class:`ImpactedDwellingsPercentage`."""
+
+        baseline, flexible = [
+            _get_activation(a) for a in [baseline_heat_pump_activation_profile, flexible_heat_pump_activation_profile]
+        ]
+        assert baseline.shape == flexible.shape, 'Activation profiles must have equal shapes.'
         _, vs = super().calculate(
-            timestamps=timestamps,
+            timestamps=np.arange(baseline.length) if timestamps is None else timestamps,
             evaluation_start_timestamp=evaluation_start_timestamp,
             evaluation_end_timestamp=evaluation_end_timestamp,
         )
-        
-        raise NotImplementedError('Variables are unclear.')
\ No newline at end of file
+        dx = cls.get_timestep_length(vs, BaseUnit.MINUTE)
+        difference = np.abs(_get_activation_count_difference(baseline, flexible, vs.evaluation_mask))*dx
+        value = float(difference.mean())
+
+        return value
+
+def _get_activation(value: Union[List[List[bool]], np.ndarray, ActivationMatrix, ActivationIntervals]) -> Union[ActivationMatrix, ActivationIntervals]:
+    return value if isinstance(value, (ActivationMatrix, ActivationIntervals)) else ActivationMatrix.from_boolean(value)
+
+def _get_activation_count_difference(
+    baseline: Union[ActivationMatrix, ActivationIntervals], flexible: Union[ActivationMatrix, ActivationIntervals], mask: np.ndarray
+) -> np.ndarray:
+    # the evaluation window is contiguous so counts are taken between its first and last timesteps
+    steps = np.flatnonzero(mask)
+    start, end = (int(steps[0]), int(steps[-1]) + 1) if steps.shape[0] > 0 else (0, 0)
+
+    return flexible.get_active_count(start, end) - baseline.get_active_count(start, end)
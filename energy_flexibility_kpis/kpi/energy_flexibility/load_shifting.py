@@ -1,6 +1,12 @@
 import datetime
-from typing import List, Union
-from scipy import integrate
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Mapping, Union
+import numpy as np
+from energy_flexibility_kpis.aggregate import SeriesAggregate
+from energy_flexibility_kpis.base import Definition
+from energy_flexibility_kpis.distance import dtw_distance
 from energy_flexibility_kpis.kpi.base import KPI
 from energy_flexibility_kpis.enumerations import BaseUnit, Complexity, DOEFlexibilityCategory, KPICategory, PerformanceAspect, Relevance 
 from energy_flexibility_kpis.enumerations import Stakeholder, TemporalEvaluationWindow,TemporalResolution, SpatialResolution
@@ -60,8 +66,8 @@ class FlexibilityFactor(KPI):
         high_generic_dx = vs.get_temporal_resolution(BaseUnit.HOUR, value=vs.timestamps.value[high_generic_signal_mask])
         low_generic_dx = vs.get_temporal_resolution(BaseUnit.HOUR, value=vs.timestamps.value[low_generic_signal_mask])
         
-        low_generic_signal_value = integrate.simpson(low_generic_signal_profile, dx=low_generic_dx)
-        high_generic_signal_value = integrate.simpson(high_generic_signal_profile, dx=high_generic_dx)
+        low_generic_signal_value = cls.simpson(low_generic_signal_profile, dx=low_generic_dx)
+        high_generic_signal_value = cls.simpson(high_generic_signal_profile, dx=high_generic_dx)
         
         value = (low_generic_signal_value - high_generic_signal_value)/(low_generic_signal_value + high_generic_signal_value)
 
@@ -198,6 +204,12 @@ class FlexibilityClassificationFactor(KPI):
     SPATIAL_RESOLUTION = SpatialResolution.UNSPECIFIED
     DOE_FLEXIBILITY_CATEGORY = [DOEFlexibilityCategory.LOAD_SHIFTING]
     PERFORMANCE_ASPECT = [PerformanceAspect.COST, PerformanceAspect.EMISSION]
+    BATCH_ARGUMENTS = {'generic_electric_power_profile': 1, 'electricity_price_profile': 1}
+
+    # price class lookup tables of recently used tariffs, shared by threads that calculate concurrently
+    __PRICE_CLASSES: Mapping[bytes, np.ndarray] = OrderedDict()
+    __PRICE_CLASSES_SIZE = 16
+    __PRICE_CLASSES_LOCK = threading.Lock()
 
     def __init__(self):
         super().__init__()
@@ -205,18 +217,78 @@ class FlexibilityClassificationFactor(KPI):
     @classmethod
     def calculate(
         cls,
+        generic_electric_power_profile: Union[List[float], List[List[float]]],
+        electricity_price_profile: Union[List[float], List[List[float]]],
         timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
         evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
         evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
-    ) -> float:
-        _, vs = super().calculate(
-            timestamps=timestamps,
-            evaluation_start_timestamp=evaluation_start_timestamp,
-            evaluation_end_timestamp=evaluation_end_timestamp,
-        )
-        
-        raise NotImplementedError('Complex equation')
-    
+    ) -> Union[float, List[float]]:
+        """Share of the energy cost that is in price classes A and B. Prices are split into classes
+        A to D by the quartiles of the price profile in the evaluation window, see :py:meth:`get_price_classes`.
+
+        A batch of buildings, see :py:meth:`KPI.get_batch`, has one shared price profile or one price
+        profile per building."""
+
+        profiles, vs, batched = cls.get_batch({
+            'generic_electric_power_profile': generic_electric_power_profile,
+            'electricity_price_profile': electricity_price_profile,
+        }, timestamps=timestamps, evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp)
+        power, price = [p[:, vs.evaluation_mask] for p in profiles.values()]
+        n, t = power.shape
+        # classes are looked up once per distinct tariff
+        classes = np.broadcast_to(np.stack([cls.get_price_classes(p) for p in price]), (n, t))
+        # the timestep length is the same for all costs so it cancels out of the share
+        cost = power*np.broadcast_to(price, (n, t))
+        class_cost = np.bincount(
+            (classes + 4*np.arange(n)[:, None]).ravel(), weights=cost.ravel(), minlength=4*n
+        ).reshape(n, 4)
+        value = class_cost[:, :2].sum(axis=1)/class_cost.sum(axis=1)
+
+        return value.tolist() if batched else float(value[0])
+
+    @classmethod
+    def get_price_classes(cls, price: Union[List[float], np.ndarray]) -> np.ndarray:
+        """Return read-only price class of each price, from 0 (A) for prices up to the first quartile to 3 (D)
+        for prices above the third quartile.
+
+        Class lookup tables are kept for the most recently used tariffs so that buildings on the same
+        tariff are classified once.
+        """
+
+        price = np.ascontiguousarray(price, dtype=float)
+        key = hashlib.blake2b(price.data, digest_size=16).digest() + str(price.shape).encode()
+
+        with cls.__PRICE_CLASSES_LOCK:
+            classes = cls.__PRICE_CLASSES.get(key)
+
+            if classes is not None:
+                cls.__PRICE_CLASSES.move_to_end(key)
+
+            else:
+                pass
+
+        if classes is None:
+            # lower quartiles of the price in linear time
+            indices = [int(q*(price.shape[0] - 1)) for q in [0.25, 0.50, 0.75]]
+            thresholds = np.partition(price, indices)[indices]
+            classes = np.digitize(price, thresholds, right=True)
+            classes.flags.writeable = False
+
+            with cls.__PRICE_CLASSES_LOCK:
+                cls.__PRICE_CLASSES[key] = classes
+
+                if len(cls.__PRICE_CLASSES) > cls.__PRICE_CLASSES_SIZE:
+                    cls.__PRICE_CLASSES.popitem(last=False)
+
+                else:
+                    pass
+
+        else:
+            pass
+
+        return classes
+
 class FlexibilityIndicator(KPI):
     """How much shape modification from reference energy profile to the target profile 
     in the next 24h: evaluation of the energy profile time series distance to reference 
@@ -235,6 +307,9 @@ class FlexibilityIndicator(KPI):
     SPATIAL_RESOLUTION = SpatialResolution.SINGLE_BUILDING
     DOE_FLEXIBILITY_CATEGORY = [DOEFlexibilityCategory.LOAD_SHIFTING, DOEFlexibilityCategory.LOAD_SHEDDING, DOEFlexibilityCategory.MODULATING]
     PERFORMANCE_ASPECT = [PerformanceAspect.ENERGY]
+    BATCH_ARGUMENTS = {
+        'baseline_electric_power_profile': 1, 'flexible_electric_power_profile': 1, 'target_electric_power_profile': 1,
+    }
 
     def __init__(self):
         super().__init__()
@@ -242,18 +317,37 @@ class FlexibilityIndicator(KPI):
     @classmethod
     def calculate(
         cls,
+        baseline_electric_power_profile: Union[List[float], List[List[float]]],
+        flexible_electric_power_profile: Union[List[float], List[List[float]]],
+        target_electric_power_profile: Union[List[float], List[List[float]]],
         timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
         evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
         evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
-    ) -> float:
-        _, vs = super().calculate(
-            timestamps=timestamps,
-            evaluation_start_timestamp=evaluation_start_timestamp,
-            evaluation_end_timestamp=evaluation_end_timestamp,
-        )
-        
-        raise NotImplementedError('Complex equation')
-    
+        window: int = None,
+    ) -> Union[float, List[float]]:
+        """Dynamic time warping distance of the flexible profile to the baseline (reference) profile
+        divided by the sum of its distances to the baseline and target profiles. It is 0 when the
+        flexible profile keeps the reference shape and 1 when it has the target shape.
+
+        A batch of buildings, see :py:meth:`KPI.get_batch`, is scored in one pass. `window` is the
+        Sakoe-Chiba band half-width in timesteps, see :py:func:`energy_flexibility_kpis.distance.dtw_distance`."""
+
+        profiles, vs, batched = cls.get_batch({
+            'baseline_electric_power_profile': baseline_electric_power_profile,
+            'flexible_electric_power_profile': flexible_electric_power_profile,
+            'target_electric_power_profile': target_electric_power_profile,
+        }, timestamps=timestamps, evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp)
+        assert len({p.shape for p in profiles.values()}) == 1, 'Profiles must have equal shapes.'
+        baseline, flexible, target = [p[:, vs.evaluation_mask] for p in profiles.values()]
+        reference_distance = dtw_distance(flexible, baseline, window=window)
+        target_distance = dtw_distance(flexible, target, window=window)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            value = reference_distance/(reference_distance + target_distance)
+
+        return value.tolist() if batched else float(value[0])
+
 class CyclePowerFlexibility(KPI):
     """The value for the average power that can be delivered as flexibility to the electrical 
     grid can be calculated. The following equations show the approach to calculate the average 
@@ -268,7 +362,7 @@ class CyclePowerFlexibility(KPI):
     RELEVANCE = Relevance.HIGH
     STAKEHOLDERS = [Stakeholder.GRID_OPERATOR, Stakeholder.TRANSMISSION_SYSTEM_OPERATOR, Stakeholder.DISTRIBUTION_SYSTEM_OPERATOR]
     COMPLEXITY = Complexity.MEDIUM
-    NEED_BASELINE = False
+    NEED_BASELINE = True
     TEMPORAL_EVALUATION_WINDOW = TemporalEvaluationWindow.SINGLE_EVENT
     TEMPORAL_RESOLUTION = TemporalResolution.UNSPECIFIED
     SPATIAL_RESOLUTION = SpatialResolution.UNSPECIFIED
@@ -281,21 +375,52 @@ class CyclePowerFlexibility(KPI):
     @classmethod
     def calculate(
         cls,
+        baseline_electric_power_profile: List[float],
+        flexible_electric_power_profile: List[float],
         timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
         evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
         evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
-    ) -> float:
+    ) -> Mapping[str, Union[float, List[float]]]:
+        """Average power of each forced (charging, flexible above baseline) and delayed (discharging,
+        flexible below baseline) cycle, where a cycle is a run of consecutive timesteps in which the
+        difference between the flexible and baseline power keeps its sign.
+
+        Returns the power and duration in hours of every forced and delayed cycle, and the average
+        power over all forced and all delayed cycles. Delayed cycle powers are positive reductions."""
+
         _, vs = super().calculate(
+            baseline_electric_power_profile=baseline_electric_power_profile,
+            flexible_electric_power_profile=flexible_electric_power_profile,
             timestamps=timestamps,
             evaluation_start_timestamp=evaluation_start_timestamp,
             evaluation_end_timestamp=evaluation_end_timestamp,
         )
-        
-        raise NotImplementedError('Complex equation')
-    
+        difference = vs.flexible_electric_power_profile.value[vs.evaluation_mask].astype(float)\
+            - vs.baseline_electric_power_profile.value[vs.evaluation_mask]
+        dx = cls.get_timestep_length(vs)
+
+        # run-length segmentation of the sign of the difference
+        sign = np.sign(difference)
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(sign)) + 1]) if sign.shape[0] > 0 else np.array([], dtype=int)
+        lengths = np.diff(np.append(starts, sign.shape[0]))
+        energy = np.add.reduceat(difference, starts)*dx if starts.shape[0] > 0 else np.array([], dtype=float)
+        duration = lengths*dx
+        power = energy/duration if duration.shape[0] > 0 else energy
+        forced = sign[starts] > 0
+        delayed = sign[starts] < 0
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            value = {
+                'forced_power': power[forced].tolist(),
+                'forced_duration': duration[forced].tolist(),
+                'delayed_power': (-power[delayed]).tolist(),
+                'delayed_duration': duration[delayed].tolist(),
+                'forced_average_power': float(energy[forced].sum()/duration[forced].sum()),
+                'delayed_average_power': float(-energy[delayed].sum()/duration[delayed].sum()),
+            }
 
+        return value
 
-    
 class AverageDemandIncrease(KPI):
     """Average demand increase during a shift event."""
 
@@ -341,6 +466,38 @@ class AverageDemandIncrease(KPI):
         ).mean()
 
         return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electric_power_profile: List[List[float]], 
+        flexible_electric_power_profile: List[List[float]],
+        generic_signal_start_timestamp: Union[int, datetime.datetime, str],
+        generic_signal_end_timestamp: Union[int, datetime.datetime, str],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            baseline_electric_power_profile=baseline_electric_power_profile,
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            generic_signal_start_timestamp=generic_signal_start_timestamp,
+            generic_signal_end_timestamp=generic_signal_end_timestamp,
+            timestamps=timestamps,
+        )
+
+        mask = vs.evaluation_mask\
+            & (vs.timestamps.value >= vs.generic_signal_start_timestamp.value)\
+                & (vs.timestamps.value <= vs.generic_signal_end_timestamp.value)
+        partial = {
+            'profile': SeriesAggregate(vs.flexible_electric_power_profile.value[mask] - vs.baseline_electric_power_profile.value[mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        value = partial['profile'].mean
+
+        return value
     
  
 class AverageDemandIncreaseIntensity(KPI):
@@ -436,4 +593,37 @@ class AverageDemandIncreaseIndex(KPI):
         
         value = vs.flexible_electric_power_profile.value[mask].mean()/vs.baseline_electric_power_profile.value[mask].mean() - 1
         
-        return value
\ No newline at end of file
+        return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electric_power_profile: List[List[float]], 
+        flexible_electric_power_profile: List[List[float]],
+        generic_signal_start_timestamp: Union[int, datetime.datetime, str],
+        generic_signal_end_timestamp: Union[int, datetime.datetime, str],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            baseline_electric_power_profile=baseline_electric_power_profile,
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            generic_signal_start_timestamp=generic_signal_start_timestamp,
+            generic_signal_end_timestamp=generic_signal_end_timestamp,
+            timestamps=timestamps,
+        )
+
+        mask = vs.evaluation_mask\
+            & (vs.timestamps.value >= vs.generic_signal_start_timestamp.value)\
+                & (vs.timestamps.value <= vs.generic_signal_end_timestamp.value)
+        partial = {
+            'baseline_profile': SeriesAggregate(vs.baseline_electric_power_profile.value[mask]),
+            'flexible_profile': SeriesAggregate(vs.flexible_electric_power_profile.value[mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        value = partial['flexible_profile'].mean/partial['baseline_profile'].mean - 1
+
+        return value
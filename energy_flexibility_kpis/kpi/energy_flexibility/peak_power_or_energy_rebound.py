@@ -1,6 +1,7 @@
 import datetime
-from typing import List, Union
-from scipy import integrate
+from typing import List, Mapping, Union
+from energy_flexibility_kpis.aggregate import SeriesAggregate
+from energy_flexibility_kpis.base import Definition
 from energy_flexibility_kpis.kpi.base import KPI
 from energy_flexibility_kpis.enumerations import BaseUnit, Complexity, DOEFlexibilityCategory, KPICategory, PerformanceAspect, Relevance 
 from energy_flexibility_kpis.enumerations import Stakeholder, TemporalEvaluationWindow,TemporalResolution, SpatialResolution
@@ -93,6 +94,38 @@ class AveragePowerRebound(KPI):
         value = (vs.flexible_electric_power_profile.value[mask] - vs.baseline_electric_power_profile.value[mask]).mean()
         
         return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electric_power_profile: List[float], 
+        flexible_electric_power_profile: List[float],
+        generic_signal_start_timestamp: Union[int, datetime.datetime, str],
+        generic_signal_end_timestamp: Union[int, datetime.datetime, str],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            baseline_electric_power_profile=baseline_electric_power_profile, 
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            generic_signal_start_timestamp=generic_signal_start_timestamp,
+            generic_signal_end_timestamp=generic_signal_end_timestamp,
+            timestamps=timestamps,
+        )
+
+        mask = vs.evaluation_mask\
+            & (vs.timestamps.value >= vs.generic_signal_start_timestamp.value)\
+                & (vs.timestamps.value <= vs.generic_signal_end_timestamp.value)
+        partial = {
+            'profile': SeriesAggregate(vs.flexible_electric_power_profile.value[mask] - vs.baseline_electric_power_profile.value[mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        value = partial['profile'].mean
+
+        return value
     
 class AveragePowerReboundIntensity(KPI):
     """Average power rebound intensity after DR event compared to baseline. The evaluation window should be set to the rebound period."""
@@ -182,6 +215,39 @@ class AveragePowerReboundIndex(KPI):
         value = vs.flexible_electric_power_profile.value[mask].mean()/vs.baseline_electric_power_profile.value[mask].mean() - 1
         
         return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electric_power_profile: List[float], 
+        flexible_electric_power_profile: List[float],
+        generic_signal_start_timestamp: Union[int, datetime.datetime, str],
+        generic_signal_end_timestamp: Union[int, datetime.datetime, str],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            baseline_electric_power_profile=baseline_electric_power_profile, 
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            generic_signal_start_timestamp=generic_signal_start_timestamp,
+            generic_signal_end_timestamp=generic_signal_end_timestamp,
+            timestamps=timestamps,
+        )
+
+        mask = vs.evaluation_mask\
+            & (vs.timestamps.value >= vs.generic_signal_start_timestamp.value)\
+                & (vs.timestamps.value <= vs.generic_signal_end_timestamp.value)
+        partial = {
+            'baseline_profile': SeriesAggregate(vs.baseline_electric_power_profile.value[mask]),
+            'flexible_profile': SeriesAggregate(vs.flexible_electric_power_profile.value[mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        value = partial['flexible_profile'].mean/partial['baseline_profile'].mean - 1
+
+        return value
     
 class ReboundEnergy(KPI):
     """Size of consumption deviation prior / following an DR event. Important to grid 
@@ -239,8 +305,8 @@ class ReboundEnergy(KPI):
         post_event_profile = post_event_flexible_electric_power_profile - post_event_baseline_electric_power_profile
         pre_event_dx = vs.get_temporal_resolution(BaseUnit.HOUR, value=vs.timestamps.value[pre_event_timestamp_mask])
         post_event_dx = vs.get_temporal_resolution(BaseUnit.HOUR, value=vs.timestamps.value[post_event_timestamp_mask])
-        pre_event_value = integrate.simpson(pre_event_profile, dx=pre_event_dx)
-        post_event_value = integrate.simpson(post_event_profile, dx=post_event_dx)
+        pre_event_value = cls.simpson(pre_event_profile, dx=pre_event_dx)
+        post_event_value = cls.simpson(post_event_profile, dx=post_event_dx)
         value = pre_event_value + post_event_value
 
         return value
\ No newline at end of file
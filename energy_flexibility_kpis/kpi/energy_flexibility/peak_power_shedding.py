@@ -1,6 +1,7 @@
 import datetime
-from typing import List, Union
-import pandas as pd
+from typing import List, Mapping, Union
+from energy_flexibility_kpis.aggregate import SeriesAggregate
+from energy_flexibility_kpis.base import Definition
 from energy_flexibility_kpis.kpi.base import KPI
 from energy_flexibility_kpis.enumerations import BaseUnit, Complexity, DOEFlexibilityCategory, KPICategory, PerformanceAspect, Relevance 
 from energy_flexibility_kpis.enumerations import Stakeholder, TemporalEvaluationWindow,TemporalResolution, SpatialResolution
@@ -47,6 +48,35 @@ class PeakPowerReduction(KPI):
             - vs.flexible_electric_power_profile.value[vs.evaluation_mask].max()
 
         return value
+
+    @classmethod
+    def calculate_partial(
+        cls,
+        baseline_electric_power_profile: List[float], 
+        flexible_electric_power_profile: List[float],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+        evaluation_start_timestamp: Union[int,datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int,datetime.datetime, str] = None,
+    ) -> Mapping[str, Definition]:
+        _, vs = super().calculate(
+            baseline_electric_power_profile=baseline_electric_power_profile,
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        partial = {
+            'baseline_profile': SeriesAggregate(vs.baseline_electric_power_profile.value[vs.evaluation_mask]),
+            'flexible_profile': SeriesAggregate(vs.flexible_electric_power_profile.value[vs.evaluation_mask]),
+        }
+
+        return partial
+
+    @classmethod
+    def finalize_partial(cls, partial: Mapping[str, Definition]) -> float:
+        value = partial['baseline_profile'].maximum - partial['flexible_profile'].maximum
+
+        return value
     
 class HourlyRelativePowerDemandReduction(KPI):
     """Reduced power demand during peak hour due to flexible operation."""
@@ -166,6 +196,7 @@ class PowerPaybackRatio(KPI):
         evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
         evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
     ) -> float:
+        import pandas as pd
         
         data_list = []
 
@@ -0,0 +1,50 @@
+import datetime
+from typing import List, Union
+from energy_flexibility_kpis.kpi.base import KPI
+from energy_flexibility_kpis.kpi.generic.primitives import FleetProfile
+from energy_flexibility_kpis.enumerations import BaseUnit, Complexity, KPICategory, PerformanceAspect, Relevance
+from energy_flexibility_kpis.enumerations import Stakeholder, TemporalEvaluationWindow,TemporalResolution, SpatialResolution
+from energy_flexibility_kpis.unit import Unit
+
+class EnergyUseIntensity(KPI):
+    """Electricity consumption of a building per unit of its floor area."""
+
+    NAME = 'energy use intensity'
+    DEFINITION = __doc__
+    UNIT = Unit(numerator=[BaseUnit.KWH], denominator=[BaseUnit.SQUARE_METER])
+    CATEGORY = KPICategory.GN_BUILDING_ENERGY_EFFICIENCY
+    RELEVANCE = Relevance.HIGH
+    STAKEHOLDERS = [Stakeholder.BUILDING_OWNER, Stakeholder.BUILDING_MANAGER, Stakeholder.POLICYMAKER]
+    COMPLEXITY = Complexity.LOW
+    NEED_BASELINE = False
+    TEMPORAL_EVALUATION_WINDOW = TemporalEvaluationWindow.WHOLE_YEAR
+    TEMPORAL_RESOLUTION = TemporalResolution.UNSPECIFIED
+    SPATIAL_RESOLUTION = SpatialResolution.SINGLE_BUILDING
+    DOE_FLEXIBILITY_CATEGORY = None
+    PERFORMANCE_ASPECT = [PerformanceAspect.ENERGY]
+    BATCH_ARGUMENTS = {'generic_electric_power_profile': 1, 'floor_area': 0}
+
+    def __init__(self):
+        super().__init__()
+
+    @classmethod
+    def calculate(
+        cls,
+        generic_electric_power_profile: Union[List[float], List[List[float]]],
+        floor_area: Union[float, List[float]],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Union[float, List[float]]:
+        """Electricity consumption is integrated with :py:meth:`FleetProfile.integrate`. A batch of
+        buildings, see :py:meth:`KPI.get_batch`, takes a list of floor areas."""
+
+        fleet, _, batched = FleetProfile.from_arguments(
+            generic_electric_power_profile=generic_electric_power_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        value = fleet.get_energy_use_intensity(floor_area)
+
+        return value.tolist() if batched else float(value[0])
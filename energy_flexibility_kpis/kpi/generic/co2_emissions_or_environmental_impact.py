@@ -0,0 +1,54 @@
+import datetime
+from typing import List, Union
+from energy_flexibility_kpis.kpi.base import KPI
+from energy_flexibility_kpis.kpi.generic.primitives import FleetProfile
+from energy_flexibility_kpis.enumerations import BaseUnit, Complexity, KPICategory, PerformanceAspect, Relevance
+from energy_flexibility_kpis.enumerations import Stakeholder, TemporalEvaluationWindow,TemporalResolution, SpatialResolution
+from energy_flexibility_kpis.unit import Unit
+
+class TotalCarbonEmissions(KPI):
+    """Carbon emissions of the electricity that a building imports from the grid."""
+
+    NAME = 'total carbon emissions'
+    DEFINITION = __doc__
+    UNIT = Unit(numerator=[BaseUnit.KG_OF_CO2])
+    CATEGORY = KPICategory.GN_CO2_EMISSIONS_OR_ENVIRONMENTAL_IMPACT
+    RELEVANCE = Relevance.HIGH
+    STAKEHOLDERS = [Stakeholder.BUILDING_OWNER, Stakeholder.POLICYMAKER]
+    COMPLEXITY = Complexity.LOW
+    NEED_BASELINE = False
+    TEMPORAL_EVALUATION_WINDOW = TemporalEvaluationWindow.UNSPECIFIED
+    TEMPORAL_RESOLUTION = TemporalResolution.UNSPECIFIED
+    SPATIAL_RESOLUTION = SpatialResolution.SINGLE_BUILDING
+    DOE_FLEXIBILITY_CATEGORY = None
+    PERFORMANCE_ASPECT = [PerformanceAspect.EMISSION]
+    BATCH_ARGUMENTS = {'generic_electric_power_profile': 1, 'generic_self_production_profile': 1}
+
+    def __init__(self):
+        super().__init__()
+
+    @classmethod
+    def calculate(
+        cls,
+        generic_electric_power_profile: Union[List[float], List[List[float]]],
+        generic_carbon_intensity_profile: Union[List[float], List[List[float]]],
+        generic_self_production_profile: Union[List[float], List[List[float]]] = None,
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Union[float, List[float]]:
+        """Grid import is the electric power demand net of self-production, clipped at 0. In a batch
+        of buildings, see :py:meth:`KPI.get_batch`, a single carbon intensity profile is shared by
+        all buildings."""
+
+        fleet, _, batched = FleetProfile.from_arguments(
+            generic_electric_power_profile=generic_electric_power_profile,
+            generic_self_production_profile=generic_self_production_profile,
+            generic_carbon_intensity_profile=generic_carbon_intensity_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        value = fleet.get_total_carbon_emissions()
+
+        return value.tolist() if batched else float(value[0])
@@ -0,0 +1,225 @@
+import datetime
+from typing import List, Mapping, Union
+from energy_flexibility_kpis.kpi.base import KPI
+from energy_flexibility_kpis.kpi.generic.primitives import FleetProfile
+from energy_flexibility_kpis.enumerations import BaseUnit, Complexity, KPICategory, PerformanceAspect, Relevance
+from energy_flexibility_kpis.enumerations import Stakeholder, TemporalEvaluationWindow,TemporalResolution, SpatialResolution
+from energy_flexibility_kpis.unit import Unit
+
+class SelfConsumptionRatio(KPI):
+    """Share of the electricity produced on site, e.g. by PV, that the building consumes itself."""
+
+    NAME = 'self-consumption ratio'
+    DEFINITION = __doc__
+    UNIT = Unit(numerator=[BaseUnit.DIMENSIONLESS])
+    CATEGORY = KPICategory.GN_GRID_INTERACTION
+    RELEVANCE = Relevance.HIGH
+    STAKEHOLDERS = [Stakeholder.BUILDING_OWNER, Stakeholder.DISTRIBUTION_SYSTEM_OPERATOR]
+    COMPLEXITY = Complexity.LOW
+    NEED_BASELINE = False
+    TEMPORAL_EVALUATION_WINDOW = TemporalEvaluationWindow.UNSPECIFIED
+    TEMPORAL_RESOLUTION = TemporalResolution.UNSPECIFIED
+    SPATIAL_RESOLUTION = SpatialResolution.SINGLE_BUILDING
+    DOE_FLEXIBILITY_CATEGORY = None
+    PERFORMANCE_ASPECT = [PerformanceAspect.ENERGY]
+    BATCH_ARGUMENTS = {'generic_electric_power_profile': 1, 'generic_self_production_profile': 1}
+
+    def __init__(self):
+        super().__init__()
+
+    @classmethod
+    def calculate(
+        cls,
+        generic_electric_power_profile: Union[List[float], List[List[float]]],
+        generic_self_production_profile: Union[List[float], List[List[float]]],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Union[float, List[float]]:
+        """Self-consumed energy divided by the self-produced energy in the evaluation window, NaN
+        without production. Returns a list of values for a batch of buildings, see :py:meth:`KPI.get_batch`."""
+
+        fleet, _, batched = FleetProfile.from_arguments(
+            generic_electric_power_profile=generic_electric_power_profile,
+            generic_self_production_profile=generic_self_production_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        value = fleet.get_self_consumption_ratio()
+
+        return value.tolist() if batched else float(value[0])
+
+class SelfSufficiencyRatio(KPI):
+    """Share of the electricity consumption of a building that is met by its own production."""
+
+    NAME = 'self-sufficiency ratio'
+    DEFINITION = __doc__
+    UNIT = Unit(numerator=[BaseUnit.DIMENSIONLESS])
+    CATEGORY = KPICategory.GN_GRID_INTERACTION
+    RELEVANCE = Relevance.HIGH
+    STAKEHOLDERS = [Stakeholder.BUILDING_OWNER, Stakeholder.DISTRIBUTION_SYSTEM_OPERATOR]
+    COMPLEXITY = Complexity.LOW
+    NEED_BASELINE = False
+    TEMPORAL_EVALUATION_WINDOW = TemporalEvaluationWindow.UNSPECIFIED
+    TEMPORAL_RESOLUTION = TemporalResolution.UNSPECIFIED
+    SPATIAL_RESOLUTION = SpatialResolution.SINGLE_BUILDING
+    DOE_FLEXIBILITY_CATEGORY = None
+    PERFORMANCE_ASPECT = [PerformanceAspect.ENERGY]
+    BATCH_ARGUMENTS = {'generic_electric_power_profile': 1, 'generic_self_production_profile': 1}
+
+    def __init__(self):
+        super().__init__()
+
+    @classmethod
+    def calculate(
+        cls,
+        generic_electric_power_profile: Union[List[float], List[List[float]]],
+        generic_self_production_profile: Union[List[float], List[List[float]]],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Union[float, List[float]]:
+        """Self-consumed energy divided by the consumed energy in the evaluation window."""
+
+        fleet, _, batched = FleetProfile.from_arguments(
+            generic_electric_power_profile=generic_electric_power_profile,
+            generic_self_production_profile=generic_self_production_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        value = fleet.get_self_sufficiency_ratio()
+
+        return value.tolist() if batched else float(value[0])
+
+class PeakGridImport(KPI):
+    """Maximum power that a building imports from the grid."""
+
+    NAME = 'peak grid import'
+    DEFINITION = __doc__
+    UNIT = Unit(numerator=[BaseUnit.KW])
+    CATEGORY = KPICategory.GN_GRID_INTERACTION
+    RELEVANCE = Relevance.HIGH
+    STAKEHOLDERS = [Stakeholder.GRID_OPERATOR, Stakeholder.DISTRIBUTION_SYSTEM_OPERATOR]
+    COMPLEXITY = Complexity.LOW
+    NEED_BASELINE = False
+    TEMPORAL_EVALUATION_WINDOW = TemporalEvaluationWindow.UNSPECIFIED
+    TEMPORAL_RESOLUTION = TemporalResolution.UNSPECIFIED
+    SPATIAL_RESOLUTION = SpatialResolution.SINGLE_BUILDING
+    DOE_FLEXIBILITY_CATEGORY = None
+    PERFORMANCE_ASPECT = [PerformanceAspect.POWER]
+    BATCH_ARGUMENTS = {'generic_electric_power_profile': 1, 'generic_self_production_profile': 1}
+
+    def __init__(self):
+        super().__init__()
+
+    @classmethod
+    def calculate(
+        cls,
+        generic_electric_power_profile: Union[List[float], List[List[float]]],
+        generic_self_production_profile: Union[List[float], List[List[float]]] = None,
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Union[float, List[float]]:
+        """Maximum positive net load in the evaluation window."""
+
+        fleet, _, batched = FleetProfile.from_arguments(
+            generic_electric_power_profile=generic_electric_power_profile,
+            generic_self_production_profile=generic_self_production_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        value = fleet.grid_import.max(axis=1)
+
+        return value.tolist() if batched else float(value[0])
+
+class PeakGridExport(KPI):
+    """Maximum power that a building exports to the grid."""
+
+    NAME = 'peak grid export'
+    DEFINITION = __doc__
+    UNIT = Unit(numerator=[BaseUnit.KW])
+    CATEGORY = KPICategory.GN_GRID_INTERACTION
+    RELEVANCE = Relevance.MEDIUM
+    STAKEHOLDERS = [Stakeholder.GRID_OPERATOR, Stakeholder.DISTRIBUTION_SYSTEM_OPERATOR]
+    COMPLEXITY = Complexity.LOW
+    NEED_BASELINE = False
+    TEMPORAL_EVALUATION_WINDOW = TemporalEvaluationWindow.UNSPECIFIED
+    TEMPORAL_RESOLUTION = TemporalResolution.UNSPECIFIED
+    SPATIAL_RESOLUTION = SpatialResolution.SINGLE_BUILDING
+    DOE_FLEXIBILITY_CATEGORY = None
+    PERFORMANCE_ASPECT = [PerformanceAspect.POWER]
+    BATCH_ARGUMENTS = {'generic_electric_power_profile': 1, 'generic_self_production_profile': 1}
+
+    def __init__(self):
+        super().__init__()
+
+    @classmethod
+    def calculate(
+        cls,
+        generic_electric_power_profile: Union[List[float], List[List[float]]],
+        generic_self_production_profile: Union[List[float], List[List[float]]],
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Union[float, List[float]]:
+        """Maximum negative net load in the evaluation window as a positive value."""
+
+        fleet, _, batched = FleetProfile.from_arguments(
+            generic_electric_power_profile=generic_electric_power_profile,
+            generic_self_production_profile=generic_self_production_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        value = fleet.grid_export.max(axis=1)
+
+        return value.tolist() if batched else float(value[0])
+
+class NetLoadStatistics(KPI):
+    """Mean, standard deviation, minimum and maximum of the electric power demand of a building
+    net of its own production, and the load factor, the ratio of the mean to the maximum."""
+
+    NAME = 'net load statistics'
+    DEFINITION = __doc__
+    UNIT = Unit(numerator=[BaseUnit.KW])
+    CATEGORY = KPICategory.GN_GRID_INTERACTION
+    RELEVANCE = Relevance.MEDIUM
+    STAKEHOLDERS = [Stakeholder.GRID_OPERATOR, Stakeholder.DISTRIBUTION_SYSTEM_OPERATOR, Stakeholder.AGGREGATOR]
+    COMPLEXITY = Complexity.LOW
+    NEED_BASELINE = False
+    TEMPORAL_EVALUATION_WINDOW = TemporalEvaluationWindow.UNSPECIFIED
+    TEMPORAL_RESOLUTION = TemporalResolution.UNSPECIFIED
+    SPATIAL_RESOLUTION = SpatialResolution.SINGLE_BUILDING
+    DOE_FLEXIBILITY_CATEGORY = None
+    PERFORMANCE_ASPECT = [PerformanceAspect.POWER]
+    BATCH_ARGUMENTS = {'generic_electric_power_profile': 1, 'generic_self_production_profile': 1}
+
+    def __init__(self):
+        super().__init__()
+
+    @classmethod
+    def calculate(
+        cls,
+        generic_electric_power_profile: Union[List[float], List[List[float]]],
+        generic_self_production_profile: Union[List[float], List[List[float]]] = None,
+        timestamps: Union[List[int], List[datetime.datetime], List[str]] = None,
+        evaluation_start_timestamp: Union[int, datetime.datetime, str] = None,
+        evaluation_end_timestamp: Union[int, datetime.datetime, str] = None,
+    ) -> Mapping[str, Union[float, List[float]]]:
+        """Returns a mapping of statistic name to value, which is a list of values for a batch of
+        buildings, see :py:meth:`KPI.get_batch`."""
+
+        fleet, _, batched = FleetProfile.from_arguments(
+            generic_electric_power_profile=generic_electric_power_profile,
+            generic_self_production_profile=generic_self_production_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=evaluation_start_timestamp,
+            evaluation_end_timestamp=evaluation_end_timestamp,
+        )
+        value = {k: v.tolist() if batched else float(v[0]) for k, v in fleet.get_net_load_statistics().items()}
+
+        return value
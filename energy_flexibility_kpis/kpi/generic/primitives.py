@@ -0,0 +1,240 @@
+"""Vectorised primitives shared by the generic KPIs.
+
+Generic KPIs of a building or a fleet of buildings are reductions of a few shared quantities,
+e.g. grid import is the clipped net load and is used by the cost, emission and peak import
+KPIs. :py:class:`FleetProfile` masks the profiles of all buildings once and computes each
+shared quantity on first use, so :py:meth:`FleetProfile.get_report` returns every generic
+KPI of a fleet from one pass over its profiles. Energies are Simpson integrals of power as in
+the energy flexibility KPIs.
+"""
+
+from typing import List, Mapping, Tuple, Union
+import numpy as np
+from energy_flexibility_kpis.base import Definition
+from energy_flexibility_kpis.kpi.base import KPI
+from energy_flexibility_kpis.profiling import stage
+
+class FleetProfile(Definition):
+    r"""Masked electric power profiles of a fleet of buildings of shape `(buildings, timesteps)`.
+
+    Parameters
+    ----------
+    electric_power: np.ndarray
+        Electric power demand in kW.
+    self_production: np.ndarray, optional
+        Self-produced electric power in kW, e.g. PV generation. Defaults to no production.
+    price: np.ndarray, optional
+        Electricity price in $/kWh of every building, or of shape `(1, timesteps)` if shared.
+    carbon_intensity: np.ndarray, optional
+        Carbon intensity of imported electricity in kgCO2/kWh of every building, or of shape `(1, timesteps)` if shared.
+    mask: np.ndarray, optional
+        Boolean mask of the evaluated timesteps. Defaults to all timesteps.
+    dx: float, default: 1.0
+        Timestep length in hours.
+    """
+
+    def __init__(
+        self, electric_power: np.ndarray, self_production: np.ndarray = None, price: np.ndarray = None,
+        carbon_intensity: np.ndarray = None, mask: np.ndarray = None, dx: float = None
+    ):
+        super().__init__()
+        mask = slice(None) if mask is None else mask
+        self.__electric_power = np.asarray(electric_power, dtype=float)[:, mask]
+        self.__self_production = None if self_production is None else np.asarray(self_production, dtype=float)[:, mask]
+        self.__price = None if price is None else np.asarray(price, dtype=float)[:, mask]
+        self.__carbon_intensity = None if carbon_intensity is None else np.asarray(carbon_intensity, dtype=float)[:, mask]
+        self.__dx = 1.0 if dx is None else dx
+        self.__net_load = None
+        self.__grid_import = None
+        self.__grid_export = None
+        self.__self_consumption = None
+
+    @property
+    def electric_power(self) -> np.ndarray:
+        return self.__electric_power
+
+    @property
+    def self_production(self) -> np.ndarray:
+        return self.__self_production
+
+    @property
+    def dx(self) -> float:
+        return self.__dx
+
+    @property
+    def net_load(self) -> np.ndarray:
+        """Electric power demand net of self-production."""
+
+        if self.__net_load is None:
+            self.__net_load = self.electric_power if self.self_production is None\
+                else self.electric_power - self.self_production
+
+        else:
+            pass
+
+        return self.__net_load
+
+    @property
+    def grid_import(self) -> np.ndarray:
+        """Power imported from the grid, the positive part of the net load."""
+
+        if self.__grid_import is None:
+            self.__grid_import = np.clip(self.net_load, 0.0, None)
+
+        else:
+            pass
+
+        return self.__grid_import
+
+    @property
+    def grid_export(self) -> np.ndarray:
+        """Power exported to the grid, the negative part of the net load as positive values."""
+
+        if self.__grid_export is None:
+            self.__grid_export = np.clip(self.net_load, None, 0.0)
+            np.negative(self.__grid_export, out=self.__grid_export)
+
+        else:
+            pass
+
+        return self.__grid_export
+
+    @property
+    def self_consumption(self) -> np.ndarray:
+        """Self-produced power consumed on site."""
+
+        if self.__self_consumption is None:
+            self.__self_consumption = np.zeros_like(self.electric_power) if self.self_production is None\
+                else np.minimum(self.electric_power, np.clip(self.self_production, 0.0, None))
+
+        else:
+            pass
+
+        return self.__self_consumption
+
+    def integrate(self, values: np.ndarray) -> np.ndarray:
+        """Return energy of every building from power `values` as their composite Simpson integral,
+        the same rule as :py:meth:`KPI.simpson` that the energy flexibility KPIs use."""
+
+        from scipy import integrate
+
+        with stage('integral', size=values.size):
+            return integrate.simpson(values, dx=self.dx, axis=1)
+
+    def get_energy_use_intensity(self, floor_area: Union[float, List[float], np.ndarray]) -> np.ndarray:
+        """Electricity consumption per unit floor area in kWh/m2."""
+
+        return self.integrate(self.electric_power)/np.asarray(floor_area, dtype=float)
+
+    def get_total_cost(self) -> np.ndarray:
+        """Cost of the electricity imported from the grid in $."""
+
+        assert self.__price is not None, 'price is required to calculate cost.'
+
+        return self.integrate(self.grid_import*self.__price)
+
+    def get_total_carbon_emissions(self) -> np.ndarray:
+        """Carbon emissions of the electricity imported from the grid in kgCO2."""
+
+        assert self.__carbon_intensity is not None, 'carbon_intensity is required to calculate emissions.'
+
+        return self.integrate(self.grid_import*self.__carbon_intensity)
+
+    def get_self_consumption_ratio(self) -> np.ndarray:
+        """Share of the self-produced energy that is consumed on site."""
+
+        production = np.zeros(self.electric_power.shape[0]) if self.self_production is None\
+            else self.integrate(np.clip(self.self_production, 0.0, None))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.integrate(self.self_consumption)/production
+
+    def get_self_sufficiency_ratio(self) -> np.ndarray:
+        """Share of the consumed energy that is self-produced."""
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.integrate(self.self_consumption)/self.integrate(self.electric_power)
+
+    def get_net_load_statistics(self) -> Mapping[str, np.ndarray]:
+        """Mean, standard deviation, minimum and maximum net load in kW and its load factor."""
+
+        net_load = self.net_load
+        mean = net_load.mean(axis=1)
+        maximum = net_load.max(axis=1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            load_factor = mean/maximum
+
+        return {
+            'mean': mean,
+            'standard_deviation': net_load.std(axis=1),
+            'minimum': net_load.min(axis=1),
+            'maximum': maximum,
+            'load_factor': load_factor,
+        }
+
+    def get_report(self, floor_area: Union[float, List[float], np.ndarray] = None) -> Mapping[str, np.ndarray]:
+        """Return every generic KPI of every building that the profiles allow.
+
+        Energy use intensity needs `floor_area`, total cost needs prices and total carbon emissions
+        needs carbon intensities.
+        """
+
+        report = {}
+
+        if floor_area is not None:
+            report['energy_use_intensity'] = self.get_energy_use_intensity(floor_area)
+
+        else:
+            pass
+
+        if self.__price is not None:
+            report['total_cost'] = self.get_total_cost()
+
+        else:
+            pass
+
+        if self.__carbon_intensity is not None:
+            report['total_carbon_emissions'] = self.get_total_carbon_emissions()
+
+        else:
+            pass
+
+        report['self_consumption_ratio'] = self.get_self_consumption_ratio()
+        report['self_sufficiency_ratio'] = self.get_self_sufficiency_ratio()
+        report['peak_grid_import'] = self.grid_import.max(axis=1)
+        report['peak_grid_export'] = self.grid_export.max(axis=1)
+        report.update({f'net_load_{k}': v for k, v in self.get_net_load_statistics().items()})
+
+        return report
+
+    @classmethod
+    def from_arguments(
+        cls, generic_electric_power_profile: Union[List[float], List[List[float]]],
+        generic_self_production_profile: Union[List[float], List[List[float]]] = None,
+        electricity_price_profile: Union[List[float], List[List[float]]] = None,
+        generic_carbon_intensity_profile: Union[List[float], List[List[float]]] = None, **kwargs
+    ) -> Tuple['FleetProfile', Definition, bool]:
+        """Return fleet profile of :py:meth:`KPI.calculate` profiles of one building or of a batch
+        of buildings, the :py:class:`VariableSet` of the first building and whether the profiles
+        are a batch, see :py:meth:`KPI.get_batch`. `kwargs` are the other :py:meth:`KPI.calculate`
+        arguments, e.g. timestamps and evaluation window. Prices and carbon intensities may be a
+        single profile shared by all buildings.
+        """
+
+        profiles, vs, batched = KPI.get_batch({
+            'generic_electric_power_profile': generic_electric_power_profile,
+            'generic_self_production_profile': generic_self_production_profile,
+            'electricity_price_profile': electricity_price_profile,
+            'generic_carbon_intensity_profile': generic_carbon_intensity_profile,
+        }, **kwargs)
+        fleet = cls(
+            profiles['generic_electric_power_profile'],
+            self_production=profiles['generic_self_production_profile'],
+            price=profiles['electricity_price_profile'],
+            carbon_intensity=profiles['generic_carbon_intensity_profile'],
+            mask=vs.evaluation_mask,
+            dx=KPI.get_timestep_length(vs),
+        )
+
+        return fleet, vs, batched
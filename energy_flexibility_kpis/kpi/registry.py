@@ -0,0 +1,152 @@
+import importlib
+import inspect
+import pkgutil
+from typing import Any, Callable, List, Mapping, Union
+from energy_flexibility_kpis.enumerations import KPICategory, PerformanceAspect, SpatialResolution
+
+class KPIRegistry:
+    r"""Registry of KPI classes.
+
+    KPI classes register themselves when they are defined. Queries import every module in
+    the `energy_flexibility_kpis.kpi` package on first use so that the registry is complete
+    without importing each module by hand.
+    """
+
+    __KPIS: Mapping[str, type] = {}
+    __DISCOVERED = False
+
+    @classmethod
+    def register(cls, kpi: type):
+        """Register KPI class under its class name."""
+
+        cls.__KPIS[kpi.__name__] = kpi
+
+    @classmethod
+    def discover(cls):
+        """Import every module in the `energy_flexibility_kpis.kpi` package."""
+
+        if not cls.__DISCOVERED:
+            package = importlib.import_module('energy_flexibility_kpis.kpi')
+
+            for module in pkgutil.walk_packages(package.__path__, prefix=f'{package.__name__}.'):
+                importlib.import_module(module.name)
+
+            cls.__DISCOVERED = True
+
+        else:
+            pass
+
+    @classmethod
+    def get(cls, name: str) -> type:
+        """Return KPI class called `name`."""
+
+        cls.discover()
+
+        try:
+            return cls.__KPIS[name]
+
+        except KeyError:
+            raise KeyError(f'Unknown KPI: {name}')
+
+    @classmethod
+    def filter(
+        cls, category: KPICategory = None, performance_aspect: PerformanceAspect = None, need_baseline: bool = None,
+        spatial_resolution: SpatialResolution = None, implemented: bool = None
+    ) -> List[type]:
+        """Return registered KPI classes that match all the specified criteria.
+
+        Parameters
+        ----------
+        category: KPICategory, optional
+            KPI category.
+        performance_aspect: PerformanceAspect, optional
+            Performance aspect that must be one of the KPI's performance aspects.
+        need_baseline: bool, optional
+            Whether the KPI needs a baseline scenario.
+        spatial_resolution: SpatialResolution, optional
+            KPI spatial resolution.
+        implemented: bool, optional
+            Whether the KPI's calculation is implemented.
+
+        Returns
+        -------
+        kpis: List[type]
+            KPI classes sorted by class name.
+        """
+
+        cls.discover()
+        kpis = []
+
+        for _, kpi in sorted(cls.__KPIS.items()):
+            if (category is not None and kpi.CATEGORY != category)\
+                or (performance_aspect is not None and performance_aspect not in (kpi.PERFORMANCE_ASPECT or []))\
+                    or (need_baseline is not None and kpi.NEED_BASELINE != need_baseline)\
+                        or (spatial_resolution is not None and kpi.SPATIAL_RESOLUTION != spatial_resolution)\
+                            or (implemented is not None and kpi.IMPLEMENTED != implemented):
+                continue
+
+            else:
+                kpis.append(kpi)
+
+        return kpis
+
+    @classmethod
+    def compute_all(
+        cls, dataset: Mapping[str, Any], filter: Union[Mapping[str, Any], Callable[[type], bool]] = None, ignore_errors: bool = False
+    ) -> Mapping[str, Any]:
+        """Calculate every selected KPI whose required arguments are in `dataset`.
+
+        The KPIs share one prepared context: the variable sets built from `dataset`, including
+        parsed timestamps and evaluation masks, are reused by all KPIs that take the same
+        arguments instead of being rebuilt for each KPI (see :py:class:`VariableSetCache`).
+
+        Parameters
+        ----------
+        dataset: Mapping[str, Any]
+            :py:meth:`KPI.calculate` argument names and values, e.g. profiles, timestamps and evaluation window.
+        filter: Union[Mapping[str, Any], Callable[[type], bool]], optional
+            :py:meth:`filter` criteria or, a predicate that selects KPI classes. Defaults to all implemented KPIs.
+        ignore_errors: bool, default: False
+            Leave out KPIs that fail to calculate instead of raising their error.
+
+        Returns
+        -------
+        values: Mapping[str, Any]
+            KPI values keyed by KPI class name.
+        """
+
+        from energy_flexibility_kpis.variable import VariableSetCache
+
+        if filter is None:
+            kpis = cls.filter(implemented=True)
+
+        elif callable(filter):
+            kpis = [k for k in cls.filter(implemented=True) if filter(k)]
+
+        else:
+            kpis = cls.filter(**{'implemented': True, **filter})
+
+        values = {}
+
+        with VariableSetCache.activate():
+            for kpi in kpis:
+                parameters = inspect.signature(kpi.calculate).parameters
+                required = [p.name for p in parameters.values() if p.default is inspect.Parameter.empty]
+
+                if any(dataset.get(p) is None for p in required):
+                    continue
+
+                else:
+                    kwargs = {p: dataset[p] for p in parameters if dataset.get(p) is not None}
+
+                try:
+                    values[kpi.__name__] = kpi.calculate(**kwargs)
+
+                except Exception:
+                    if ignore_errors:
+                        pass
+
+                    else:
+                        raise
+
+        return values
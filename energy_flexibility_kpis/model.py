@@ -0,0 +1,115 @@
+"""Grey-box building models."""
+
+from typing import List, Tuple, Union
+import numpy as np
+from energy_flexibility_kpis.base import Definition
+
+class RCModel(Definition):
+    r"""Single zone resistance-capacitance (1R1C) thermal model with an electric heat pump or chiller.
+
+    The zone temperature at the end of timestep :math:`k` of length :math:`\Delta t` hours is
+
+    .. math::
+        T_{k+1} = a T_k + (1 - a)(T^{out}_k + R \eta P_k), \quad a = e^{-\Delta t/(R C)}
+
+    where :math:`P_k` is the electric power of the heat pump or chiller.
+
+    Parameters
+    ----------
+    resistance: float
+        Thermal resistance :math:`R` between the zone and outdoors in K/kW.
+    capacitance: float
+        Thermal capacitance :math:`C` of the zone in kWh/K.
+    maximum_power: float
+        Maximum electric power of the heat pump or chiller in kW.
+    efficiency: float, default: 1.0
+        Thermal power delivered to the zone per unit of electric power :math:`\eta`, e.g. the
+        coefficient of performance. Negative values model cooling.
+    initial_temperature: float, default: 20.0
+        Zone temperature at the start of the horizon in C.
+    """
+
+    def __init__(
+        self, resistance: float, capacitance: float, maximum_power: float, efficiency: float = None,
+        initial_temperature: float = None
+    ):
+        super().__init__()
+        self.resistance = resistance
+        self.capacitance = capacitance
+        self.maximum_power = maximum_power
+        self.efficiency = 1.0 if efficiency is None else efficiency
+        self.initial_temperature = 20.0 if initial_temperature is None else initial_temperature
+
+    @property
+    def resistance(self) -> float:
+        return self.__resistance
+
+    @property
+    def capacitance(self) -> float:
+        return self.__capacitance
+
+    @property
+    def maximum_power(self) -> float:
+        return self.__maximum_power
+
+    @property
+    def efficiency(self) -> float:
+        return self.__efficiency
+
+    @property
+    def initial_temperature(self) -> float:
+        return self.__initial_temperature
+
+    @resistance.setter
+    def resistance(self, value: float):
+        assert value > 0, 'resistance must be greater than 0.'
+        self.__resistance = value
+
+    @capacitance.setter
+    def capacitance(self, value: float):
+        assert value > 0, 'capacitance must be greater than 0.'
+        self.__capacitance = value
+
+    @maximum_power.setter
+    def maximum_power(self, value: float):
+        assert value >= 0, 'maximum_power must be greater than or equal to 0.'
+        self.__maximum_power = value
+
+    @efficiency.setter
+    def efficiency(self, value: float):
+        self.__efficiency = value
+
+    @initial_temperature.setter
+    def initial_temperature(self, value: float):
+        self.__initial_temperature = value
+
+    def get_response(self, outdoor_temperature: Union[List[float], np.ndarray], dx: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Return matrix `G` and vector `f` such that zone temperatures at the end of each timestep are `G @ power + f`.
+
+        Parameters
+        ----------
+        outdoor_temperature: Union[List[float], np.ndarray]
+            Outdoor temperature at each timestep in C.
+        dx: float
+            Timestep length in hours.
+        """
+
+        outdoor_temperature = np.asarray(outdoor_temperature, dtype=float)
+        t = outdoor_temperature.shape[0]
+        a = np.exp(-dx/(self.resistance*self.capacitance))
+        steps = np.arange(t)
+        lag = steps[:, None] - steps[None, :]
+        # decay[k, m] = a^(k - m) for m <= k
+        decay = np.where(lag >= 0, a**np.clip(lag, 0, None), 0.0)
+        gain = decay*(1.0 - a)
+        matrix = gain*self.resistance*self.efficiency
+        vector = self.initial_temperature*a**(steps + 1) + gain @ outdoor_temperature
+
+        return matrix, vector
+
+    def simulate(self, power: Union[List[float], np.ndarray], outdoor_temperature: Union[List[float], np.ndarray], dx: float) -> np.ndarray:
+        """Return zone temperature at the end of each timestep in C."""
+
+        matrix, vector = self.get_response(outdoor_temperature, dx)
+
+        return matrix @ np.asarray(power, dtype=float) + vector
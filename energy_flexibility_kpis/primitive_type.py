@@ -1,14 +1,28 @@
 from typing import Any, Mapping
-from energy_flexibility_kpis.base import Definition
+from energy_flexibility_kpis.base import Definition, DefaultDefinitionMetaClass
 from energy_flexibility_kpis.enumerations import BaseUnit
 from energy_flexibility_kpis.unit import Unit
 
 class PrimitiveType(Definition):
+    __slots__ = ('__name', '__definition', '__unit')
+
     def __init__(self, name: str, definition: str, unit: Unit) -> None:
         super().__init__()
-        self.name = name
-        self.definition = definition
-        self.unit = unit
+        self.__name = name
+        self.__definition = definition
+        self.__unit = unit
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def definition(self) -> str:
+        return self.__definition
+
+    @property
+    def unit(self) -> Unit:
+        return self.__unit
 
     def info(self) -> Mapping[str, Any]:
         return {
@@ -17,129 +31,86 @@ class PrimitiveType(Definition):
             'unit': str(self.unit)
         }
 
-class DefaultPrimitiveTypeMetaClass(type):
-    def __init__(cls, *args, **kwargs) -> None:
-        pass
-
-    @property
-    def power_demand(cls) -> PrimitiveType:
-        """An instantaneous power demand of a entity at a moment."""
-        
-        return PrimitiveType(
-            name='power demand',
-            definition='An instantaneous power demand of a entity at a moment.',
-            unit=Unit(numerator=[BaseUnit.KW])
-        )
-    
-    @property
-    def energy_consumption(cls) -> PrimitiveType:
-        """The energy consumption of an entiry during a certain period."""
-        
-        return PrimitiveType(
-            name='energy consumption',
-            definition='The energy consumption of an entiry during a certain period.',
-            unit=Unit(numerator=[BaseUnit.KW, BaseUnit.HOUR])
-        )
-    
-    @property
-    def operation_cost(cls) -> PrimitiveType:
-        """The operational cost of an entiry during a certain period."""
-        
-        return PrimitiveType(
-            name='operation cost',
-            definition='The operational cost of an entiry during a certain period.',
-            unit=Unit(numerator=[BaseUnit.DOLLAR])
-        )
-    
-    @property
-    def energy_price(cls) -> PrimitiveType:
-        """The price of energy per unit."""
-        
-        return PrimitiveType(
-            name='energy price',
-            definition='The price of energy per unit.',
-            unit=Unit(numerator=[BaseUnit.DOLLAR], denominator=[BaseUnit.KW, BaseUnit.HOUR])
-        )
-    
-    @property
-    def carbon_emission(cls) -> PrimitiveType:
-        """The carbon emission of an entiry during a certain period."""
-        
-        return PrimitiveType(
-            name='carbon emission',
-            definition='The carbon emission of an entiry during a certain period.',
-            unit=Unit(numerator=[BaseUnit.KG_OF_CO2])
-        )
-    
-    @property
-    def carbon_emission_factor(cls) -> PrimitiveType:
-        """The carbon emission factor of an entiry during a certain period."""
-        
-        return PrimitiveType(
-            name='carbon emission factor',
-            definition='The carbon emission factor of an entiry during a certain period.',
-            unit=Unit(numerator=[BaseUnit.KG_OF_CO2], denominator=[BaseUnit.KW, BaseUnit.HOUR])
-        )
-    
-    @property
-    def temperature(cls) -> PrimitiveType:
-        """The temperature of an entity (either an instantaneous value or average value)."""
-        
-        return PrimitiveType(
-            name='temperature',
-            definition='The temperature of an entity (either an instantaneous value or average value).',
-            unit=Unit(numerator=[BaseUnit.CELSIUS])
-        )
-    
-    @property
-    def timestamp(cls) -> PrimitiveType:
-        """The datetime of a moment."""
-        
-        return PrimitiveType(
-            name='timestamp',
-            definition='The datetime of a moment.',
-            unit=Unit(numerator=[BaseUnit.DIMENSIONLESS])
-        )
-    
-    @property
-    def duration(cls) -> PrimitiveType:
-        """The time difference between two timestamps."""
-        
-        return PrimitiveType(
-            name='duration',
-            definition='The time difference between two timestamps.',
-            unit=Unit(numerator=[BaseUnit.SECOND])
-        )
-    
-    @property
-    def area(cls) -> PrimitiveType:
-        """The floor area of a space (e.g., zone, building)."""
-        
-        return PrimitiveType(
-            name='area',
-            definition='The floor area of a space (e.g., zone, building).',
-            unit=Unit(numerator=[BaseUnit.SQUARE_METER])
-        )
-    
-    @property
-    def occupant_count(cls) -> PrimitiveType:
-        """The number of occupants in a space."""
-        
-        return PrimitiveType(
-            name='occupant count',
-            definition='The number of occupants in a space.',
-            unit=Unit(numerator=[BaseUnit.DIMENSIONLESS])
-        )
-    
-    @property
-    def unspecified(cls) -> PrimitiveType:
-        """Default primitive type."""
-        
-        return PrimitiveType(
-            name='unspecified',
-            definition='Default primitive type.',
-            unit=Unit(numerator=[BaseUnit.DIMENSIONLESS])
-        )
+class DefaultPrimitiveTypeMetaClass(DefaultDefinitionMetaClass):
+    pass
 
 class DefaultPrimitiveType(metaclass=DefaultPrimitiveTypeMetaClass):
-    pass
\ No newline at end of file
+    """Registry of default primitive types that are built once at import."""
+
+    power_demand = PrimitiveType(
+        name='power demand',
+        definition='An instantaneous power demand of a entity at a moment.',
+        unit=Unit(numerator=[BaseUnit.KW])
+    )
+
+    energy_consumption = PrimitiveType(
+        name='energy consumption',
+        definition='The energy consumption of an entiry during a certain period.',
+        unit=Unit(numerator=[BaseUnit.KW, BaseUnit.HOUR])
+    )
+
+    operation_cost = PrimitiveType(
+        name='operation cost',
+        definition='The operational cost of an entiry during a certain period.',
+        unit=Unit(numerator=[BaseUnit.DOLLAR])
+    )
+
+    energy_price = PrimitiveType(
+        name='energy price',
+        definition='The price of energy per unit.',
+        unit=Unit(numerator=[BaseUnit.DOLLAR], denominator=[BaseUnit.KW, BaseUnit.HOUR])
+    )
+
+    carbon_emission = PrimitiveType(
+        name='carbon emission',
+        definition='The carbon emission of an entiry during a certain period.',
+        unit=Unit(numerator=[BaseUnit.KG_OF_CO2])
+    )
+
+    carbon_emission_factor = PrimitiveType(
+        name='carbon emission factor',
+        definition='The carbon emission factor of an entiry during a certain period.',
+        unit=Unit(numerator=[BaseUnit.KG_OF_CO2], denominator=[BaseUnit.KW, BaseUnit.HOUR])
+    )
+
+    temperature = PrimitiveType(
+        name='temperature',
+        definition='The temperature of an entity (either an instantaneous value or average value).',
+        unit=Unit(numerator=[BaseUnit.CELSIUS])
+    )
+
+    co2_concentration = PrimitiveType(
+        name='CO2 concentration',
+        definition='The carbon dioxide concentration of the air in a space.',
+        unit=Unit(numerator=[BaseUnit.PPM])
+    )
+
+    timestamp = PrimitiveType(
+        name='timestamp',
+        definition='The datetime of a moment.',
+        unit=Unit(numerator=[BaseUnit.DIMENSIONLESS])
+    )
+
+    duration = PrimitiveType(
+        name='duration',
+        definition='The time difference between two timestamps.',
+        unit=Unit(numerator=[BaseUnit.SECOND])
+    )
+
+    area = PrimitiveType(
+        name='area',
+        definition='The floor area of a space (e.g., zone, building).',
+        unit=Unit(numerator=[BaseUnit.SQUARE_METER])
+    )
+
+    occupant_count = PrimitiveType(
+        name='occupant count',
+        definition='The number of occupants in a space.',
+        unit=Unit(numerator=[BaseUnit.DIMENSIONLESS])
+    )
+
+    unspecified = PrimitiveType(
+        name='unspecified',
+        definition='Default primitive type.',
+        unit=Unit(numerator=[BaseUnit.DIMENSIONLESS])
+    )
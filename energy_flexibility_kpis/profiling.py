@@ -0,0 +1,198 @@
+import contextlib
+import contextvars
+import datetime
+import functools
+import json
+from pathlib import Path
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, List, Mapping, Union
+from energy_flexibility_kpis.base import Definition
+
+class Profiler(Definition):
+    r"""Opt-in per-stage instrumentation of :py:meth:`KPI.calculate` invocations.
+
+    While a profiler is active, every KPI calculation produces a record with its total wall
+    time, net allocated memory block count and, per stage (`variable_set`, `timestamp_parsing`,
+    `evaluation_mask`, `get_resolution` and `integral`), the number of calls, wall time, net
+    allocated memory block count and largest processed array size. Stages may nest, e.g.
+    `timestamp_parsing` happens within `variable_set`. When no profiler is active the
+    instrumentation is a single context variable lookup per stage.
+
+    The active profiler and the calculation being recorded are context-local, as in
+    :py:class:`ResultStore`, so concurrent calculations in threads or asyncio tasks that
+    inherit the context are recorded separately, each with its own stages.
+
+    Parameters
+    ----------
+    callback: Callable[[Mapping[str, Any]], None], optional
+        Called with each record as soon as its calculation completes, e.g. to stream records to a log.
+    trace_memory: bool, default: False
+        Also record peak traced memory in bytes per calculation using :py:mod:`tracemalloc`.
+        This adds significant overhead.
+
+    Examples
+    --------
+    >>> with Profiler() as profiler:
+    ...     LoadFactor.calculate(generic_electric_power_profile)
+    >>> profiler.records[0]['stages']['evaluation_mask']['wall_time']
+    """
+
+    def __init__(self, callback: Callable[[Mapping[str, Any]], None] = None, trace_memory: bool = False):
+        super().__init__()
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.records: List[Mapping[str, Any]] = []
+        self.__token: contextvars.Token = None
+        self.__started_tracemalloc = False
+        self.__lock = threading.Lock()
+
+    def __enter__(self) -> 'Profiler':
+        self.start()
+
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        """Make this the active profiler in the current context."""
+
+        self.__token = _profiler.set(self)
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__started_tracemalloc = True
+
+        else:
+            pass
+
+    def stop(self):
+        """Restore the previously active profiler, if any."""
+
+        _profiler.reset(self.__token)
+        self.__token = None
+
+        if self.__started_tracemalloc:
+            tracemalloc.stop()
+            self.__started_tracemalloc = False
+
+        else:
+            pass
+
+    def reset(self):
+        self.records = []
+
+    def to_json_lines(self, filepath: Union[str, Path] = None) -> str:
+        """Return records as JSON lines and optionally, write them to `filepath`."""
+
+        text = ''.join(json.dumps(r, default=str) + '\n' for r in self.records)
+
+        if filepath is not None:
+            with open(filepath, 'w') as f:
+                f.write(text)
+
+        else:
+            pass
+
+        return text
+
+    def _begin(self, kpi: str) -> contextvars.Token:
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+
+        else:
+            pass
+
+        return _record.set({
+            'kpi': kpi,
+            'timestamp': datetime.datetime.now().isoformat(),
+            'wall_time': time.perf_counter(),
+            'allocated_blocks': sys.getallocatedblocks(),
+            'stages': {},
+        })
+
+    def _end(self, token: contextvars.Token, error: BaseException = None):
+        record = _record.get()
+        _record.reset(token)
+        record['wall_time'] = time.perf_counter() - record['wall_time']
+        record['allocated_blocks'] = sys.getallocatedblocks() - record['allocated_blocks']
+        record['peak_memory'] = tracemalloc.get_traced_memory()[1] if self.trace_memory else None
+        record['error'] = None if error is None else f'{type(error).__name__}: {error}'
+
+        with self.__lock:
+            self.records.append(record)
+
+            if self.callback is not None:
+                self.callback(record)
+
+            else:
+                pass
+
+    @contextlib.contextmanager
+    def _stage(self, name: str, size: int = None):
+        start = time.perf_counter()
+        blocks = sys.getallocatedblocks()
+
+        try:
+            yield
+
+        finally:
+            wall_time = time.perf_counter() - start
+            blocks = sys.getallocatedblocks() - blocks
+
+            record = _record.get()
+
+            # stages outside a KPI calculation, e.g. direct VariableSet use, are not recorded
+            if record is not None:
+                stage = record['stages'].setdefault(name, {'calls': 0, 'wall_time': 0.0, 'allocated_blocks': 0, 'size': None})
+                stage['calls'] += 1
+                stage['wall_time'] += wall_time
+                stage['allocated_blocks'] += blocks
+                stage['size'] = size if stage['size'] is None or (size is not None and size > stage['size']) else stage['size']
+
+            else:
+                pass
+
+_profiler: contextvars.ContextVar = contextvars.ContextVar('profiler', default=None)
+# record of the KPI calculation in progress in the current context
+_record: contextvars.ContextVar = contextvars.ContextVar('profiler_record', default=None)
+_NULL_STAGE = contextlib.nullcontext()
+
+def stage(name: str, size: int = None) -> contextlib.AbstractContextManager:
+    """Return context manager that times a calculation stage when a :py:class:`Profiler` is active."""
+
+    profiler = _profiler.get()
+
+    return _NULL_STAGE if profiler is None else profiler._stage(name, size=size)
+
+def profile_calculate(function: Callable) -> Callable:
+    """Wrap a KPI `calculate` function so that each invocation is recorded when a :py:class:`Profiler` is active."""
+
+    @functools.wraps(function)
+    def wrapper(cls, *args, **kwargs):
+        profiler = _profiler.get()
+
+        # nested calculations, e.g. super().calculate of a KPI subclass, are part of the outer record
+        if profiler is None or _record.get() is not None:
+            return function(cls, *args, **kwargs)
+
+        else:
+            pass
+
+        token = profiler._begin(cls.__name__)
+
+        try:
+            value = function(cls, *args, **kwargs)
+
+        except BaseException as e:
+            profiler._end(token, error=e)
+            raise
+
+        profiler._end(token)
+
+        return value
+
+    return wrapper
@@ -0,0 +1,387 @@
+"""Config-driven batch evaluation of KPIs.
+
+A YAML config, like `examples/config_file_incite.yaml`, is compiled into an
+:py:class:`ExecutionPlan` whose steps load the baseline, flexible and price signal files,
+align them on a common time step, detect shed, shift and rebound events from the price
+signal, and compute every applicable KPI for the evaluation window and each event.
+:py:class:`BatchRunner` runs the plans of several configs in parallel and caches their
+results.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, List, Mapping, Tuple, Union
+import numpy as np
+import pandas as pd
+from energy_flexibility_kpis.base import Definition
+from energy_flexibility_kpis.enumerations import KPICategory
+from energy_flexibility_kpis.utilities import FileHandler
+
+class ExecutionPlan(Definition):
+    r"""Compiled KPI evaluation of one baseline and flexible scenario pair.
+
+    Parameters
+    ----------
+    name: str
+        Plan name used to label results, e.g. config file name.
+    baseline_filepath: Union[str, Path]
+        Baseline scenario CSV file.
+    flexible_filepath: Union[str, Path]
+        Flexible scenario CSV file.
+    timestamp_column: str
+        Timestamp column of the scenario and price signal files.
+    power_columns: Mapping[str, List[str]]
+        Electric power columns of the `baseline` and `flexible` scenario files that are summed into the
+        scenario's electric power profile.
+    evaluation_start_timestamp: str
+        Evaluation window start.
+    evaluation_end_timestamp: str
+        Evaluation window end.
+    price_filepath: Union[str, Path], optional
+        Price signal CSV file. Events are only detected and cost profiles computed if it is provided.
+    price_column: str, optional
+        Price signal column.
+    shift_window: float, optional
+        Hours before shed events that are searched for low-price shift periods.
+    rebound_window: float, optional
+        Hours after shed events that are searched for low-price rebound periods.
+    resolution: str, default: '15min'
+        Time step that all the files are aligned on.
+    kpis: List[str], optional
+        KPI class names to compute. Defaults to all implemented KPIs whose inputs are available.
+    floor_area: float, optional
+        Building floor area for intensity KPIs.
+    """
+
+    STEPS = ('load', 'align', 'detect_events', 'compute')
+    EVENT_CATEGORIES = {
+        'shed': KPICategory.EF_ENERGY_OR_AVERAGE_POWER_LOAD_SHEDDING,
+        'shift': KPICategory.EF_LOAD_SHIFTING,
+        'rebound': KPICategory.EF_PEAK_POWER_OR_ENERGY_REBOUND,
+    }
+    REQUIRED_CONFIG_KEYS = ['path_to_dataset', 'baseline_scenario', 'flexible_scenario', 'evaluation_timestamps']
+
+    def __init__(
+        self, name: str, baseline_filepath: Union[str, Path], flexible_filepath: Union[str, Path], timestamp_column: str,
+        power_columns: Mapping[str, List[str]], evaluation_start_timestamp: str, evaluation_end_timestamp: str,
+        price_filepath: Union[str, Path] = None, price_column: str = None, shift_window: float = None,
+        rebound_window: float = None, resolution: str = None, kpis: List[str] = None, floor_area: float = None
+    ):
+        super().__init__()
+        self.name = name
+        self.baseline_filepath = str(baseline_filepath)
+        self.flexible_filepath = str(flexible_filepath)
+        self.timestamp_column = timestamp_column
+        self.power_columns = {k: list(v) for k, v in power_columns.items()}
+        self.evaluation_start_timestamp = str(evaluation_start_timestamp)
+        self.evaluation_end_timestamp = str(evaluation_end_timestamp)
+        self.price_filepath = None if price_filepath is None else str(price_filepath)
+        self.price_column = price_column
+        self.shift_window = shift_window
+        self.rebound_window = rebound_window
+        self.resolution = '15min' if resolution is None else resolution
+        self.kpis = kpis
+        self.floor_area = floor_area
+
+    @classmethod
+    def compile(cls, config: Mapping[str, Any], directory: Union[str, Path] = None, name: str = None) -> 'ExecutionPlan':
+        """Return plan compiled from a config file document.
+
+        Parameters
+        ----------
+        config: Mapping[str, Any]
+            Config document with the keys of `examples/config_file_incite.yaml`. Scenario electric power
+            columns are read from the `power_identifiers` key if set, otherwise they are resolved from
+            the Brick model in `updated_brick_model_file_name` (see :py:class:`BrickInputResolver`).
+            `resolution`, `kpis` and `floor_area` keys are optional.
+        directory: Union[str, Path], optional
+            Directory that `path_to_dataset` is relative to, e.g. the config file directory.
+        name: str, optional
+            Plan name.
+        """
+
+        for key in cls.REQUIRED_CONFIG_KEYS:
+            assert key in config, f"Key '{key}' is missing in the config file."
+
+        directory = Path('.' if directory is None else directory)
+        data_directory = directory/config['path_to_dataset']
+        baseline_scenario = config['baseline_scenario']
+        flexible_scenario = config['flexible_scenario']
+        power_columns = config.get('power_identifiers')
+
+        if power_columns is None:
+            assert 'updated_brick_model_file_name' in config,\
+                "Either 'power_identifiers' or 'updated_brick_model_file_name' is required to find electric power columns."
+            from energy_flexibility_kpis.brick import BrickInputResolver
+            resolver = BrickInputResolver(data_directory/config['updated_brick_model_file_name'])
+            points = [p for p in resolver.get_points() if p['class'] == 'Electric_Power_Sensor']
+            power_columns = {
+                'baseline': [p['id'] for p in points if p['table'] == baseline_scenario],
+                'flexible': [p['id'] for p in points if p['table'] == flexible_scenario],
+            }
+
+        elif isinstance(power_columns, (str, list)):
+            power_columns = [power_columns] if isinstance(power_columns, str) else power_columns
+            power_columns = {'baseline': power_columns, 'flexible': power_columns}
+
+        else:
+            pass
+
+        price_filename = config.get('price_signal_file_name')
+
+        return cls(
+            name=baseline_scenario if name is None else name,
+            baseline_filepath=data_directory/f'{baseline_scenario}.csv',
+            flexible_filepath=data_directory/f'{flexible_scenario}.csv',
+            timestamp_column=config.get('timestamp_identifier', 'Timestamp'),
+            power_columns=power_columns,
+            evaluation_start_timestamp=config['evaluation_timestamps']['start'],
+            evaluation_end_timestamp=config['evaluation_timestamps']['end'],
+            price_filepath=None if price_filename is None else data_directory/price_filename,
+            price_column=config.get('price_signal_identifier'),
+            shift_window=config.get('shift_window'),
+            rebound_window=config.get('rebound_window'),
+            resolution=config.get('resolution'),
+            kpis=config.get('kpis'),
+            floor_area=config.get('floor_area'),
+        )
+
+    def get_key(self) -> str:
+        """Return hash of the plan and the size and modification time of its input files."""
+
+        files = [f for f in [self.baseline_filepath, self.flexible_filepath, self.price_filepath] if f is not None]
+        stats = [(f, os.stat(f).st_size, os.stat(f).st_mtime_ns) for f in files]
+        plan = {k: v for k, v in vars(self).items()}
+
+        return hashlib.sha256(json.dumps([plan, stats], sort_keys=True, default=str).encode()).hexdigest()
+
+    def run(self, cache_directory: Union[str, Path] = None) -> List[Mapping[str, Any]]:
+        """Execute the plan steps and return result rows, reading and writing them to `cache_directory` if set."""
+
+        cache_filepath = None if cache_directory is None else os.path.join(cache_directory, f'{self.get_key()}.json')
+
+        if cache_filepath is not None and os.path.isfile(cache_filepath):
+            with open(cache_filepath) as f:
+                return json.load(f)
+
+        else:
+            pass
+
+        data = self.load()
+        data = self.align(data)
+        events = self.detect_events(data)
+        results = self.compute(data, events)
+
+        if cache_filepath is not None:
+            os.makedirs(cache_directory, exist_ok=True)
+            temporary_filepath = f'{cache_filepath}.{os.getpid()}.tmp'
+
+            with open(temporary_filepath, 'w') as f:
+                json.dump(results, f)
+
+            os.replace(temporary_filepath, cache_filepath)
+
+        else:
+            pass
+
+        return results
+
+    def load(self) -> Mapping[str, pd.DataFrame]:
+        """Return the timestamp and required columns of the scenario and price signal files."""
+
+        data = {}
+        files = [
+            ('baseline', self.baseline_filepath, self.power_columns['baseline']),
+            ('flexible', self.flexible_filepath, self.power_columns['flexible']),
+        ]
+        files += [] if self.price_filepath is None else [('price', self.price_filepath, [self.price_column])]
+
+        for key, filepath, columns in files:
+            assert len(columns) > 0, f'No electric power column found for {key} scenario.'
+            df = pd.read_csv(filepath, usecols=[self.timestamp_column] + columns)
+            df[self.timestamp_column] = pd.to_datetime(df[self.timestamp_column], errors='coerce')
+            df = df.dropna(subset=[self.timestamp_column]).set_index(self.timestamp_column)
+            data[key] = df.apply(pd.to_numeric, errors='coerce')
+
+        return data
+
+    def align(self, data: Mapping[str, pd.DataFrame]) -> pd.DataFrame:
+        """Return scenario profiles and price signal resampled to the plan resolution within the evaluation window."""
+
+        start, end = pd.Timestamp(self.evaluation_start_timestamp), pd.Timestamp(self.evaluation_end_timestamp)
+        aligned = pd.DataFrame({
+            f'{k}_electric_power_profile': data[k].sum(axis=1, min_count=1).resample(self.resolution).mean()
+            for k in ['baseline', 'flexible']
+        })
+
+        if 'price' in data:
+            hours = pd.Timedelta(self.resolution).total_seconds()/3600.0
+            aligned['price'] = data['price'][self.price_column].resample(self.resolution).mean()
+            aligned['price'] = aligned['price'].ffill()
+
+            for k in ['baseline', 'flexible']:
+                aligned[f'{k}_cost_profile'] = aligned[f'{k}_electric_power_profile']*hours*aligned['price']
+
+        else:
+            pass
+
+        aligned = aligned[(aligned.index >= start) & (aligned.index <= end)]
+        aligned = aligned.dropna(subset=['baseline_electric_power_profile', 'flexible_electric_power_profile'])
+
+        return aligned
+
+    def detect_events(self, data: pd.DataFrame) -> Mapping[str, List[Tuple[pd.Timestamp, pd.Timestamp]]]:
+        """Return the evaluation window and the shed, shift and rebound event periods.
+
+        Shed periods are time steps whose price is at or above the third quartile of the price
+        signal. Shift and rebound periods are the lower-price time steps within `shift_window`
+        hours before and `rebound_window` hours after a shed time step.
+        """
+
+        events = {'evaluation': [(pd.Timestamp(self.evaluation_start_timestamp), pd.Timestamp(self.evaluation_end_timestamp))]}
+
+        if 'price' not in data or len(data) == 0:
+            return events
+
+        else:
+            pass
+
+        timestamps = data.index
+        price = data['price'].to_numpy()
+        shed = price >= self.get_price_threshold(price[~np.isnan(price)].tolist())
+        events['shed'] = self.__get_periods(timestamps, shed)
+        steps_per_hour = pd.Timedelta('1h')/pd.Timedelta(self.resolution)
+        cumulative_shed = np.concatenate([[0], np.cumsum(shed)])
+        indices = np.arange(len(shed))
+
+        if self.shift_window is not None:
+            count = int(self.shift_window*steps_per_hour)
+            # shed time steps in (i, i + count]
+            upcoming = cumulative_shed[np.minimum(indices + count + 1, len(shed))] - cumulative_shed[indices + 1]
+            events['shift'] = self.__get_periods(timestamps, ~shed & (upcoming > 0))
+
+        else:
+            pass
+
+        if self.rebound_window is not None:
+            count = int(self.rebound_window*steps_per_hour)
+            # shed time steps in [i - count, i)
+            previous = cumulative_shed[indices] - cumulative_shed[np.maximum(indices - count, 0)]
+            events['rebound'] = self.__get_periods(timestamps, ~shed & (previous > 0))
+
+        else:
+            pass
+
+        return events
+
+    def compute(
+        self, data: pd.DataFrame, events: Mapping[str, List[Tuple[pd.Timestamp, pd.Timestamp]]]
+    ) -> List[Mapping[str, Any]]:
+        """Return a result row for each KPI value calculated for the evaluation window and each event."""
+
+        from energy_flexibility_kpis.kpi.registry import KPIRegistry
+
+        dataset = {c: data[c].to_numpy() for c in data.columns if c != 'price'}
+        dataset['timestamps'] = data.index.to_numpy()
+        dataset['floor_area'] = self.floor_area
+        signal_arguments = ['generic_signal_start_timestamp', 'generic_signal_end_timestamp']
+        results = []
+
+        for event, periods in events.items():
+            if event == 'evaluation':
+                selected = lambda k: not any(a.endswith('_start_timestamp') and a != 'evaluation_start_timestamp'\
+                    for a in k.get_calculate_arguments())
+
+            else:
+                selected = lambda k: k.CATEGORY == self.EVENT_CATEGORIES[event]\
+                    and all(a in k.get_calculate_arguments() for a in signal_arguments)
+
+            kpi_filter = lambda k: selected(k) and (self.kpis is None or k.__name__ in self.kpis)
+
+            for i, (start, end) in enumerate(periods):
+                if event == 'evaluation':
+                    arguments = {'evaluation_start_timestamp': start, 'evaluation_end_timestamp': end}
+
+                else:
+                    arguments = dict(zip(signal_arguments, [start, end]))
+
+                values = KPIRegistry.compute_all({**dataset, **arguments}, filter=kpi_filter, ignore_errors=True)
+
+                for kpi, value in values.items():
+                    results.append({
+                        'plan': self.name, 'event': event, 'event_index': i, 'start': str(start), 'end': str(end),
+                        'kpi': kpi, 'value': np.asarray(value).tolist(),
+                    })
+
+        return results
+
+    @staticmethod
+    def get_price_threshold(price_schedule: List[float]) -> float:
+        """Return the third quartile of the price schedule."""
+
+        price_schedule = sorted(price_schedule)
+        n = len(price_schedule)
+        k = (3.0*n - 1)/4
+
+        if k == int(k):
+            threshold = price_schedule[int(k) - 1]
+
+        else:
+            threshold = (price_schedule[int(k) - 1] + price_schedule[int(k)])/2
+
+        return threshold
+
+    @staticmethod
+    def __get_periods(timestamps: pd.DatetimeIndex, mask: np.ndarray) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        # start and end timestamps of runs of consecutive true time steps
+        edges = np.diff(np.concatenate([[0], mask.astype(int), [0]]))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1) - 1
+
+        return [(timestamps[s], timestamps[e]) for s, e in zip(starts, ends)]
+
+class BatchRunner:
+    r"""Compiles config files into execution plans and runs them as one batch."""
+
+    @staticmethod
+    def compile(config_filepaths: List[Union[str, Path]]) -> List[ExecutionPlan]:
+        """Return execution plan of each config file read with :py:meth:`FileHandler.read_yaml`."""
+
+        plans = []
+
+        for filepath in config_filepaths:
+            config = FileHandler.read_yaml(filepath)
+            plans.append(ExecutionPlan.compile(config, directory=Path(filepath).parent, name=Path(filepath).stem))
+
+        return plans
+
+    @classmethod
+    def run(
+        cls, config_filepaths: List[Union[str, Path]], max_workers: int = None, cache_directory: Union[str, Path] = None
+    ) -> List[Mapping[str, Any]]:
+        """Return the result rows of all config files.
+
+        Parameters
+        ----------
+        config_filepaths: List[Union[str, Path]]
+            Config files.
+        max_workers: int, optional
+            Number of processes the plans are run in. Defaults to the number of CPUs, 1 runs them in this process.
+        cache_directory: Union[str, Path], optional
+            Directory that plan results are cached in, keyed by plan and input file versions.
+        """
+
+        plans = cls.compile(config_filepaths)
+        max_workers = min(max_workers or os.cpu_count() or 1, max(len(plans), 1))
+
+        if max_workers == 1:
+            results = [p.run(cache_directory=cache_directory) for p in plans]
+
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(ExecutionPlan.run, plans, [cache_directory]*len(plans)))
+
+        return [r for plan_results in results for r in plan_results]
@@ -0,0 +1,443 @@
+"""Local HTTP KPI service.
+
+A long-running process that keeps the KPI modules imported and uploaded datasets parsed in
+memory so that clients do not pay for importing NumPy, SciPy and pandas or re-parsing their
+inputs on every calculation. It is built on the standard library HTTP server:
+
+    energy_flexibility_kpis serve --port 8000
+
+Endpoints
+---------
+GET /kpis
+    KPI catalogue, see :py:func:`load_catalogue`.
+GET /kpis/<name>
+    Catalogue entry of one KPI.
+PUT /datasets/<id>
+    Store a JSON object of :py:meth:`KPI.calculate` arguments in memory. Timestamps are parsed
+    and numeric series converted to arrays once.
+DELETE /datasets/<id>
+    Remove a stored dataset.
+POST /calculate
+    Calculate a KPI from `{"kpi": <name>, "dataset": <id, optional>, "arguments": {...}}` and
+    return `{"value": ..., "latency": {...}}`.
+GET /metrics
+    Request count and latency statistics of each KPI.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, List, Mapping, Tuple
+from energy_flexibility_kpis.base import Definition
+from energy_flexibility_kpis.catalogue import load_catalogue
+
+class KPIService(Definition):
+    r"""KPI calculation service that micro-batches concurrent requests.
+
+    Requests for the same KPI that arrive within `batch_window` seconds of each other are
+    calculated together under a shared :py:class:`VariableSetCache`. For KPIs that evaluate a
+    batch of buildings in one call, see :py:attr:`KPI.BATCH_ARGUMENTS`, requests that share every
+    other argument, e.g. timestamps and evaluation window, and whose per-building profiles have
+    equal shapes are stacked into one batched calculation. Other requests are calculated one at
+    a time, and those on the same stored dataset and evaluation window reuse one prepared
+    variable set.
+
+    Parameters
+    ----------
+    host: str, default: '127.0.0.1'
+        Address to listen on.
+    port: int, default: 8000
+        Port to listen on, 0 picks a free port.
+    batch_window: float, default: 0.005
+        Seconds to wait for more requests for the same KPI before calculating a batch.
+    max_batch_size: int, default: 64
+        Batch size that is calculated without waiting for the batch window to end.
+    metrics_size: int, default: 1000
+        Number of most recent request latencies kept per KPI.
+    """
+
+    def __init__(
+        self, host: str = None, port: int = None, batch_window: float = None, max_batch_size: int = None,
+        metrics_size: int = None
+    ):
+        super().__init__()
+        self.host = '127.0.0.1' if host is None else host
+        self.port = 8000 if port is None else port
+        self.batch_window = 0.005 if batch_window is None else batch_window
+        self.max_batch_size = 64 if max_batch_size is None else max_batch_size
+        self.metrics_size = 1000 if metrics_size is None else metrics_size
+        self.__datasets: Mapping[str, Mapping[str, Any]] = {}
+        self.__batches: Mapping[str, List[Tuple[Mapping[str, Any], Future, float]]] = {}
+        self.__latencies: Mapping[str, deque] = {}
+        self.__batch_counts: Mapping[str, int] = {}
+        self.__lock = threading.Lock()
+        self.__server = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Address the server is listening on."""
+
+        return None if self.__server is None else self.__server.server_address[:2]
+
+    def start(self) -> 'KPIService':
+        """Start serving in a background thread."""
+
+        self.__create_server()
+        threading.Thread(target=self.__server.serve_forever, daemon=True).start()
+
+        return self
+
+    def serve_forever(self):
+        """Serve in the current thread until interrupted."""
+
+        self.__create_server()
+
+        try:
+            self.__server.serve_forever()
+
+        except KeyboardInterrupt:
+            pass
+
+        finally:
+            self.__server.server_close()
+            self.__server = None
+
+    def stop(self):
+        """Stop serving."""
+
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+
+        else:
+            pass
+
+    def set_dataset(self, dataset_id: str, arguments: Mapping[str, Any]):
+        """Store dataset in memory with its timestamps parsed and numeric series as arrays."""
+
+        import numpy as np
+        import pandas as pd
+
+        dataset = {}
+
+        for k, v in arguments.items():
+            if k == 'timestamps' and isinstance(v, list) and len(v) > 0 and not isinstance(v[0], int):
+                v = pd.to_datetime(v).to_numpy()
+
+            elif isinstance(v, list) and len(v) > 0 and all(isinstance(x, (int, float)) for x in v):
+                v = np.asarray(v)
+
+            else:
+                pass
+
+            dataset[k] = v
+
+        with self.__lock:
+            self.__datasets[dataset_id] = dataset
+
+    def delete_dataset(self, dataset_id: str):
+        with self.__lock:
+            self.__datasets.pop(dataset_id)
+
+    def calculate(self, kpi: str, arguments: Mapping[str, Any] = None, dataset: str = None) -> Tuple[Any, Mapping[str, float]]:
+        """Return KPI value and request latencies in seconds once the request's batch is calculated.
+
+        Parameters
+        ----------
+        kpi: str
+            KPI class name.
+        arguments: Mapping[str, Any], optional
+            :py:meth:`KPI.calculate` arguments. They override stored dataset arguments of the same name.
+        dataset: str, optional
+            ID of a stored dataset whose arguments that the KPI takes are used.
+        """
+
+        from energy_flexibility_kpis.kpi.registry import KPIRegistry
+
+        received = time.perf_counter()
+        kpi_class = KPIRegistry.get(kpi)
+        kpi_arguments = kpi_class.get_calculate_arguments()
+
+        with self.__lock:
+            stored = {} if dataset is None else self.__datasets[dataset]
+
+        arguments = {
+            **{k: v for k, v in stored.items() if k in kpi_arguments},
+            **({} if arguments is None else arguments),
+        }
+        future = Future()
+
+        with self.__lock:
+            batch = self.__batches.setdefault(kpi, [])
+            batch.append((arguments, future, received))
+
+            if len(batch) == 1:
+                timer = threading.Timer(self.batch_window, self.__calculate_batch, args=(kpi,))
+                timer.daemon = True
+                timer.start()
+
+            elif len(batch) >= self.max_batch_size:
+                threading.Thread(target=self.__calculate_batch, args=(kpi,), daemon=True).start()
+
+            else:
+                pass
+
+        value, latency = future.result()
+        latency['total'] = time.perf_counter() - received
+
+        with self.__lock:
+            self.__latencies.setdefault(kpi, deque(maxlen=self.metrics_size)).append(latency['total'])
+
+        return value, latency
+
+    def get_metrics(self) -> Mapping[str, Mapping[str, float]]:
+        """Return request count, batch count and latency statistics in seconds of each KPI."""
+
+        import numpy as np
+
+        metrics = {}
+
+        with self.__lock:
+            latencies = {k: list(v) for k, v in self.__latencies.items()}
+            batch_counts = dict(self.__batch_counts)
+
+        for kpi, values in latencies.items():
+            metrics[kpi] = {
+                'requests': len(values),
+                'batches': batch_counts.get(kpi, 0),
+                'mean': float(np.mean(values)),
+                'p50': float(np.percentile(values, 50)),
+                'p95': float(np.percentile(values, 95)),
+                'max': float(np.max(values)),
+            }
+
+        return metrics
+
+    def __create_server(self):
+        from energy_flexibility_kpis.kpi.registry import KPIRegistry
+
+        # import KPI modules before the first request
+        KPIRegistry.discover()
+        self.__server = ThreadingHTTPServer((self.host, self.port), _RequestHandler)
+        self.__server.daemon_threads = True
+        self.__server.service = self
+
+    def __calculate_batch(self, kpi: str):
+        from energy_flexibility_kpis.kpi.registry import KPIRegistry
+        from energy_flexibility_kpis.variable import VariableSetCache
+
+        with self.__lock:
+            batch = self.__batches.pop(kpi, [])
+            self.__batch_counts[kpi] = self.__batch_counts.get(kpi, 0) + (1 if len(batch) > 0 else 0)
+
+        if len(batch) == 0:
+            return
+
+        else:
+            pass
+
+        kpi_class = KPIRegistry.get(kpi)
+        started = time.perf_counter()
+        interned = {}
+        groups = {}
+
+        # requests that only differ in their per-building arguments of equal shapes are stacked into
+        # one batched calculation
+        for i, (arguments, _, _) in enumerate(batch):
+            groups.setdefault(self.__get_group_key(kpi_class, arguments, i), []).append(batch[i])
+
+        with VariableSetCache.activate():
+            for group in groups.values():
+                if len(group) > 1:
+                    try:
+                        values = self.__calculate_group(kpi_class, [a for a, _, _ in group])
+
+                    except Exception:
+                        # calculate requests one at a time so that each gets its own error
+                        values = None
+
+                else:
+                    values = None
+
+                for i, (arguments, future, received) in enumerate(group):
+                    # equal scalar arguments, e.g. evaluation window, become the same object so that
+                    # requests on the same dataset share their variable set
+                    arguments = {
+                        k: interned.setdefault((type(v), v), v) if isinstance(v, (str, int, float)) else v
+                        for k, v in arguments.items()
+                    }
+
+                    try:
+                        value = kpi_class.calculate(**arguments) if values is None else values[i]
+                        latency = {
+                            'queue': started - received, 'calculate': time.perf_counter() - started,
+                            'batch_size': len(batch), 'group_size': len(group) if values is not None else 1,
+                        }
+                        future.set_result((value, latency))
+
+                    except Exception as e:
+                        future.set_exception(e)
+
+    @staticmethod
+    def __calculate_group(kpi_class: type, group: List[Mapping[str, Any]]) -> List[Any]:
+        arguments = {
+            **group[0],
+            **{k: [a[k] for a in group] for k in kpi_class.BATCH_ARGUMENTS if group[0].get(k) is not None},
+        }
+        value = kpi_class.calculate(**arguments)
+
+        if isinstance(value, dict):
+            values = [{k: v[i] for k, v in value.items()} for i in range(len(group))]
+
+        else:
+            values = list(value)
+
+        return values
+
+    @staticmethod
+    def __get_group_key(kpi_class: type, arguments: Mapping[str, Any], index: int) -> tuple:
+        import numpy as np
+
+        batch_arguments = {} if kpi_class.BATCH_ARGUMENTS is None else kpi_class.BATCH_ARGUMENTS
+
+        if len(batch_arguments) == 0 or any(
+            v is not None and np.ndim(v) != batch_arguments[k] for k, v in arguments.items() if k in batch_arguments
+        ):
+            # the KPI does not stack buildings or the request is already a batch
+            return (index,)
+
+        else:
+            pass
+
+        key = []
+
+        for k, v in sorted(arguments.items()):
+            if k in batch_arguments:
+                key.append((k, None if v is None else np.shape(v)))
+
+            elif v is None or isinstance(v, (str, int, float, bool)):
+                key.append((k, type(v), v))
+
+            else:
+                try:
+                    value = np.asarray(v)
+                    assert value.dtype != object
+                    key.append((k, value.dtype.str, value.shape, value.tobytes()))
+
+                except (AssertionError, ValueError, TypeError):
+                    return (index,)
+
+        return tuple(key)
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server_version = 'EnergyFlexibilityKPIs'
+
+    def do_GET(self):
+        path = self.path.rstrip('/').split('/')[1:]
+
+        if path == ['kpis']:
+            self.__respond(200, load_catalogue())
+
+        elif len(path) == 2 and path[0] == 'kpis':
+            catalogue = load_catalogue()
+
+            if path[1] in catalogue:
+                self.__respond(200, catalogue[path[1]])
+
+            else:
+                self.__respond(404, {'error': f'Unknown KPI: {path[1]}'})
+
+        elif path == ['metrics']:
+            self.__respond(200, self.server.service.get_metrics())
+
+        else:
+            self.__respond(404, {'error': f'Unknown path: {self.path}'})
+
+    def do_PUT(self):
+        path = self.path.rstrip('/').split('/')[1:]
+
+        if len(path) == 2 and path[0] == 'datasets':
+            body = self.__read_body()
+
+            if body is not None:
+                self.server.service.set_dataset(path[1], body)
+                self.__respond(204)
+
+            else:
+                pass
+
+        else:
+            self.__respond(404, {'error': f'Unknown path: {self.path}'})
+
+    def do_DELETE(self):
+        path = self.path.rstrip('/').split('/')[1:]
+
+        try:
+            assert len(path) == 2 and path[0] == 'datasets'
+            self.server.service.delete_dataset(path[1])
+            self.__respond(204)
+
+        except (AssertionError, KeyError):
+            self.__respond(404, {'error': f'Unknown path: {self.path}'})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/calculate':
+            self.__respond(404, {'error': f'Unknown path: {self.path}'})
+            return
+
+        else:
+            pass
+
+        body = self.__read_body()
+
+        if body is None:
+            return
+
+        else:
+            pass
+
+        try:
+            value, latency = self.server.service.calculate(body['kpi'], body.get('arguments'), body.get('dataset'))
+
+        except KeyError as e:
+            self.__respond(400, {'error': f'Unknown KPI, dataset or missing key: {e}'})
+
+        except Exception as e:
+            self.__respond(422, {'error': f'{type(e).__name__}: {e}'})
+
+        else:
+            import numpy as np
+            self.__respond(200, {'value': np.asarray(value).tolist(), 'latency': latency})
+
+    def log_message(self, format: str, *args):
+        pass
+
+    def __read_body(self) -> Mapping[str, Any]:
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length))
+            assert isinstance(body, dict)
+
+        except (ValueError, AssertionError):
+            self.__respond(400, {'error': 'Request body must be a JSON object.'})
+            body = None
+
+        return body
+
+    def __respond(self, status: int, body: Any = None):
+        content = b'' if body is None else json.dumps(body).encode()
+        self.send_response(status)
+
+        if body is not None:
+            self.send_header('Content-Type', 'application/json')
+
+        else:
+            pass
+
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
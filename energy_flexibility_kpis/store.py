@@ -0,0 +1,276 @@
+"""Persistent KPI result store.
+
+KPI values are stored in a local SQLite database keyed by a hash of the KPI class, the library
+version and the :py:meth:`KPI.calculate` arguments, so that re-running a batch only calculates
+the buildings whose inputs changed:
+
+    with ResultStore().activate():
+        values = [PeakPowerReduction.calculate(**arguments) for arguments in buildings]
+"""
+
+import contextlib
+import contextvars
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+from typing import Any, Callable, Iterator, Mapping, Union
+import numpy as np
+from energy_flexibility_kpis import __version__
+from energy_flexibility_kpis.base import Definition
+
+class ResultStore(Definition):
+    r"""On-disk KPI result cache with least-recently-used eviction.
+
+    While the store is active (see :py:meth:`activate`), :py:meth:`KPI.calculate` returns the
+    stored value if the same KPI was calculated on equal inputs before, and stores the value it
+    calculates otherwise. Array inputs are hashed from their raw buffers so looking a building up
+    costs one pass over its data. The least recently used values are evicted once the stored
+    values exceed `max_size` bytes.
+
+    Parameters
+    ----------
+    filepath: Union[str, os.PathLike], optional
+        SQLite database file. Defaults to `results.sqlite` in the user cache directory.
+    max_size: int, default: 536870912
+        Maximum total size in bytes of the stored values.
+    """
+
+    __CURRENT = contextvars.ContextVar('result_store', default=None)
+    __CALCULATING = contextvars.ContextVar('result_store_calculating', default=False)
+    # access counter that orders values from least to most recently used
+    __NEXT_ACCESS = 'SELECT COALESCE(MAX(accessed), 0) + 1 FROM results'
+
+    def __init__(self, filepath: Union[str, os.PathLike] = None, max_size: int = None):
+        super().__init__()
+        self.filepath = filepath
+        self.max_size = 512*1024*1024 if max_size is None else max_size
+        self.__local = threading.local()
+
+    @property
+    def filepath(self) -> Union[str, os.PathLike]:
+        return self.__filepath
+
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
+
+    @filepath.setter
+    def filepath(self, value: Union[str, os.PathLike]):
+        if value is None:
+            cache_directory = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+            value = os.path.join(cache_directory, 'energy_flexibility_kpis', 'results.sqlite')
+
+        else:
+            pass
+
+        self.__filepath = value
+
+    @max_size.setter
+    def max_size(self, value: int):
+        assert value > 0, 'max_size must be greater than 0.'
+        self.__max_size = value
+
+    @classmethod
+    def current(cls) -> 'ResultStore':
+        """Return the active store or `None`."""
+
+        return cls.__CURRENT.get()
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator['ResultStore']:
+        """Context manager that makes :py:meth:`KPI.calculate` consult this store in the current context."""
+
+        token = self.__CURRENT.set(self)
+
+        try:
+            yield self
+
+        finally:
+            self.__CURRENT.reset(token)
+
+    def calculate(self, kpi: type, **kwargs) -> Any:
+        """Return stored `kpi` value for the `kwargs` inputs, calculating and storing it if there is none."""
+
+        key = self.get_key(kpi, kwargs)
+        found, value = self.get(key)
+
+        if not found:
+            token = self.__CALCULATING.set(True)
+
+            try:
+                value = kpi.calculate(**kwargs)
+
+            finally:
+                self.__CALCULATING.reset(token)
+
+            self.set(key, kpi, value)
+
+        else:
+            pass
+
+        return value
+
+    def get(self, key: str) -> tuple:
+        """Return whether `key` is stored and its value, and mark it as recently used."""
+
+        connection = self.__get_connection()
+        row = connection.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+
+        if row is None:
+            found, value = False, None
+
+        else:
+            found, value = True, pickle.loads(row[0])
+
+            with connection:
+                connection.execute(f'UPDATE results SET accessed = ({self.__NEXT_ACCESS}) WHERE key = ?', (key,))
+
+        return found, value
+
+    def set(self, key: str, kpi: type, value: Any):
+        """Store `value` of `kpi` under `key` and evict least recently used values over :py:attr:`max_size`."""
+
+        content = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        connection = self.__get_connection()
+
+        with connection:
+            connection.execute(
+                f'INSERT OR REPLACE INTO results (key, kpi, value, size, accessed) VALUES (?, ?, ?, ?, ({self.__NEXT_ACCESS}))',
+                (key, self.__get_kpi_name(kpi), content, len(content))
+            )
+            size = connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+
+            if size > self.max_size:
+                # delete the least recently used values until the rest fit
+                connection.execute(
+                    'DELETE FROM results WHERE key IN ('
+                        'SELECT key FROM ('
+                            'SELECT key, SUM(size) OVER (ORDER BY accessed DESC, key) AS cumulative_size FROM results'
+                        ') WHERE cumulative_size > ?'
+                    ')', (self.max_size,)
+                )
+
+            else:
+                pass
+
+    def invalidate(self, kpi: Union[type, str] = None) -> int:
+        """Delete stored values of `kpi`, or all stored values if `kpi` is `None`, and return how many were deleted."""
+
+        connection = self.__get_connection()
+
+        with connection:
+            if kpi is None:
+                count = connection.execute('DELETE FROM results').rowcount
+
+            else:
+                count = connection.execute('DELETE FROM results WHERE kpi = ?', (self.__get_kpi_name(kpi),)).rowcount
+
+        return count
+
+    def get_size(self) -> int:
+        """Return total size in bytes of the stored values."""
+
+        return self.__get_connection().execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+
+    def close(self):
+        """Close the connection of the current thread."""
+
+        connection = getattr(self.__local, 'connection', None)
+
+        if connection is not None:
+            connection.close()
+            self.__local.connection = None
+
+        else:
+            pass
+
+    @classmethod
+    def get_key(cls, kpi: type, arguments: Mapping[str, Any]) -> str:
+        """Return hash of the `kpi` class, library version and :py:meth:`KPI.calculate` `arguments`."""
+
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f'{cls.__get_kpi_name(kpi)}:{__version__}'.encode())
+
+        for name in sorted(arguments):
+            value = arguments[name]
+
+            if value is None:
+                continue
+
+            else:
+                digest.update(name.encode())
+                cls.__update_digest(digest, value)
+
+        return digest.hexdigest()
+
+    @classmethod
+    def _is_calculating(cls) -> bool:
+        return cls.__CALCULATING.get()
+
+    @staticmethod
+    def __update_digest(digest: Any, value: Any):
+        if isinstance(value, list):
+            array = np.asarray(value)
+            value = value if array.dtype == object else array
+
+        else:
+            pass
+
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            digest.update(f'{value.dtype.str}{value.shape}'.encode())
+            digest.update(np.ascontiguousarray(value).data)
+
+        elif isinstance(value, (str, int, float, bool, np.generic)):
+            digest.update(f'{type(value).__name__}:{value!r}'.encode())
+
+        else:
+            digest.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def __get_kpi_name(kpi: Union[type, str]) -> str:
+        return kpi if isinstance(kpi, str) else f'{kpi.__module__}.{kpi.__qualname__}'
+
+    def __get_connection(self) -> sqlite3.Connection:
+        # one connection per thread as SQLite connections cannot be shared between threads
+        connection = getattr(self.__local, 'connection', None)
+
+        if connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.filepath)), exist_ok=True)
+            connection = sqlite3.connect(self.filepath, timeout=30.0)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                    'key TEXT PRIMARY KEY, kpi TEXT NOT NULL, value BLOB NOT NULL, size INTEGER NOT NULL, accessed INTEGER NOT NULL'
+                ')'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS results_kpi ON results (kpi)')
+            connection.execute('CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)')
+            self.__local.connection = connection
+
+        else:
+            pass
+
+        return connection
+
+def store_calculate(function: Callable) -> Callable:
+    """Wrap a KPI `calculate` function so that results are looked up in and saved to the active :py:class:`ResultStore`."""
+
+    @functools.wraps(function)
+    def wrapper(cls, *args, **kwargs):
+        store = ResultStore.current()
+
+        # nested calculations, e.g. super().calculate of a KPI subclass, are part of the outer result
+        if store is None or ResultStore._is_calculating():
+            return function(cls, *args, **kwargs)
+
+        else:
+            pass
+
+        kwargs = {**dict(zip(cls.get_calculate_arguments(), args)), **kwargs}
+
+        return store.calculate(cls, **kwargs)
+
+    return wrapper
@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+from energy_flexibility_kpis.activation import ActivationIntervals, ActivationMatrix
+
+class test_ActivationMatrix(unittest.TestCase):
+    def setUp(self):
+        self.values = np.random.RandomState(0).uniform(size=(9, 37)) < 0.4
+
+    def test_get_active_count(self):
+        # given
+        activation = ActivationMatrix.from_boolean(self.values, batch_size=4)
+
+        for start, end in [(0, 37), (3, 5), (8, 16), (7, 9), (30, 100), (10, 3)]:
+            # result
+            result = activation.get_active_count(start, end, batch_size=2)
+
+            # expected
+            expected = self.values[:, start:max(start, end)].sum(axis=1)
+
+            # assert
+            np.testing.assert_array_equal(result, expected)
+
+class test_ActivationIntervals(unittest.TestCase):
+    def setUp(self):
+        self.values = np.random.RandomState(0).uniform(size=(9, 37)) < 0.4
+        self.values[0] = True
+        self.values[1] = False
+
+    def test_from_boolean(self):
+        # result
+        result = ActivationIntervals.from_boolean([[False, True, True, False, True], [True, False, False, False, True]])
+
+        # expected
+        expected = [0, 2, 4], [1, 4, 0, 4], [3, 5, 1, 5]
+
+        # assert
+        np.testing.assert_array_equal(result.offsets, expected[0])
+        np.testing.assert_array_equal(result.starts, expected[1])
+        np.testing.assert_array_equal(result.ends, expected[2])
+
+    def test_get_active_count(self):
+        # given
+        activation = ActivationIntervals.from_boolean(self.values, batch_size=4)
+
+        for start, end in [(0, 37), (3, 5), (8, 16), (30, 100), (10, 3)]:
+            # result
+            result = activation.get_active_count(start, end)
+
+            # expected
+            expected = self.values[:, start:max(start, end)].sum(axis=1)
+
+            # assert
+            np.testing.assert_array_equal(result, expected)
+
+if __name__ == '__main__':
+    unittest.main()
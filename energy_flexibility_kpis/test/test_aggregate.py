@@ -0,0 +1,78 @@
+import unittest
+import numpy as np
+from energy_flexibility_kpis.aggregate import PortfolioAggregate
+
+class test_PortfolioAggregate(unittest.TestCase):
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        self.upward = random_state.uniform(0.0, 2.0, (12, 24))
+        self.downward = random_state.uniform(0.0, 2.0, (12, 24))
+
+    def get_synergy_factor(self, members):
+        capacity = PortfolioAggregate.get_capacity(self.upward[members].sum(axis=0), self.downward[members].sum(axis=0))
+        individual_capacity = PortfolioAggregate.get_capacity(self.upward[members], self.downward[members]).sum()
+
+        return capacity/individual_capacity - 1.0
+
+    def test_add_and_remove(self):
+        # given
+        portfolio = PortfolioAggregate(self.upward, self.downward)
+
+        # result
+        for i in [0, 3, 5, 7]:
+            portfolio.add(i)
+
+        portfolio.remove(3)
+        result = portfolio.synergy_factor
+
+        # expected
+        expected = self.get_synergy_factor([0, 5, 7])
+
+        # assert
+        self.assertAlmostEqual(result, expected)
+        self.assertEqual(portfolio.members.sum(), 3)
+
+    def test_get_subset_synergy_factors(self):
+        # given
+        portfolio = PortfolioAggregate(self.upward, self.downward)
+        subsets = [[0, 1], [2, 3, 4], list(range(12))]
+
+        # result
+        result = portfolio.get_subset_synergy_factors(subsets, batch_size=2)
+
+        # expected
+        expected = [self.get_synergy_factor(s) for s in subsets]
+
+        # assert
+        np.testing.assert_allclose(result, expected)
+
+    def test_get_prefix_synergy_factors(self):
+        # given
+        portfolio = PortfolioAggregate(self.upward, self.downward)
+        order = [4, 2, 9, 0]
+
+        # result
+        result = portfolio.get_prefix_synergy_factors(order)
+
+        # expected
+        expected = [self.get_synergy_factor(order[:i + 1]) for i in range(len(order))]
+
+        # assert
+        np.testing.assert_allclose(result, expected)
+
+    def test_get_addition_synergy_factors(self):
+        # given
+        portfolio = PortfolioAggregate(self.upward, self.downward, members=[1, 6])
+        candidates = [0, 2, 11]
+
+        # result
+        result = portfolio.get_addition_synergy_factors(candidates)
+
+        # expected
+        expected = [self.get_synergy_factor([1, 6, c]) for c in candidates]
+
+        # assert
+        np.testing.assert_allclose(result, expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import numpy as np
+from energy_flexibility_kpis.kpi.base import KPI
+from energy_flexibility_kpis.kpi.energy_flexibility.energy_or_average_power_load_shedding import LoadFactor
+from energy_flexibility_kpis.kpi.energy_flexibility.peak_power_shedding import PeakPowerReduction
+
+class test_KPI(unittest.TestCase):
+    def test_info_is_memoised_per_class(self):
+        # result
+        info = LoadFactor.info()
+
+        # assert
+        self.assertEqual(LoadFactor.info(), info)
+        self.assertNotEqual(PeakPowerReduction.info(), info)
+        self.assertEqual(info['name'], LoadFactor.NAME)
+        self.assertEqual(PeakPowerReduction.info()['name'], PeakPowerReduction.NAME)
+        self.assertEqual(
+            [a['snake_case_name'] for a in info['calculation_arguments']],
+            ['generic_electric_power_profile', 'timestamps', 'evaluation_start_timestamp', 'evaluation_end_timestamp']
+        )
+
+    def test_info_copy_can_be_modified(self):
+        # given
+        info = LoadFactor.info()
+
+        # result
+        info['unit'] = 'modified'
+        info['stakeholders'].append('modified')
+        info['calculation_arguments'][0]['name'] = 'modified'
+
+        # assert
+        self.assertEqual(LoadFactor.info()['unit'], str(LoadFactor.UNIT))
+        self.assertEqual(LoadFactor.info()['stakeholders'], [s.value for s in LoadFactor.STAKEHOLDERS])
+        self.assertEqual(LoadFactor.info()['calculation_arguments'][0]['name'], 'generic electric power profile')
+
+    def test_subclass_does_not_inherit_info(self):
+        # given
+        LoadFactor.info()
+
+        class CustomLoadFactor(LoadFactor):
+            NAME = 'custom load factor'
+
+        # assert
+        self.assertEqual(CustomLoadFactor.info()['name'], 'custom load factor')
+        self.assertEqual(LoadFactor.info()['name'], LoadFactor.NAME)
+        self.assertIs(CustomLoadFactor.get_calculate_arguments(), CustomLoadFactor.get_calculate_arguments())
+        self.assertIn('timestamps', KPI.get_calculate_arguments())
+
+    def test_get_batch(self):
+        # given
+        timestamps = [0, 1, 2, 3]
+        zone_temperature_profile = [[[20.0, 21.0]]*4, [[22.0, 23.0]]*4]
+
+        # result
+        profiles, vs, batched = KPI.get_batch(
+            {'zone_temperature_profile': zone_temperature_profile, 'cooling_setpoints': [[24.0, 24.0]]*4, 'heating_setpoints': None},
+            ndim=2, timestamps=timestamps, evaluation_start_timestamp=1,
+        )
+        single_profiles, _, single_batched = KPI.get_batch(
+            {'generic_electric_power_profile': [1.0, 2.0, 3.0, 4.0], 'electricity_price_profile': [0.1]*4}
+        )
+
+        # assert
+        self.assertTrue(batched)
+        self.assertEqual(profiles['zone_temperature_profile'].shape, (2, 4, 2))
+        self.assertEqual(profiles['cooling_setpoints'].shape, (1, 4, 2))
+        self.assertIsNone(profiles['heating_setpoints'])
+        np.testing.assert_array_equal(vs.evaluation_mask, [False, True, True, True])
+        self.assertEqual(KPI.get_timestep_length(vs), 1.0)
+        self.assertFalse(single_batched)
+        self.assertEqual(single_profiles['generic_electric_power_profile'].shape, (1, 4))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import json
+import os
+import sqlite3
+import tempfile
+from energy_flexibility_kpis.brick import BrickInputResolver
+
+class test_BrickInputResolver(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.model_filepath = os.path.join(self.directory.name, 'model.ttl')
+        self.index_filepath = os.path.join(self.directory.name, 'index.json')
+
+        with open(self.model_filepath, 'w') as f:
+            f.write('@prefix brick: <https://brickschema.org/schema/Brick#> .\n')
+
+        # index entry as written after the model is resolved once so that rdflib is not needed
+        self.resolver = BrickInputResolver(self.model_filepath, index_filepath=self.index_filepath)
+        points = [
+            {'class': 'Electric_Power_Sensor', 'id': 'HP_Pel', 'table': 'baseline'},
+            {'class': 'Electric_Power_Sensor', 'id': 'Pump_Pel', 'table': 'baseline'},
+            {'class': 'Electric_Power_Sensor', 'id': 'HP_Pel', 'table': 'flexible'},
+            {'class': 'Zone_Air_Temperature_Sensor', 'id': 'Zone1_T', 'table': 'flexible'},
+            {'class': 'Zone_Air_Temperature_Sensor', 'id': 'Zone2_T', 'table': 'flexible'},
+        ]
+
+        with open(self.index_filepath, 'w') as f:
+            json.dump({self.resolver.get_key(): points}, f)
+
+        self.connection = sqlite3.connect(':memory:')
+        self.connection.execute('CREATE TABLE baseline ("Timestamp" TEXT, HP_Pel REAL, Pump_Pel REAL)')
+        self.connection.execute('CREATE TABLE flexible ("Timestamp" TEXT, HP_Pel REAL, Zone1_T REAL, Zone2_T REAL)')
+        self.connection.executemany('INSERT INTO baseline VALUES (?, ?, ?)', [('t1', 1.0, 0.5), ('t2', 2.0, 0.5), ('t3', 3.0, 0.5)])
+        self.connection.executemany(
+            'INSERT INTO flexible VALUES (?, ?, ?, ?)', [('t1', 0.5, 20.0, 21.0), ('t2', 1.5, 20.5, 21.5), ('t3', 4.0, 21.0, 22.0)]
+        )
+
+    def tearDown(self):
+        self.connection.close()
+        self.directory.cleanup()
+
+    def test_resolve(self):
+        # result
+        result = self.resolver.resolve(self.connection, 'baseline', 'flexible', evaluation_start_timestamp='t2')
+
+        # expected
+        expected = {
+            'timestamps': ['t2', 't3'],
+            'baseline_electric_power_profile': [2.5, 3.5],
+            'flexible_electric_power_profile': [1.5, 4.0],
+            'zone_temperature_profile': [[20.5, 21.5], [21.0, 22.0]],
+        }
+
+        # assert
+        self.assertEqual(result, expected)
+
+    def test_resolve_missing_values(self):
+        # given
+        self.connection.execute("UPDATE baseline SET Pump_Pel = NULL WHERE \"Timestamp\" = 't3'")
+        self.connection.execute("DELETE FROM flexible WHERE \"Timestamp\" = 't2'")
+
+        # result
+        result = self.resolver.resolve(self.connection, 'baseline', 'flexible')
+
+        # assert
+        self.assertEqual(result['baseline_electric_power_profile'], [1.5, 2.5, None])
+        self.assertEqual(result['flexible_electric_power_profile'], [0.5, None, 4.0])
+        self.assertEqual(result['zone_temperature_profile'], [[20.0, 21.0], [None, None], [21.0, 22.0]])
+
+    def test_get_key(self):
+        # given
+        points = self.resolver.get_points()
+        key = self.resolver.get_key()
+
+        with open(self.model_filepath, 'a') as f:
+            f.write('# changed\n')
+
+        # result
+        result = self.resolver.get_key()
+
+        # assert
+        self.assertEqual(len(points), 5)
+        self.assertNotEqual(result, key)
+
+if __name__ == '__main__':
+    unittest.main()
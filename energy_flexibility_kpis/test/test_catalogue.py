@@ -0,0 +1,29 @@
+import unittest
+import subprocess
+import sys
+from energy_flexibility_kpis.catalogue import build_catalogue, get_kpi, load_catalogue
+from energy_flexibility_kpis.kpi.energy_flexibility.energy_or_average_power_load_shedding import LoadFactor
+
+class test_Catalogue(unittest.TestCase):
+    def test_up_to_date(self):
+        # assert
+        self.assertEqual(load_catalogue(), build_catalogue(), 'Outdated catalogue. Run python -m energy_flexibility_kpis.catalogue.')
+
+    def test_get_kpi(self):
+        # assert
+        self.assertIs(get_kpi('LoadFactor'), LoadFactor)
+        self.assertEqual(load_catalogue()['LoadFactor']['name'], LoadFactor.NAME)
+
+    def test_load_without_heavy_dependencies(self):
+        # given
+        code = 'import sys; from energy_flexibility_kpis.catalogue import load_catalogue; load_catalogue();'\
+            ' print(",".join(m for m in ["numpy", "scipy", "pandas"] if m in sys.modules))'
+
+        # result
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout.strip()
+
+        # assert
+        self.assertEqual(result, '')
+
+if __name__ == '__main__':
+    unittest.main()
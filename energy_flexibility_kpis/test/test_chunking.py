@@ -0,0 +1,107 @@
+import unittest
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import os
+from energy_flexibility_kpis.chunking import ChunkedDataset, ChunkedEvaluator
+from energy_flexibility_kpis.kpi.energy_flexibility.demand_response_costs_or_savings import FlexibilitySavingsIndex
+from energy_flexibility_kpis.kpi.energy_flexibility.demand_response_energy_efficiency import EnergySavingsOfDemandResponse
+from energy_flexibility_kpis.kpi.energy_flexibility.energy_or_average_power_load_shedding import AverageDemandDecrease, LoadFactor
+from energy_flexibility_kpis.kpi.energy_flexibility.peak_power_shedding import PeakPowerReduction
+
+# get the directory of the current file
+dir_path = os.path.dirname(os.path.realpath(__file__))
+
+class test_ChunkedEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.filepath = os.path.join(dir_path, 'data_24hr_hourly.csv')
+        data = pd.read_csv(self.filepath)
+        self.baseline_electric_power_profile = data['baseline_power'].tolist()
+        self.flexible_electric_power_profile = data['flexible_power'].tolist()
+        self.timestamps = pd.to_datetime(data['timestamp']).tolist()
+        self.columns = {
+            'baseline_electric_power_profile': 'baseline_power',
+            'flexible_electric_power_profile': 'flexible_power',
+            'timestamps': 'timestamp',
+        }
+
+    def test_calculate_matches_in_memory(self):
+        # given
+        evaluation_start_timestamp = datetime(2022, 1, 1, 6, 0)
+        evaluation_end_timestamp = datetime(2022, 1, 1, 20, 0)
+
+        for chunksize in [1, 5, 7, 24]:
+            dataset = ChunkedDataset.from_csv(self.filepath, self.columns, chunksize=chunksize)
+
+            for kpi in [EnergySavingsOfDemandResponse, PeakPowerReduction]:
+                # result
+                result = ChunkedEvaluator.calculate(
+                    kpi,
+                    dataset,
+                    evaluation_start_timestamp=evaluation_start_timestamp,
+                    evaluation_end_timestamp=evaluation_end_timestamp,
+                )
+
+                # expected
+                expected = kpi.calculate(
+                    baseline_electric_power_profile=self.baseline_electric_power_profile,
+                    flexible_electric_power_profile=self.flexible_electric_power_profile,
+                    timestamps=self.timestamps,
+                    evaluation_start_timestamp=evaluation_start_timestamp,
+                    evaluation_end_timestamp=evaluation_end_timestamp,
+                )
+
+                # assert
+                self.assertAlmostEqual(result, expected, 6)
+
+    def test_calculate_with_signal_window(self):
+        # given
+        dataset = ChunkedDataset.from_csv(self.filepath, self.columns, chunksize=4)
+        generic_signal_start_timestamp = datetime(2022, 1, 1, 13, 0)
+        generic_signal_end_timestamp = datetime(2022, 1, 1, 15, 0)
+
+        # result
+        result = ChunkedEvaluator.calculate(
+            AverageDemandDecrease,
+            dataset,
+            generic_signal_start_timestamp=generic_signal_start_timestamp,
+            generic_signal_end_timestamp=generic_signal_end_timestamp,
+        )
+
+        # expected
+        expected = AverageDemandDecrease.calculate(
+            self.baseline_electric_power_profile,
+            self.flexible_electric_power_profile,
+            generic_signal_start_timestamp,
+            generic_signal_end_timestamp,
+            timestamps=self.timestamps,
+        )
+
+        # assert
+        self.assertAlmostEqual(result, expected, 6)
+
+    def test_calculate_building_blocks(self):
+        # given
+        rng = np.random.default_rng(0)
+        baseline_cost_profile = rng.random((3, 50))
+        flexible_cost_profile = rng.random((3, 50))
+        generic_electric_power_profile = rng.random((3, 50))
+        dataset = ChunkedDataset.from_arrays({
+            'baseline_cost_profile': baseline_cost_profile,
+            'flexible_cost_profile': flexible_cost_profile,
+        }, chunksize=9)
+        power_dataset = ChunkedDataset.from_arrays({'generic_electric_power_profile': generic_electric_power_profile}, chunksize=9)
+
+        # result
+        savings_result = ChunkedEvaluator.calculate(FlexibilitySavingsIndex, dataset, evaluation_start_timestamp=10)
+        load_factor_result = ChunkedEvaluator.calculate(LoadFactor, power_dataset)
+
+        # assert
+        for b in range(3):
+            self.assertAlmostEqual(savings_result[b], FlexibilitySavingsIndex.calculate(
+                baseline_cost_profile[b].tolist(), flexible_cost_profile[b].tolist(), evaluation_start_timestamp=10
+            ), 10)
+            self.assertAlmostEqual(load_factor_result[b], LoadFactor.calculate(generic_electric_power_profile[b].tolist()), 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+from datetime import datetime
+import importlib.util
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from energy_flexibility_kpis.chunking import ChunkedDataset, ChunkedEvaluator
+from energy_flexibility_kpis.database import DuckDBDataset
+from energy_flexibility_kpis.kpi.energy_flexibility.demand_response_energy_efficiency import EnergySavingsOfDemandResponse
+from energy_flexibility_kpis.kpi.energy_flexibility.peak_power_shedding import PeakPowerReduction
+
+@unittest.skipUnless(importlib.util.find_spec('duckdb') is not None, 'duckdb is required for DuckDB datasets.')
+class test_DuckDBDataset(unittest.TestCase):
+    def setUp(self):
+        import duckdb
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.database = os.path.join(self.directory.name, 'data.duckdb')
+        rng = np.random.default_rng(0)
+        length = 5760
+        timestamps = pd.date_range('2022-01-01 00:00:00', periods=length, freq='15s')
+        self.data = pd.concat([
+            pd.DataFrame({
+                'building': b,
+                'Timestamp': timestamps,
+                'baseline_power': 2.0 + rng.random(length),
+                'flexible_power': 1.5 + rng.random(length),
+                'unused': rng.random(length),
+            })
+            for b in ['b1', 'b2']
+        ], ignore_index=True)
+
+        with duckdb.connect(self.database) as connection:
+            connection.register('data_df', self.data)
+            connection.execute('CREATE TABLE readings AS SELECT * FROM data_df')
+
+        self.columns = {
+            'timestamps': 'Timestamp',
+            'baseline_electric_power_profile': 'baseline_power',
+            'flexible_electric_power_profile': 'flexible_power',
+        }
+        self.dataset = DuckDBDataset(self.database, 'readings', self.columns, building_column='building')
+        self.evaluation_start_timestamp = datetime(2022, 1, 1, 6, 0)
+        self.evaluation_end_timestamp = datetime(2022, 1, 1, 20, 0)
+
+    def tearDown(self):
+        DuckDBDataset.close_connections()
+        self.directory.cleanup()
+
+    def get_expected(self, kpi, building_id):
+        data = self.data[self.data['building'] == building_id]
+
+        return kpi.calculate(
+            baseline_electric_power_profile=data['baseline_power'].tolist(),
+            flexible_electric_power_profile=data['flexible_power'].tolist(),
+            timestamps=data['Timestamp'].tolist(),
+            evaluation_start_timestamp=self.evaluation_start_timestamp,
+            evaluation_end_timestamp=self.evaluation_end_timestamp,
+        )
+
+    def test_build_query(self):
+        # result
+        query, parameters = self.dataset.build_query(
+            ['timestamps', 'flexible_electric_power_profile'], evaluation_start_timestamp=self.evaluation_start_timestamp,
+            evaluation_end_timestamp=self.evaluation_end_timestamp, building_id='b2'
+        )
+
+        # expected
+        expected = 'SELECT "Timestamp" AS "timestamps", "flexible_power" AS "flexible_electric_power_profile",'\
+            ' "building" AS "__building" FROM "readings"'\
+            ' WHERE "Timestamp" >= ? AND "Timestamp" <= ? AND "building" = ? ORDER BY "building", "Timestamp"'
+
+        # assert
+        self.assertEqual(query, expected)
+        self.assertEqual(parameters, [self.evaluation_start_timestamp, self.evaluation_end_timestamp, 'b2'])
+
+    def test_get_arguments(self):
+        # result
+        result = self.dataset.get_arguments(
+            ['timestamps', 'flexible_electric_power_profile'], evaluation_start_timestamp=self.evaluation_start_timestamp,
+            evaluation_end_timestamp=self.evaluation_end_timestamp, building_id='b2'
+        )
+
+        # expected
+        data = self.data[
+            (self.data['building'] == 'b2')
+            & (self.data['Timestamp'] >= self.evaluation_start_timestamp)
+            & (self.data['Timestamp'] <= self.evaluation_end_timestamp)
+        ]
+
+        # assert
+        self.assertEqual(list(result.keys()), ['timestamps', 'flexible_electric_power_profile'])
+        np.testing.assert_array_equal(result['timestamps'], data['Timestamp'].values)
+        np.testing.assert_allclose(result['flexible_electric_power_profile'], data['flexible_power'].values)
+
+    def test_calculate(self):
+        for kpi in [EnergySavingsOfDemandResponse, PeakPowerReduction]:
+            # result
+            result = self.dataset.calculate(
+                kpi, evaluation_start_timestamp=self.evaluation_start_timestamp,
+                evaluation_end_timestamp=self.evaluation_end_timestamp, building_id='b1'
+            )
+
+            # expected
+            expected = self.get_expected(kpi, 'b1')
+
+            # assert
+            self.assertAlmostEqual(result, expected, 6)
+
+    def test_to_chunked_dataset(self):
+        # given
+        source = self.dataset.to_chunked_dataset(chunksize=2048)
+        chunks = []
+
+        def record():
+            for building_id, chunk in source:
+                chunks.append(chunk)
+                yield building_id, chunk
+
+        dataset = ChunkedDataset(record)
+
+        for kpi in [EnergySavingsOfDemandResponse, PeakPowerReduction]:
+            chunks.clear()
+
+            # result
+            result = ChunkedEvaluator.calculate(
+                kpi, dataset, evaluation_start_timestamp=self.evaluation_start_timestamp,
+                evaluation_end_timestamp=self.evaluation_end_timestamp,
+            )
+
+            # assert
+            self.assertGreater(len(chunks), 2)
+            self.assertTrue(all(len(c['timestamps']) <= 2048 for c in chunks))
+            self.assertEqual(set(result.keys()), {'b1', 'b2'})
+
+            for building_id, value in result.items():
+                self.assertAlmostEqual(value, self.get_expected(kpi, building_id), 6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 from datetime import datetime
 import energy_flexibility_kpis.kpi.energy_flexibility.demand_profile_reshaping as demand_profile_reshaping
+from energy_flexibility_kpis.model import RCModel
 import pandas as pd
 import numpy as np
 import os
@@ -46,5 +47,68 @@ class test_Ramp(unittest.TestCase):
         self.assertTrue(np.isnan(result[0]))
         np.testing.assert_allclose(result[1:], expected[1:], rtol=1e-3)
 
+class test_FlexibilityMap(unittest.TestCase):
+    def setUp(self):
+        self.outdoor_air_temperature_profile = (5.0 + 5.0*np.sin(np.arange(24)/24*2*np.pi)).tolist()
+        self.electricity_price_profile = [0.4 if 16 <= i < 20 else 0.1 for i in range(24)]
+        self.heating_setpoints = [20.0]*24
+        self.cooling_setpoints = [24.0]*24
+        self.model = RCModel(resistance=5.0, capacitance=10.0, maximum_power=5.0, efficiency=3.0, initial_temperature=21.0)
+
+    def test_calculate(self):
+        # result
+        result = demand_profile_reshaping.FlexibilityMap.calculate(
+            self.model, self.outdoor_air_temperature_profile, self.electricity_price_profile,
+            self.heating_setpoints, self.cooling_setpoints,
+        )
+        upward = np.array(result['upward'])
+        downward = np.array(result['downward'])
+
+        # assert
+        self.assertEqual(upward.shape, (24,))
+        self.assertTrue(np.all(upward >= 0.0) and np.all(downward >= 0.0))
+        # the heat pump can always be run at full or zero power in a timestep
+        np.testing.assert_allclose(upward + downward, self.model.maximum_power, atol=1e-6)
+        # cheap energy is stored ahead of the high price period so there is little left to add
+        self.assertLess(upward[15], upward[0])
+
+    def test_calculate_batch(self):
+        # given
+        models = [self.model, RCModel(resistance=5.0, capacitance=10.0, maximum_power=0.0, initial_temperature=21.0)]
+
+        # result
+        result = demand_profile_reshaping.FlexibilityMap.calculate(
+            models, self.outdoor_air_temperature_profile, self.electricity_price_profile,
+            [self.heating_setpoints, [0.0]*24], self.cooling_setpoints,
+        )
+        single = demand_profile_reshaping.FlexibilityMap.calculate(
+            self.model, self.outdoor_air_temperature_profile, self.electricity_price_profile,
+            self.heating_setpoints, self.cooling_setpoints,
+        )
+
+        # assert
+        np.testing.assert_allclose(result['upward'][0], single['upward'], atol=1e-6)
+        np.testing.assert_allclose(result['downward'][0], single['downward'], atol=1e-6)
+        self.assertEqual(result['upward'][1], [0.0]*24)
+
+    def test_calculate_batch_infeasible(self):
+        # given
+        models = [self.model, self.model]
+
+        # result
+        result = demand_profile_reshaping.FlexibilityMap.calculate(
+            models, self.outdoor_air_temperature_profile, self.electricity_price_profile,
+            [[26.0]*24, self.heating_setpoints], self.cooling_setpoints,
+        )
+        single = demand_profile_reshaping.FlexibilityMap.calculate(
+            self.model, self.outdoor_air_temperature_profile, self.electricity_price_profile,
+            self.heating_setpoints, self.cooling_setpoints,
+        )
+
+        # assert
+        self.assertTrue(np.all(np.isnan(result['upward'][0])) and np.all(np.isnan(result['downward'][0])))
+        np.testing.assert_allclose(result['upward'][1], single['upward'], atol=1e-6)
+        np.testing.assert_allclose(result['downward'][1], single['downward'], atol=1e-6)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
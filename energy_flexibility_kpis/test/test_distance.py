@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+from energy_flexibility_kpis.distance import dtw_distance, euclidean_distance
+
+class test_dtw_distance(unittest.TestCase):
+    @staticmethod
+    def get_brute_force_distance(x: np.ndarray, y: np.ndarray, window: int) -> float:
+        t = len(x)
+        cost = np.full((t + 1, t + 1), np.inf)
+        cost[0, 0] = 0.0
+
+        for i in range(1, t + 1):
+            for j in range(max(1, i - window), min(t, i + window) + 1):
+                cost[i, j] = (x[i - 1] - y[j - 1])**2 + min(cost[i - 1, j - 1], cost[i - 1, j], cost[i, j - 1])
+
+        return cost[t, t]**0.5
+
+    def test_dtw_distance(self):
+        # given
+        rng = np.random.default_rng(0)
+        x = rng.random((20, 24))
+        y = rng.random((20, 24))
+
+        for window in [0, 1, 3, 23]:
+            # result
+            result = dtw_distance(x, y, window=window)
+
+            # expected
+            expected = [self.get_brute_force_distance(a, b, window) for a, b in zip(x, y)]
+
+            # assert
+            np.testing.assert_allclose(result, expected)
+
+        np.testing.assert_allclose(dtw_distance(x, y, window=0), euclidean_distance(x, y))
+
+    def test_shifted_profile(self):
+        # given
+        x = np.array([0, 0, 1, 5, 1, 0, 0, 0], dtype=float)
+        y = np.roll(x, 1)
+
+        # result
+        banded = dtw_distance(x, y, window=1)
+        rigid = dtw_distance(x, y, window=0)
+
+        # assert
+        self.assertIsInstance(banded, float)
+        self.assertEqual(banded, 0.0)
+        self.assertGreater(rigid, 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -86,6 +86,38 @@ class test_AverageLoadReduction(unittest.TestCase):
 #         # for res, exp in zip(result, expected):
 #         self.assertAlmostEqual(result, expected, 3)
     
+class test_FlexibleTimeDuration(unittest.TestCase):
+
+    def test_calculate(self):
+        # given
+        timestamps = pd.date_range('2022-01-01 00:00', periods=6, freq='h').tolist()
+        # second zone overheats at 03:00 and first zone is too cold at 05:00
+        zone_temperature_profile = [[21.0, 22.0], [21.0, 23.0], [20.5, 24.0], [20.5, 25.0], [20.0, 23.0], [19.0, 22.0]]
+        cooling_setpoints = [[24.0, 24.0]]*6
+        heating_setpoints = [[20.0, 20.0]]*6
+
+        # result
+        result = energy_or_average_power_load_shedding.FlexibleTimeDuration.calculate(
+            zone_temperature_profile=zone_temperature_profile,
+            cooling_setpoints=cooling_setpoints,
+            heating_setpoints=heating_setpoints,
+            timestamps=timestamps,
+        )
+        batch_result = energy_or_average_power_load_shedding.FlexibleTimeDuration.calculate(
+            zone_temperature_profile=[zone_temperature_profile, np.full((6, 2), 22.0)],
+            cooling_setpoints=[cooling_setpoints]*2,
+            heating_setpoints=[heating_setpoints]*2,
+            timestamps=timestamps,
+        )
+
+        # expected
+        expected = [10800.0, 7200.0, 3600.0, 0.0, 3600.0, 0.0]
+        expected_batch = [expected, [21600.0, 18000.0, 14400.0, 10800.0, 7200.0, 3600.0]]
+
+        # assert
+        np.testing.assert_allclose(result, expected)
+        np.testing.assert_allclose(batch_result, expected_batch)
+
 # class test_BuildingEnergyFlexibilityIndex(unittest.TestCase):
 
 #     def test_calculate(self):
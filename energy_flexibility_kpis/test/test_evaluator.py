@@ -0,0 +1,111 @@
+import unittest
+import asyncio
+import os
+import pandas as pd
+from energy_flexibility_kpis.evaluator import AsyncEvaluator
+from energy_flexibility_kpis.kpi.energy_flexibility.peak_power_shedding import PeakPowerReduction
+
+# get the directory of the current file
+dir_path = os.path.dirname(os.path.realpath(__file__))
+
+class test_AsyncEvaluator(unittest.TestCase):
+    def setUp(self):
+        data = pd.read_csv(os.path.join(dir_path, 'data_24hr_hourly.csv'))
+        self.datasets = [
+            {
+                'baseline_electric_power_profile': (data['baseline_power']*(i + 1)).tolist(),
+                'flexible_electric_power_profile': data['flexible_power'].tolist(),
+            } for i in range(10)
+        ]
+
+    def test_acalculate(self):
+        # result
+        result = asyncio.run(PeakPowerReduction.acalculate(**self.datasets[0]))
+
+        # expected
+        expected = PeakPowerReduction.calculate(**self.datasets[0])
+
+        # assert
+        self.assertEqual(result, expected)
+
+    def test_gather(self):
+        # given
+        pending = {'current': 0, 'maximum': 0}
+
+        async def fetch(dataset):
+            pending['current'] += 1
+            pending['maximum'] = max(pending['maximum'], pending['current'])
+            await asyncio.sleep(0.001)
+
+            return dataset
+
+        async def evaluate():
+            async with AsyncEvaluator(max_workers=2, max_pending=3) as evaluator:
+                values = await evaluator.gather(PeakPowerReduction, (fetch(d) for d in self.datasets))
+
+            return values
+
+        # result
+        original_calculate = AsyncEvaluator.calculate
+
+        async def calculate(evaluator, kpi, **kwargs):
+            value = await original_calculate(evaluator, kpi, **kwargs)
+            pending['current'] -= 1
+
+            return value
+
+        AsyncEvaluator.calculate = calculate
+
+        try:
+            result = asyncio.run(evaluate())
+
+        finally:
+            AsyncEvaluator.calculate = original_calculate
+
+        # expected
+        expected = [PeakPowerReduction.calculate(**d) for d in self.datasets]
+
+        # assert
+        self.assertEqual(result, expected)
+        self.assertLessEqual(pending['maximum'], 3)
+
+    def test_gather_errors(self):
+        # given
+        datasets = [self.datasets[0], {'baseline_electric_power_profile': 'a', 'flexible_electric_power_profile': 'b'}]
+
+        async def evaluate(return_exceptions):
+            async with AsyncEvaluator(max_pending=1) as evaluator:
+                return await evaluator.gather(PeakPowerReduction, datasets, return_exceptions=return_exceptions)
+
+        # result
+        result = asyncio.run(evaluate(True))
+
+        # assert
+        self.assertEqual(result[0], PeakPowerReduction.calculate(**self.datasets[0]))
+        self.assertIsInstance(result[1], Exception)
+
+        with self.assertRaises(AssertionError):
+            asyncio.run(evaluate(False))
+
+    def test_gather_stops_after_error(self):
+        # given
+        pulled = []
+        invalid = {'baseline_electric_power_profile': 'a', 'flexible_electric_power_profile': 'b'}
+
+        def datasets():
+            for i in range(100):
+                pulled.append(i)
+                yield invalid if i == 1 else self.datasets[0]
+
+        async def evaluate():
+            async with AsyncEvaluator(max_workers=1, max_pending=1) as evaluator:
+                return await evaluator.gather(PeakPowerReduction, datasets())
+
+        # assert
+        with self.assertRaises(AssertionError):
+            asyncio.run(evaluate())
+
+        self.assertLess(len(pulled), 100)
+
+if __name__ == '__main__':
+    unittest.main()
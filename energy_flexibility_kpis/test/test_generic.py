@@ -0,0 +1,103 @@
+import unittest
+import numpy as np
+import pandas as pd
+from scipy import integrate
+from energy_flexibility_kpis.kpi.generic.building_energy_efficiency import EnergyUseIntensity
+from energy_flexibility_kpis.kpi.generic.co2_emissions_or_environmental_impact import TotalCarbonEmissions
+from energy_flexibility_kpis.kpi.generic.cost_and_savings import TotalCost
+from energy_flexibility_kpis.kpi.generic.grid_interaction import NetLoadStatistics, PeakGridExport, PeakGridImport
+from energy_flexibility_kpis.kpi.generic.grid_interaction import SelfConsumptionRatio, SelfSufficiencyRatio
+from energy_flexibility_kpis.kpi.generic.primitives import FleetProfile
+
+class test_FleetProfile(unittest.TestCase):
+    def test_get_report(self):
+        # given
+        random_state = np.random.RandomState(0)
+        timestamps = pd.date_range('2022-01-01 00:00', periods=96, freq='15min').tolist()
+        electric_power = random_state.uniform(0.0, 5.0, (3, 96))
+        self_production = random_state.uniform(0.0, 5.0, (3, 96))
+        price = random_state.uniform(0.1, 0.3, 96)
+
+        # result
+        fleet, _, batched = FleetProfile.from_arguments(
+            electric_power, generic_self_production_profile=self_production, electricity_price_profile=price,
+            timestamps=timestamps,
+        )
+        result = fleet.get_report(floor_area=[100.0, 200.0, 300.0])
+
+        # expected
+        net_load = electric_power - self_production
+        self_consumption = integrate.simpson(np.minimum(electric_power, self_production), dx=0.25, axis=1)
+        expected = {
+            'energy_use_intensity': integrate.simpson(electric_power, dx=0.25, axis=1)/[100.0, 200.0, 300.0],
+            'total_cost': integrate.simpson(np.clip(net_load, 0.0, None)*price, dx=0.25, axis=1),
+            'self_consumption_ratio': self_consumption/integrate.simpson(self_production, dx=0.25, axis=1),
+            'self_sufficiency_ratio': self_consumption/integrate.simpson(electric_power, dx=0.25, axis=1),
+            'peak_grid_import': net_load.max(axis=1),
+            'peak_grid_export': -net_load.min(axis=1),
+            'net_load_mean': net_load.mean(axis=1),
+            'net_load_standard_deviation': net_load.std(axis=1),
+            'net_load_minimum': net_load.min(axis=1),
+            'net_load_maximum': net_load.max(axis=1),
+            'net_load_load_factor': net_load.mean(axis=1)/net_load.max(axis=1),
+        }
+
+        # assert
+        self.assertTrue(batched)
+        self.assertEqual(set(result), set(expected))
+
+        for k, v in expected.items():
+            np.testing.assert_allclose(result[k], v)
+
+class test_GenericKPIs(unittest.TestCase):
+    def setUp(self):
+        self.timestamps = pd.date_range('2022-01-01 00:00', periods=5, freq='30min').tolist()
+        self.generic_electric_power_profile = [2.0, 2.0, 2.0, 2.0, 2.0]
+        self.generic_self_production_profile = [0.0, 2.0, 4.0, 2.0, 0.0]
+
+    def test_calculate(self):
+        # given
+        arguments = {
+            'generic_electric_power_profile': self.generic_electric_power_profile,
+            'generic_self_production_profile': self.generic_self_production_profile,
+            'timestamps': self.timestamps,
+        }
+
+        # result
+        result = {
+            'energy_use_intensity': EnergyUseIntensity.calculate(self.generic_electric_power_profile, 10.0, timestamps=self.timestamps),
+            'total_cost': TotalCost.calculate(electricity_price_profile=[1.0, 1.0, 2.0, 2.0, 2.0], **arguments),
+            'total_carbon_emissions': TotalCarbonEmissions.calculate(generic_carbon_intensity_profile=[0.5]*5, **arguments),
+            'self_consumption_ratio': SelfConsumptionRatio.calculate(**arguments),
+            'self_sufficiency_ratio': SelfSufficiencyRatio.calculate(**arguments),
+            'peak_grid_import': PeakGridImport.calculate(**arguments),
+            'peak_grid_export': PeakGridExport.calculate(**arguments),
+            'net_load_mean': NetLoadStatistics.calculate(**arguments)['mean'],
+        }
+        batch_result = PeakGridExport.calculate(
+            generic_electric_power_profile=[self.generic_electric_power_profile]*2,
+            generic_self_production_profile=[self.generic_self_production_profile, [0.0]*5],
+        )
+
+        # expected
+        # Simpson weights of the half-hourly timesteps are 1/6, 4/6, 2/6, 4/6 and 1/6 h so grid import
+        # is 2/3 kWh at the first and last timesteps, and 10/3 of 4 kWh of production is self-consumed
+        expected = {
+            'energy_use_intensity': 0.4,
+            'total_cost': 1.0,
+            'total_carbon_emissions': 1.0/3.0,
+            'self_consumption_ratio': 5.0/6.0,
+            'self_sufficiency_ratio': 5.0/6.0,
+            'peak_grid_import': 2.0,
+            'peak_grid_export': 2.0,
+            'net_load_mean': 0.4,
+        }
+
+        # assert
+        for k, v in expected.items():
+            self.assertAlmostEqual(result[k], v, msg=k)
+
+        self.assertEqual(batch_result, [2.0, 0.0])
+
+if __name__ == '__main__':
+    unittest.main()
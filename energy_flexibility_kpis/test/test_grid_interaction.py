@@ -0,0 +1,21 @@
+import unittest
+from energy_flexibility_kpis.kpi.energy_flexibility.grid_interaction import FlexibilityAggregationSynergyFactor
+
+class test_FlexibilityAggregationSynergyFactor(unittest.TestCase):
+    def test_calculate(self):
+        # given
+        # each asset is limited at a different hour so the aggregate is limited less than their sum
+        upward_flexible_power_profile = [[1.0, 3.0, 3.0], [3.0, 1.0, 3.0]]
+        downward_flexible_power_profile = [[2.0, 2.0, 2.0], [2.0, 2.0, 2.0]]
+
+        # result
+        result = FlexibilityAggregationSynergyFactor.calculate(upward_flexible_power_profile, downward_flexible_power_profile)
+
+        # expected
+        expected = 4.0/2.0 - 1.0
+
+        # assert
+        self.assertAlmostEqual(result, expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,230 @@
+import unittest
+import numpy as np
+import pandas as pd
+from energy_flexibility_kpis.chunking import ChunkedDataset, ChunkedEvaluator
+from energy_flexibility_kpis.activation import ActivationIntervals
+from energy_flexibility_kpis.kpi.energy_flexibility.impact_on_ieq import AverageDisruptionDuration, CumulativeAverageIndoorAirQualityDiscomfort
+from energy_flexibility_kpis.kpi.energy_flexibility.impact_on_ieq import CumulativeAverageThermalDiscomfort, ImpactedDwellingsPercentage
+
+class test_CumulativeAverageThermalDiscomfort(unittest.TestCase):
+    def setUp(self):
+        self.timestamps = pd.date_range('2022-01-01 00:00', periods=48, freq='h').tolist()
+        self.zone_temperature_profile = np.random.RandomState(0).uniform(18.0, 27.0, (48, 3))
+        self.cooling_setpoints = np.full((48, 3), 25.0)
+        self.heating_setpoints = np.full((48, 3), 20.0)
+
+    def test_calculate(self):
+        # result
+        result = CumulativeAverageThermalDiscomfort.calculate(
+            zone_temperature_profile=self.zone_temperature_profile.tolist(),
+            cooling_setpoints=self.cooling_setpoints.tolist(),
+            heating_setpoints=self.heating_setpoints.tolist(),
+            timestamps=self.timestamps,
+            chunk_size=5,
+        )
+        batch_result = CumulativeAverageThermalDiscomfort.calculate(
+            zone_temperature_profile=np.stack([self.zone_temperature_profile, np.full((48, 3), 22.0)]),
+            cooling_setpoints=np.stack([self.cooling_setpoints]*2),
+            heating_setpoints=np.stack([self.heating_setpoints]*2),
+            num_zones=3,
+            num_days=2,
+            breakdown=True,
+        )
+
+        # expected
+        cooling_discomfort = np.maximum(self.zone_temperature_profile - self.cooling_setpoints, 0.0).sum(axis=0)/2
+        heating_discomfort = np.maximum(self.heating_setpoints - self.zone_temperature_profile, 0.0).sum(axis=0)/2
+        expected = (cooling_discomfort + heating_discomfort).sum()/3
+
+        # assert
+        self.assertAlmostEqual(result, expected)
+        np.testing.assert_allclose(batch_result['value'], [expected, 0.0])
+        np.testing.assert_allclose(batch_result['zone_cooling_value'], [cooling_discomfort, np.zeros(3)])
+        np.testing.assert_allclose(batch_result['zone_heating_value'], [heating_discomfort, np.zeros(3)])
+
+    def test_calculate_timesteps(self):
+        # result
+        result = CumulativeAverageThermalDiscomfort.calculate(
+            zone_temperature_profile=self.zone_temperature_profile.tolist(),
+            cooling_setpoints=self.cooling_setpoints.tolist(),
+            heating_setpoints=self.heating_setpoints.tolist(),
+            num_zones=3,
+            num_days=2,
+            timestamps=list(range(48)),
+        )
+
+        # expected
+        expected = 9.824557322429126
+
+        # assert
+        self.assertAlmostEqual(result, expected)
+
+        with self.assertRaises(AssertionError):
+            CumulativeAverageThermalDiscomfort.calculate(
+                zone_temperature_profile=self.zone_temperature_profile.tolist(),
+                cooling_setpoints=self.cooling_setpoints.tolist(),
+                heating_setpoints=self.heating_setpoints.tolist(),
+                timestamps=list(range(48)),
+            )
+
+class test_CumulativeAverageIndoorAirQualityDiscomfort(unittest.TestCase):
+    def setUp(self):
+        self.timestamps = pd.date_range('2022-01-01 00:00', periods=4, freq='30min').tolist()
+        self.zone_co2_concentration_profile = [[800.0, 900.0], [1100.0, 900.0], [1300.0, 1000.0], [900.0, 1200.0]]
+        self.upper_co2_concentration_limits = [[1000.0, 1000.0]]*4
+
+    def test_calculate(self):
+        # result
+        result = CumulativeAverageIndoorAirQualityDiscomfort.calculate(
+            zone_co2_concentration_profile=self.zone_co2_concentration_profile,
+            upper_co2_concentration_limits=self.upper_co2_concentration_limits,
+            timestamps=self.timestamps,
+        )
+        batch_result = CumulativeAverageIndoorAirQualityDiscomfort.calculate(
+            zone_co2_concentration_profile=[self.zone_co2_concentration_profile, np.full((4, 2), 500.0)],
+            upper_co2_concentration_limits=[self.upper_co2_concentration_limits]*2,
+            timestamps=self.timestamps,
+        )
+
+        # expected
+        # first zone exceeds by 100 and 300 ppm and second zone by 200 ppm for half an hour each
+        expected = (100.0 + 300.0 + 200.0)*0.5/2
+
+        # assert
+        self.assertAlmostEqual(result, expected)
+        np.testing.assert_allclose(batch_result, [expected, 0.0])
+
+    def test_calculate_partial(self):
+        # given
+        arguments = [
+            {
+                'zone_co2_concentration_profile': self.zone_co2_concentration_profile[i:i + 3],
+                'upper_co2_concentration_limits': self.upper_co2_concentration_limits[i:i + 3],
+                'timestamps': self.timestamps[i:i + 3],
+            } for i in range(0, 4, 3)
+        ]
+        dataset = ChunkedDataset(lambda: ((None, a) for a in arguments))
+
+        # result
+        result = ChunkedEvaluator.calculate(CumulativeAverageIndoorAirQualityDiscomfort, dataset)
+
+        # expected
+        expected = CumulativeAverageIndoorAirQualityDiscomfort.calculate(
+            zone_co2_concentration_profile=self.zone_co2_concentration_profile,
+            upper_co2_concentration_limits=self.upper_co2_concentration_limits,
+            timestamps=self.timestamps,
+        )
+
+        # assert
+        self.assertAlmostEqual(result, expected)
+
+    def test_calculate_timesteps(self):
+        # given
+        arguments = [
+            {
+                'zone_co2_concentration_profile': self.zone_co2_concentration_profile[i:i + 3],
+                'upper_co2_concentration_limits': self.upper_co2_concentration_limits[i:i + 3],
+                'timestamps': list(range(i, min(i + 3, 4))),
+            } for i in range(0, 4, 3)
+        ]
+        dataset = ChunkedDataset(lambda: ((None, a) for a in arguments))
+
+        # result
+        result = CumulativeAverageIndoorAirQualityDiscomfort.calculate(
+            zone_co2_concentration_profile=self.zone_co2_concentration_profile,
+            upper_co2_concentration_limits=self.upper_co2_concentration_limits,
+            timestamps=list(range(4)),
+        )
+        partial_result = ChunkedEvaluator.calculate(CumulativeAverageIndoorAirQualityDiscomfort, dataset)
+
+        # expected
+        # each timestep is one hour
+        expected = (100.0 + 300.0 + 200.0)/2
+
+        # assert
+        self.assertAlmostEqual(result, expected)
+        self.assertAlmostEqual(partial_result, expected)
+
+class test_ImpactedDwellingsPercentage(unittest.TestCase):
+    def test_calculate(self):
+        # given
+        timestamps = pd.date_range('2022-01-01 00:00', periods=6, freq='15min').tolist()
+        baseline_heat_pump_activation_profile = [[1, 1, 0, 0, 1, 1], [0, 1, 1, 0, 0, 0], [1, 1, 1, 1, 0, 0], [0, 0, 0, 0, 0, 1]]
+        # first dwelling shifts without changing its activation time in the window
+        flexible_heat_pump_activation_profile = [[0, 1, 1, 0, 1, 1], [0, 0, 0, 0, 0, 0], [1, 1, 1, 1, 1, 0], [0, 0, 0, 0, 0, 1]]
+
+        # result
+        result = ImpactedDwellingsPercentage.calculate(
+            baseline_heat_pump_activation_profile=baseline_heat_pump_activation_profile,
+            flexible_heat_pump_activation_profile=ActivationIntervals.from_boolean(flexible_heat_pump_activation_profile),
+            timestamps=timestamps,
+            evaluation_start_timestamp=timestamps[0],
+            evaluation_end_timestamp=timestamps[4],
+        )
+        tolerance_result = ImpactedDwellingsPercentage.calculate(
+            baseline_heat_pump_activation_profile=baseline_heat_pump_activation_profile,
+            flexible_heat_pump_activation_profile=flexible_heat_pump_activation_profile,
+            timestamps=timestamps,
+            evaluation_start_timestamp=timestamps[0],
+            evaluation_end_timestamp=timestamps[4],
+            tolerance=15.0,
+        )
+
+        # expected
+        expected = 50.0
+        expected_tolerance = 25.0
+
+        # assert
+        self.assertAlmostEqual(result, expected)
+        self.assertAlmostEqual(tolerance_result, expected_tolerance)
+
+class test_AverageDisruptionDuration(unittest.TestCase):
+    def test_calculate(self):
+        # given
+        timestamps = pd.date_range('2022-01-01 00:00', periods=6, freq='15min').tolist()
+        baseline_heat_pump_activation_profile = [[1, 1, 0, 0, 1, 1], [0, 1, 1, 0, 0, 0], [1, 1, 1, 1, 0, 0], [0, 0, 0, 0, 0, 1]]
+        flexible_heat_pump_activation_profile = [[0, 1, 1, 0, 1, 1], [0, 0, 0, 0, 0, 0], [1, 1, 1, 1, 1, 0], [0, 0, 0, 0, 0, 1]]
+
+        # result
+        result = AverageDisruptionDuration.calculate(
+            baseline_heat_pump_activation_profile=baseline_heat_pump_activation_profile,
+            flexible_heat_pump_activation_profile=flexible_heat_pump_activation_profile,
+            timestamps=timestamps,
+        )
+
+        # expected
+        expected = (0.0 + 30.0 + 15.0 + 0.0)/4
+
+        # assert
+        self.assertAlmostEqual(result, expected)
+
+    def test_calculate_timesteps(self):
+        # given
+        baseline_heat_pump_activation_profile = [[1, 1, 0, 0, 1, 1], [0, 1, 1, 0, 0, 0], [1, 1, 1, 1, 0, 0], [0, 0, 0, 0, 0, 1]]
+        flexible_heat_pump_activation_profile = [[0, 1, 1, 0, 1, 1], [0, 0, 0, 0, 0, 0], [1, 1, 1, 1, 1, 0], [0, 0, 0, 0, 0, 1]]
+
+        for kpi in [AverageDisruptionDuration, ImpactedDwellingsPercentage]:
+            # result
+            result = kpi.calculate(
+                baseline_heat_pump_activation_profile=baseline_heat_pump_activation_profile,
+                flexible_heat_pump_activation_profile=flexible_heat_pump_activation_profile,
+                timestamps=list(range(6)),
+                evaluation_start_timestamp=1,
+            )
+
+            # expected
+            expected = kpi.calculate(
+                baseline_heat_pump_activation_profile=[p[1:] for p in baseline_heat_pump_activation_profile],
+                flexible_heat_pump_activation_profile=[p[1:] for p in flexible_heat_pump_activation_profile],
+            )
+
+            # assert
+            self.assertAlmostEqual(result, expected)
+
+        self.assertAlmostEqual(
+            AverageDisruptionDuration.calculate(baseline_heat_pump_activation_profile, flexible_heat_pump_activation_profile),
+            (0.0 + 2.0 + 1.0 + 0.0)/4
+        )
+
+if __name__ == '__main__':
+    unittest.main()
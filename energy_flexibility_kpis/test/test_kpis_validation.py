@@ -0,0 +1,83 @@
+import unittest
+import glob
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+
+# get the directory of the current file
+dir_path = os.path.dirname(os.path.realpath(__file__))
+root_path = os.path.dirname(os.path.dirname(dir_path))
+examples_path = os.path.join(root_path, 'examples')
+validation_path = os.path.join(examples_path, 'validation_buildingMOTIF')
+constraints_path = os.path.join(os.path.dirname(root_path), 'buildingmotif', 'libraries', 'constraints', 'constraints.ttl')
+
+@unittest.skipUnless(
+    all(importlib.util.find_spec(m) is not None for m in ['buildingmotif', 'rdflib', 'tabulate']),
+    'buildingmotif, rdflib and tabulate are required to validate KPI manifests.'
+)
+class test_ValidationInterface(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        sys.path.insert(0, examples_path)
+        from validation_buildingMOTIF import kpis_validation
+        cls.kpis_validation = kpis_validation
+
+    @classmethod
+    def tearDownClass(cls):
+        sys.path.remove(examples_path)
+
+    def setUp(self):
+        self.manifest_paths = {
+            os.path.basename(p): p for p in sorted(glob.glob(os.path.join(validation_path, 'manifests_kpis', '*.ttl')))
+        }
+
+    def test_manifest_ontology_names_are_unique(self):
+        # result
+        names = [self.kpis_validation._get_ontology_name(p) for p in self.manifest_paths.values()]
+
+        # assert
+        self.assertEqual(len(set(names)), len(names))
+
+    def test_rejects_colliding_ontology_names(self):
+        # given
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        decrease = self.manifest_paths['manifest_average_demand_decrease.ttl']
+        collision = os.path.join(directory, 'manifest_collision.ttl')
+
+        with open(decrease) as f:
+            content = f.read()
+
+        with open(collision, 'w') as f:
+            f.write(content.replace('brick:Electric_Power_Sensor .', 'brick:Energy_Sensor .'))
+
+        brick_path = os.path.join(validation_path, 'Brick-subset.ttl')
+        validator = self.kpis_validation.ValidationInterface(
+            os.path.join(root_path, 'data', 'incite_dataset', 'incite.ttl'), {'decrease': decrease, 'collision': collision},
+            constraints_path=brick_path, brick_path=brick_path
+        )
+
+        # assert
+        with self.assertRaises(ValueError):
+            validator.validate()
+
+    @unittest.skipUnless(os.path.isfile(constraints_path), 'buildingmotif repository constraints library is required.')
+    def test_parallel_matches_serial(self):
+        # given
+        kwargs = {
+            'constraints_path': constraints_path,
+            'brick_path': os.path.join(validation_path, 'Brick-subset.ttl'),
+        }
+        model_path = os.path.join(root_path, 'data', 'incite_dataset', 'incite.ttl')
+
+        # result
+        serial = self.kpis_validation.ValidationInterface(model_path, self.manifest_paths, max_workers=1, **kwargs).validate()
+        parallel = self.kpis_validation.ValidationInterface(model_path, self.manifest_paths, max_workers=2, **kwargs).validate()
+
+        # assert
+        self.assertEqual(parallel, serial)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import energy_flexibility_kpis.kpi.energy_flexibility.load_shifting as load_shifting
+import pandas as pd
+import numpy as np
+import os
+
+# get the directory of the current file
+dir_path = os.path.dirname(os.path.realpath(__file__))
+
+class test_FlexibilityClassificationFactor(unittest.TestCase):
+    def test_calculate(self):
+        # given
+        electricity_price_profile = [0.1, 0.2, 0.3, 0.4]*6
+
+        # result
+        flat = load_shifting.FlexibilityClassificationFactor.calculate(
+            generic_electric_power_profile=[1.0]*24,
+            electricity_price_profile=electricity_price_profile,
+        )
+        batch = load_shifting.FlexibilityClassificationFactor.calculate(
+            generic_electric_power_profile=[[1.0, 1.0, 0.0, 0.0]*6, [0.0, 0.0, 1.0, 1.0]*6],
+            electricity_price_profile=electricity_price_profile,
+        )
+
+        # expected
+        expected = (0.1 + 0.2)/(0.1 + 0.2 + 0.3 + 0.4)
+
+        # assert
+        self.assertAlmostEqual(flat, expected)
+        self.assertEqual(batch, [1.0, 0.0])
+
+    def test_get_price_classes(self):
+        # given
+        price = np.array([5.0, 1.0, 4.0, 2.0, 3.0, 6.0, 8.0, 7.0])
+
+        # result
+        result = load_shifting.FlexibilityClassificationFactor.get_price_classes(price)
+        cached = load_shifting.FlexibilityClassificationFactor.get_price_classes(price.tolist())
+
+        # assert
+        self.assertEqual(result.tolist(), [2, 0, 1, 0, 1, 2, 3, 3])
+        self.assertIs(result, cached)
+
+    def test_get_price_classes_concurrent(self):
+        # given
+        prices = [np.roll(np.arange(24, dtype=float), i) for i in range(48)]*20
+
+        # result
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            result = list(executor.map(load_shifting.FlexibilityClassificationFactor.get_price_classes, prices))
+
+        # expected
+        expected = [np.digitize(p, np.sort(p)[[5, 11, 17]], right=True) for p in prices]
+
+        # assert
+        for r, e in zip(result, expected):
+            self.assertEqual(r.tolist(), e.tolist())
+
+class test_CyclePowerFlexibility(unittest.TestCase):
+    def test_calculate(self):
+        # given
+        baseline_electric_power_profile = [1.0]*8
+        flexible_electric_power_profile = [2.0, 3.0, 1.0, 0.0, 0.0, 1.0, 4.0, 0.5]
+        timestamps = pd.date_range('2022-01-01', periods=8, freq='30min').tolist()
+
+        # result
+        result = load_shifting.CyclePowerFlexibility.calculate(
+            baseline_electric_power_profile=baseline_electric_power_profile,
+            flexible_electric_power_profile=flexible_electric_power_profile,
+            timestamps=timestamps,
+        )
+
+        # assert
+        self.assertEqual(result['forced_power'], [1.5, 3.0])
+        self.assertEqual(result['forced_duration'], [1.0, 0.5])
+        self.assertEqual(result['delayed_power'], [1.0, 0.5])
+        self.assertEqual(result['delayed_duration'], [1.0, 0.5])
+        self.assertAlmostEqual(result['forced_average_power'], 2.0)
+        self.assertAlmostEqual(result['delayed_average_power'], 2.5/3)
+
+class test_FlexibilityIndicator(unittest.TestCase):
+    def setUp(self):
+        data = pd.read_csv(os.path.join(dir_path, 'data_24hr_hourly.csv'))
+        self.baseline_electric_power_profile = data['baseline_power'].tolist()
+        self.flexible_electric_power_profile = data['flexible_power'].tolist()
+        self.timestamps = data['timestamp'].tolist()
+
+    def test_calculate(self):
+        # given
+        baseline = np.array(self.baseline_electric_power_profile, dtype=float)
+        flexible = np.array(self.flexible_electric_power_profile, dtype=float)
+        halfway = ((baseline + flexible)/2).tolist()
+
+        # result
+        matches_target = load_shifting.FlexibilityIndicator.calculate(
+            baseline_electric_power_profile=self.baseline_electric_power_profile,
+            flexible_electric_power_profile=self.flexible_electric_power_profile,
+            target_electric_power_profile=self.flexible_electric_power_profile,
+            timestamps=self.timestamps,
+        )
+        matches_reference = load_shifting.FlexibilityIndicator.calculate(
+            baseline_electric_power_profile=self.baseline_electric_power_profile,
+            flexible_electric_power_profile=self.baseline_electric_power_profile,
+            target_electric_power_profile=self.flexible_electric_power_profile,
+            timestamps=self.timestamps,
+        )
+        halfway_to_target = load_shifting.FlexibilityIndicator.calculate(
+            baseline_electric_power_profile=self.baseline_electric_power_profile,
+            flexible_electric_power_profile=halfway,
+            target_electric_power_profile=self.flexible_electric_power_profile,
+            timestamps=self.timestamps,
+            window=0,
+        )
+
+        # assert
+        self.assertEqual(matches_target, 1.0)
+        self.assertEqual(matches_reference, 0.0)
+        self.assertAlmostEqual(halfway_to_target, 0.5)
+
+    def test_calculate_batch(self):
+        # given
+        baseline = [self.baseline_electric_power_profile]*3
+        flexible = [self.flexible_electric_power_profile, self.baseline_electric_power_profile, self.flexible_electric_power_profile]
+        target = [self.flexible_electric_power_profile]*3
+
+        # result
+        result = load_shifting.FlexibilityIndicator.calculate(
+            baseline_electric_power_profile=baseline,
+            flexible_electric_power_profile=flexible,
+            target_electric_power_profile=target,
+        )
+
+        # expected
+        expected = [
+            load_shifting.FlexibilityIndicator.calculate(
+                baseline_electric_power_profile=b,
+                flexible_electric_power_profile=f,
+                target_electric_power_profile=t,
+            ) for b, f, t in zip(baseline, flexible, target)
+        ]
+
+        # assert
+        self.assertEqual(result, expected)
+
+if __name__ == '__main__':
+    unittest.main()
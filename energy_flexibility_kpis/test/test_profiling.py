@@ -0,0 +1,82 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import json
+import os
+import pandas as pd
+from energy_flexibility_kpis import profiling
+from energy_flexibility_kpis.kpi.energy_flexibility.demand_response_energy_efficiency import EnergySavingsOfDemandResponse
+from energy_flexibility_kpis.profiling import Profiler
+
+# get the directory of the current file
+dir_path = os.path.dirname(os.path.realpath(__file__))
+
+class test_Profiler(unittest.TestCase):
+    def setUp(self):
+        data = pd.read_csv(os.path.join(dir_path, 'data_24hr_hourly.csv'))
+        self.kwargs = {
+            'baseline_electric_power_profile': data['baseline_power'].tolist(),
+            'flexible_electric_power_profile': data['flexible_power'].tolist(),
+            'timestamps': data['timestamp'].tolist(),
+        }
+
+    def test_records_stages(self):
+        # given
+        streamed = []
+
+        # result
+        with Profiler(callback=streamed.append) as profiler:
+            value = EnergySavingsOfDemandResponse.calculate(**self.kwargs)
+
+        # expected
+        expected = EnergySavingsOfDemandResponse.calculate(**self.kwargs)
+
+        # assert
+        self.assertAlmostEqual(value, expected, 6)
+        self.assertEqual(len(profiler.records), 1)
+        self.assertEqual(streamed, profiler.records)
+        record = profiler.records[0]
+        self.assertEqual(record['kpi'], 'EnergySavingsOfDemandResponse')
+        self.assertIsNone(record['error'])
+
+        for name in ['variable_set', 'timestamp_parsing', 'evaluation_mask', 'get_resolution', 'integral']:
+            self.assertIn(name, record['stages'])
+            self.assertGreaterEqual(record['stages'][name]['calls'], 1)
+
+        self.assertEqual(record['stages']['timestamp_parsing']['size'], 24)
+        self.assertLessEqual(record['stages']['timestamp_parsing']['wall_time'], record['stages']['variable_set']['wall_time'])
+        self.assertLessEqual(record['stages']['variable_set']['wall_time'], record['wall_time'])
+        self.assertEqual(json.loads(profiler.to_json_lines().splitlines()[0])['kpi'], record['kpi'])
+
+    def test_disabled(self):
+        # result
+        EnergySavingsOfDemandResponse.calculate(**self.kwargs)
+
+        # assert
+        self.assertIsNone(profiling._profiler.get())
+        self.assertIs(profiling.stage('integral'), profiling._NULL_STAGE)
+
+    def test_concurrent_calculations(self):
+        # given
+        count = 16
+
+        # result
+        with Profiler() as profiler:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = [
+                    executor.submit(contextvars.copy_context().run, EnergySavingsOfDemandResponse.calculate, **self.kwargs)
+                    for _ in range(count)
+                ]
+                [f.result() for f in futures]
+
+        # assert
+        self.assertEqual(len(profiler.records), count)
+
+        for record in profiler.records:
+            self.assertEqual(record['stages']['timestamp_parsing']['calls'], profiler.records[0]['stages']['timestamp_parsing']['calls'])
+            self.assertEqual(record['stages']['integral']['calls'], profiler.records[0]['stages']['integral']['calls'])
+
+        self.assertIsNone(profiling._profiler.get())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import os
+import numpy as np
+import pandas as pd
+from energy_flexibility_kpis.enumerations import KPICategory, PerformanceAspect
+from energy_flexibility_kpis.kpi.energy_flexibility.demand_response_costs_or_savings import CostSavings
+from energy_flexibility_kpis.kpi.energy_flexibility.peak_power_shedding import PeakPowerReduction
+from energy_flexibility_kpis.kpi.registry import KPIRegistry
+from energy_flexibility_kpis.profiling import Profiler
+
+# get the directory of the current file
+dir_path = os.path.dirname(os.path.realpath(__file__))
+
+class test_KPIRegistry(unittest.TestCase):
+    def setUp(self):
+        data = pd.read_csv(os.path.join(dir_path, 'data_24hr_hourly.csv'))
+        self.dataset = {
+            'baseline_electric_power_profile': data['baseline_power'].tolist(),
+            'flexible_electric_power_profile': data['flexible_power'].tolist(),
+            'timestamps': data['timestamp'].tolist(),
+            'evaluation_start_timestamp': '2022-01-01 06:00:00',
+            'evaluation_end_timestamp': '2022-01-01 20:00:00',
+        }
+
+    def test_filter(self):
+        # result
+        peak_power_shedding = KPIRegistry.filter(category=KPICategory.EF_PEAK_POWER_SHEDDING)
+        not_implemented = KPIRegistry.filter(implemented=False)
+        comfort = KPIRegistry.filter(performance_aspect=PerformanceAspect.COMFORT, need_baseline=False)
+
+        # assert
+        self.assertIn(PeakPowerReduction, peak_power_shedding)
+        self.assertTrue(all(k.CATEGORY == KPICategory.EF_PEAK_POWER_SHEDDING for k in peak_power_shedding))
+        self.assertIn(CostSavings, not_implemented)
+        self.assertNotIn(PeakPowerReduction, not_implemented)
+        self.assertTrue(all(PerformanceAspect.COMFORT in k.PERFORMANCE_ASPECT and not k.NEED_BASELINE for k in comfort))
+        self.assertIs(KPIRegistry.get('PeakPowerReduction'), PeakPowerReduction)
+
+    def test_compute_all(self):
+        # given
+        kpis = KPIRegistry.filter(category=KPICategory.EF_ENERGY_OR_AVERAGE_POWER_LOAD_SHEDDING, implemented=True)\
+            + KPIRegistry.filter(category=KPICategory.EF_PEAK_POWER_SHEDDING, implemented=True)
+
+        # result
+        with Profiler() as profiler:
+            values = KPIRegistry.compute_all(self.dataset, filter=lambda k: k in kpis, ignore_errors=True)
+
+        build_calls = sum(r['stages'].get('variable_set', {'calls': 0})['calls'] for r in profiler.records)
+
+        # assert
+        self.assertIn('PeakPowerReduction', values)
+        self.assertIn('EnergyDeviationForPeakShaving', values)
+
+        # variable sets are built once for all KPIs that take the same inputs
+        self.assertLess(build_calls, len(values))
+
+        for name, value in values.items():
+            kpi = KPIRegistry.get(name)
+            expected = kpi.calculate(**{k: v for k, v in self.dataset.items() if k in kpi.get_calculate_arguments()})
+            np.testing.assert_allclose(value, expected)
+
+if __name__ == '__main__':
+    unittest.main()
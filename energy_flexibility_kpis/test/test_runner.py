@@ -0,0 +1,89 @@
+import unittest
+import os
+import tempfile
+import pandas as pd
+from energy_flexibility_kpis.cli import main
+from energy_flexibility_kpis.runner import BatchRunner, ExecutionPlan
+from energy_flexibility_kpis.utilities import FileHandler
+
+# get the directory of the current file
+dir_path = os.path.dirname(os.path.realpath(__file__))
+data_path = os.path.join(dir_path, '..', '..', 'data', 'incite_dataset')
+
+class test_ExecutionPlan(unittest.TestCase):
+    def setUp(self):
+        self.plan = ExecutionPlan(
+            'test', 'baseline.csv', 'flexible.csv', 'Timestamp', {'baseline': ['P'], 'flexible': ['P']},
+            '2022-01-01 00:00:00', '2022-01-01 09:00:00', price_filepath='price.csv', price_column='Price',
+            shift_window=2, rebound_window=1, resolution='1h',
+        )
+
+    def test_detect_events(self):
+        # given
+        price = [1, 1, 1, 1, 5, 5, 5, 1]
+        data = pd.DataFrame({'price': price}, index=pd.date_range('2022-01-01', periods=len(price), freq='1h'))
+
+        # result
+        events = self.plan.detect_events(data)
+
+        # expected
+        timestamp = lambda h: pd.Timestamp(f'2022-01-01 {h:02d}:00:00')
+
+        # assert
+        self.assertEqual(events['shed'], [(timestamp(4), timestamp(6))])
+        self.assertEqual(events['shift'], [(timestamp(2), timestamp(3))])
+        self.assertEqual(events['rebound'], [(timestamp(7), timestamp(7))])
+
+    def test_get_price_threshold(self):
+        # assert
+        self.assertEqual(ExecutionPlan.get_price_threshold([4, 1, 3, 2]), 2.5)
+        self.assertEqual(ExecutionPlan.get_price_threshold([1, 2, 3, 4, 5]), 3.5)
+
+class test_BatchRunner(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.config_filepath = os.path.join(self.directory.name, 'incite.yaml')
+        FileHandler.write_yaml({
+            'path_to_dataset': os.path.abspath(data_path),
+            'baseline_scenario': 'dataset_Ref_Cool',
+            'flexible_scenario': 'dataset_RBC_Cost_Cool',
+            'power_identifiers': ['HP_Pel'],
+            'evaluation_timestamps': {'start': '2016-07-08 00:00:00', 'end': '2016-07-08 23:59:59'},
+            'price_signal_file_name': 'dataset_Ref_Cool.csv',
+            'timestamp_identifier': 'Timestamp',
+            'price_signal_identifier': 'Price',
+            'shift_window': 2,
+            'kpis': ['PeakPowerReduction', 'AverageDemandDecrease', 'AverageDemandIncrease'],
+        }, self.config_filepath)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_run(self):
+        # given
+        cache_directory = os.path.join(self.directory.name, 'cache')
+
+        # result
+        results = BatchRunner.run([self.config_filepath], max_workers=1, cache_directory=cache_directory)
+        cached_results = BatchRunner.run([self.config_filepath], max_workers=1, cache_directory=cache_directory)
+
+        # assert
+        self.assertEqual(sorted(set(r['event'] for r in results)), ['evaluation', 'shed', 'shift'])
+        self.assertEqual(sorted(set(r['kpi'] for r in results)), ['AverageDemandDecrease', 'AverageDemandIncrease', 'PeakPowerReduction'])
+        self.assertEqual(len(os.listdir(cache_directory)), 1)
+        self.assertEqual(results, cached_results)
+
+    def test_cli(self):
+        # given
+        output_filepath = os.path.join(self.directory.name, 'results.csv')
+
+        # result
+        main(['run', self.config_filepath, self.config_filepath, '--workers', '2', '--output', output_filepath])
+        results = pd.read_csv(output_filepath)
+
+        # assert
+        self.assertEqual(results['plan'].unique().tolist(), ['incite'])
+        self.assertEqual(len(results)%2, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+import json
+import os
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from energy_flexibility_kpis.kpi.energy_flexibility.peak_power_shedding import PeakPowerReduction
+from energy_flexibility_kpis.kpi.generic.grid_interaction import SelfSufficiencyRatio
+from energy_flexibility_kpis.service import KPIService
+
+# get the directory of the current file
+dir_path = os.path.dirname(os.path.realpath(__file__))
+
+class test_KPIService(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.service = KPIService(port=0, batch_window=0.05).start()
+        cls.url = 'http://{}:{}'.format(*cls.service.address)
+        data = pd.read_csv(os.path.join(dir_path, 'data_24hr_hourly.csv'))
+        cls.arguments = {
+            'baseline_electric_power_profile': data['baseline_power'].tolist(),
+            'flexible_electric_power_profile': data['flexible_power'].tolist(),
+            'timestamps': data['timestamp'].tolist(),
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.service.stop()
+
+    def request(self, method: str, path: str, body: dict = None) -> dict:
+        data = None if body is None else json.dumps(body).encode()
+        request = urllib.request.Request(self.url + path, data=data, method=method)
+
+        with urllib.request.urlopen(request) as response:
+            content = response.read()
+
+        return json.loads(content) if len(content) > 0 else None
+
+    def test_catalogue(self):
+        # result
+        catalogue = self.request('GET', '/kpis')
+        entry = self.request('GET', '/kpis/PeakPowerReduction')
+
+        # assert
+        self.assertIn('PeakPowerReduction', catalogue)
+        self.assertEqual(entry['name'], PeakPowerReduction.NAME)
+
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.request('GET', '/kpis/Unknown')
+
+        self.assertEqual(context.exception.code, 404)
+
+    def test_calculate(self):
+        # given
+        self.request('PUT', '/datasets/building', self.arguments)
+        windows = [('2022-01-01 06:00:00', '2022-01-01 20:00:00')]*4 + [('2022-01-01 00:00:00', '2022-01-01 12:00:00')]*4
+        body = lambda s, e: {
+            'kpi': 'PeakPowerReduction', 'dataset': 'building',
+            'arguments': {'evaluation_start_timestamp': s, 'evaluation_end_timestamp': e},
+        }
+
+        # result
+        with ThreadPoolExecutor(max_workers=len(windows)) as executor:
+            responses = list(executor.map(lambda w: self.request('POST', '/calculate', body(*w)), windows))
+
+        metrics = self.request('GET', '/metrics')['PeakPowerReduction']
+
+        # expected
+        expected = [PeakPowerReduction.calculate(**self.arguments, evaluation_start_timestamp=s, evaluation_end_timestamp=e) for s, e in windows]
+
+        # assert
+        for response, value in zip(responses, expected):
+            self.assertAlmostEqual(response['value'], value)
+            self.assertGreaterEqual(response['latency']['total'], response['latency']['calculate'])
+
+        self.assertGreaterEqual(metrics['requests'], len(windows))
+        self.assertLess(metrics['batches'], metrics['requests'])
+        self.assertGreater(max(r['latency']['batch_size'] for r in responses), 1)
+
+    def test_calculate_stacked(self):
+        # given
+        production = [[0.5*i*float(p) for p in self.arguments['flexible_electric_power_profile']] for i in range(6)]
+        body = lambda p: {
+            'kpi': 'SelfSufficiencyRatio',
+            'arguments': {
+                'generic_electric_power_profile': self.arguments['baseline_electric_power_profile'],
+                'generic_self_production_profile': p,
+                'timestamps': self.arguments['timestamps'],
+                'evaluation_start_timestamp': '2022-01-01 06:00:00',
+            },
+        }
+
+        # result
+        with ThreadPoolExecutor(max_workers=len(production)) as executor:
+            responses = list(executor.map(lambda p: self.request('POST', '/calculate', body(p)), production))
+
+        # expected
+        expected = [SelfSufficiencyRatio.calculate(**body(p)['arguments']) for p in production]
+
+        # assert
+        for response, value in zip(responses, expected):
+            self.assertAlmostEqual(response['value'], value)
+
+        self.assertGreater(max(r['latency']['group_size'] for r in responses), 1)
+
+    def test_calculate_error(self):
+        # assert
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.request('POST', '/calculate', {'kpi': 'PeakPowerReduction', 'arguments': {'baseline_electric_power_profile': 'a'}})
+
+        self.assertEqual(context.exception.code, 422)
+
+if __name__ == '__main__':
+    unittest.main()
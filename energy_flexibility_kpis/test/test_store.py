@@ -0,0 +1,79 @@
+import unittest
+import os
+import tempfile
+import pandas as pd
+from energy_flexibility_kpis.kpi.energy_flexibility.peak_power_shedding import PeakPowerReduction
+from energy_flexibility_kpis.store import ResultStore
+
+# get the directory of the current file
+dir_path = os.path.dirname(os.path.realpath(__file__))
+
+class test_ResultStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = ResultStore(os.path.join(self.directory.name, 'results.sqlite'))
+        data = pd.read_csv(os.path.join(dir_path, 'data_24hr_hourly.csv'))
+        self.arguments = {
+            'baseline_electric_power_profile': data['baseline_power'].to_numpy(),
+            'flexible_electric_power_profile': data['flexible_power'].tolist(),
+        }
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_calculate(self):
+        # given
+        key = ResultStore.get_key(PeakPowerReduction, self.arguments)
+
+        # result
+        with self.store.activate():
+            result = PeakPowerReduction.calculate(**self.arguments)
+
+        found, stored = self.store.get(key)
+        self.store.set(key, PeakPowerReduction, 'stored')
+
+        with self.store.activate():
+            cached = PeakPowerReduction.calculate(**self.arguments)
+
+        # expected
+        expected = PeakPowerReduction.calculate(**self.arguments)
+
+        # assert
+        self.assertEqual(result, expected)
+        self.assertTrue(found)
+        self.assertEqual(stored, expected)
+        self.assertEqual(cached, 'stored')
+
+    def test_get_key(self):
+        # given
+        changed = {**self.arguments, 'flexible_electric_power_profile': self.arguments['flexible_electric_power_profile'][:-1] + [0.0]}
+
+        # result
+        key = ResultStore.get_key(PeakPowerReduction, self.arguments)
+        same_key = ResultStore.get_key(PeakPowerReduction, {**self.arguments, 'timestamps': None})
+        changed_key = ResultStore.get_key(PeakPowerReduction, changed)
+
+        # assert
+        self.assertEqual(key, same_key)
+        self.assertNotEqual(key, changed_key)
+
+    def test_eviction_and_invalidation(self):
+        # given
+        store = ResultStore(self.store.filepath, max_size=150)
+        value = 'x'*40
+
+        # result
+        for key in ['a', 'b', 'c']:
+            store.set(key, PeakPowerReduction, value)
+
+        found = [store.get(k)[0] for k in ['a', 'b', 'c']]
+        count = store.invalidate(PeakPowerReduction)
+        store.close()
+
+        # assert
+        self.assertEqual(found, [False, True, True])
+        self.assertEqual(count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+from energy_flexibility_kpis.enumerations import BaseUnit
+from energy_flexibility_kpis.unit import Unit
+
+class test_Unit(unittest.TestCase):
+    def test_parse(self):
+        # given
+        units = ['W', 'kWh', '$/(kW*h)', '(C*h)/(zone*d)', '1/h']
+
+        # result
+        result = [str(Unit.parse(u)) for u in units]
+
+        # assert
+        self.assertEqual(result, units)
+        self.assertEqual(Unit.parse('kelvin'), Unit(numerator=[BaseUnit.KELVIN]))
+        self.assertEqual(hash(Unit.parse('kW')), hash(Unit(numerator=[BaseUnit.KW])))
+
+        with self.assertRaises(ValueError):
+            Unit.parse('parsec')
+
+    def test_get_conversion(self):
+        # result
+        power = Unit.parse('W').get_conversion('kW')
+        energy = Unit.parse('Wh').get_conversion(Unit(numerator=[BaseUnit.KW, BaseUnit.HOUR]))
+        temperature = Unit.parse('K').get_conversion('C')
+        temperature_hours = Unit.parse('(K*h)').get_conversion('(C*h)')
+
+        # assert
+        self.assertEqual(power, (0.001, 0.0))
+        self.assertAlmostEqual(energy[0], 0.001)
+        self.assertEqual(temperature, (1.0, -273.15))
+        self.assertEqual(temperature_hours, (1.0, 0.0))
+
+        with self.assertRaises(ValueError):
+            Unit.parse('kW').get_conversion('kWh')
+
+    def test_convert(self):
+        # given
+        kelvin = np.array([293.15, 300.15])
+        read_only = np.array([1000.0, 2000.0])
+        read_only.flags.writeable = False
+
+        # result
+        celsius = Unit.parse('K').convert(kelvin, 'C')
+        kilowatts = Unit.parse('W').convert(read_only, 'kW')
+        fahrenheit = Unit.parse('F').convert(212.0, 'C')
+        stacked = Unit.parse('F').convert([[32.0, 212.0], [50.0, 68.0]], 'C')
+
+        # assert
+        self.assertIs(celsius, kelvin)
+        np.testing.assert_allclose(celsius, [20.0, 27.0])
+        self.assertIsNot(kilowatts, read_only)
+        self.assertEqual(kilowatts.tolist(), [1.0, 2.0])
+        self.assertAlmostEqual(fahrenheit, 100.0)
+        np.testing.assert_allclose(stacked, [[0.0, 100.0], [10.0, 20.0]], atol=1e-9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import numpy as np
+from energy_flexibility_kpis.primitive_type import DefaultPrimitiveType
+from energy_flexibility_kpis.variable import DateTimeVariable, DefaultVariable, Variable, VariableSet
+
+class test_DefaultVariable(unittest.TestCase):
+    def test_definitions_are_interned(self):
+        # assert
+        self.assertIs(DefaultVariable.baseline_electric_power_profile, DefaultVariable.baseline_electric_power_profile)
+        self.assertIs(DefaultPrimitiveType.power_demand, DefaultPrimitiveType.power_demand)
+        self.assertIs(DefaultVariable.baseline_electric_power_profile.primitive_type, DefaultPrimitiveType.power_demand)
+        self.assertEqual(str(DefaultVariable.baseline_electric_power_profile.unit), 'kW')
+
+    def test_definitions_are_immutable(self):
+        # assert
+        with self.assertRaises(AttributeError):
+            DefaultVariable.timestamps = None
+
+        with self.assertRaises(AttributeError):
+            DefaultVariable.timestamps.name = 'time'
+
+        with self.assertRaises(AttributeError):
+            DefaultPrimitiveType.power_demand.unit = None
+
+    def test_bind(self):
+        # result
+        first = DefaultVariable.generic_electric_power_profile.bind([1.0, 2.0])
+        second = DefaultVariable.generic_electric_power_profile.bind([3.0])
+        timestamps = DefaultVariable.timestamps.bind([0, 1])
+
+        # assert
+        self.assertIsInstance(first, Variable)
+        self.assertIsInstance(timestamps, DateTimeVariable)
+        self.assertIs(first.variable_definition, second.variable_definition)
+        self.assertEqual(first.value.tolist(), [1.0, 2.0])
+        self.assertEqual(second.value.tolist(), [3.0])
+        self.assertEqual(first.snake_case_name, 'generic_electric_power_profile')
+
+    def test_variable_set(self):
+        # result
+        vs = VariableSet(generic_electric_power_profile=[1.0, 2.0, 3.0], timestamps=[0, 1, 2])
+
+        # assert
+        self.assertIs(vs.generic_electric_power_profile.variable_definition, DefaultVariable.generic_electric_power_profile)
+        self.assertEqual(vs.evaluation_length, 3)
+
+    def test_convert_units(self):
+        # given
+        power = np.array([1000.0, 2000.0, 3000.0])
+        arguments = {'generic_electric_power_profile': power, 'zone_temperature_profile': [[293.15, 294.15, 295.15]]}
+
+        # result
+        result = VariableSet.convert_units(arguments, {'generic_electric_power_profile': 'W', 'zone_temperature_profile': 'K'})
+        vs = VariableSet(generic_electric_power_profile=result['generic_electric_power_profile'])
+
+        # assert
+        self.assertIs(result['generic_electric_power_profile'], power)
+        self.assertEqual(vs.generic_electric_power_profile.value.tolist(), [1.0, 2.0, 3.0])
+        np.testing.assert_allclose(result['zone_temperature_profile'], [[20.0, 21.0, 22.0]])
+
+        with self.assertRaises(ValueError):
+            VariableSet.convert_units(arguments, {'generic_electric_power_profile': 'kWh'})
+
+    def test_array_values(self):
+        # given
+        profile = np.array([1.0, 2.0, 3.0])
+        timestamps = np.array(['2022-01-01T00:00', '2022-01-01T01:00', '2022-01-01T02:00'], dtype='datetime64[ns]')
+
+        # result
+        vs = VariableSet(generic_electric_power_profile=profile, timestamps=timestamps)
+        timesteps = DefaultVariable.timestamps.bind(np.arange(3))
+
+        # assert
+        self.assertTrue(np.shares_memory(vs.generic_electric_power_profile.value, profile))
+        self.assertEqual(vs.timestamps.value[1].hour, 1)
+        self.assertEqual(timesteps.value.tolist(), [0, 1, 2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,51 @@
-from typing import List
+import functools
+from typing import Any, List, Mapping, Tuple, Union
+import numpy as np
 from energy_flexibility_kpis.base import Definition
 from energy_flexibility_kpis.enumerations import BaseUnit
 
+# dimension exponents, scale to the reference unit of the dimension and offset of each base unit
+# i.e. reference value = value*scale + offset. Offsets only apply to absolute temperatures.
+_BASE_UNIT_CONVERSIONS: Mapping[BaseUnit, Tuple[Mapping[str, int], float, float]] = {
+    BaseUnit.DIMENSIONLESS: ({}, 1.0, 0.0),
+    BaseUnit.PERCENT: ({}, 0.01, 0.0),
+    BaseUnit.WH: ({'power': 1, 'time': 1}, 3600.0, 0.0),
+    BaseUnit.KWH: ({'power': 1, 'time': 1}, 3600.0*1000.0, 0.0),
+    BaseUnit.W: ({'power': 1}, 1.0, 0.0),
+    BaseUnit.KW: ({'power': 1}, 1000.0, 0.0),
+    BaseUnit.DOLLAR: ({'currency': 1}, 1.0, 0.0),
+    BaseUnit.DAY: ({'time': 1}, 86400.0, 0.0),
+    BaseUnit.HOUR: ({'time': 1}, 3600.0, 0.0),
+    BaseUnit.MINUTE: ({'time': 1}, 60.0, 0.0),
+    BaseUnit.SECOND: ({'time': 1}, 1.0, 0.0),
+    BaseUnit.MILLISECOND: ({'time': 1}, 0.001, 0.0),
+    # ton of refrigeration
+    BaseUnit.TON: ({'power': 1}, 3516.8528420667, 0.0),
+    BaseUnit.CELSIUS: ({'temperature': 1}, 1.0, 273.15),
+    BaseUnit.KELVIN: ({'temperature': 1}, 1.0, 0.0),
+    BaseUnit.FAHRENHEIT: ({'temperature': 1}, 5.0/9.0, 273.15 - 32.0*5.0/9.0),
+    BaseUnit.SQUARE_METER: ({'length': 2}, 1.0, 0.0),
+    BaseUnit.KG_OF_CO2: ({'carbon_dioxide': 1}, 1.0, 0.0),
+    BaseUnit.PPM: ({}, 1.0e-6, 0.0),
+    BaseUnit.ZONE: ({'zone': 1}, 1.0, 0.0),
+}
+
 class Unit(Definition):
+    r"""Unit made up of a product of base units divided by another product of base units.
+
+    Units are compared and hashed by their base units so they can be used as dictionary keys,
+    and values can be converted between units of the same dimension with :py:meth:`convert`.
+    Temperatures are converted as absolute temperatures when the unit is a single temperature
+    base unit, e.g. C to K, and as temperature differences otherwise, e.g. C*h to K*h.
+
+    Parameters
+    ----------
+    numerator: List[BaseUnit], optional
+        Base units that are multiplied in the numerator.
+    denominator: List[BaseUnit], optional
+        Base units that are multiplied in the denominator.
+    """
+
     def __init__(self, numerator: List[BaseUnit] = None, denominator: List[BaseUnit] = None):
         super().__init__()
         self.numerator = numerator
@@ -11,11 +54,11 @@ class Unit(Definition):
     @property
     def numerator(self) -> List[BaseUnit]:
         return self.__numerator
-    
+
     @property
     def denominator(self) -> List[BaseUnit]:
         return self.__denominator
-    
+
     @numerator.setter
     def numerator(self, value: List[BaseUnit]):
         value = [BaseUnit.DIMENSIONLESS] if value is None else value
@@ -26,6 +69,168 @@ class Unit(Definition):
         value = [BaseUnit.DIMENSIONLESS] if value is None else value
         self.__denominator = value
 
+    @property
+    def dimension(self) -> Mapping[str, int]:
+        """Exponent of each dimension, e.g. `{'power': 1, 'time': 1}` for kWh."""
+
+        return dict(self.__get_reference()[0])
+
+    @classmethod
+    def parse(cls, value: Union[str, BaseUnit, 'Unit']) -> 'Unit':
+        """Return unit from its string representation, e.g. 'W', 'kWh', '$/(kW*h)' or '(C*h)/(zone*d)'.
+
+        Base units are matched by symbol or name, e.g. 'K' or 'kelvin'.
+        """
+
+        if isinstance(value, Unit):
+            unit = value
+
+        elif isinstance(value, BaseUnit):
+            unit = cls(numerator=[value])
+
+        else:
+            unit = cls.__parse(value)
+
+        return unit
+
+    def get_conversion(self, unit: Union[str, 'Unit']) -> Tuple[float, float]:
+        """Return scale and offset that convert a value in this unit to `unit` as `value*scale + offset`.
+
+        Raises
+        ------
+        ValueError
+            If the units do not have the same dimension.
+        """
+
+        return Unit.__get_conversion(self, self.parse(unit))
+
+    def convert(self, value: Union[float, List[float], np.ndarray], unit: Union[str, 'Unit'], copy: bool = None) -> Union[float, np.ndarray]:
+        """Return `value` in this unit converted to `unit`.
+
+        Arrays are scaled and offset in place unless `copy` is `True`, or they are not writable
+        floating point arrays, in which case one converted copy is made. Lists, including lists
+        of lists, are converted to arrays.
+
+        Parameters
+        ----------
+        value: Union[float, List[float], np.ndarray]
+            Value or values in this unit.
+        unit: Union[str, Unit]
+            Unit to convert to.
+        copy: bool, default: False
+            Whether to always return a copy of array values.
+        """
+
+        copy = False if copy is None else copy
+        scale, offset = self.get_conversion(unit)
+
+        if scale == 1.0 and offset == 0.0:
+            converted = value
+
+        elif isinstance(value, (int, float, np.number)):
+            converted = value*scale + offset
+
+        else:
+            inplace = isinstance(value, np.ndarray) and not copy and value.flags.writeable\
+                and np.issubdtype(value.dtype, np.floating)
+            converted = value if inplace else np.array(value, dtype=float)
+            converted *= scale
+
+            if offset != 0.0:
+                converted += offset
+
+            else:
+                pass
+
+        return converted
+
+    def __get_reference(self) -> Tuple[Tuple[Tuple[str, int], ...], float, float]:
+        dimension = {}
+        scale = 1.0
+
+        for base_units, sign in [(self.numerator, 1), (self.denominator, -1)]:
+            for b in base_units:
+                d, s, _ = _BASE_UNIT_CONVERSIONS[b]
+                scale *= s**sign
+
+                for k, v in d.items():
+                    dimension[k] = dimension.get(k, 0) + v*sign
+
+        dimension = tuple(sorted((k, v) for k, v in dimension.items() if v != 0))
+        numerator = [b for b in self.numerator if b != BaseUnit.DIMENSIONLESS]
+        denominator = [b for b in self.denominator if b != BaseUnit.DIMENSIONLESS]
+        offset = _BASE_UNIT_CONVERSIONS[numerator[0]][2] if len(numerator) == 1 and len(denominator) == 0 else 0.0
+
+        return dimension, scale, offset
+
+    @classmethod
+    def __parse(cls, value: str) -> 'Unit':
+        base_units = {}
+
+        for b in BaseUnit:
+            base_units[b.value[0]] = b
+            base_units[b.value[1]] = b
+
+        def parse_product(product: str) -> List[BaseUnit]:
+            product = product.strip()
+            product = product[1:-1] if product.startswith('(') and product.endswith(')') else product
+            parsed = []
+
+            for p in product.split('*'):
+                p = p.strip()
+                b = base_units.get(p, base_units.get(p.lower()))
+
+                if b is None:
+                    raise ValueError(f'Unknown unit: {value}')
+
+                else:
+                    parsed.append(b)
+
+            return parsed
+
+        parts = value.split('/')
+
+        if len(parts) > 2:
+            raise ValueError(f'Unknown unit: {value}')
+
+        else:
+            pass
+
+        numerator = [BaseUnit.DIMENSIONLESS] if parts[0].strip() == '1' else parse_product(parts[0])
+        denominator = parse_product(parts[1]) if len(parts) == 2 else None
+
+        return cls(numerator=numerator, denominator=denominator)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def __get_conversion(from_unit: 'Unit', to_unit: 'Unit') -> Tuple[float, float]:
+        # cached per (from, to) pair so that converting many variables or datasets only walks the base units once
+        from_dimension, from_scale, from_offset = from_unit.__get_reference()
+        to_dimension, to_scale, to_offset = to_unit.__get_reference()
+
+        if from_dimension != to_dimension:
+            raise ValueError(
+                f'Cannot convert {from_unit} to {to_unit} because their dimensions,'
+                f' {dict(from_dimension)} and {dict(to_dimension)}, differ.'
+            )
+
+        else:
+            pass
+
+        scale = from_scale/to_scale
+        offset = (from_offset - to_offset)/to_scale
+
+        return scale, offset
+
+    def __key(self) -> Tuple[Tuple[BaseUnit, ...], Tuple[BaseUnit, ...]]:
+        return tuple(self.numerator), tuple(self.denominator)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Unit) and self.__key() == other.__key()
+
+    def __hash__(self) -> int:
+        return hash(self.__key())
+
     def __str__(self) -> str:
         division_sign = '/'
 
@@ -33,13 +238,13 @@ class Unit(Definition):
             if self.numerator[0] == BaseUnit.DIMENSIONLESS:
                 if len(self.denominator) > 1 or self.denominator[0] != BaseUnit.DIMENSIONLESS:
                     numerator = '1'
-                
+
                 else:
                     numerator = ''
-            
+
             else:
                 numerator = self.numerator[0].value[0]
-        
+
         else:
             numerator =  '(' + '*'.join([n.value[0] for n in self.numerator]) + ')'
 
@@ -49,12 +254,10 @@ class Unit(Definition):
                 denominator = ''
             else:
                 denominator = self.denominator[0].value[0]
-            
+
         else:
             denominator =  '(' + '*'.join([d.value[0] for d in self.denominator]) + ')'
 
         unit = numerator + division_sign + denominator
 
         return unit
-                
-        
\ No newline at end of file
@@ -1,33 +1,70 @@
+import contextlib
+import contextvars
 import datetime
 import math
-from typing import Any, List, Mapping, Union
+import sys
+from typing import Any, Iterator, List, Mapping, Union
 import numpy as np
-import pandas as pd
-from energy_flexibility_kpis.base import Definition
+from energy_flexibility_kpis.base import Definition, DefaultDefinitionMetaClass
 from energy_flexibility_kpis.enumerations import BaseUnit, OperationCondition, ValueType
 from energy_flexibility_kpis.primitive_type import DefaultPrimitiveType, PrimitiveType
+from energy_flexibility_kpis.profiling import stage
 from energy_flexibility_kpis.unit import Unit
 
 class Variable(Definition):
+    __slots__ = ('__variable_definition', '__value')
+
     def __init__(
             self, name: str, definition: str, primitive_type: PrimitiveType, value_type: ValueType, 
             operation_condition: OperationCondition = None, value: Union[str, int, float, bool, datetime.datetime, list, np.ndarray] = None, unit: Unit = None, 
             efont_uri: str = None, brick_uri: str = None
         ):
         super().__init__()
-        self.name = name
-        self.definition = definition
-        self.primitive_type = primitive_type
-        self.value_type = value_type
+        self.__variable_definition = VariableDefinition(
+            name=name, definition=definition, primitive_type=primitive_type, value_type=value_type,
+            operation_condition=operation_condition, unit=unit, efont_uri=efont_uri, brick_uri=brick_uri
+        )
         self.value = value
-        self.unit = unit
-        self.operation_condition = operation_condition
-        self.efont_uri = efont_uri
-        self.brick_uri = brick_uri
+
+    @classmethod
+    def _bind(cls, variable_definition: 'VariableDefinition', value: Any) -> 'Variable':
+        variable = cls.__new__(cls)
+        variable.__variable_definition = variable_definition
+        variable.value = value
+
+        return variable
+
+    @property
+    def variable_definition(self) -> 'VariableDefinition':
+        return self.__variable_definition
+
+    @property
+    def name(self) -> str:
+        return self.__variable_definition.name
+
+    @property
+    def definition(self) -> str:
+        return self.__variable_definition.definition
+
+    @property
+    def primitive_type(self) -> PrimitiveType:
+        return self.__variable_definition.primitive_type
+
+    @property
+    def value_type(self) -> ValueType:
+        return self.__variable_definition.value_type
 
     @property
     def unit(self) -> Unit:
-        self.primitive_type.unit if self.__unit is None else self.__unit
+        return self.__variable_definition.unit
+
+    @property
+    def efont_uri(self) -> str:
+        return self.__variable_definition.efont_uri
+
+    @property
+    def brick_uri(self) -> str:
+        return self.__variable_definition.brick_uri
 
     @property
     def value(self) -> np.ndarray:
@@ -35,38 +72,24 @@ class Variable(Definition):
     
     @property
     def operation_condition(self) -> OperationCondition:
-        return self.__operation_condition
+        return self.__variable_definition.operation_condition
     
     @property
     def snake_case_name(self) -> str:
-        return self.name.strip().replace(' ', '_')
+        return self.__variable_definition.snake_case_name
     
     def info(self) -> Mapping[str, Any]:
-        return {
-            'name': self.name,
-            'snake_case_name': self.snake_case_name,
-            'definition': self.definition,
-            'primitive_type': self.primitive_type.info(),
-            'value_type': self.value_type.value,
-            'unit': str(self.unit),
-            'operation_condition': self.operation_condition.value,
-            'efont_uri': self.efont_uri,
-            'brick_uri': self.brick_uri
-        }
-
-    @unit.setter
-    def unit(self, value: Unit):
-        self.__unit = value
+        return self.__variable_definition.info()
 
     @value.setter
     def value(self, value: Union[str, int, float, bool, datetime.datetime, list, np.ndarray]):
         value_type_error_message = f'The variable {self.snake_case_name} is a {self.value_type}'\
             f' value type and must be one of the following types: {[v.__name__ for v in self.value_type.value]}.'
 
-        if value is None or isinstance(value, pd._libs.tslibs.nattype.NaTType):
+        if value is None or _is_nat(value):
             pass
         
-        elif (isinstance(value, float) and math.isnan(value)) or isinstance(value, pd._libs.tslibs.nattype.NaTType):
+        elif (isinstance(value, float) and math.isnan(value)) or _is_nat(value):
             value = None
 
         elif self.value_type == ValueType.SINGLE:
@@ -75,34 +98,43 @@ class Variable(Definition):
         
         elif self.value_type == ValueType.SERIAL:
             assert isinstance(value, tuple(self.value_type.value)), value_type_error_message
-            value = np.array(value, dtype=type(value[0]))
+            # arrays, e.g. columns fetched from a database, are viewed instead of copied
+            value = value.view() if isinstance(value, np.ndarray) else np.array(value, dtype=type(value[0]))
            
         else:
             raise Exception(f'Unknown value_type: {self.value_type}')
 
         self.__value = value
 
-    @operation_condition.setter
-    def operation_condition(self, value: OperationCondition):
-        self.__operation_condition = OperationCondition.GENERIC if value is None else value
-
 class DateTimeVariable(Variable):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+    @property
+    def is_datetime(self) -> bool:
+        """Whether the value holds datetimes rather than integer timesteps."""
+
+        return self.value is not None and not np.issubdtype(self.value.dtype, np.integer)
+
     @Variable.value.setter
-    def value(self, value: Union[str, datetime.datetime, int, list]):
+    def value(self, value: Union[str, datetime.datetime, int, list, np.ndarray]):
         # if it is an integer, then it is assumed to be a timestep not a timestamp
         if (self.value_type == ValueType.SINGLE and not isinstance(value, int))\
             or (self.value_type == ValueType.SERIAL\
-                and (not isinstance(value, list) or not isinstance(value[0], int))
+                and (not isinstance(value, list) or not isinstance(value[0], int))\
+                    and (not isinstance(value, np.ndarray) or not np.issubdtype(value.dtype, np.integer))
             ):
-            value = pd.to_datetime(value)
-            
-            try:
-                value = value.tolist()
-            except AttributeError:
-                pass
+            import pandas as pd
+
+            with stage('timestamp_parsing', size=len(value) if isinstance(value, (list, np.ndarray)) else 1):
+                value = pd.to_datetime(value)
+                
+                try:
+                    value = value.tolist()
+                except AttributeError:
+                    pass
         
         else:
             pass
@@ -117,10 +149,14 @@ class DateTimeVariable(Variable):
         
         resolution = None
         value = self.value if value is None else value
-        timestamps = pd.to_datetime(value)
-        resolutions = timestamps.to_series().diff()
-        minimum_resolution = resolutions.min().total_seconds()
-        maximum_resolution = resolutions.max().total_seconds()
+
+        import pandas as pd
+
+        with stage('get_resolution', size=len(value)):
+            timestamps = pd.to_datetime(value)
+            resolutions = timestamps.to_series().diff()
+            minimum_resolution = resolutions.min().total_seconds()
+            maximum_resolution = resolutions.max().total_seconds()
 
         assert minimum_resolution == maximum_resolution,\
             f'Discontinuous time series. Minimum time interval ({minimum_resolution}s)'\
@@ -143,445 +179,509 @@ class DateTimeVariable(Variable):
 
         return resolution
 
-class DefaultVariableMetaClass(type):
-    def __init__(cls, *args, **kwargs) -> None:
-        pass
-    
-    @property
-    def availability(cls) -> Variable:
-        return Variable(
-            name='availability',
-            definition='Equipment availability mask.',
-            primitive_type=DefaultPrimitiveType.unspecified,
-            value_type=ValueType.SERIAL,
-        )
+class VariableDefinition(Definition):
+    r"""Immutable variable definition.
 
-    @property
-    def zone_temperature_profile(cls) -> Variable:
-        return Variable(
-            name='zone_temperature_profile',
-            definition='A time series data points of zone_temperature_profile.',
-            primitive_type=DefaultPrimitiveType.temperature,
-            value_type=ValueType.SERIAL,
-        )
-    
-    @property
-    def cooling_setpoints(cls) -> Variable:
-        return Variable(
-            name='cooling_setpoints',
-            definition='A time series data points of cooling_setpoints.',
-            primitive_type=DefaultPrimitiveType.temperature,
-            value_type=ValueType.SERIAL,
-        )
-    
-    @property
-    def heating_setpoints(cls) -> Variable:
-        return Variable(
-            name='heating_setpoints',
-            definition='A time series data points of heating_setpoints.',
-            primitive_type=DefaultPrimitiveType.temperature,
-            value_type=ValueType.SERIAL,
-        )
-    
-    @property
-    def baseline_electric_power_profile(cls) -> Variable:
-        return Variable(
-            name='baseline electric power profile',
-            definition='A time series data points of electric power demand acquired in baseline operation scenario.',
-            primitive_type=DefaultPrimitiveType.power_demand,
-            value_type=ValueType.SERIAL,
-            operation_condition=OperationCondition.BASELINE,
-        )
-    
-    @property
-    def baseline_electricity_consumption_profile(cls) -> Variable:
-        return Variable(
-            name='baseline electricity consumption profile',
-            definition='A time series data points of electricity consumption acquired in baseline operation scenario.',
-            primitive_type=DefaultPrimitiveType.energy_consumption,
-            value_type=ValueType.SERIAL,
-            operation_condition=OperationCondition.BASELINE,
-        )
-    
-    @property
-    def baseline_natural_gas_consumption_profile(cls) -> Variable:
-        return Variable(
-            name='baseline natural gas consumption profile',
-            definition='A time series data points of natural gas consumption acquired in baseline operation scenario.',
-            primitive_type=DefaultPrimitiveType.energy_consumption,
-            value_type=ValueType.SERIAL,
-            operation_condition=OperationCondition.BASELINE,
-        )
-    
-    @property
-    def baseline_cost_profile(cls) -> Variable:
-        return Variable(
-            name='baseline cost profile',
-            definition='A time series data points of energy cost acquired in baseline operation scenario.',
-            primitive_type=DefaultPrimitiveType.operation_cost,
-            value_type=ValueType.SERIAL,
-            operation_condition=OperationCondition.BASELINE,
-        )
-    
-    @property
-    def baseline_carbon_emissions_profile(cls) -> Variable:
-        return Variable(
-            name='baseline carbon emissions profile',
-            definition='A time series data points of energy carbon emissions acquired in baseline operation scenario.',
-            primitive_type=DefaultPrimitiveType.carbon_emission,
-            value_type=ValueType.SERIAL,
-            operation_condition=OperationCondition.BASELINE,
-        )
-    
-    @property
-    def baseline_carbon_intensity_profile(cls) -> Variable:
-        return Variable(
-            name='baseline carbon intensity profile',
-            definition='A time series data points of energy carbon intensity acquired in baseline operation scenario.',
-            primitive_type=DefaultPrimitiveType.carbon_emission_factor,
-            value_type=ValueType.SERIAL,
-            operation_condition=OperationCondition.BASELINE,
-        )
-    
-    @property
-    def baseline_self_production_profile(cls) -> Variable:
-        return Variable(
-            name='baseline self production profile',
-            definition='A time series data points of self-produced acquired in baseline operation scenario.',
-            primitive_type=DefaultPrimitiveType.power_demand,
-            value_type=ValueType.SERIAL,
-            operation_condition=OperationCondition.BASELINE,
-        )
-    
-    @property
-    def flexible_electric_power_profile(cls) -> Variable:
-        return Variable(
-            name='flexible electric power profile',
-            definition='A time series data points of electric power demand acquired in flexible operation scenario.',
-            primitive_type=DefaultPrimitiveType.power_demand,
-            value_type=ValueType.SERIAL,
-            operation_condition=OperationCondition.FLEXIBLE,
-        )
-    
-    @property
-    def flexible_electricity_consumption_profile(cls) -> Variable:
-        return Variable(
-            name='flexible electricity consumption profile',
-            definition='A time series data points of electricity consumption acquired in flexible operation scenario.',
-            primitive_type=DefaultPrimitiveType.energy_consumption,
-            value_type=ValueType.SERIAL,
-            operation_condition=OperationCondition.FLEXIBLE,
-        )
-    
-    @property
-    def flexible_natural_gas_consumption_profile(cls) -> Variable:
-        return Variable(
-            name='flexible natural gas consumption profile',
-            definition='A time series data points of natural gas consumption acquired in flexible operation scenario.',
-            primitive_type=DefaultPrimitiveType.energy_consumption,
-            value_type=ValueType.SERIAL,
-            operation_condition=OperationCondition.FLEXIBLE,
-        )
-    
-    @property
-    def flexible_cost_profile(cls) -> Variable:
-        return Variable(
-            name='flexible cost profile',
-            definition='A time series data points of energy cost acquired in flexible operation scenario.',
-            primitive_type=DefaultPrimitiveType.operation_cost,
-            value_type=ValueType.SERIAL,
-            operation_condition=OperationCondition.FLEXIBLE,
-        )
-    
-    @property
-    def flexible_carbon_emissions_profile(cls) -> Variable:
-        return Variable(
-            name='flexible carbon emissions profile',
-            definition='A time series data points of energy carbon emissions acquired in flexible operation scenario.',
-            primitive_type=DefaultPrimitiveType.carbon_emission,
-            value_type=ValueType.SERIAL,
-            operation_condition=OperationCondition.FLEXIBLE,
-        )
-    
-    @property
-    def flexible_carbon_intensity_profile(cls) -> Variable:
-        return Variable(
-            name='flexible carbon intensity profile',
-            definition='A time series data points of energy carbon intensity acquired in flexible operation scenario.',
-            primitive_type=DefaultPrimitiveType.carbon_emission_factor,
-            value_type=ValueType.SERIAL,
-            operation_condition=OperationCondition.FLEXIBLE,
-        )
-    
-    @property
-    def flexible_self_production_profile(cls) -> Variable:
-        return Variable(
-            name='flexible self production profile',
-            definition='A time series data points of self-produced acquired in flexible operation scenario.',
-            primitive_type=DefaultPrimitiveType.power_demand,
-            value_type=ValueType.SERIAL,
-            operation_condition=OperationCondition.FLEXIBLE,
-        )
-    
-    @property
-    def generic_electric_power_profile(cls) -> Variable:
-        return Variable(
-            name='generic electric power profile',
-            definition='A time series data points of electric power demand acquired in unspecified operation scenario.',
-            primitive_type=DefaultPrimitiveType.power_demand,
-            value_type=ValueType.SERIAL,
-        )
+    Default definitions are built once at import in :py:class:`DefaultVariable` and shared by
+    every :py:class:`Variable` that is bound to them with :py:meth:`bind`.
+    """
+
+    __slots__ = (
+        '__name', '__definition', '__primitive_type', '__value_type', '__operation_condition', 
+        '__unit', '__efont_uri', '__brick_uri', '__snake_case_name'
+    )
+    VARIABLE_CLASS = Variable
+
+    def __init__(
+            self, name: str, definition: str, primitive_type: PrimitiveType, value_type: ValueType, 
+            operation_condition: OperationCondition = None, unit: Unit = None, efont_uri: str = None, brick_uri: str = None
+        ):
+        super().__init__()
+        self.__name = name
+        self.__definition = definition
+        self.__primitive_type = primitive_type
+        self.__value_type = value_type
+        self.__operation_condition = OperationCondition.GENERIC if operation_condition is None else operation_condition
+        self.__unit = unit
+        self.__efont_uri = efont_uri
+        self.__brick_uri = brick_uri
+        self.__snake_case_name = name.strip().replace(' ', '_')
 
     @property
-    def generic_electricity_consumption_profile(cls) -> Variable:
-        return Variable(
-            name='generic electricity consumption profile',
-            definition='A time series data points of electricity consumption acquired in unspecified operation scenario.',
-            primitive_type=DefaultPrimitiveType.energy_consumption,
-            value_type=ValueType.SERIAL,
-        )
-    
-    @property
-    def generic_natural_gas_consumption_profile(cls) -> Variable:
-        return Variable(
-            name='generic natural gas consumption profile',
-            definition='A time series data points of natural gas consumption acquired in unspecified operation scenario.',
-            primitive_type=DefaultPrimitiveType.energy_consumption,
-            value_type=ValueType.SERIAL,
-        )
-    
-    @property
-    def generic_cost_profile(cls) -> Variable:
-        return Variable(
-            name='generic cost profile',
-            definition='A time series data points of energy cost acquired in generic operation scenario.',
-            primitive_type=DefaultPrimitiveType.operation_cost,
-            value_type=ValueType.SERIAL,
-            operation_condition=OperationCondition.GENERIC,
-        )
-    
-    @property
-    def generic_carbon_emissions_profile(cls) -> Variable:
-        return Variable(
-            name='generic carbon emissions profile',
-            definition='A time series data points of energy carbon emissions acquired in generic operation scenario.',
-            primitive_type=DefaultPrimitiveType.carbon_emission,
-            value_type=ValueType.SERIAL,
-            operation_condition=OperationCondition.GENERIC,
-        )
-    
-    @property
-    def generic_carbon_intensity_profile(cls) -> Variable:
-        return Variable(
-            name='generic carbon intensity profile',
-            definition='A time series data points of energy carbon intensity acquired in generic operation scenario.',
-            primitive_type=DefaultPrimitiveType.carbon_emission_factor,
-            value_type=ValueType.SERIAL,
-            operation_condition=OperationCondition.GENERIC,
-        )
-    
-    @property
-    def generic_self_production_profile(cls) -> Variable:
-        return Variable(
-            name='generic self production profile',
-            definition='A time series data points of self-produced acquired in generic operation scenario.',
-            primitive_type=DefaultPrimitiveType.power_demand,
-            value_type=ValueType.SERIAL,
-            operation_condition=OperationCondition.GENERIC,
-        )
-    
-    @property
-    def timestamps(cls) -> DateTimeVariable:
-        return DateTimeVariable(
-            name='timestamps',
-            definition='Profile timestamps.',
-            primitive_type=DefaultPrimitiveType.timestamp,
-            value_type=ValueType.SERIAL,
-        )
-    
-    @property
-    def evaluation_start_timestamp(cls) -> DateTimeVariable:
-        return DateTimeVariable(
-            name='evaluation start timestamp',
-            definition='The starting timestamp of an user specified evaluation window.',
-            primitive_type=DefaultPrimitiveType.timestamp,
-            value_type=ValueType.SINGLE,
-        )
-    
-    @property
-    def evaluation_end_timestamp(cls) -> DateTimeVariable:
-        return DateTimeVariable(
-            name='evaluation end timestamp',
-            definition='The starting timestamp of an user specified evaluation window.',
-            primitive_type=DefaultPrimitiveType.timestamp,
-            value_type=ValueType.SINGLE,
-        )
-    
-    @property
-    def load_profile_peak_timestamp(cls) -> DateTimeVariable:
-        return DateTimeVariable(
-            name='load profile peak timestamp',
-            definition='The timestamp of the maximum value of a given load profile.',
-            primitive_type=DefaultPrimitiveType.timestamp,
-            value_type=ValueType.SINGLE
-        )
-    
-    @property
-    def load_profile_valley_timestamp(cls) -> DateTimeVariable:
-        return DateTimeVariable(
-            name='load profile valley timestamp',
-            definition='The timestamp of the minimum value of a given load profile.',
-            primitive_type=DefaultPrimitiveType.timestamp,
-            value_type=ValueType.SINGLE
-        )
-    
-    @property
-    def grid_peak_timestamp(cls) -> DateTimeVariable:
-        return DateTimeVariable(
-            name='grid peak timestamp',
-            definition='The timestamp of the maximum load of the connected grid.',
-            primitive_type=DefaultPrimitiveType.timestamp,
-            value_type=ValueType.SINGLE
-        )
-    
-    @property
-    def generic_signal_start_timestamp(cls) -> DateTimeVariable:
-        return DateTimeVariable(
-            name='generic_signal_start_timestamp',
-            definition='The starting timestamp of a signal e.g. price, emissions, e.t.c.',
-            primitive_type=DefaultPrimitiveType.timestamp,
-            value_type=ValueType.SINGLE
-        )
-    
-    @property
-    def generic_signal_end_timestamp(cls) -> DateTimeVariable:
-        return DateTimeVariable(
-            name='generic_signal_end_timestamp',
-            definition='The ending timestamp of a signal e.g. price, emissions, e.t.c..',
-            primitive_type=DefaultPrimitiveType.timestamp,
-            value_type=ValueType.SINGLE
-        )
-    
-    @property
-    def low_generic_signal_start_timestamp(cls) -> DateTimeVariable:
-        return DateTimeVariable(
-            name='low_generic_signal_start_timestamp',
-            definition='The starting timestamp of a period when a signal e.g. price, emissions, e.t.c. is low.',
-            primitive_type=DefaultPrimitiveType.timestamp,
-            value_type=ValueType.SINGLE
-        )
-    
-    @property
-    def low_generic_signal_end_timestamp(cls) -> DateTimeVariable:
-        return DateTimeVariable(
-            name='low_generic_signal_end_timestamp',
-            definition='The ending timestamp of a period when a signal e.g. price, emissions, e.t.c. is low.',
-            primitive_type=DefaultPrimitiveType.timestamp,
-            value_type=ValueType.SINGLE
-        )
-    
-    @property
-    def medium_generic_signal_start_timestamp(cls) -> DateTimeVariable:
-        return DateTimeVariable(
-            name='medium_generic_signal_start_timestamp',
-            definition='The starting timestamp of a period when a signal e.g. price, emissions, e.t.c. is medium.',
-            primitive_type=DefaultPrimitiveType.timestamp,
-            value_type=ValueType.SINGLE
-        )
-    
-    @property
-    def medium_generic_signal_end_timestamp(cls) -> DateTimeVariable:
-        return DateTimeVariable(
-            name='medium_generic_signal_end_timestamp',
-            definition='The ending timestamp of a period when a signal e.g. price, emissions, e.t.c. is medium.',
-            primitive_type=DefaultPrimitiveType.timestamp,
-            value_type=ValueType.SINGLE
-        )
-    
-    @property
-    def high_generic_signal_start_timestamp(cls) -> DateTimeVariable:
-        return DateTimeVariable(
-            name='high_generic_signal_start_timestamp',
-            definition='The starting timestamp of a period when a signal e.g. price, emissions, e.t.c. is high.',
-            primitive_type=DefaultPrimitiveType.timestamp,
-            value_type=ValueType.SINGLE
-        )
-    
+    def name(self) -> str:
+        return self.__name
+
     @property
-    def high_generic_signal_end_timestamp(cls) -> DateTimeVariable:
-        return DateTimeVariable(
-            name='high_generic_signal_end_timestamp',
-            definition='The ending timestamp of a period when a signal e.g. price, emissions, e.t.c. is high.',
-            primitive_type=DefaultPrimitiveType.timestamp,
-            value_type=ValueType.SINGLE
-        )
-    
+    def definition(self) -> str:
+        return self.__definition
+
     @property
-    def high_price_start_timestamp(cls) -> DateTimeVariable:
-        return DateTimeVariable(
-            name='high price start timestamp',
-            definition='The starting timestamp of a period when the grid price is high.',
-            primitive_type=DefaultPrimitiveType.timestamp,
-            value_type=ValueType.SINGLE
-        )
-    
+    def primitive_type(self) -> PrimitiveType:
+        return self.__primitive_type
+
     @property
-    def high_price_end_timestamp(cls) -> DateTimeVariable:
-        return DateTimeVariable(
-            name='high price end timestamp',
-            definition='The ending timestamp of a period when the grid price is high.',
-            primitive_type=DefaultPrimitiveType.timestamp,
-            value_type=ValueType.SINGLE
-        )
-    
+    def value_type(self) -> ValueType:
+        return self.__value_type
+
     @property
-    def high_emission_start_timestamp(cls) -> DateTimeVariable:
-        return DateTimeVariable(
-            name='high emission start timestamp',
-            definition='The starting timestamp of a period when the grid emission factor is high.',
-            primitive_type=DefaultPrimitiveType.timestamp,
-            value_type=ValueType.SINGLE
-        )
-    
+    def operation_condition(self) -> OperationCondition:
+        return self.__operation_condition
+
     @property
-    def high_emission_end_timestamp(cls) -> DateTimeVariable:
-        return DateTimeVariable(
-            name='high emission end timestamp',
-            definition='The ending timestamp of a period when the grid emission factor is high.',
-            primitive_type=DefaultPrimitiveType.timestamp,
-            value_type=ValueType.SINGLE
-        )
-    
+    def unit(self) -> Unit:
+        return self.__primitive_type.unit if self.__unit is None else self.__unit
+
     @property
-    def floor_area(cls) -> Variable:
-        return Variable(
-            name='floor area',
-            definition='Floor area.',
-            primitive_type=DefaultPrimitiveType.area,
-            value_type=ValueType.SINGLE,
-        )
-    
+    def efont_uri(self) -> str:
+        return self.__efont_uri
+
     @property
-    def num_zones(cls) -> Variable:
-        return Variable(
-            name='num_zones',
-            definition='num_zones.',
-            primitive_type=DefaultPrimitiveType.unspecified,
-            value_type=ValueType.SINGLE,
-        )
-    
+    def brick_uri(self) -> str:
+        return self.__brick_uri
+
     @property
-    def num_days(cls) -> Variable:
-        return Variable(
-            name='num_days',
-            definition='num_days.',
-            primitive_type=DefaultPrimitiveType.unspecified,
-            value_type=ValueType.SINGLE,
-        )
-    
-class DefaultVariable(metaclass=DefaultVariableMetaClass):
+    def snake_case_name(self) -> str:
+        return self.__snake_case_name
+
+    def bind(self, value: Union[str, int, float, bool, datetime.datetime, list, np.ndarray] = None) -> Variable:
+        """Return a variable of this definition that holds `value`."""
+
+        return self.VARIABLE_CLASS._bind(self, value)
+
+    def info(self) -> Mapping[str, Any]:
+        return {
+            'name': self.name,
+            'snake_case_name': self.snake_case_name,
+            'definition': self.definition,
+            'primitive_type': self.primitive_type.info(),
+            'value_type': self.value_type.value,
+            'unit': str(self.unit),
+            'operation_condition': self.operation_condition.value,
+            'efont_uri': self.efont_uri,
+            'brick_uri': self.brick_uri
+        }
+
+class DateTimeVariableDefinition(VariableDefinition):
+    __slots__ = ()
+    VARIABLE_CLASS = DateTimeVariable
+
+def _is_nat(value: Any) -> bool:
+    # NaT can only be passed once pandas is imported so there is no need to import it here
+    pandas = sys.modules.get('pandas')
+
+    return pandas is not None and value is pandas.NaT
+
+class DefaultVariableMetaClass(DefaultDefinitionMetaClass):
     pass
 
+class DefaultVariable(metaclass=DefaultVariableMetaClass):
+    """Registry of default variable definitions that are built once at import."""
+
+    availability = VariableDefinition(
+        name='availability',
+        definition='Equipment availability mask.',
+        primitive_type=DefaultPrimitiveType.unspecified,
+        value_type=ValueType.SERIAL,
+    )
+
+    zone_temperature_profile = VariableDefinition(
+        name='zone_temperature_profile',
+        definition='A time series data points of zone_temperature_profile.',
+        primitive_type=DefaultPrimitiveType.temperature,
+        value_type=ValueType.SERIAL,
+    )
+
+    cooling_setpoints = VariableDefinition(
+        name='cooling_setpoints',
+        definition='A time series data points of cooling_setpoints.',
+        primitive_type=DefaultPrimitiveType.temperature,
+        value_type=ValueType.SERIAL,
+    )
+
+    heating_setpoints = VariableDefinition(
+        name='heating_setpoints',
+        definition='A time series data points of heating_setpoints.',
+        primitive_type=DefaultPrimitiveType.temperature,
+        value_type=ValueType.SERIAL,
+    )
+
+    zone_co2_concentration_profile = VariableDefinition(
+        name='zone_co2_concentration_profile',
+        definition='A time series data points of the CO2 concentration of each zone.',
+        primitive_type=DefaultPrimitiveType.co2_concentration,
+        value_type=ValueType.SERIAL,
+    )
+
+    upper_co2_concentration_limits = VariableDefinition(
+        name='upper_co2_concentration_limits',
+        definition='A time series data points of the acceptable upper CO2 concentration of each zone.',
+        primitive_type=DefaultPrimitiveType.co2_concentration,
+        value_type=ValueType.SERIAL,
+    )
+
+    baseline_heat_pump_activation_profile = VariableDefinition(
+        name='baseline heat pump activation profile',
+        definition='A time series data points of the on/off state of heat pumps in baseline operation scenario.',
+        primitive_type=DefaultPrimitiveType.unspecified,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.BASELINE,
+    )
+
+    flexible_heat_pump_activation_profile = VariableDefinition(
+        name='flexible heat pump activation profile',
+        definition='A time series data points of the on/off state of heat pumps in flexible operation scenario.',
+        primitive_type=DefaultPrimitiveType.unspecified,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.FLEXIBLE,
+    )
+
+    baseline_electric_power_profile = VariableDefinition(
+        name='baseline electric power profile',
+        definition='A time series data points of electric power demand acquired in baseline operation scenario.',
+        primitive_type=DefaultPrimitiveType.power_demand,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.BASELINE,
+    )
+
+    baseline_electricity_consumption_profile = VariableDefinition(
+        name='baseline electricity consumption profile',
+        definition='A time series data points of electricity consumption acquired in baseline operation scenario.',
+        primitive_type=DefaultPrimitiveType.energy_consumption,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.BASELINE,
+    )
+
+    baseline_natural_gas_consumption_profile = VariableDefinition(
+        name='baseline natural gas consumption profile',
+        definition='A time series data points of natural gas consumption acquired in baseline operation scenario.',
+        primitive_type=DefaultPrimitiveType.energy_consumption,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.BASELINE,
+    )
+
+    baseline_cost_profile = VariableDefinition(
+        name='baseline cost profile',
+        definition='A time series data points of energy cost acquired in baseline operation scenario.',
+        primitive_type=DefaultPrimitiveType.operation_cost,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.BASELINE,
+    )
+
+    baseline_carbon_emissions_profile = VariableDefinition(
+        name='baseline carbon emissions profile',
+        definition='A time series data points of energy carbon emissions acquired in baseline operation scenario.',
+        primitive_type=DefaultPrimitiveType.carbon_emission,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.BASELINE,
+    )
+
+    baseline_carbon_intensity_profile = VariableDefinition(
+        name='baseline carbon intensity profile',
+        definition='A time series data points of energy carbon intensity acquired in baseline operation scenario.',
+        primitive_type=DefaultPrimitiveType.carbon_emission_factor,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.BASELINE,
+    )
+
+    baseline_self_production_profile = VariableDefinition(
+        name='baseline self production profile',
+        definition='A time series data points of self-produced acquired in baseline operation scenario.',
+        primitive_type=DefaultPrimitiveType.power_demand,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.BASELINE,
+    )
+
+    flexible_electric_power_profile = VariableDefinition(
+        name='flexible electric power profile',
+        definition='A time series data points of electric power demand acquired in flexible operation scenario.',
+        primitive_type=DefaultPrimitiveType.power_demand,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.FLEXIBLE,
+    )
+
+    flexible_electricity_consumption_profile = VariableDefinition(
+        name='flexible electricity consumption profile',
+        definition='A time series data points of electricity consumption acquired in flexible operation scenario.',
+        primitive_type=DefaultPrimitiveType.energy_consumption,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.FLEXIBLE,
+    )
+
+    flexible_natural_gas_consumption_profile = VariableDefinition(
+        name='flexible natural gas consumption profile',
+        definition='A time series data points of natural gas consumption acquired in flexible operation scenario.',
+        primitive_type=DefaultPrimitiveType.energy_consumption,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.FLEXIBLE,
+    )
+
+    flexible_cost_profile = VariableDefinition(
+        name='flexible cost profile',
+        definition='A time series data points of energy cost acquired in flexible operation scenario.',
+        primitive_type=DefaultPrimitiveType.operation_cost,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.FLEXIBLE,
+    )
+
+    flexible_carbon_emissions_profile = VariableDefinition(
+        name='flexible carbon emissions profile',
+        definition='A time series data points of energy carbon emissions acquired in flexible operation scenario.',
+        primitive_type=DefaultPrimitiveType.carbon_emission,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.FLEXIBLE,
+    )
+
+    flexible_carbon_intensity_profile = VariableDefinition(
+        name='flexible carbon intensity profile',
+        definition='A time series data points of energy carbon intensity acquired in flexible operation scenario.',
+        primitive_type=DefaultPrimitiveType.carbon_emission_factor,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.FLEXIBLE,
+    )
+
+    flexible_self_production_profile = VariableDefinition(
+        name='flexible self production profile',
+        definition='A time series data points of self-produced acquired in flexible operation scenario.',
+        primitive_type=DefaultPrimitiveType.power_demand,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.FLEXIBLE,
+    )
+
+    generic_electric_power_profile = VariableDefinition(
+        name='generic electric power profile',
+        definition='A time series data points of electric power demand acquired in unspecified operation scenario.',
+        primitive_type=DefaultPrimitiveType.power_demand,
+        value_type=ValueType.SERIAL,
+    )
+
+    generic_electricity_consumption_profile = VariableDefinition(
+        name='generic electricity consumption profile',
+        definition='A time series data points of electricity consumption acquired in unspecified operation scenario.',
+        primitive_type=DefaultPrimitiveType.energy_consumption,
+        value_type=ValueType.SERIAL,
+    )
+
+    generic_natural_gas_consumption_profile = VariableDefinition(
+        name='generic natural gas consumption profile',
+        definition='A time series data points of natural gas consumption acquired in unspecified operation scenario.',
+        primitive_type=DefaultPrimitiveType.energy_consumption,
+        value_type=ValueType.SERIAL,
+    )
+
+    generic_cost_profile = VariableDefinition(
+        name='generic cost profile',
+        definition='A time series data points of energy cost acquired in generic operation scenario.',
+        primitive_type=DefaultPrimitiveType.operation_cost,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.GENERIC,
+    )
+
+    generic_carbon_emissions_profile = VariableDefinition(
+        name='generic carbon emissions profile',
+        definition='A time series data points of energy carbon emissions acquired in generic operation scenario.',
+        primitive_type=DefaultPrimitiveType.carbon_emission,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.GENERIC,
+    )
+
+    generic_carbon_intensity_profile = VariableDefinition(
+        name='generic carbon intensity profile',
+        definition='A time series data points of energy carbon intensity acquired in generic operation scenario.',
+        primitive_type=DefaultPrimitiveType.carbon_emission_factor,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.GENERIC,
+    )
+
+    generic_self_production_profile = VariableDefinition(
+        name='generic self production profile',
+        definition='A time series data points of self-produced acquired in generic operation scenario.',
+        primitive_type=DefaultPrimitiveType.power_demand,
+        value_type=ValueType.SERIAL,
+        operation_condition=OperationCondition.GENERIC,
+    )
+
+    target_electric_power_profile = VariableDefinition(
+        name='target electric power profile',
+        definition='A time series data points of the electric power demand that a flexible operation aims for, e.g. one requested by an aggregator.',
+        primitive_type=DefaultPrimitiveType.power_demand,
+        value_type=ValueType.SERIAL,
+    )
+
+    upward_flexible_power_profile = VariableDefinition(
+        name='upward flexible power profile',
+        definition='A time series data points of the electric power that can be added to the power demand.',
+        primitive_type=DefaultPrimitiveType.power_demand,
+        value_type=ValueType.SERIAL,
+    )
+
+    downward_flexible_power_profile = VariableDefinition(
+        name='downward flexible power profile',
+        definition='A time series data points of the electric power that can be removed from the power demand.',
+        primitive_type=DefaultPrimitiveType.power_demand,
+        value_type=ValueType.SERIAL,
+    )
+
+    electricity_price_profile = VariableDefinition(
+        name='electricity price profile',
+        definition='A time series data points of electricity price, e.g. a day-ahead price forecast.',
+        primitive_type=DefaultPrimitiveType.energy_price,
+        value_type=ValueType.SERIAL,
+    )
+
+    outdoor_air_temperature_profile = VariableDefinition(
+        name='outdoor air temperature profile',
+        definition='A time series data points of outdoor air temperature.',
+        primitive_type=DefaultPrimitiveType.temperature,
+        value_type=ValueType.SERIAL,
+    )
+
+    timestamps = DateTimeVariableDefinition(
+        name='timestamps',
+        definition='Profile timestamps.',
+        primitive_type=DefaultPrimitiveType.timestamp,
+        value_type=ValueType.SERIAL,
+    )
+
+    evaluation_start_timestamp = DateTimeVariableDefinition(
+        name='evaluation start timestamp',
+        definition='The starting timestamp of an user specified evaluation window.',
+        primitive_type=DefaultPrimitiveType.timestamp,
+        value_type=ValueType.SINGLE,
+    )
+
+    evaluation_end_timestamp = DateTimeVariableDefinition(
+        name='evaluation end timestamp',
+        definition='The starting timestamp of an user specified evaluation window.',
+        primitive_type=DefaultPrimitiveType.timestamp,
+        value_type=ValueType.SINGLE,
+    )
+
+    load_profile_peak_timestamp = DateTimeVariableDefinition(
+        name='load profile peak timestamp',
+        definition='The timestamp of the maximum value of a given load profile.',
+        primitive_type=DefaultPrimitiveType.timestamp,
+        value_type=ValueType.SINGLE
+    )
+
+    load_profile_valley_timestamp = DateTimeVariableDefinition(
+        name='load profile valley timestamp',
+        definition='The timestamp of the minimum value of a given load profile.',
+        primitive_type=DefaultPrimitiveType.timestamp,
+        value_type=ValueType.SINGLE
+    )
+
+    grid_peak_timestamp = DateTimeVariableDefinition(
+        name='grid peak timestamp',
+        definition='The timestamp of the maximum load of the connected grid.',
+        primitive_type=DefaultPrimitiveType.timestamp,
+        value_type=ValueType.SINGLE
+    )
+
+    generic_signal_start_timestamp = DateTimeVariableDefinition(
+        name='generic_signal_start_timestamp',
+        definition='The starting timestamp of a signal e.g. price, emissions, e.t.c.',
+        primitive_type=DefaultPrimitiveType.timestamp,
+        value_type=ValueType.SINGLE
+    )
+
+    generic_signal_end_timestamp = DateTimeVariableDefinition(
+        name='generic_signal_end_timestamp',
+        definition='The ending timestamp of a signal e.g. price, emissions, e.t.c..',
+        primitive_type=DefaultPrimitiveType.timestamp,
+        value_type=ValueType.SINGLE
+    )
+
+    low_generic_signal_start_timestamp = DateTimeVariableDefinition(
+        name='low_generic_signal_start_timestamp',
+        definition='The starting timestamp of a period when a signal e.g. price, emissions, e.t.c. is low.',
+        primitive_type=DefaultPrimitiveType.timestamp,
+        value_type=ValueType.SINGLE
+    )
+
+    low_generic_signal_end_timestamp = DateTimeVariableDefinition(
+        name='low_generic_signal_end_timestamp',
+        definition='The ending timestamp of a period when a signal e.g. price, emissions, e.t.c. is low.',
+        primitive_type=DefaultPrimitiveType.timestamp,
+        value_type=ValueType.SINGLE
+    )
+
+    medium_generic_signal_start_timestamp = DateTimeVariableDefinition(
+        name='medium_generic_signal_start_timestamp',
+        definition='The starting timestamp of a period when a signal e.g. price, emissions, e.t.c. is medium.',
+        primitive_type=DefaultPrimitiveType.timestamp,
+        value_type=ValueType.SINGLE
+    )
+
+    medium_generic_signal_end_timestamp = DateTimeVariableDefinition(
+        name='medium_generic_signal_end_timestamp',
+        definition='The ending timestamp of a period when a signal e.g. price, emissions, e.t.c. is medium.',
+        primitive_type=DefaultPrimitiveType.timestamp,
+        value_type=ValueType.SINGLE
+    )
+
+    high_generic_signal_start_timestamp = DateTimeVariableDefinition(
+        name='high_generic_signal_start_timestamp',
+        definition='The starting timestamp of a period when a signal e.g. price, emissions, e.t.c. is high.',
+        primitive_type=DefaultPrimitiveType.timestamp,
+        value_type=ValueType.SINGLE
+    )
+
+    high_generic_signal_end_timestamp = DateTimeVariableDefinition(
+        name='high_generic_signal_end_timestamp',
+        definition='The ending timestamp of a period when a signal e.g. price, emissions, e.t.c. is high.',
+        primitive_type=DefaultPrimitiveType.timestamp,
+        value_type=ValueType.SINGLE
+    )
+
+    high_price_start_timestamp = DateTimeVariableDefinition(
+        name='high price start timestamp',
+        definition='The starting timestamp of a period when the grid price is high.',
+        primitive_type=DefaultPrimitiveType.timestamp,
+        value_type=ValueType.SINGLE
+    )
+
+    high_price_end_timestamp = DateTimeVariableDefinition(
+        name='high price end timestamp',
+        definition='The ending timestamp of a period when the grid price is high.',
+        primitive_type=DefaultPrimitiveType.timestamp,
+        value_type=ValueType.SINGLE
+    )
+
+    high_emission_start_timestamp = DateTimeVariableDefinition(
+        name='high emission start timestamp',
+        definition='The starting timestamp of a period when the grid emission factor is high.',
+        primitive_type=DefaultPrimitiveType.timestamp,
+        value_type=ValueType.SINGLE
+    )
+
+    high_emission_end_timestamp = DateTimeVariableDefinition(
+        name='high emission end timestamp',
+        definition='The ending timestamp of a period when the grid emission factor is high.',
+        primitive_type=DefaultPrimitiveType.timestamp,
+        value_type=ValueType.SINGLE
+    )
+
+    floor_area = VariableDefinition(
+        name='floor area',
+        definition='Floor area.',
+        primitive_type=DefaultPrimitiveType.area,
+        value_type=ValueType.SINGLE,
+    )
+
+    num_zones = VariableDefinition(
+        name='num_zones',
+        definition='num_zones.',
+        primitive_type=DefaultPrimitiveType.unspecified,
+        value_type=ValueType.SINGLE,
+    )
+
+    num_days = VariableDefinition(
+        name='num_days',
+        definition='num_days.',
+        primitive_type=DefaultPrimitiveType.unspecified,
+        value_type=ValueType.SINGLE,
+    )
+
 class VariableSet(Definition):
     def __init__(
             self,
@@ -610,6 +710,11 @@ class VariableSet(Definition):
             generic_carbon_emissions_profile: List[float] = None,
             generic_carbon_intensity_profile: List[float] = None,
             generic_self_production_profile: List[float] = None,
+            target_electric_power_profile: List[float] = None,
+            upward_flexible_power_profile: List[float] = None,
+            downward_flexible_power_profile: List[float] = None,
+            electricity_price_profile: List[float] = None,
+            outdoor_air_temperature_profile: List[float] = None,
             load_profile_peak_timestamp: Union[int, datetime.datetime, str] = None,
             load_profile_valley_timestamp: Union[int, datetime.datetime, str] = None,
             grid_peak_timestamp: Union[int, datetime.datetime, str] = None,
@@ -631,6 +736,10 @@ class VariableSet(Definition):
             zone_temperature_profile: List[float] = None,
             cooling_setpoints: List[float] = None,
             heating_setpoints: List[float] = None,
+            zone_co2_concentration_profile: List[float] = None,
+            upper_co2_concentration_limits: List[float] = None,
+            baseline_heat_pump_activation_profile: List[bool] = None,
+            flexible_heat_pump_activation_profile: List[bool] = None,
         ) -> None:
 
         # variables
@@ -656,6 +765,11 @@ class VariableSet(Definition):
         self.generic_carbon_emissions_profile = self.__set_variable(DefaultVariable.generic_carbon_emissions_profile, generic_carbon_emissions_profile)
         self.generic_carbon_intensity_profile = self.__set_variable(DefaultVariable.generic_carbon_intensity_profile, generic_carbon_intensity_profile)
         self.generic_self_production_profile = self.__set_variable(DefaultVariable.generic_self_production_profile, generic_self_production_profile)
+        self.target_electric_power_profile = self.__set_variable(DefaultVariable.target_electric_power_profile, target_electric_power_profile)
+        self.upward_flexible_power_profile = self.__set_variable(DefaultVariable.upward_flexible_power_profile, upward_flexible_power_profile)
+        self.downward_flexible_power_profile = self.__set_variable(DefaultVariable.downward_flexible_power_profile, downward_flexible_power_profile)
+        self.electricity_price_profile = self.__set_variable(DefaultVariable.electricity_price_profile, electricity_price_profile)
+        self.outdoor_air_temperature_profile = self.__set_variable(DefaultVariable.outdoor_air_temperature_profile, outdoor_air_temperature_profile)
         self.timestamps: DateTimeVariable = self.__set_variable(DefaultVariable.timestamps, timestamps)
         self.evaluation_start_timestamp = self.__set_variable(DefaultVariable.evaluation_start_timestamp, evaluation_start_timestamp)
         self.evaluation_end_timestamp = self.__set_variable(DefaultVariable.evaluation_end_timestamp, evaluation_end_timestamp)
@@ -680,24 +794,78 @@ class VariableSet(Definition):
         self.zone_temperature_profile = self.__set_variable(DefaultVariable.zone_temperature_profile, zone_temperature_profile)
         self.cooling_setpoints = self.__set_variable(DefaultVariable.cooling_setpoints, cooling_setpoints)
         self.heating_setpoints = self.__set_variable(DefaultVariable.heating_setpoints, heating_setpoints)
+        self.zone_co2_concentration_profile = self.__set_variable(DefaultVariable.zone_co2_concentration_profile, zone_co2_concentration_profile)
+        self.upper_co2_concentration_limits = self.__set_variable(DefaultVariable.upper_co2_concentration_limits, upper_co2_concentration_limits)
+        self.baseline_heat_pump_activation_profile = self.__set_variable(DefaultVariable.baseline_heat_pump_activation_profile, baseline_heat_pump_activation_profile)
+        self.flexible_heat_pump_activation_profile = self.__set_variable(DefaultVariable.flexible_heat_pump_activation_profile, flexible_heat_pump_activation_profile)
         self.validate_serial_variables()
+        self.__evaluation_mask = None
     
+    @staticmethod
+    def convert_units(arguments: Mapping[str, Any], units: Mapping[str, Union[str, Unit]], copy: bool = None) -> Mapping[str, Any]:
+        """Return :py:meth:`KPI.calculate` arguments with values converted to the units of their default variables.
+
+        Each value is converted with one vectorised scale and offset, in place for writable floating
+        point arrays, using conversion factors that are cached per unit pair.
+
+        Parameters
+        ----------
+        arguments: Mapping[str, Any]
+            :py:meth:`KPI.calculate` arguments.
+        units: Mapping[str, Union[str, Unit]]
+            Units that argument values are in, e.g. `{'baseline_electric_power_profile': 'W'}`.
+            Arguments that are not in `units` are assumed to already be in their default units.
+        copy: bool, default: False
+            Whether to convert copies of array values instead of converting them in place.
+
+        Raises
+        ------
+        ValueError
+            If an argument is not a default variable or its unit has a different dimension.
+        """
+
+        arguments = dict(arguments)
+
+        for name, unit in units.items():
+            variable_definition = getattr(DefaultVariable, name, None)
+
+            if not isinstance(variable_definition, VariableDefinition):
+                raise ValueError(f'Unknown variable: {name}')
+
+            elif arguments.get(name) is None:
+                continue
+
+            else:
+                arguments[name] = Unit.parse(unit).convert(arguments[name], variable_definition.unit, copy=copy)
+
+        return arguments
+
     @property
     def evaluation_length(self) -> int:
         return self.evaluation_mask[self.evaluation_mask].shape[0]
     
     @property
     def evaluation_mask(self) -> np.ndarray:
-        # use timesteps for masking and assume evaluation start timestamp and timestep 
-        # are integers that indicate timestep
-        timestamps = np.array(range(self.__serial_variable_length), dtype=int)\
-            if self.timestamps.value is None else self.timestamps.value
-        evaluation_start_timestamp = timestamps[0] if self.evaluation_start_timestamp.value is None\
-            else self.evaluation_start_timestamp.value
-        evaluation_end_timestamp = timestamps[-1] if self.evaluation_end_timestamp.value is None\
-            else self.evaluation_end_timestamp.value
-
-        return (timestamps >= evaluation_start_timestamp) & (timestamps <= evaluation_end_timestamp)
+        """Read-only boolean mask of timesteps within the evaluation window, computed on first access."""
+
+        if self.__evaluation_mask is None:
+            with stage('evaluation_mask', size=self.__serial_variable_length):
+                # use timesteps for masking and assume evaluation start timestamp and timestep 
+                # are integers that indicate timestep
+                timestamps = np.array(range(self.__serial_variable_length), dtype=int)\
+                    if self.timestamps.value is None else self.timestamps.value
+                evaluation_start_timestamp = timestamps[0] if self.evaluation_start_timestamp.value is None\
+                    else self.evaluation_start_timestamp.value
+                evaluation_end_timestamp = timestamps[-1] if self.evaluation_end_timestamp.value is None\
+                    else self.evaluation_end_timestamp.value
+                mask = (timestamps >= evaluation_start_timestamp) & (timestamps <= evaluation_end_timestamp)
+                mask.flags.writeable = False
+                self.__evaluation_mask = mask
+
+        else:
+            pass
+
+        return self.__evaluation_mask
     
     def get_temporal_resolution(self, unit: BaseUnit, value: List[datetime.datetime] = None):
         return self.timestamps.get_resolution(unit, value=value)
@@ -723,8 +891,67 @@ class VariableSet(Definition):
             and  variable.value_type == ValueType.SERIAL\
                 and isinstance(variable.value, np.ndarray)
     
-    def __set_variable(self, default: Variable, value: Any) -> Variable:
-        variable = default
-        variable.value = value
-        
-        return variable
\ No newline at end of file
+    def __set_variable(self, default: VariableDefinition, value: Any) -> Variable:
+        return default.bind(value)
+
+class VariableSetCache(Definition):
+    r"""Shares :py:class:`VariableSet` objects between KPI calculations on the same inputs.
+
+    While the cache is active (see :py:meth:`activate`), :py:meth:`KPI.calculate` reuses the
+    variable set built for a previous calculation if every input argument is the same object,
+    so that timestamps are parsed and evaluation masks are built once for a batch of KPIs.
+    Inputs are matched by identity, not equality, and the arrays of shared variable sets are
+    made read-only.
+    """
+
+    __CURRENT = contextvars.ContextVar('variable_set_cache', default=None)
+
+    def __init__(self):
+        super().__init__()
+        self.__variable_sets: Mapping[tuple, tuple] = {}
+
+    @classmethod
+    def current(cls) -> 'VariableSetCache':
+        """Return the active cache or `None`."""
+
+        return cls.__CURRENT.get()
+
+    @classmethod
+    @contextlib.contextmanager
+    def activate(cls) -> Iterator['VariableSetCache']:
+        """Context manager that activates a new cache in the current context."""
+
+        cache = cls()
+        token = cls.__CURRENT.set(cache)
+
+        try:
+            yield cache
+
+        finally:
+            cls.__CURRENT.reset(token)
+
+    def get(self, arguments: Mapping[str, Any]) -> VariableSet:
+        """Return variable set built from the same `arguments` objects, or `None`."""
+
+        cached = self.__variable_sets.get(self.__get_key(arguments))
+
+        if cached is not None and all(arguments[k] is v for k, v in cached[0].items()):
+            return cached[1]
+
+        else:
+            return None
+
+    def set(self, arguments: Mapping[str, Any], variable_set: VariableSet):
+        for v in vars(variable_set).values():
+            if isinstance(v, Variable) and isinstance(v.value, np.ndarray):
+                v.value.flags.writeable = False
+
+            else:
+                pass
+
+        # keep references to the arguments so that their ids are not reused while cached
+        self.__variable_sets[self.__get_key(arguments)] = (dict(arguments), variable_set)
+
+    @staticmethod
+    def __get_key(arguments: Mapping[str, Any]) -> tuple:
+        return tuple((k, id(v)) for k, v in arguments.items() if v is not None)
\ No newline at end of file
@@ -1,81 +1,191 @@
 #%%
-import yaml
-from rdflib import Namespace
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from rdflib import Graph, Namespace, OWL, RDF
 from buildingmotif import BuildingMOTIF
 from buildingmotif.dataclasses import Model, Library
 from buildingmotif.namespaces import BRICK # import this to make writing URIs easier
 from tabulate import tabulate
 
-class ValidationInterface:
-    def __init__(self, model_path, manifest_paths):
+# per-process validation state: one in-memory buildingMOTIF instance, the shape collections
+# of the shared libraries, libraries loaded so far keyed by ontology name and models loaded
+# so far keyed by file hash
+_STATE = {}
 
-        '''Interface for buildingMOTIF to run semantic sufficiency validation
-        '''   
+def _get_file_hash(filepath):
+    '''Return SHA-256 hash of file content
+    '''
 
-        # Define graph path
-        self.graph_path = model_path
+    with open(filepath, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
 
-        # Define manifest path
-        self.manifest_paths = manifest_paths
+def _get_ontology_name(filepath):
+    '''Return name of the ontology declared in a library file, which buildingMOTIF stores the library under
+    '''
 
-    def validate(self):
-    
-        table_data = []
-        suitable_kpis = []
+    names = list(Graph().parse(filepath, format="ttl").subjects(RDF.type, OWL.Ontology))
+
+    return str(names[0]) if len(names) > 0 else None
+
+def _check_ontology_names(filepaths):
+    '''Raise if different library files declare the same ontology name
+
+    buildingMOTIF stores a library under its ontology name so loading the second file into the
+    shared instance would overwrite or merge the shapes of the first.
+    '''
+
+    found = {}
+
+    for filepath in filepaths:
+        name = _get_ontology_name(filepath)
+        key = _get_file_hash(filepath)
+
+        if name is not None and found.setdefault(name, (filepath, key))[1] != key:
+            raise ValueError(f'{filepath} and {found[name][0]} declare the same ontology name {name}.')
+
+        else:
+            pass
+
+def _initialize(constraints_path, brick_path):
+    '''Create the in-memory buildingMOTIF instance and load the shared libraries once per process
+    '''
+
+    _STATE['bm'] = BuildingMOTIF("sqlite://")
+    _STATE['libraries'] = {}
+    _STATE['names'] = {}
+    _STATE['models'] = {}
+
+    # load libraries included with the python package
+    constraints = _get_library(constraints_path)
+
+    # load libraries excluded from the python package (available from the repository)
+    brick = _get_library(brick_path)
+
+    _STATE['shape_collections'] = [brick.get_shape_collection(), constraints.get_shape_collection()]
+
+def _get_library(filepath):
+    '''Return library loaded from file, loading it only the first time its ontology is seen
+    '''
+
+    key = _get_file_hash(filepath)
+
+    if key not in _STATE['names']:
+        name = _get_ontology_name(filepath)
+        _STATE['names'][key] = key if name is None else name
+
+    else:
+        pass
 
-        # Iterate over manifest paths and validate each one
-        for key, manifest_path in self.manifest_paths.items():
+    name = _STATE['names'][key]
+    loaded_key, library = _STATE['libraries'].get(name, (None, None))
 
-            # in-memory instance
-            bm = BuildingMOTIF("sqlite://")
+    if library is None:
+        library = Library.load(ontology_graph=filepath)
+        _STATE['libraries'][name] = (key, library)
 
-            # create the namespace for the building
-            BLDG = Namespace('urn:bldg/')
+    elif loaded_key != key:
+        raise ValueError(f'A different library with ontology name {name} is already loaded.')
 
+    else:
+        pass
 
-            # create the building model
-            model = Model.create(BLDG, description="This is a test model for a simple building")
+    return library
 
-            # load test case model
-            model.graph.parse(self.graph_path, format="ttl")
+def _get_model(filepath):
+    '''Return building model parsed from file, parsing it only the first time its content is seen
+    '''
 
-            #print(model.graph.serialize())
+    key = _get_file_hash(filepath)
 
-            # load libraries included with the python package
-            constraints = Library.load(ontology_graph="../../buildingmotif/libraries/constraints/constraints.ttl")
+    if key not in _STATE['models']:
+        # create the namespace for the building, unique per model content
+        BLDG = Namespace(f'urn:bldg/{key}/')
 
-            # load libraries excluded from the python package (available from the repository)
-            brick = Library.load(ontology_graph="validation_buildingMOTIF/Brick-subset.ttl")
+        # create the building model
+        model = Model.create(BLDG, description="This is a test model for a simple building")
 
-            # pass a list of shape collections to .validate()
-            validation_result = model.validate([brick.get_shape_collection()])
-            #print(f"Model is valid? {validation_result.valid}")
+        # load test case model
+        model.graph.parse(filepath, format="ttl")
+        _STATE['models'][key] = model
 
-            # load manifest into BuildingMOTIF as its own library!
-            manifest = Library.load(ontology_graph=manifest_path)
-            #print(manifest_path)
-            #print(manifest)
-            # gather shape collections into a list for ease of use
-            shape_collections = [
-                brick.get_shape_collection(),
-                constraints.get_shape_collection(),
-                manifest.get_shape_collection(),
-            ]
+    else:
+        pass
 
-            # pass a list of shape collections to .validate()
-            validation_result = model.validate(shape_collections)
+    return _STATE['models'][key]
 
+def _validate(model_path, key, manifest_path):
+    '''Validate building model against one KPI manifest and return the KPI, result and diff reasons
+    '''
+
+    model = _get_model(model_path)
+
+    # load manifest into BuildingMOTIF as its own library!
+    manifest = _get_library(manifest_path)
+
+    # pass a list of shape collections to .validate()
+    validation_result = model.validate([*_STATE['shape_collections'], manifest.get_shape_collection()])
+    reasons = [diff.reason() for diff in validation_result.diffset]
+
+    return key, validation_result.valid, reasons
+
+class ValidationInterface:
+    def __init__(
+        self, model_path, manifest_paths, constraints_path="../../buildingmotif/libraries/constraints/constraints.ttl",
+        brick_path="validation_buildingMOTIF/Brick-subset.ttl", max_workers=None
+    ):
+
+        '''Interface for buildingMOTIF to run semantic sufficiency validation
+
+        The building model and shared libraries are parsed once per worker process, libraries are
+        cached by ontology name and models by file hash, and the manifests are validated concurrently
+        across `max_workers` processes (defaults to the number of CPUs, 1 validates in this process).
+        Manifests and shared libraries must declare distinct ontology names as they share one
+        buildingMOTIF instance per process.
+        '''
+
+        # Define graph path
+        self.graph_path = model_path
+
+        # Define manifest path
+        self.manifest_paths = manifest_paths
+
+        # Define shared library paths
+        self.constraints_path = constraints_path
+        self.brick_path = brick_path
+
+        self.max_workers = max_workers
+
+    def validate(self):
+
+        table_data = []
+        suitable_kpis = []
+        keys = list(self.manifest_paths.keys())
+        manifest_paths = list(self.manifest_paths.values())
+        max_workers = min(self.max_workers or os.cpu_count() or 1, max(len(keys), 1))
+        _check_ontology_names([self.constraints_path, self.brick_path, *manifest_paths])
+
+        # Validate each manifest, concurrently if more than one worker
+        if max_workers == 1:
+            _initialize(self.constraints_path, self.brick_path)
+            results = list(map(_validate, [self.graph_path]*len(keys), keys, manifest_paths))
+
+        else:
+            with ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_initialize, initargs=(self.constraints_path, self.brick_path)
+            ) as executor:
+                results = list(executor.map(_validate, [self.graph_path]*len(keys), keys, manifest_paths))
+
+        for key, valid, reasons in results:
             # Append a row to the table with validation result and key
-            row = [key, validation_result.valid]
+            row = [key, valid]
 
-            if validation_result.valid == True:
+            if valid == True:
                 suitable_kpis.append({key})
-            
-            # Add reasons for each diff if available
-            for diff in validation_result.diffset:
-                print (f" For KPI {key} - {diff.reason()}") 
 
-            #print(f"KPI: {key}, Validation Result: {validation_result.valid}")
+            # Add reasons for each diff if available
+            for reason in reasons:
+                print (f" For KPI {key} - {reason}")
 
             # Append the row to the overall table data
             table_data.append(row)
@@ -84,4 +194,4 @@ class ValidationInterface:
         # Print the table without headers
         print(tabulate(table_data, headers=["KPI", "Brick model validation result"], tablefmt="fancy_grid"))
 
-        return suitable_kpis
\ No newline at end of file
+        return suitable_kpis
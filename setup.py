@@ -44,6 +44,7 @@ setuptools.setup(
         "Source Code": f"https://github.com/{GITHUB_ACCOUNT}/{REPOSITORY_NAME}",
     },
     packages=setuptools.find_packages(),
+    package_data={PACKAGE_NAME: ['catalogue.json']},
     python_requires=f">={MINIMUM_PYTHON_VERSION}",
     classifiers=[
         'Programming Language :: Python :: 3',
@@ -51,4 +52,5 @@ setuptools.setup(
         'Operating System :: OS Independent',
     ],
     install_requires=requirements,  # Automatically install the requirements
+    entry_points={'console_scripts': [f'{PACKAGE_NAME}={PACKAGE_NAME}.cli:main']},
 )